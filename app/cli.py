@@ -0,0 +1,282 @@
+# app/cli.py
+"""Command line maintenance tasks.
+
+* **Rôle global** : regrouper les **commandes ponctuelles de maintenance** (backfills,
+  reconstructions) qui ne passent pas par l'API.
+  👉 S'exécute avec la même configuration que l'application (`settings.database_url`).
+
+* **Commandes** :
+
+  * `python -m app.cli backfill-hashtags [--chunk-size N]`
+
+    * Crée les tables manquantes puis reconstruit `tweet_hashtags` et `hashtag_counts` à
+      partir de `tweets`.
+    * À lancer une fois sur une base existante, avant d'utiliser `/analytics/hashtags`.
+
+  * `python -m app.cli rebuild-rollups [--chunk-size N]`
+
+    * Régénère les rollups `tweet_counts_minute`, `tweet_counts_hour` et
+      `hashtag_counts_hour` à partir de `tweets`.
+
+  * `python -m app.cli backfill-sentiment [--chunk-size N] [--workers N]`
+
+    * Score les tweets sans sentiment persisté, sur un pool de processus (reprend là où
+      il s'est arrêté).
+
+  * `python -m app.cli archive-tweets [--root DIR] [--include-raw] [--chunk-size N]
+    [--prune-days N]`
+
+    * Archive en Parquet (partitions par jour) les tweets insérés depuis le dernier
+      archivage (nécessite `pyarrow`).
+    * `--prune-days N` → supprime ensuite de la base les tweets archivés de plus de N
+      jours.
+
+  * `python -m app.cli record-corpus --query Q [--pages N] [--max-results N]
+    [--out FICHIER]`
+
+    * Interroge la vraie API (`BEARER_TOKEN`) et enregistre les réponses page par page
+      dans un corpus NDJSON, rejouable hors ligne par le serveur stub
+      (`STUB_API_CORPUS_PATH=... make stub-api`).
+
+  * `python -m app.cli compress-payloads [--chunk-size N]`
+
+    * Compresse dans `tweet_payloads` le JSON brut encore stocké en clair dans
+      `tweets.raw_json` (base existante), puis affiche les volumes avant / après (lancer
+      `VACUUM` ensuite sous SQLite pour réduire le fichier).
+
+  * `python -m app.cli rebuild-search`
+
+    * Crée l'index plein texte s'il manque (base existante) et le reconstruit depuis
+      `tweets`.
+
+  * `python -m app.cli sync-indexes`
+
+    * Crée les index manquants et recrée ceux dont les colonnes ont changé dans les
+      modèles (ex. `ix_tweet_created` passé de `(created_at)` à `(created_at, id)`), que
+      `create_all` n'applique pas à une base existante.
+
+👉 En résumé : le point d'entrée des opérations **hors ligne** sur la base.
+
+"""
+import argparse
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+
+from .database import engine, Base, SessionLocal, sync_indexes as sync_database_indexes
+from . import models  # noqa: F401  (enregistre les modèles avant create_all)
+from .services.archive_service import ArchiveService
+from .services.corpus import ResponseCorpus
+from .services.hashtag_service import HashtagService
+from .services.payload_service import PayloadService
+from .services.rollup_service import RollupService
+from .services.search_service import SearchService
+from .services.sentiment_service import SentimentService
+from .services.twitter_client import TwitterClient
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_hashtags(args: argparse.Namespace) -> None:
+    """Reconstruit l'index des hashtags depuis la table `tweets`."""
+    db = SessionLocal()
+    try:
+        processed = HashtagService.backfill(db, chunk_size=args.chunk_size)
+        print(f"Indexed hashtags for {processed} tweets")
+    finally:
+        db.close()
+
+
+def rebuild_rollups(args: argparse.Namespace) -> None:
+    """Régénère les tables de rollup depuis la table `tweets`."""
+    db = SessionLocal()
+    try:
+        processed = RollupService.rebuild(db, chunk_size=args.chunk_size)
+        print(f"Rebuilt rollups from {processed} tweets")
+    finally:
+        db.close()
+
+
+def backfill_sentiment(args: argparse.Namespace) -> None:
+    """Score les tweets qui n'ont pas encore de sentiment persisté."""
+    db = SessionLocal()
+    try:
+        processed = SentimentService.backfill(
+            db, chunk_size=args.chunk_size, workers=args.workers
+        )
+        print(f"Scored sentiment for {processed} tweets")
+    finally:
+        db.close()
+
+
+def archive_tweets(args: argparse.Namespace) -> None:
+    """Archive en Parquet les nouveaux tweets, puis élague la base si demandé."""
+    db = SessionLocal()
+    try:
+        result = ArchiveService.archive(
+            db, root=args.root, include_raw=args.include_raw, chunk_size=args.chunk_size
+        )
+        print(
+            f"Archived {result['rows']} tweets "
+            f"into {len(result['partitions'])} partitions"
+        )
+
+        if args.prune_days is not None:
+            before = datetime.now(timezone.utc) - timedelta(days=args.prune_days)
+            pruned = ArchiveService.prune(db, before)
+            print(f"Pruned {pruned} archived tweets from the database")
+    finally:
+        db.close()
+
+
+def compress_payloads(args: argparse.Namespace) -> None:
+    """Compresse le JSON brut encore stocké en clair dans `tweets`."""
+    db = SessionLocal()
+    try:
+        result = PayloadService.compress_legacy(db, chunk_size=args.chunk_size)
+        print(
+            f"Compressed raw JSON of {result['tweets']} tweets: "
+            f"{result['raw_bytes']} -> {result['compressed_bytes']} bytes"
+        )
+    finally:
+        db.close()
+
+
+def rebuild_search(args: argparse.Namespace) -> None:
+    """Crée et reconstruit l'index plein texte des tweets."""
+    db = SessionLocal()
+    try:
+        SearchService.rebuild(db)
+        print("Rebuilt full-text search index")
+    finally:
+        db.close()
+
+
+def sync_indexes(args: argparse.Namespace) -> None:
+    """Aligne les index de la base existante sur les modèles."""
+    synced = sync_database_indexes(engine)
+    print(
+        f"Synced {len(synced)} indexes" + (f": {', '.join(synced)}" if synced else "")
+    )
+
+
+def record_corpus(args: argparse.Namespace) -> None:
+    """Enregistre des réponses réelles de l'API dans un corpus rejouable."""
+    client = TwitterClient(recorder=ResponseCorpus(args.out))
+    next_token = None
+    fetched = page = 0
+    for page in range(1, args.pages + 1):
+        response = client.search_recent(args.query, args.max_results, next_token)
+        fetched += len(response.get("data", []))
+        next_token = response.get("meta", {}).get("next_token")
+        if not next_token:
+            break
+    print(
+        f"Recorded {page} pages ({fetched} tweets) for '{args.query}' into {args.out}"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit le parseur de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description=__doc__.splitlines()[0]
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backfill = subparsers.add_parser(
+        "backfill-hashtags", help="Reconstruit tweet_hashtags et hashtag_counts"
+    )
+    backfill.add_argument(
+        "--chunk-size", type=int, default=5000, help="Tweets par paquet"
+    )
+    backfill.set_defaults(handler=backfill_hashtags)
+
+    rollups = subparsers.add_parser(
+        "rebuild-rollups", help="Régénère les rollups minute / heure depuis tweets"
+    )
+    rollups.add_argument(
+        "--chunk-size", type=int, default=5000, help="Tweets par paquet"
+    )
+    rollups.set_defaults(handler=rebuild_rollups)
+
+    sentiment = subparsers.add_parser(
+        "backfill-sentiment",
+        help="Score le sentiment des tweets qui n'en ont pas encore",
+    )
+    sentiment.add_argument(
+        "--chunk-size", type=int, default=5000, help="Tweets par paquet"
+    )
+    sentiment.add_argument(
+        "--workers", type=int, default=None, help="Processus de scoring"
+    )
+    sentiment.set_defaults(handler=backfill_sentiment)
+
+    archive = subparsers.add_parser(
+        "archive-tweets",
+        help="Archive les nouveaux tweets en Parquet (partitions par jour)",
+    )
+    archive.add_argument("--root", default=None, help="Répertoire de l'archive")
+    archive.add_argument(
+        "--include-raw", action="store_true", help="Inclut la colonne raw_json"
+    )
+    archive.add_argument(
+        "--chunk-size", type=int, default=5000, help="Tweets par paquet"
+    )
+    archive.add_argument(
+        "--prune-days", type=int, default=None,
+        help="Supprime de la base les tweets archivés de plus de N jours"
+    )
+    archive.set_defaults(handler=archive_tweets)
+
+    record = subparsers.add_parser(
+        "record-corpus",
+        help="Enregistre des réponses de l'API dans un corpus rejouable",
+    )
+    record.add_argument("--query", required=True, help="Requête de recherche")
+    record.add_argument("--pages", type=int, default=10, help="Pages maximum")
+    record.add_argument(
+        "--max-results", type=int, default=100, help="Tweets par page (10-100)"
+    )
+    record.add_argument(
+        "--out", default="corpus/search_recent.ndjson", help="Fichier du corpus"
+    )
+    record.set_defaults(handler=record_corpus)
+
+    payloads = subparsers.add_parser(
+        "compress-payloads",
+        help="Compresse le JSON brut des tweets dans tweet_payloads",
+    )
+    payloads.add_argument(
+        "--chunk-size", type=int, default=5000, help="Tweets par paquet"
+    )
+    payloads.set_defaults(handler=compress_payloads)
+
+    search = subparsers.add_parser(
+        "rebuild-search", help="Crée et reconstruit l'index plein texte des tweets"
+    )
+    search.set_defaults(handler=rebuild_search)
+
+    indexes = subparsers.add_parser(
+        "sync-indexes", help="Crée ou recrée les index qui diffèrent des modèles"
+    )
+    indexes.set_defaults(handler=sync_indexes)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Point d'entrée de la ligne de commande."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    args = build_parser().parse_args(argv)
+
+    # Les nouvelles tables (index, rollups...) doivent exister avant le traitement
+    Base.metadata.create_all(bind=engine)
+    args.handler(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+# app/compression.py
+"""HTTP response compression (gzip / Brotli).
+
+* **Rôle global** : compresser les réponses volumineuses (`/tweets/?limit=1000`, listes
+  de hashtags, exports) selon l'en-tête `Accept-Encoding` du client.
+  👉 Du JSON très répétitif : 5 à 10 fois moins d'octets sur le réseau pour quelques
+    millisecondes de CPU.
+
+* **Négociation** (`negotiate`) :
+
+  * `br` (Brotli) si le client l'accepte **et** que le paquet optionnel `brotli` est
+    installé, sinon `gzip`.
+  * Valeurs `q` respectées (`gzip;q=0` = refus) ; rien d'acceptable → réponse non
+    compressée.
+
+* **Réponses compressées** (`CompressionMiddleware`) :
+
+  * Type de contenu dans `compression_content_types` (JSON, NDJSON, CSV, texte, HTML par
+    défaut).
+  * Pas déjà encodée (`Content-Encoding`), ni `HEAD`, `204` ou `304`.
+  * Corps complet : compressé seulement s'il atteint `compression_minimum_size` octets
+    (en dessous, le gain ne paie pas le CPU).
+  * Corps en flux (`StreamingResponse`, ex. `GET /tweets/export`) : compressé **morceau
+    par morceau**, chaque morceau vidé aussitôt (`Z_SYNC_FLUSH` / `flush()` Brotli) →
+    rien n'est mis en tampon, le client reçoit les lignes au fil de l'eau.
+  * `Vary: Accept-Encoding` sur toute réponse compressible (caches intermédiaires).
+
+* **Réglages** : `compression_enabled`, `compression_minimum_size`,
+  `compression_content_types`, `compression_gzip_level` (1-9),
+  `compression_brotli_quality` (0-11).
+
+* **Mesure** : `python -m benchmarks.cli run` → `compress_*` (temps de compression et
+  `ratio` d'une page de 1000 tweets).
+
+👉 En résumé : moins de bande passante pour les grosses réponses, sans retarder les flux.
+
+"""
+import zlib
+from typing import Iterable, Optional
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle : gzip seul
+    brotli = None
+
+
+class GzipEncoder:
+    """Compresseur gzip incrémental."""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        """Compresse un morceau ; `flush` → tout ce qui précède est décodable
+        immédiatement."""
+        chunk = self._compressor.compress(data)
+        return chunk + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else chunk
+
+    def finish(self) -> bytes:
+        """Termine le flux (bloc final + en-queue gzip)."""
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Compresseur Brotli incrémental (paquet `brotli`)."""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        """Compresse un morceau ; `flush` → tout ce qui précède est décodable
+        immédiatement."""
+        chunk = self._compressor.process(data)
+        return chunk + self._compressor.flush() if flush else chunk
+
+    def finish(self) -> bytes:
+        """Termine le flux."""
+        return self._compressor.finish()
+
+
+def available_encodings() -> Iterable[str]:
+    """Encodages proposés, par ordre de préférence."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def new_encoder(encoding: str):
+    """
+    Crée un compresseur pour `encoding` avec les niveaux configurés.
+
+    Raises:
+        ValueError: Si l'encodage n'est pas disponible
+    """
+    if encoding == "gzip":
+        return GzipEncoder(settings.compression_gzip_level)
+    if encoding == "br" and brotli is not None:
+        return BrotliEncoder(settings.compression_brotli_quality)
+    raise ValueError(f"Unsupported content encoding '{encoding}'")
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """
+    Choisit l'encodage d'après l'en-tête `Accept-Encoding`.
+
+    Returns:
+        Optional[str]: `br`, `gzip`, ou None si aucun encodage disponible n'est accepté
+    """
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """Middleware ASGI : compression gzip / Brotli des réponses compressibles."""
+
+    def __init__(self, app):
+        self.app = app
+        self.minimum_size = settings.compression_minimum_size
+        self.content_types = {
+            content_type.strip().lower()
+            for content_type in settings.compression_content_types.split(",")
+            if content_type.strip()
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding += value.decode("latin-1") + ","
+        encoding = negotiate(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "encoder": None, "passthrough": False}
+
+        async def send_compressed(message):
+            if message["type"] == "http.response.start":
+                # Différé jusqu'au premier morceau du corps (taille connue ou flux)
+                state["start"] = message
+                return
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if state["encoder"] is None:
+                start = state["start"]
+                headers = _Headers(start.get("headers", []))
+                if not self._compressible(start["status"], headers):
+                    state["passthrough"] = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                headers.add_vary()
+                declared = headers.get(b"content-length")
+                small = (
+                    len(body) < self.minimum_size
+                    if not more_body
+                    else (
+                        declared is not None
+                        and declared.isdigit()
+                        and int(declared) < self.minimum_size
+                    )
+                )
+                if small:
+                    state["passthrough"] = True
+                    await send({**start, "headers": headers.raw})
+                    await send(message)
+                    return
+
+                state["encoder"] = encoder = new_encoder(encoding)
+                headers.set(b"content-encoding", encoding.encode("ascii"))
+                if not more_body:
+                    # Corps complet : compressé d'un bloc, longueur exacte
+                    compressed = encoder.compress(body, flush=False) + encoder.finish()
+                    headers.set(b"content-length", str(len(compressed)).encode("ascii"))
+                    await send({**start, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                # Flux : longueur inconnue à l'avance (transfert par morceaux)
+                headers.remove(b"content-length")
+                await send({**start, "headers": headers.raw})
+
+            encoder = state["encoder"]
+            if more_body:
+                chunk = encoder.compress(body) if body else b""
+                if chunk:
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+            else:
+                chunk = encoder.compress(body, flush=False) + encoder.finish()
+                await send({"type": "http.response.body", "body": chunk})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, status: int, headers: "_Headers") -> bool:
+        """Réponse à compresser : type autorisé, pas déjà encodée, avec un corps."""
+        if (
+            status < 200
+            or status in (204, 304)
+            or headers.get(b"content-encoding") is not None
+        ):
+            return False
+        content_type = (
+            (headers.get(b"content-type") or "").split(";")[0].strip().lower()
+        )
+        return content_type in self.content_types
+
+
+class _Headers:
+    """En-têtes ASGI bruts (liste de couples d'octets) modifiables."""
+
+    def __init__(self, raw):
+        self.raw = list(raw)
+
+    def get(self, name: bytes) -> Optional[str]:
+        for key, value in self.raw:
+            if key.lower() == name:
+                return value.decode("latin-1")
+        return None
+
+    def remove(self, name: bytes) -> None:
+        self.raw = [(key, value) for key, value in self.raw if key.lower() != name]
+
+    def set(self, name: bytes, value: bytes) -> None:
+        self.remove(name)
+        self.raw.append((name, value))
+
+    def add_vary(self) -> None:
+        vary = self.get(b"vary")
+        if vary is None:
+            self.raw.append((b"vary", b"Accept-Encoding"))
+        elif "accept-encoding" not in vary.lower():
+            self.set(b"vary", f"{vary}, Accept-Encoding".encode("latin-1"))
@@ -13,6 +13,78 @@
 
     * `x_api_base` (par défaut `https://api.x.com/2`).
     * `bearer_token` (peut venir de l’env var `BEARER_TOKEN`).
+    * `x_api_timeout` (30 s), `x_api_max_connections` / `x_api_max_keepalive` (taille du
+      pool HTTP partagé).
+    * `x_api_http2` → active HTTP/2 si le paquet `h2` est installé.
+    * `x_api_rate_limit_max_wait` → attente maximale d'un jeton de quota avant de
+      rejeter la requête (60 s).
+    * `x_api_record_path` → si défini, chaque réponse de l'API est ajoutée à ce corpus
+      NDJSON (rejouable par `app.stub_api`).
+    * Hors ligne : `x_api_base=http://127.0.0.1:8001/2` vise le serveur stub (`make
+      stub-api`).
+  * **Collecte** :
+
+    * `collect_max_total` → plafond de tweets pour une collecte paginée (10 000).
+  * **Planificateur de collecte** (`CollectionScheduler`) :
+
+    * `scheduler_enabled` → lance le planificateur au démarrage de l'app (jamais en mode
+      test).
+    * `scheduler_tick` → période de recherche des jobs à exécuter (secondes).
+    * `scheduler_max_concurrency` → jobs exécutés en parallèle au maximum.
+    * `scheduler_jitter` → variation aléatoire des intervalles (fraction, `0.1` = ±10
+      %).
+    * `scheduler_max_backoff` → attente maximale après des erreurs API répétées
+      (secondes).
+    * `scheduler_max_pages` → pages suivies par exécution quand beaucoup de nouveaux
+      tweets sont arrivés.
+    * `scheduler_min_interval` → intervalle minimal accepté pour un job (secondes).
+  * **File d'ingestion** (`IngestQueue`, collectes `background=true`) :
+
+    * `ingest_queue_size` → pages en attente d'écriture au maximum (au-delà : attente
+      des fetchers, `503` des nouveaux jobs).
+    * `ingest_batch_size` → tweets maximum par commit du writer (pages et requêtes
+      regroupées).
+    * `ingest_flush_interval` → attente des pages suivantes avant d'écrire un lot
+      (secondes).
+    * `ingest_job_retention` → jobs dont l'état reste consultable.
+    * `ingest_drain_timeout` → temps laissé au writer pour vider la file à l'arrêt
+      (secondes).
+  * **Export** :
+
+    * `export_chunk_size` → lignes lues et émises par paquet par `GET /tweets/export` (1
+      000).
+  * **Hashtags approximatifs** :
+
+    * `sketch_capacity` → taille des résumés Space-Saving (erreur ≤ total / capacity).
+    * `sketch_flush_interval` → période de persistance des résumés (secondes).
+    * `sketch_memory_windows` → nombre de fenêtres horaires gardées en mémoire (les plus
+      anciennes au-delà sont persistées).
+  * **Sentiment** :
+
+    * `sentiment_workers` → processus du backfill de sentiment (défaut : nombre de CPU).
+    * `sentiment_batch_size` → textes envoyés à chaque processus par lot (500).
+  * **Archive Parquet** :
+
+    * `archive_dir` → racine des fichiers Parquet partitionnés par jour (`./archive`,
+      nécessite `pyarrow`).
+  * **Cache d'analytics** :
+
+    * `analytics_cache_size` → nombre de résultats gardés en cache (LRU, `0` =
+      désactivé).
+  * **Réponses JSON** :
+
+    * `fast_json` → les routes `tweets` / `analytics` sérialisent leurs données de
+      confiance avec `FastJSONResponse` (orjson, sans validation Pydantic) ; `False` →
+      chemin FastAPI standard.
+  * **Compression HTTP** (`CompressionMiddleware`, gzip ou Brotli si le paquet `brotli`
+    est installé) :
+
+    * `compression_enabled` → active la compression des réponses.
+    * `compression_minimum_size` → taille minimale (octets) d'un corps complet pour le
+      compresser.
+    * `compression_content_types` → types compressibles, séparés par des virgules.
+    * `compression_gzip_level` (1-9) / `compression_brotli_quality` (0-11) → compromis
+      CPU / taille.
   * **App** :
 
     * `app_name` = "Twitter/X Collector".
@@ -47,25 +119,80 @@ from pydantic import BaseSettings
 
 class Settings(BaseSettings):
     """Application settings with validation and environment variable support."""
-    
+
     # Database configuration
     database_url: str = "sqlite:///./tweets.db"
-    
+
     # Twitter/X API configuration
     x_api_base: str = "https://api.x.com/2"
     bearer_token: Optional[str] = None
-    
+    x_api_timeout: float = 30.0
+    x_api_max_connections: int = 20
+    x_api_max_keepalive: int = 10
+    x_api_http2: bool = True
+    x_api_rate_limit_max_wait: float = 60.0
+    x_api_record_path: Optional[str] = None
+
+    # Collection configuration
+    collect_max_total: int = 10000
+
+    # Background collection scheduler
+    scheduler_enabled: bool = True
+    scheduler_tick: float = 1.0
+    scheduler_max_concurrency: int = 4
+    scheduler_jitter: float = 0.1
+    scheduler_max_backoff: float = 3600.0
+    scheduler_max_pages: int = 5
+    scheduler_min_interval: int = 10
+
+    # Write-behind ingest queue
+    ingest_queue_size: int = 100
+    ingest_batch_size: int = 5000
+    ingest_flush_interval: float = 0.05
+    ingest_job_retention: int = 1000
+    ingest_drain_timeout: float = 30.0
+
+    # Streaming export
+    export_chunk_size: int = 1000
+
+    # Approximate hashtag counting (Space-Saving sketches)
+    sketch_capacity: int = 1000
+    sketch_flush_interval: float = 60.0
+    sketch_memory_windows: int = 24
+
+    # Sentiment scoring
+    sentiment_workers: Optional[int] = None
+    sentiment_batch_size: int = 500
+
+    # Parquet archive (optional pyarrow dependency)
+    archive_dir: str = "./archive"
+
+    # Analytics response cache
+    analytics_cache_size: int = 256
+
+    # JSON responses (orjson when installed)
+    fast_json: bool = True
+
+    # HTTP response compression (Brotli when the optional package is installed)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_content_types: str = (
+        "application/json,application/x-ndjson,text/csv,text/plain,text/html"
+    )
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+
     # Application configuration
     app_name: str = "Twitter/X Collector"
     debug: bool = False
-    
+
     # Test mode detection (automatiquement détecté)
     testing: bool = False
-    
+
     class Config:
         env_file = ".env"
         case_sensitive = False
-    
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Détection automatique du mode test
@@ -74,14 +201,14 @@ class Settings(BaseSettings):
             "pytest" in os.getenv("_", "") or
             "pytest" in str(os.getenv("PYTEST_CURRENT_TEST", ""))
         )
-    
+
     def is_sqlite(self) -> bool:
         """Vérifie si on utilise SQLite."""
         return self.database_url.startswith("sqlite")
-    
+
     def is_memory_db(self) -> bool:
         """Vérifie si on utilise une base en mémoire (pour les tests)."""
         return ":memory:" in self.database_url
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -6,13 +6,18 @@
 
 * **Fonctionnalités principales** :
 
-  1. **`create_database_engine()`**
+  1. **`create_database_engine(database_url)`**
 
      * Construit un moteur SQLAlchemy à partir de `settings.database_url`.
      * Si c’est **SQLite** → applique des configs spéciales :
 
        * `check_same_thread=False` (multi-threads autorisés).
-       * `StaticPool` (utile pour tests et bases en mémoire).
+       * Base fichier → pool par défaut (`QueuePool`) : **une connexion par session**,
+         donc une transaction par session. Le writer de l'ingestion, le scheduler et les
+         requêtes écrivent depuis des threads différents : sur une connexion partagée,
+         le rollback d'une session annulerait le lot non commité d'une autre.
+       * Base en mémoire → `StaticPool` (une seule connexion, sinon chaque connexion
+         verrait une base vide) ; réservé aux tests, sans écritures concurrentes.
      * Active le mode debug SQL (`echo=True`) si `settings.debug=True`.
 
   2. **Moteur et session**
@@ -21,7 +26,31 @@
      * `SessionLocal` → factory de sessions (`autocommit=False`, `autoflush=False`).
      * `Base = declarative_base()` → base des modèles ORM (`models.Tweet`, etc.).
 
-  3. **`get_db()`**
+  3. **`dialect_insert(db, target)`**
+
+     * Retourne la construction `insert()` propre au dialecte de la session (SQLite /
+       PostgreSQL).
+     * Permet d'utiliser `ON CONFLICT DO NOTHING` / `DO UPDATE` pour les insertions en
+       masse.
+     * Fallback sur l'`insert()` générique pour les autres dialectes.
+
+  4. **`increment_counters(connection, table, rows, index_elements)`**
+
+     * Incrémente des compteurs (`count += n`) en un seul
+       `INSERT ... ON CONFLICT DO UPDATE`.
+     * Fallback UPDATE puis INSERT pour les dialectes sans upsert.
+     * Utilisé par les tables maintenues à l'ingestion (hashtags, rollups).
+
+  5. **`sync_indexes(bind)`**
+
+     * `create_all` ne touche pas aux tables existantes : un index ajouté ou modifié
+       dans les modèles n'y est jamais appliqué.
+     * Crée les index manquants et recrée ceux dont les colonnes diffèrent du modèle
+       (ex. `ix_tweet_created` → `(created_at, id)`).
+     * Appelé par `python -m app.cli sync-indexes` (verrouille la table le temps de la
+       reconstruction).
+
+  6. **`get_db()`**
 
      * Fonction génératrice pour FastAPI (dépendance `Depends(get_db)`).
      * Fournit une session `db`.
@@ -38,10 +67,10 @@
 Tu veux que je passe aux **models** (vu qu’ils héritent de `Base`) pour compléter le puzzle ORM ?
 
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert, inspect, make_url, update, and_
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import StaticPool
-from typing import Generator
+from typing import Generator, List, Dict, Any, Optional
 import logging
 
 from .config import settings
@@ -49,18 +78,25 @@ from .config import settings
 logger = logging.getLogger(__name__)
 
 
-def create_database_engine():
-    """Crée et configure le moteur de base de données selon l'environnement."""
-    engine_kwargs = {"echo": settings.debug}
+def create_database_engine(database_url: Optional[str] = None):
+    """
+    Crée et configure le moteur de base de données selon l'environnement.
+
+    Args:
+        database_url: URL de la base (défaut : `settings.database_url`)
+    """
+    url = make_url(database_url or settings.database_url)
+    engine_kwargs: Dict[str, Any] = {"echo": settings.debug}
     
     # Configuration spécifique pour SQLite
-    if settings.database_url.startswith("sqlite"):
-        engine_kwargs.update({
-            "connect_args": {"check_same_thread": False},
-            "poolclass": StaticPool
-        })
+    if url.get_backend_name() == "sqlite":
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+        # Connexion unique seulement pour une base en mémoire : sur fichier, chaque
+        # session a la sienne
+        if url.database in (None, "", ":memory:"):
+            engine_kwargs["poolclass"] = StaticPool
     
-    return create_engine(settings.database_url, **engine_kwargs)
+    return create_engine(url, **engine_kwargs)
 
 
 # Initialisation du moteur et de la session
@@ -69,6 +105,104 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def dialect_insert(db, target):
+    """
+    Construit un `INSERT` spécifique au dialecte de la session.
+
+    Les constructions SQLite et PostgreSQL exposent `on_conflict_do_nothing()`
+    et `on_conflict_do_update()`, indispensables pour l'ingestion en masse.
+
+    Args:
+        db: Session (ou connexion) SQLAlchemy
+        target: Modèle ORM ou table cible
+
+    Returns:
+        Insert: Construction `insert()` adaptée au dialecte
+    """
+    bind = db.get_bind() if hasattr(db, "get_bind") else db
+    dialect_name = bind.dialect.name
+
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(target)
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(target)
+
+    return insert(target)
+
+
+def increment_counters(
+    connection,
+    table,
+    rows: List[Dict[str, Any]],
+    index_elements: List[str]
+) -> None:
+    """
+    Incrémente la colonne `count` de `table` pour chaque ligne (création si absente).
+
+    Args:
+        connection: Connexion ou session portant la transaction courante
+        table: Table cible (doit avoir une colonne `count`)
+        rows: Lignes `{clé..., "count": n}` à ajouter
+        index_elements: Colonnes de la contrainte d'unicité
+    """
+    if not rows:
+        return
+
+    stmt = dialect_insert(connection, table)
+    if hasattr(stmt, "on_conflict_do_update"):
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={"count": table.c.count + stmt.excluded["count"]}
+        )
+        connection.execute(stmt, rows)
+        return
+
+    # Fallback générique : UPDATE puis INSERT si absent
+    for row in rows:
+        condition = and_(*(table.c[column] == row[column] for column in index_elements))
+        result = connection.execute(
+            update(table).where(condition).values(count=table.c.count + row["count"])
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table), row)
+
+
+def sync_indexes(bind) -> List[str]:
+    """
+    Aligne les index des tables existantes sur ceux déclarés dans les modèles.
+
+    Args:
+        bind: Moteur (ou connexion) de la base à mettre à jour
+
+    Returns:
+        List[str]: Noms des index créés ou recréés
+    """
+    inspector = inspect(bind)
+    synced = []
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {
+                index["name"]: index["column_names"]
+                for index in inspector.get_indexes(table.name)
+            }
+            for index in table.indexes:
+                expected = [column.name for column in index.columns]
+                if existing.get(index.name) == expected:
+                    continue
+                if index.name in existing:
+                    index.drop(connection)
+                index.create(connection)
+                synced.append(index.name)
+                logger.info(
+                    f"Index {index.name} synced on {table.name}({', '.join(expected)})"
+                )
+    return synced
+
+
 def get_db() -> Generator:
     """
     Dependency injection pour obtenir une session de base de données.
@@ -85,4 +219,4 @@ def get_db() -> Generator:
         db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -7,6 +7,23 @@ class TwitterAPIError(Exception):
     pass
 
 
+class RateLimitExceeded(TwitterAPIError):
+    """Exception levée quand le quota de l'API Twitter/X est épuisé pour trop
+    longtemps."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class IngestQueueFull(Exception):
+    """Exception levée quand la file d'ingestion est pleine (writer en retard)."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class DatabaseError(Exception):
     """Exception levée lors d'erreurs de base de données."""
     pass
@@ -14,4 +31,4 @@ class DatabaseError(Exception):
 
 class ConfigurationError(Exception):
     """Exception levée lors d'erreurs de configuration."""
-    pass
\ No newline at end of file
+    pass
@@ -23,9 +23,19 @@
      * Log “starting”.
      * Création des tables DB (`Base.metadata.create_all(bind=engine)`).
      * Vérifie que le `BEARER_TOKEN` est bien configuré (sinon warning).
+     * Lance la persistance périodique des résumés de hashtags (hors mode test).
+     * Lance le planificateur de collecte (`collection_scheduler`) si
+       `scheduler_enabled` (hors mode test).
+     * Lance le writer de la file d'ingestion (`ingest_queue`, collectes
+       `background=true`).
    * Arrêt :
 
      * Log “shutting down”.
+     * Arrête le planificateur de collecte (jobs en cours annulés, repris au prochain
+       démarrage).
+     * Écrit les pages encore en file d'ingestion puis arrête le writer.
+     * Arrête la persistance périodique et persiste les derniers résumés de hashtags.
+     * Ferme le pool de connexions du client Twitter asynchrone.
        👉 C’est ici que tu initialises tes dépendances critiques.
 
 3. **Instance FastAPI (`app = FastAPI(...)`)**
@@ -42,9 +52,16 @@
    * `CORS` (Cross-Origin Resource Sharing) :
 
      * Ouvert à tous (`*`) si debug (utile en dev front/back séparés).
+   * `CompressionMiddleware` (si `compression_enabled`) : gzip / Brotli des réponses
+     JSON, NDJSON, CSV... au-delà de `compression_minimum_size` octets ; flux compressés
+     morceau par morceau.
+   * `MetricsMiddleware` : latence de chaque requête par gabarit de route
+     (`http_request_duration_seconds`).
+   * Les requêtes SQL du moteur sont comptées et chronométrées (`instrument_engine`).
 
 5. **Gestion des exceptions globales**
 
+   * `RateLimitExceeded` → `429 Too Many Requests` (+ `Retry-After`).
    * `TwitterAPIError` → `502 Bad Gateway`.
    * `DatabaseError` → `500 Internal Server Error`.
    * `ConfigurationError` → `500 Internal Server Error`.
@@ -54,15 +71,19 @@
 
    * `tweets.router` → endpoints liés à la collecte/lecture des tweets.
    * `analytics.router` → endpoints pour analyser les données (hashtags, stats).
+   * `jobs.router` → gestion des jobs de collecte périodique.
 
-7. **Endpoints de santé (`/` et `/health`)**
+7. **Endpoints de santé (`/`, `/health` et `/metrics`)**
 
    * `/` → health check basique (status, nom app, version, API configurée ou non).
    * `/health` → health check détaillé :
 
      * Vérifie DB avec `SELECT 1`.
      * Vérifie présence de `BEARER_TOKEN`.
+     * Expose le budget de quota de l'API (`rate_limit_governor.snapshot()`).
      * Retourne un statut global (`healthy` ou `degraded`).
+   * `/metrics` → métriques au format texte Prometheus (HTTP, base, ingestion, API X,
+     analytics, planificateur).
 
 ---
 
@@ -76,18 +97,32 @@ Il agit comme le **point d’entrée unique** et garantit que tout est prêt ava
 👉 Tu veux que je trace maintenant la **vision complète du flow de données** (depuis un appel API → DB → retour API), histoire de voir comment tout s’imbrique ?
 
 """
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+import math
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .config import settings
 from .database import engine, Base
-from .routes import tweets, analytics
-from .exceptions import TwitterAPIError, DatabaseError, ConfigurationError
+from .routes import tweets, analytics, jobs
+from .services.scheduler_service import collection_scheduler
+from .services.ingest_queue import ingest_queue
+from .services.sketch_service import HashtagSketchService
+from .compression import CompressionMiddleware
+from .services.metrics import MetricsMiddleware, instrument_engine, registry
+from .services.rate_limiter import rate_limit_governor
+from .services.twitter_client import async_twitter_client
+from .exceptions import (
+    TwitterAPIError,
+    DatabaseError,
+    ConfigurationError,
+    RateLimitExceeded,
+)
 
 # Configuration du logging
 logging.basicConfig(
@@ -103,24 +138,48 @@ async def lifespan(app: FastAPI):
     Gestionnaire du cycle de vie de l'application.
     Initialise la base de données au démarrage.
     """
+    sketch_flusher = None
     try:
         logger.info("Starting Twitter/X Collector application")
-        
+
         # Création des tables de base de données
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
-        
+
         # Vérification de la configuration
         if not settings.bearer_token:
             logger.warning("BEARER_TOKEN not configured - API calls will fail")
-        
+
+        # Persistance périodique des résumés de hashtags (mode approx)
+        if not settings.testing:
+            sketch_flusher = asyncio.create_task(
+                HashtagSketchService.run_periodic_flush()
+            )
+
+        # Collecte périodique des jobs enregistrés (`/jobs`)
+        if settings.scheduler_enabled and not settings.testing:
+            collection_scheduler.start()
+
+        # Writer de la file d'ingestion (collectes en arrière-plan)
+        ingest_queue.start()
+
         yield
-        
+
     except Exception as e:
         logger.error(f"Failed to initialize application: {e}")
         raise
     finally:
         logger.info("Shutting down Twitter/X Collector application")
+        await collection_scheduler.stop()
+        await ingest_queue.stop()
+        if sketch_flusher:
+            sketch_flusher.cancel()
+            with suppress(asyncio.CancelledError):
+                await sketch_flusher
+            with suppress(DatabaseError):
+                await asyncio.to_thread(HashtagSketchService.flush_with_new_session)
+        if async_twitter_client:
+            await async_twitter_client.aclose()
 
 
 # Création de l'application FastAPI
@@ -147,10 +206,31 @@ if settings.debug:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
+# Compression des réponses (sous les métriques : son coût CPU est compté dans la
+# latence)
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+# Métriques : ajouté en dernier → enveloppe toute la pile (latence vue par le client)
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+
 
 # Gestionnaires d'exceptions globaux
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exception_handler(request: Request, exc: RateLimitExceeded):
+    """Gestionnaire pour le quota de l'API Twitter épuisé (requête rejetée)."""
+    logger.warning(f"Twitter API rate limit exhausted: {exc}")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))}
+    )
+
+
 @app.exception_handler(TwitterAPIError)
 async def twitter_api_exception_handler(request: Request, exc: TwitterAPIError):
     """Gestionnaire pour les erreurs de l'API Twitter."""
@@ -184,6 +264,7 @@ async def configuration_exception_handler(request: Request, exc: ConfigurationEr
 # Inclusion des routeurs
 app.include_router(tweets.router)
 app.include_router(analytics.router)
+app.include_router(jobs.router)
 
 
 @app.get("/", tags=["health"])
@@ -216,6 +297,7 @@ async def detailed_health_check():
             "database": "ok",
             "twitter_api": "configured" if settings.bearer_token else "not_configured"
         },
+        "x_api_rate_limit": rate_limit_governor.snapshot(),
         "timestamp": "2025-01-09T00:00:00Z"
     }
     
@@ -229,4 +311,15 @@ async def detailed_health_check():
         health_status["status"] = "degraded"
         health_status["checks"]["database"] = f"error: {str(e)}"
     
-    return health_status
\ No newline at end of file
+    return health_status
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    Métriques de l'application au format texte Prometheus.
+
+    Returns:
+        PlainTextResponse: Exposition `text/plain; version=0.0.4`
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
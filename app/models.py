@@ -19,12 +19,20 @@ Définir les **modèles ORM SQLAlchemy** pour stocker les tweets collectés depu
   * `text` : contenu textuel du tweet (non nullable).
   * `created_at` : datetime de création du tweet (nullable).
   * `collected_at` : datetime automatique de collecte (`func.now()`).
-  * `raw_json` : JSON brut retourné par l’API Twitter (nullable).
+  * `raw_json` : JSON brut retourné par l’API Twitter (nullable) → **propriété** lue à
+    la demande depuis `tweet_payloads`.
+
+    * L'ancienne colonne `tweets.raw_json` (non compressée) reste mappée en **différé**
+      (`legacy_raw_json`) : jamais lue par `db.query(Tweet)`, vidée par
+      `python -m app.cli compress-payloads`.
 
 * **Index** :
 
   * `ix_tweet_author_created` → composite sur `author_id` + `created_at` pour accélérer les requêtes par auteur/date.
-  * `ix_tweet_created` → sur `created_at` pour les tris/filtrages temporels fréquents.
+  * `ix_tweet_created` → sur `created_at` + `id` pour les tris/filtrages temporels
+    fréquents et la pagination par curseur.
+  * Sur une base existante (ancien `ix_tweet_created` sur `created_at` seul) :
+    `python -m app.cli sync-indexes`.
 
 * **Représentation (`__repr__`)**
 
@@ -34,12 +42,148 @@ Définir les **modèles ORM SQLAlchemy** pour stocker les tweets collectés depu
     <Tweet(id=1, tweet_id=123, author_id=456)>
     ```
 
+* **Index plein texte** (`SEARCH_DDL`, créé avec la table via l'événement
+  `after_create`) :
+
+  * SQLite → table virtuelle **FTS5** `tweets_fts` (contenu externe = `tweets`),
+    synchronisée par triggers insert / update / delete.
+  * PostgreSQL → index **GIN** `ix_tweets_text_fts` sur `to_tsvector('simple', text)`.
+  * Sur une base existante : `python -m app.cli rebuild-search`.
+
+---
+
+### 🗜️ Modèle `TweetPayload`
+
+* **Table** : `tweet_payloads` (`tweet_id` → `tweets.id`), une ligne par tweet.
+* `data` = JSON brut **compressé** (`utils/payload_codec` : zlib + dictionnaire
+  prédéfini), `codec` = version du codec, `size` = taille décompressée (statistiques de
+  stockage sans rien décompresser).
+* Relation `Tweet.payload` chargée **paresseusement** : lire les tweets ne transfère
+  plus le JSON brut.
+
+---
+
+### #️⃣ Modèles `TweetHashtag` et `HashtagCount`
+
+* **`tweet_hashtags`** : table normalisée (`tweet_id` → `tweets.id`, `hashtag` en
+  minuscules), une ligne par couple tweet/hashtag.
+
+  * Index `ix_tweet_hashtags_hashtag` (`hashtag`, `tweet_id`) pour filtrer les tweets
+    d'un hashtag.
+* **`hashtag_counts`** : compteur maintenu à l'ingestion (`hashtag` → `count`).
+
+  * Index `ix_hashtag_counts_count` → `/analytics/hashtags` devient un simple
+    `ORDER BY count DESC LIMIT n`.
+* Alimentées par `HashtagService` (à l'insertion des tweets) et reconstruites par
+  `python -m app.cli backfill-hashtags`.
+
+---
+
+### ⏱️ Tables de rollup (`TweetCountMinute`, `TweetCountHour`, `HashtagCountHour`)
+
+* **`tweet_counts_minute`** / **`tweet_counts_hour`** : nombre de tweets par tranche
+  (`bucket_start` → `count`).
+* **`hashtag_counts_hour`** : nombre de tweets par hashtag et par heure (`hashtag`,
+  `bucket_start` → `count`).
+
+  * Index `ix_hashtag_counts_hour_bucket` (`bucket_start`, `hashtag`) pour les lectures
+    par plage de temps.
+* Maintenues par `RollupService` dans la **même transaction** que l'insertion des
+  tweets.
+* Reconstruites par `python -m app.cli rebuild-rollups`.
+* Les dashboards lisent quelques centaines de lignes au lieu de scanner `tweets`.
+
+---
+
+### 🙂 Modèle `TweetSentiment`
+
+* **Table** : `tweet_sentiments` (`tweet_id` → `tweets.id`, `compound` = score VADER
+  entre -1 et 1).
+* Table annexe plutôt que colonne de `tweets` : créée par `create_all` sur une base
+  existante, sans migration.
+* Alimentée par `SentimentService` à l'ingestion, complétée par
+  `python -m app.cli backfill-sentiment`.
+* `/analytics/sentiment` agrège ces scores en SQL (`AVG`) par hashtag et par tranche de
+  temps.
+
+---
+
+### 🧮 Modèle `HashtagSketch`
+
+* **Table** : `hashtag_sketches`
+* Résumés Space-Saving sérialisés (JSON), un par worker (`worker_id`) et par heure
+  (`window_start`).
+* Persistés périodiquement par `HashtagSketchService`, fusionnés à la lecture
+  (`/analytics/hashtags?mode=approx`).
+
+---
+
+### 🗄️ Modèle `ArchiveWatermark`
+
+* **Table** : `archive_watermarks`
+* Filigrane de l'archive Parquet (`ArchiveService`) : `last_id` = dernier `tweets.id`
+  archivé, `rows_archived` cumulés.
+* Rend l'archivage **incrémental** : chaque exécution n'exporte que les tweets plus
+  récents.
+
+---
+
+### 🔄 Modèle `DataVersion`
+
+* **Table** : `data_versions`
+* Une ligne par jeu de données (`name`, ex. `analytics`) : `count` = version,
+  incrémentée **dans la transaction** de chaque écriture qui change les analytics
+  (ingestion, archivage, élagage, backfills).
+* Lue par `AnalyticsCache.sync` : le cache et les ETags d'un processus suivent aussi les
+  écritures des autres (CLI, autres workers).
+
+---
+
+### 🧭 Modèle `CollectionState`
+
+* **Table** : `collection_states`
+* Une ligne par requête de collecte (`query` unique).
+* Mémorise le dernier `next_token` commité par la collecte paginée → permet de
+  **reprendre** une collecte interrompue.
+* Compteurs cumulés : `pages_collected`, `tweets_fetched`, `tweets_saved`.
+
+---
+
+### 🔖 Modèle `SearchWatermark`
+
+* **Table** : `search_watermarks`
+* Une ligne par requête (`query`) : `since_id` = plus grand `tweet_id` déjà reçu pour
+  cette requête.
+* Passé en `since_id` à l'API par `TweetService` → une nouvelle collecte de la même
+  requête ne transfère que les tweets plus récents.
+* Table annexe (et non colonne de `collection_states`) : créée par `create_all` sur une
+  base existante.
+
+---
+
+### ⏰ Modèle `CollectionJob`
+
+* **Table** : `collection_jobs`
+* Une requête surveillée par le planificateur (`CollectionScheduler`) : `query` unique,
+  `interval_seconds`, `max_results`, `enabled`.
+* `since_id` → reflet (lecture seule) du `since_id` partagé de la requête
+  (`search_watermarks`), recopié à chaque passage.
+* `next_token` / `pending_newest_id` → pagination inachevée (plus de
+  `scheduler_max_pages` pages de nouveaux tweets) : reprise au passage suivant avec le
+  même `since_id`, le watermark n'avançant qu'à la dernière page.
+* `next_run_at` → prochaine exécution (persistée : les jobs reprennent après un
+  redémarrage).
+* Suivi : `last_run_at`, `last_status`, `last_error`, `consecutive_failures` (backoff),
+  `runs`, `tweets_saved`.
+* Géré par les routes CRUD `/jobs`.
+
 ---
 
 ### 🔑 Points clés
 
 * Optimisé pour **recherches fréquentes sur la date et l’auteur**.
-* Stocke **texte brut et JSON** → permet analyses ultérieures (analytics, hashtags, sentiment).
+* Stocke **texte brut et JSON** (compressé, à part) → permet analyses ultérieures
+  (analytics, hashtags, sentiment).
 * Compatible avec `TweetService` pour insertion et récupération.
 * Compatible avec `AnalyticsService` pour analyser volume et hashtags.
 
@@ -51,11 +195,27 @@ Si tu veux, Patron, je peux maintenant te faire **le schéma complet du fonction
 Veux-tu que je fasse ça maintenant ?
 
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    String,
+    DateTime,
+    Float,
+    Text,
+    Index,
+    ForeignKey,
+    UniqueConstraint,
+    DDL,
+    LargeBinary,
+    event,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
+from typing import Optional
 
 from .database import Base
+from .utils import payload_codec
 
 
 class Tweet(Base):
@@ -64,20 +224,459 @@ class Tweet(Base):
     Optimisé avec des index pour les requêtes fréquentes.
     """
     __tablename__ = "tweets"
-    
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    tweet_id = Column(String(50), unique=True, nullable=False, comment="ID unique du tweet")
-    author_id = Column(String(50), nullable=True, comment="ID de l'auteur du tweet")
-    text = Column(Text, nullable=False, comment="Contenu textuel du tweet")
-    created_at = Column(DateTime, nullable=True, comment="Date de création du tweet")
-    collected_at = Column(DateTime, default=func.now(), nullable=False, comment="Date de collecte")
-    raw_json = Column(Text, nullable=True, comment="JSON brut de l'API Twitter")
-    
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, index=True, autoincrement=True
+    )
+    tweet_id: Mapped[str] = mapped_column(
+        String(50), unique=True, nullable=False, comment="ID unique du tweet"
+    )
+    author_id: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True, comment="ID de l'auteur du tweet"
+    )
+    text: Mapped[str] = mapped_column(
+        Text, nullable=False, comment="Contenu textuel du tweet"
+    )
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True, comment="Date de création du tweet"
+    )
+    collected_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), nullable=False, comment="Date de collecte"
+    )
+    # Ancienne colonne du JSON brut non compressé : différée, lue seulement à défaut de
+    # payload
+    legacy_raw_json: Mapped[Optional[str]] = mapped_column(
+        "raw_json", Text, nullable=True, deferred=True,
+        comment="JSON brut de l'API Twitter (non compressé, historique)"
+    )
+
+    # JSON brut compressé, chargé au premier accès à `raw_json`
+    payload: Mapped[Optional["TweetPayload"]] = relationship(
+        "TweetPayload",
+        uselist=False,
+        lazy="select",
+        cascade="save-update, merge, delete",
+        passive_deletes=True,
+    )
+
     # Index composé pour optimiser les requêtes par auteur et date
     __table_args__ = (
         Index('ix_tweet_author_created', 'author_id', 'created_at'),
-        Index('ix_tweet_created', 'created_at'),
+        Index('ix_tweet_created', 'created_at', 'id'),
     )
-    
+
+    @property
+    def raw_json(self) -> Optional[str]:
+        """JSON brut de l'API, décompressé à la demande (ancienne colonne si le tweet
+        n'a pas de payload)."""
+        # Copie en clair laissée par l'ingestion en masse sur les tweets qu'elle
+        # retourne (détachés)
+        if "_raw_json" in self.__dict__:
+            return self.__dict__["_raw_json"]
+        if self.payload is not None:
+            return self.payload.decode()
+        return self.legacy_raw_json
+
+    @raw_json.setter
+    def raw_json(self, value: Optional[str]) -> None:
+        self.__dict__.pop("_raw_json", None)
+        self.payload = TweetPayload.from_json(value) if value is not None else None
+
     def __repr__(self) -> str:
         return f"<Tweet(id={self.id}, tweet_id={self.tweet_id}, author_id={self.author_id})>"
+
+
+class TweetPayload(Base):
+    """JSON brut d'un tweet, compressé (`utils/payload_codec`)."""
+    __tablename__ = "tweet_payloads"
+
+    tweet_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tweets.id", ondelete="CASCADE"), primary_key=True,
+        comment="Clé primaire interne du tweet"
+    )
+    codec: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="Codec de compression (payload_codec)"
+    )
+    size: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="Taille du JSON décompressé (octets)"
+    )
+    data: Mapped[bytes] = mapped_column(
+        LargeBinary, nullable=False, comment="JSON brut compressé"
+    )
+
+    @staticmethod
+    def compress(raw_json: str) -> dict:
+        """Colonnes `codec`, `size` et `data` d'un JSON brut (pour un insert en
+        masse)."""
+        codec, size, data = payload_codec.compress(raw_json)
+        return {"codec": codec, "size": size, "data": data}
+
+    @classmethod
+    def from_json(cls, raw_json: str) -> "TweetPayload":
+        """Construit le payload compressé d'un JSON brut."""
+        return cls(**cls.compress(raw_json))
+
+    def decode(self) -> str:
+        """JSON brut décompressé."""
+        return payload_codec.decompress(self.codec, self.data)
+
+    def __repr__(self) -> str:
+        return (
+            f"<TweetPayload(tweet_id={self.tweet_id}, codec={self.codec}, "
+            f"size={self.size})>"
+        )
+
+
+# Configuration text search PostgreSQL : l'expression de l'index doit être reprise à
+# l'identique par les requêtes
+SEARCH_TS_CONFIG = "simple"
+
+# Index plein texte par dialecte (instructions idempotentes, rejouées par
+# `SearchService.rebuild`)
+SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS tweets_fts "
+        "USING fts5(text, content='tweets', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS tweets_fts_ai AFTER INSERT ON tweets BEGIN "
+        "INSERT INTO tweets_fts(rowid, text) VALUES (new.id, new.text); END",
+        "CREATE TRIGGER IF NOT EXISTS tweets_fts_ad AFTER DELETE ON tweets BEGIN "
+        "INSERT INTO tweets_fts(tweets_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); END",
+        "CREATE TRIGGER IF NOT EXISTS tweets_fts_au "
+        "AFTER UPDATE OF text ON tweets BEGIN "
+        "INSERT INTO tweets_fts(tweets_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        "INSERT INTO tweets_fts(rowid, text) VALUES (new.id, new.text); END",
+    ],
+    "postgresql": [
+        "CREATE INDEX IF NOT EXISTS ix_tweets_text_fts ON tweets "
+        f"USING gin (to_tsvector('{SEARCH_TS_CONFIG}', text))",
+    ],
+}
+
+for _dialect, _statements in SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Tweet.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
+event.listen(
+    Tweet.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS tweets_fts").execute_if(dialect="sqlite")
+)
+
+
+class TweetHashtag(Base):
+    """
+    Association normalisée tweet ↔ hashtag, extraite une seule fois à l'ingestion.
+    """
+    __tablename__ = "tweet_hashtags"
+
+    tweet_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tweets.id", ondelete="CASCADE"), primary_key=True,
+        comment="Clé primaire interne du tweet"
+    )
+    hashtag: Mapped[str] = mapped_column(
+        String(280), primary_key=True, comment="Hashtag normalisé en minuscules"
+    )
+
+    __table_args__ = (
+        Index('ix_tweet_hashtags_hashtag', 'hashtag', 'tweet_id'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TweetHashtag(tweet_id={self.tweet_id}, hashtag={self.hashtag})>"
+
+
+class HashtagCount(Base):
+    """
+    Compteur global par hashtag, maintenu de façon incrémentale à l'ingestion.
+    """
+    __tablename__ = "hashtag_counts"
+
+    hashtag: Mapped[str] = mapped_column(
+        String(280), primary_key=True, comment="Hashtag normalisé en minuscules"
+    )
+    count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="Nombre de tweets contenant le hashtag",
+    )
+
+    __table_args__ = (
+        Index('ix_hashtag_counts_count', 'count'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<HashtagCount(hashtag={self.hashtag}, count={self.count})>"
+
+
+class TweetCountMinute(Base):
+    """Rollup du nombre de tweets par minute (UTC)."""
+    __tablename__ = "tweet_counts_minute"
+
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, comment="Début de la minute (UTC)"
+    )
+    count: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Nombre de tweets"
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<TweetCountMinute(bucket_start={self.bucket_start}, count={self.count})>"
+        )
+
+
+class TweetCountHour(Base):
+    """Rollup du nombre de tweets par heure (UTC)."""
+    __tablename__ = "tweet_counts_hour"
+
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, comment="Début de l'heure (UTC)"
+    )
+    count: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Nombre de tweets"
+    )
+
+    def __repr__(self) -> str:
+        return f"<TweetCountHour(bucket_start={self.bucket_start}, count={self.count})>"
+
+
+class HashtagCountHour(Base):
+    """Rollup du nombre de tweets par hashtag et par heure (UTC)."""
+    __tablename__ = "hashtag_counts_hour"
+
+    hashtag: Mapped[str] = mapped_column(
+        String(280), primary_key=True, comment="Hashtag normalisé en minuscules"
+    )
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, comment="Début de l'heure (UTC)"
+    )
+    count: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Nombre de tweets"
+    )
+
+    __table_args__ = (
+        Index('ix_hashtag_counts_hour_bucket', 'bucket_start', 'hashtag'),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<HashtagCountHour(hashtag={self.hashtag}, "
+            f"bucket_start={self.bucket_start}, count={self.count})>"
+        )
+
+
+class TweetSentiment(Base):
+    """Score de sentiment VADER d'un tweet, calculé une seule fois."""
+    __tablename__ = "tweet_sentiments"
+
+    tweet_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tweets.id", ondelete="CASCADE"), primary_key=True,
+        comment="Clé primaire interne du tweet"
+    )
+    compound: Mapped[float] = mapped_column(
+        Float, nullable=False, comment="Score VADER compound (-1 à 1)"
+    )
+
+    def __repr__(self) -> str:
+        return f"<TweetSentiment(tweet_id={self.tweet_id}, compound={self.compound})>"
+
+
+class HashtagSketch(Base):
+    """
+    Résumé Space-Saving des hashtags d'un worker pour une fenêtre d'une heure.
+    """
+    __tablename__ = "hashtag_sketches"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    worker_id: Mapped[str] = mapped_column(
+        String(100), nullable=False, comment="Identifiant du worker (hôte-pid)"
+    )
+    window_start: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, comment="Début de la fenêtre (UTC)"
+    )
+    payload: Mapped[str] = mapped_column(
+        Text, nullable=False, comment="Résumé sérialisé en JSON"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False,
+        comment="Date de dernière persistance"
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            'worker_id', 'window_start', name='uq_hashtag_sketch_worker_window'
+        ),
+        Index('ix_hashtag_sketches_window', 'window_start'),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<HashtagSketch(worker_id={self.worker_id}, "
+            f"window_start={self.window_start})>"
+        )
+
+
+class ArchiveWatermark(Base):
+    """Filigrane de l'archivage Parquet incrémental."""
+    __tablename__ = "archive_watermarks"
+
+    name: Mapped[str] = mapped_column(
+        String(50), primary_key=True, comment="Jeu de données archivé"
+    )
+    last_id: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Dernier tweets.id archivé"
+    )
+    rows_archived: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Lignes archivées cumulées"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False,
+        comment="Date du dernier archivage"
+    )
+
+    def __repr__(self) -> str:
+        return f"<ArchiveWatermark(name={self.name}, last_id={self.last_id})>"
+
+
+class DataVersion(Base):
+    """Version persistée d'un jeu de données, partagée entre processus."""
+    __tablename__ = "data_versions"
+
+    name: Mapped[str] = mapped_column(
+        String(50), primary_key=True, comment="Jeu de données versionné"
+    )
+    count: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Version (nombre d'écritures)"
+    )
+
+    def __repr__(self) -> str:
+        return f"<DataVersion(name={self.name}, count={self.count})>"
+
+
+class CollectionState(Base):
+    """
+    État persistant d'une collecte paginée, par requête.
+    Permet de reprendre depuis le dernier `next_token` commité.
+    """
+    __tablename__ = "collection_states"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    query: Mapped[str] = mapped_column(
+        String(512), unique=True, nullable=False, comment="Requête de recherche"
+    )
+    next_token: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True, comment="Dernier next_token non consommé"
+    )
+    pages_collected: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Pages commitées"
+    )
+    tweets_fetched: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Tweets reçus de l'API"
+    )
+    tweets_saved: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Tweets réellement insérés"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False,
+        comment="Date de dernière mise à jour"
+    )
+
+    def __repr__(self) -> str:
+        return f"<CollectionState(query={self.query}, next_token={self.next_token})>"
+
+
+class SearchWatermark(Base):
+    """
+    Plus grand `tweet_id` reçu pour une requête de recherche.
+    Sert de `since_id` pour les collectes suivantes de la même requête.
+    """
+    __tablename__ = "search_watermarks"
+
+    query: Mapped[str] = mapped_column(
+        String(512), primary_key=True, comment="Requête de recherche"
+    )
+    since_id: Mapped[str] = mapped_column(
+        String(50), nullable=False, comment="Plus grand tweet_id reçu"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False,
+        comment="Date de dernière mise à jour"
+    )
+
+    def __repr__(self) -> str:
+        return f"<SearchWatermark(query={self.query}, since_id={self.since_id})>"
+
+
+class CollectionJob(Base):
+    """
+    Requête de collecte exécutée périodiquement par le planificateur.
+    Le `since_id` utilisé est celui de `search_watermarks` ; la colonne n'en est qu'un
+    reflet.
+    """
+    __tablename__ = "collection_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    query: Mapped[str] = mapped_column(
+        String(512), unique=True, nullable=False, comment="Requête de recherche"
+    )
+    interval_seconds: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="Période entre deux exécutions"
+    )
+    max_results: Mapped[int] = mapped_column(
+        Integer, default=100, nullable=False, comment="Tweets par page (10-100)"
+    )
+    enabled: Mapped[bool] = mapped_column(
+        Boolean, default=True, nullable=False, comment="Job actif"
+    )
+    since_id: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True, comment="Reflet de search_watermarks.since_id"
+    )
+    next_token: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="Pagination inachevée : token des pages plus anciennes",
+    )
+    pending_newest_id: Mapped[Optional[str]] = mapped_column(
+        String(50),
+        nullable=True,
+        comment="since_id à enregistrer à la fin de la pagination",
+    )
+    next_run_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, comment="Prochaine exécution (UTC)"
+    )
+    last_run_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True, comment="Dernière exécution (UTC)"
+    )
+    last_status: Mapped[Optional[str]] = mapped_column(
+        String(20), nullable=True, comment="ok / error"
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, comment="Dernière erreur"
+    )
+    consecutive_failures: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Échecs consécutifs"
+    )
+    runs: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Exécutions cumulées"
+    )
+    tweets_saved: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="Tweets insérés cumulés"
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), nullable=False, comment="Date de création"
+    )
+
+    __table_args__ = (
+        Index("ix_collection_jobs_due", "enabled", "next_run_at"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<CollectionJob(id={self.id}, query={self.query}, "
+            f"since_id={self.since_id})>"
+        )
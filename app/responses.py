@@ -0,0 +1,110 @@
+# app/responses.py
+"""Fast JSON responses for the read endpoints.
+
+* **Rôle global** : sérialiser les réponses JSON **sans** le chemin par défaut de
+  FastAPI (validation Pydantic de chaque objet contre `response_model`, puis
+  `jsonable_encoder`, puis `json.dumps`).
+  👉 Pour `/tweets/?limit=1000`, ce chemin coûtait plus cher que la requête SQL
+    elle-même.
+
+* **`FastJSONResponse`** :
+
+  * Rendu par **`orjson`** (dépendance optionnelle) : `datetime`, `date`, `UUID`, dict à
+    clés non `str` gérés nativement.
+  * Types du projet via `_default` : lignes SQLAlchemy (`Row` → dict), modèles Pydantic
+    (`.dict()`), `Decimal` (`AVG` PostgreSQL).
+  * Sans `orjson` : repli sur `json.dumps` avec le même `_default` (même JSON, plus
+    lent).
+  * Classe de réponse par défaut des routers `tweets` et `analytics`
+    (`default_response_class`).
+
+* **`fast_response(content, response)`** :
+
+  * Opt-in, route par route, pour les contenus **de confiance** (lignes lues en base,
+    résultats d'`AnalyticsService`) : retourne directement une `FastJSONResponse` →
+    FastAPI saute la validation contre `response_model` (qui reste utilisé pour la
+    documentation OpenAPI).
+  * Reprend les en-têtes posés sur la réponse injectée (`X-Next-Cursor`, `ETag`...).
+  * `settings.fast_json = False` → retourne le contenu tel quel (chemin FastAPI
+    standard, validé).
+
+👉 En résumé : même JSON qu'avant, sans aller-retour Pydantic pour des données déjà
+  sûres.
+
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Row
+from starlette.responses import Response
+
+from .config import settings
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle : repli sur la bibliothèque standard
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(value: Any) -> Any:
+    """Conversion des types que le sérialiseur ne connaît pas (appelée objet par
+    objet)."""
+    if isinstance(value, Row):
+        return value._asdict()
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, Decimal):
+        # Comme `jsonable_encoder` : entier si la valeur n'a pas de décimales
+        exponent = value.as_tuple().exponent
+        return (
+            int(value) if isinstance(exponent, int) and exponent >= 0 else float(value)
+        )
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """Réponse JSON rendue par `orjson` (ou `json` à défaut)."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(
+                content, default=_default, option=orjson.OPT_NON_STR_KEYS
+            )
+        return json.dumps(
+            content,
+            default=_default,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+def fast_response(
+    content: Any, response: Optional[Response] = None, status_code: int = 200
+) -> Any:
+    """
+    Sérialise directement un contenu de confiance, sans validation contre
+    `response_model`.
+
+    Args:
+        content: Contenu JSON (dicts, listes, lignes `Row`, dates...)
+        response: Réponse injectée par FastAPI dont on reprend les en-têtes
+            (optionnelle)
+        status_code: Code HTTP
+
+    Returns:
+        FastJSONResponse, ou `content` inchangé si `settings.fast_json` est désactivé
+    """
+    if not settings.fast_json:
+        return content
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
@@ -1,7 +1,8 @@
 # app/routes/analytics.py
 """Analytics endpoints for tweet analysis.
 
-* **Rôle global** : C’est un module FastAPI qui expose des endpoints REST pour faire des analyses sur les tweets (hashtags, volume horaire, et bientôt sentiment).
+* **Rôle global** : C’est un module FastAPI qui expose des endpoints REST pour faire des
+  analyses sur les tweets (hashtags, volume horaire, tendances, sentiment).
 
 * **Structure** :
 
@@ -15,17 +16,46 @@
 
      * Retourne les hashtags les plus populaires.
      * Paramètre `limit` (entre 1 et 100, défaut 20).
-     * Retourne un dict : `{ "top_hashtags": [...] }`.
+     * Paramètre `mode` : `exact` (défaut, compteurs maintenus à l'ingestion) ou
+       `approx` (résumés Space-Saving, mémoire bornée).
+     * Retourne un dict : `{ "top_hashtags": [...] }` (+ `mode`, `max_error`, `total` en
+       mode `approx`).
 
   2. **`/analytics/volume_by_hour`**
 
-     * Retourne le nombre de tweets par heure.
+     * Retourne le nombre de tweets par tranche de temps (agrégé en SQL).
+     * Paramètres : `bucket` (`minute`, `5min`, `hour` par défaut, `day`), `start` /
+       `end` (ISO8601, optionnels).
+     * `source=archive` → lit l'archive Parquet au lieu de la base (plages historiques,
+       nécessite `pyarrow`).
      * Résultat : `{ "volume_by_hour": [...] }`.
 
-  3. **`/analytics/sentiment`**
+  3. **`/analytics/trending`**
 
-     * Pas encore implémenté.
-     * Retourne un **501 Not Implemented** avec une note sur l’usage futur de bibliothèques NLP (TextBlob, VADER, Transformers).
+     * Retourne les hashtags **en accélération** (z-score EWMA de la dernière heure
+       contre leur ligne de base).
+     * Paramètres : `limit`, `baseline_hours` (1-168), `alpha` (lissage EWMA),
+       `min_count`, `at` (heure de référence, ISO8601).
+     * Résultat : `{ "bucket": "...", "trending": [{"hashtag", "score", "count",
+       "baseline"}, ...] }`.
+
+  4. **`/analytics/sentiment`**
+
+     * Sentiment moyen (score VADER `compound`, calculé une fois à l'ingestion) par
+       hashtag et par tranche de temps.
+     * Paramètres : `bucket` (comme `/volume_by_hour`), `limit` (hashtags), `start` /
+       `end`.
+     * Résultat : `{ "by_hashtag": [...], "by_bucket": [...] }`.
+
+* **Cache et ETag** :
+
+  * Chaque résultat passe par `AnalyticsCache` (clé = endpoint + paramètres), invalidé
+    quand `TweetService` commite de nouveaux tweets.
+  * Chaque réponse porte un `ETag` ; un `If-None-Match` identique renvoie un **304 sans
+    corps** (sans requête SQL).
+
+* **Sérialisation** : résultats d'`AnalyticsService` (de confiance) rendus par
+  `fast_response` (orjson, sans passer par `jsonable_encoder`), en-têtes `ETag` compris.
 
 * **Logs et erreurs** :
 
@@ -37,29 +67,70 @@
 Tu veux m’envoyer le fichier **`analytics_service`** juste après ? Ce sera la pièce maîtresse derrière ces endpoints 🔑
 
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
+from datetime import datetime
 import logging
 
 from ..database import get_db
+from ..responses import FastJSONResponse, fast_response
 from ..services.analytics_service import AnalyticsService
+from ..services.cache_service import AnalyticsCache
+from ..exceptions import ConfigurationError
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+router = APIRouter(
+    prefix="/analytics", tags=["analytics"], default_response_class=FastJSONResponse
+)
+
+
+def _not_modified(
+    request: Request,
+    response: Response,
+    endpoint: str,
+    params: Dict[str, Any],
+    db: Session
+) -> Optional[Response]:
+    """
+    Pose l'ETag courant sur la réponse et gère `If-None-Match`.
+
+    Returns:
+        Optional[Response]: Un 304 si le client possède déjà cette version, sinon None
+    """
+    # Écritures d'autres processus (CLI d'archivage, autres workers) → cache et ETag
+    # invalidés
+    AnalyticsCache.sync(db)
+    etag = AnalyticsCache.etag(endpoint, params)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        ]
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
 
 
 @router.get("/hashtags", response_model=Dict[str, Any])
 async def get_top_hashtags(
+    request: Request,
+    response: Response,
     limit: int = 20, 
+    mode: str = Query("exact", pattern="^(exact|approx)$"),
     db: Session = Depends(get_db)
-) -> Dict[str, Any]:
+) -> Union[Dict[str, Any], Response]:
     """
     Analyse et retourne les hashtags les plus populaires.
     
     Args:
         limit: Nombre maximum de hashtags à retourner (défaut: 20)
+        mode: `exact` (compteurs exacts) ou `approx` (résumés à mémoire bornée)
         db: Session de base de données injectée
     
     Returns:
@@ -68,12 +139,30 @@ async def get_top_hashtags(
     try:
         # Validation et normalisation du paramètre
         limit = max(1, min(100, limit))  # Entre 1 et 100
-        
-        top_hashtags = AnalyticsService.get_top_hashtags(limit=limit, db=db)
-        
-        logger.info(f"Generated hashtag analysis with {len(top_hashtags)} results")
-        return {"top_hashtags": top_hashtags}
-        
+        params: Dict[str, Any] = {"limit": limit, "mode": mode}
+
+        not_modified = _not_modified(request, response, "hashtags", params, db)
+        if not_modified is not None:
+            return not_modified
+
+        def compute() -> Dict[str, Any]:
+            if mode == "approx":
+                approx = AnalyticsService.get_top_hashtags_approx(limit=limit, db=db)
+                logger.info(
+                    f"Generated approximate hashtag analysis with "
+                    f"{len(approx['top_hashtags'])} results"
+                )
+                return {"mode": "approx", **approx}
+
+            top_hashtags = AnalyticsService.get_top_hashtags(limit=limit, db=db)
+
+            logger.info(f"Generated hashtag analysis with {len(top_hashtags)} results")
+            return {"top_hashtags": top_hashtags}
+
+        return fast_response(
+            AnalyticsCache.get_or_compute("hashtags", params, compute), response
+        )
+
     except Exception as e:
         logger.error(f"Error during hashtag analysis: {e}")
         raise HTTPException(
@@ -83,22 +172,55 @@ async def get_top_hashtags(
 
 
 @router.get("/volume_by_hour", response_model=Dict[str, Any])
-async def get_volume_by_hour(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def get_volume_by_hour(
+    request: Request,
+    response: Response,
+    bucket: str = Query("hour", pattern="^(minute|5min|hour|day)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    source: str = Query("db", pattern="^(db|archive)$"),
+    db: Session = Depends(get_db)
+) -> Union[Dict[str, Any], Response]:
     """
-    Analyse le volume de tweets par heure.
+    Analyse le volume de tweets par tranche de temps.
     
     Args:
+        bucket: Largeur des tranches (`minute`, `5min`, `hour`, `day`)
+        start: Début de la plage analysée (inclus, optionnel)
+        end: Fin de la plage analysée (exclue, optionnelle)
+        source: `db` (défaut) ou `archive` (archive Parquet)
         db: Session de base de données injectée
     
     Returns:
-        Dict: Volume de tweets groupé par heure
+        Dict: Volume de tweets groupé par tranche
     """
     try:
-        volume_data = AnalyticsService.get_volume_by_hour(db=db)
-        
-        logger.info(f"Generated volume analysis with {len(volume_data)} time periods")
-        return {"volume_by_hour": volume_data}
-        
+        params: Dict[str, Any] = {
+            "bucket": bucket,
+            "start": start,
+            "end": end,
+            "source": source,
+        }
+
+        not_modified = _not_modified(request, response, "volume_by_hour", params, db)
+        if not_modified is not None:
+            return not_modified
+
+        def compute() -> Dict[str, Any]:
+            volume_data = AnalyticsService.get_volume_by_hour(db=db, **params)
+
+            logger.info(
+                f"Generated volume analysis with {len(volume_data)} time periods"
+            )
+            return {"volume_by_hour": volume_data}
+
+        return fast_response(
+            AnalyticsCache.get_or_compute("volume_by_hour", params, compute), response
+        )
+
+    except ConfigurationError:
+        # `pyarrow` absent : réponse du gestionnaire global
+        raise
     except Exception as e:
         logger.error(f"Error during volume analysis: {e}")
         raise HTTPException(
@@ -107,14 +229,112 @@ async def get_volume_by_hour(db: Session = Depends(get_db)) -> Dict[str, Any]:
         )
 
 
-@router.get("/sentiment")
-async def get_sentiment_analysis():
+@router.get("/trending", response_model=Dict[str, Any])
+async def get_trending_hashtags(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    baseline_hours: int = Query(24, ge=1, le=168),
+    alpha: float = Query(0.3, gt=0, le=1),
+    min_count: int = Query(3, ge=1),
+    at: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+) -> Union[Dict[str, Any], Response]:
     """
-    Endpoint placeholder pour l'analyse de sentiment.
-    À implémenter avec une bibliothèque de NLP (ex: TextBlob, VADER, transformers).
+    Détecte les hashtags en accélération à partir du rollup horaire.
+
+    Args:
+        limit: Nombre maximum de hashtags à retourner
+        baseline_hours: Heures d'historique utilisées pour la ligne de base
+        alpha: Facteur de lissage EWMA
+        min_count: Volume minimum sur l'heure de référence
+        at: Heure de référence (défaut : dernière heure connue)
+        db: Session de base de données injectée
+
+    Returns:
+        Dict: Heure de référence et hashtags tendance avec leur score
     """
-    raise HTTPException(
-        status_code=501,
-        detail="Sentiment analysis endpoint not implemented yet. "
-               "Consider integrating TextBlob, VADER, or Transformers library."
-    )
\ No newline at end of file
+    try:
+        params: Dict[str, Any] = {
+            "limit": limit, "baseline_hours": baseline_hours,
+            "alpha": alpha, "min_count": min_count, "at": at
+        }
+
+        not_modified = _not_modified(request, response, "trending", params, db)
+        if not_modified is not None:
+            return not_modified
+
+        def compute() -> Dict[str, Any]:
+            result = AnalyticsService.get_trending(db=db, **params)
+
+            logger.info(
+                f"Generated trending analysis with {len(result['trending'])} results"
+            )
+            return result
+
+        return fast_response(
+            AnalyticsCache.get_or_compute("trending", params, compute), response
+        )
+
+    except Exception as e:
+        logger.error(f"Error during trending analysis: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error during trending analysis"
+        )
+
+
+@router.get("/sentiment", response_model=Dict[str, Any])
+async def get_sentiment_analysis(
+    request: Request,
+    response: Response,
+    bucket: str = Query("hour", pattern="^(minute|5min|hour|day)$"),
+    limit: int = Query(20, ge=1, le=100),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+) -> Union[Dict[str, Any], Response]:
+    """
+    Analyse le sentiment moyen des tweets par hashtag et par tranche de temps.
+
+    Args:
+        bucket: Largeur des tranches (`minute`, `5min`, `hour`, `day`)
+        limit: Nombre maximum de hashtags à retourner
+        start: Début de la plage analysée (inclus, optionnel)
+        end: Fin de la plage analysée (exclue, optionnelle)
+        db: Session de base de données injectée
+
+    Returns:
+        Dict: Sentiment moyen par hashtag (`by_hashtag`) et par tranche (`by_bucket`)
+    """
+    try:
+        params: Dict[str, Any] = {
+            "bucket": bucket,
+            "limit": limit,
+            "start": start,
+            "end": end,
+        }
+
+        not_modified = _not_modified(request, response, "sentiment", params, db)
+        if not_modified is not None:
+            return not_modified
+
+        def compute() -> Dict[str, Any]:
+            sentiment = AnalyticsService.get_sentiment(db=db, **params)
+
+            logger.info(
+                f"Generated sentiment analysis with "
+                f"{len(sentiment['by_bucket'])} time periods"
+            )
+            return sentiment
+
+        return fast_response(
+            AnalyticsCache.get_or_compute("sentiment", params, compute), response
+        )
+
+    except Exception as e:
+        logger.error(f"Error during sentiment analysis: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error during sentiment analysis"
+        )
@@ -0,0 +1,176 @@
+# app/routes/jobs.py
+"""Collection job management endpoints.
+
+* **Rôle global** : module FastAPI qui gère les **jobs de collecte périodique** exécutés
+  par le planificateur (`CollectionScheduler`).
+
+* **Structure** :
+
+  * Router FastAPI avec le préfixe `/jobs`.
+  * Délègue le CRUD à `JobService` et l'exécution immédiate à `collection_scheduler`.
+
+* **Endpoints** :
+
+  1. **`POST /jobs/`** → crée un job (`CollectionJobCreate`), `201`. Requête déjà
+     enregistrée → 400.
+  2. **`GET /jobs/`** → liste des jobs avec leur état (`CollectionJobRead`).
+  3. **`GET /jobs/{job_id}`** → un job (404 s'il n'existe pas).
+  4. **`PATCH /jobs/{job_id}`** → modifie `interval_seconds`, `max_results` ou `enabled`
+     (`CollectionJobUpdate`).
+  5. **`DELETE /jobs/{job_id}`** → supprime le job, `204`.
+  6. **`POST /jobs/{job_id}/run`** → exécute le job tout de suite (hors planning) et
+     retourne son nouvel état ; une erreur de l'API Twitter/X est enregistrée sur le job
+     (`last_status = "error"`), pas renvoyée en 502.
+
+* **Erreurs** : `DatabaseError` → 500 (gestionnaire global de `main.py`).
+
+👉 En résumé : le tableau de bord des collectes automatiques.
+
+"""
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+from typing import List
+import logging
+
+from .. import schemas
+from ..database import get_db
+from ..services.job_service import JobService
+from ..services.scheduler_service import collection_scheduler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("/", response_model=schemas.CollectionJobRead, status_code=201)
+async def create_job(
+    payload: schemas.CollectionJobCreate,
+    db: Session = Depends(get_db)
+) -> schemas.CollectionJobRead:
+    """
+    Enregistre une requête à collecter périodiquement.
+
+    Args:
+        payload: Requête, intervalle, taille de page et activation
+        db: Session de base de données injectée
+
+    Returns:
+        schemas.CollectionJobRead: Job créé
+    """
+    try:
+        job = JobService.create_job(
+            db,
+            query=payload.query,
+            interval_seconds=payload.interval_seconds,
+            max_results=payload.max_results,
+            enabled=payload.enabled
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return schemas.CollectionJobRead.from_orm(job)
+
+
+@router.get("/", response_model=List[schemas.CollectionJobRead])
+async def list_jobs(db: Session = Depends(get_db)) -> List[schemas.CollectionJobRead]:
+    """
+    Liste les jobs de collecte et leur état.
+
+    Args:
+        db: Session de base de données injectée
+
+    Returns:
+        List[schemas.CollectionJobRead]: Jobs par ordre de création
+    """
+    return [schemas.CollectionJobRead.from_orm(job) for job in JobService.list_jobs(db)]
+
+
+@router.get("/{job_id}", response_model=schemas.CollectionJobRead)
+async def get_job(
+    job_id: int, db: Session = Depends(get_db)
+) -> schemas.CollectionJobRead:
+    """
+    Retourne un job de collecte.
+
+    Args:
+        job_id: Identifiant du job
+        db: Session de base de données injectée
+
+    Returns:
+        schemas.CollectionJobRead: Job demandé
+    """
+    job = JobService.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404, detail=f"Collection job {job_id} not found"
+        )
+    return schemas.CollectionJobRead.from_orm(job)
+
+
+@router.patch("/{job_id}", response_model=schemas.CollectionJobRead)
+async def update_job(
+    job_id: int,
+    payload: schemas.CollectionJobUpdate,
+    db: Session = Depends(get_db)
+) -> schemas.CollectionJobRead:
+    """
+    Modifie l'intervalle, la taille de page ou l'activation d'un job.
+
+    Args:
+        job_id: Identifiant du job
+        payload: Champs à modifier
+        db: Session de base de données injectée
+
+    Returns:
+        schemas.CollectionJobRead: Job modifié
+    """
+    try:
+        job = JobService.update_job(db, job_id, payload.dict(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if job is None:
+        raise HTTPException(
+            status_code=404, detail=f"Collection job {job_id} not found"
+        )
+    return schemas.CollectionJobRead.from_orm(job)
+
+
+@router.delete("/{job_id}", status_code=204)
+async def delete_job(job_id: int, db: Session = Depends(get_db)) -> Response:
+    """
+    Supprime un job de collecte.
+
+    Args:
+        job_id: Identifiant du job
+        db: Session de base de données injectée
+
+    Returns:
+        Response: Réponse vide (204)
+    """
+    if not JobService.delete_job(db, job_id):
+        raise HTTPException(
+            status_code=404, detail=f"Collection job {job_id} not found"
+        )
+    return Response(status_code=204)
+
+
+@router.post("/{job_id}/run", response_model=schemas.CollectionJobRead)
+async def run_job(
+    job_id: int, db: Session = Depends(get_db)
+) -> schemas.CollectionJobRead:
+    """
+    Exécute un job immédiatement, hors planning.
+
+    Args:
+        job_id: Identifiant du job
+        db: Session de base de données injectée
+
+    Returns:
+        schemas.CollectionJobRead: État du job après l'exécution
+    """
+    job = await collection_scheduler.run_job(job_id, db=db)
+    if job is None:
+        raise HTTPException(
+            status_code=404, detail=f"Collection job {job_id} not found"
+        )
+    logger.info(f"Collection job {job_id} run on demand: {job.last_status}")
+    return schemas.CollectionJobRead.from_orm(job)
@@ -15,18 +15,75 @@
   1. **`POST /tweets/collect`**
 
      * Reçoit une requête (`CollectRequest`) contenant une `query` et `max_results`.
-     * Appelle `TweetService.collect_tweets()` pour interroger l’API Twitter/X et stocker les tweets en DB.
+     * Appelle `TweetService.collect_tweets_async()` pour interroger l’API Twitter/X
+       (client httpx asynchrone) et stocker les tweets en DB.
+     * N'occupe jamais la boucle d'événements : les autres requêtes restent servies
+       pendant l'appel API.
+     * Utilise le mode batch : une seule requête de déduplication, un seul INSERT et un
+       seul COMMIT par page.
      * Retourne les tweets insérés au format `TweetRead`.
      * Gère proprement les erreurs API (502) et DB (500).
+     * Quota de l'API épuisé pour trop longtemps → 429 avec `Retry-After`.
+     * `background=true` → **202** immédiat avec un job (`IngestJobRead`) : la page est
+       récupérée puis écrite par la file d'ingestion (`ingest_queue`, commits groupés
+       entre pages et requêtes) ; file pleine → 503 + `Retry-After`.
 
-  2. **`GET /tweets/`**
+  2. **`GET /tweets/collect/jobs/{job_id}`**
 
-     * Récupère les tweets déjà en DB.
+     * État d'une collecte en arrière-plan : `status`, `fetched`, `queued`, `written`,
+       `deduplicated`, `failed`.
+     * Job inconnu (ou oublié) → 404.
+
+  3. **`POST /tweets/collect/paginated`**
+
+     * Reçoit un `PaginatedCollectRequest` (`query`, `total`, `page_size`, `resume`).
+     * Appelle `TweetService.collect_tweets_paginated()` : suit `next_token` jusqu'à
+       `total` tweets, page par page.
+     * Retourne uniquement la progression (`PaginatedCollectResponse`), jamais les
+       tweets → mémoire constante.
+     * En cas d'interruption, relancer la même requête reprend depuis le dernier token
+       commité.
+
+  4. **`GET /tweets/`**
+
+     * Récupère les tweets déjà en DB, page par page (`TweetService.get_tweets_page`).
      * Paramètre `limit` (entre 1 et 1000, défaut 50).
-     * Tweets triés par date décroissante (logique déléguée à `TweetService`).
-     * Retourne des objets `TweetRead`.
+     * Pagination par curseur : la réponse porte un en-tête `X-Next-Cursor`, à renvoyer
+       dans `cursor` pour la page suivante (absent sur la dernière page).
+     * Filtres indexés optionnels : `author_id`, `start` / `end` (ISO8601), `hashtag`.
+     * Tweets triés par date décroissante puis `id` (les tweets sans date en dernier).
+     * Curseur invalide → 400.
+     * Retourne des objets `TweetRead`, sérialisés directement depuis les lignes lues
+       (`fast_response`, sans revalidation).
+
+  5. **`GET /tweets/count`**
+
+     * Retourne `{ "count": n }` sans charger les tweets (utilisé par le dashboard).
+
+  6. **`GET /tweets/search`**
+
+     * Recherche plein texte (`SearchService.search`) : FTS5 sous SQLite, `tsvector` +
+       GIN sous PostgreSQL.
+     * Paramètres : `q` (obligatoire), `limit` (1-100, défaut 20), `sort` (`rank` par
+       pertinence, ou `recent`).
+     * Pagination par curseur (`X-Next-Cursor` / `cursor`), comme `GET /tweets/`.
+     * Requête vide ou curseur invalide → 400.
+     * Retourne des objets `TweetSearchHit` (`TweetRead` + `score`), sérialisés par
+       `fast_response`.
+
+  7. **`GET /tweets/export`**
 
-  3. **`GET /tweets/top-hashtags`**
+     * Exporte la table `tweets` **en flux** : NDJSON (`format=ndjson`, défaut) ou CSV
+       (`format=csv`).
+     * Paramètres : `columns` (liste séparée par des virgules, parmi `EXPORT_COLUMNS`),
+       `start` / `end`.
+     * Lecture par paquets (`yield_per`) dans un thread → mémoire constante, boucle
+       d'événements libre.
+     * S'arrête dès que le client se déconnecte (curseur libéré, après la fin du paquet
+       en cours de lecture).
+     * Format ou colonne inconnue → 400 (422 pour un format hors motif).
+
+  8. **`GET /tweets/top-hashtags`**
 
      * Petit endpoint indépendant.
      * Prend une **liste de tweets (strings)** en paramètre.
@@ -44,28 +101,53 @@
 Tu veux que je fasse un parallèle entre `tweets.py` et `analytics.py` déjà maintenant, ou on garde ça pour le gros schéma final une fois tous les fichiers envoyés ?
 
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Union
+from datetime import datetime
+import asyncio
 import logging
+import math
 
 from .. import schemas
 from ..database import get_db
-from ..services.tweet_service import TweetService
-from ..exceptions import TwitterAPIError, DatabaseError
+from ..config import settings
+from ..responses import FastJSONResponse, fast_response
+from ..services.tweet_service import TweetService, DEFAULT_EXPORT_COLUMNS
+from ..services.search_service import SearchService
+from ..services.ingest_queue import ingest_queue
+from ..exceptions import (
+    TwitterAPIError,
+    DatabaseError,
+    RateLimitExceeded,
+    IngestQueueFull,
+)
 
 from ..utils import analyse_hashtag
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/tweets", tags=["tweets"])
+router = APIRouter(
+    prefix="/tweets", tags=["tweets"], default_response_class=FastJSONResponse
+)
 
 
-@router.post("/collect", response_model=List[schemas.TweetRead])
+@router.post(
+    "/collect",
+    response_model=List[schemas.TweetRead],
+    responses={
+        202: {
+            "model": schemas.IngestJobRead,
+            "description": "Collecte lancée en arrière-plan",
+        }
+    },
+)
 async def collect_tweets(
     payload: schemas.CollectRequest, 
     db: Session = Depends(get_db)
-) -> List[schemas.TweetRead]:
+) -> Union[List[schemas.TweetRead], JSONResponse]:
     """
     Collecte des tweets depuis l'API Twitter/X et les stocke en base.
     
@@ -75,25 +157,57 @@ async def collect_tweets(
     
     Returns:
         List[schemas.TweetRead]: Liste des nouveaux tweets collectés
+        (ou `202` + `IngestJobRead` si `background=true`)
     
     Raises:
-        HTTPException: 502 pour erreurs API, 500 pour erreurs internes
+        HTTPException: 502 pour erreurs API, 500 pour erreurs internes, 503 si la file
+            d'ingestion est pleine
     """
     try:
         logger.info(f"Starting tweet collection for query: {payload.query}")
-        
-        saved_tweets = TweetService.collect_tweets(
+        # `max_results: null` explicite → valeur par défaut du schéma
+        max_results = payload.max_results if payload.max_results is not None else 10
+
+        if payload.background:
+            try:
+                job = ingest_queue.submit_collect(payload.query, max_results)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            logger.info(
+                f"Queued background collection {job['id']} for query: {payload.query}"
+            )
+            return JSONResponse(
+                status_code=202, content=jsonable_encoder(schemas.IngestJobRead(**job))
+            )
+
+        saved_tweets = await TweetService.collect_tweets_async(
             query=payload.query,
-            max_results=payload.max_results,
+            max_results=max_results,
             db=db
         )
-        
+
         # Conversion vers le schema de réponse
         result = [schemas.TweetRead.from_orm(tweet) for tweet in saved_tweets]
-        
+
         logger.info(f"Successfully collected {len(result)} tweets")
         return result
-        
+
+    except HTTPException:
+        raise
+    except IngestQueueFull as e:
+        logger.warning(f"Background collection rejected: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    except RateLimitExceeded as e:
+        logger.warning(f"Twitter API rate limit exhausted during collection: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
     except TwitterAPIError as e:
         logger.error(f"Twitter API error during collection: {e}")
         raise HTTPException(
@@ -114,16 +228,117 @@ async def collect_tweets(
         )
 
 
+@router.get("/collect/jobs/{job_id}", response_model=schemas.IngestJobRead)
+async def get_collect_job(job_id: str) -> schemas.IngestJobRead:
+    """
+    État d'une collecte lancée en arrière-plan.
+
+    Args:
+        job_id: Identifiant retourné par `POST /tweets/collect` (`background=true`)
+
+    Returns:
+        schemas.IngestJobRead: Statut et compteurs (récupérés, en file, écrits,
+        doublons, échecs)
+
+    Raises:
+        HTTPException: 404 si le job est inconnu
+    """
+    job = ingest_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Collect job {job_id} not found")
+    return schemas.IngestJobRead(**job)
+
+
+@router.post("/collect/paginated", response_model=schemas.PaginatedCollectResponse)
+async def collect_tweets_paginated(
+    payload: schemas.PaginatedCollectRequest,
+    db: Session = Depends(get_db)
+) -> schemas.PaginatedCollectResponse:
+    """
+    Collecte plusieurs pages de tweets en suivant `meta.next_token`.
+
+    Args:
+        payload: Requête contenant la query, le total visé et la taille de page
+        db: Session de base de données injectée
+
+    Returns:
+        schemas.PaginatedCollectResponse: Progression page par page et totaux
+
+    Raises:
+        HTTPException: 502 pour erreurs API, 500 pour erreurs internes
+    """
+    try:
+        logger.info(
+            f"Starting paginated collection for query: {payload.query} "
+            f"(total={payload.total})"
+        )
+
+        summary = await TweetService.collect_tweets_paginated(
+            query=payload.query,
+            total=payload.total,
+            db=db,
+            page_size=payload.page_size,
+            resume=payload.resume
+        )
+
+        logger.info(
+            f"Paginated collection done: {summary['total_saved']} saved "
+            f"over {len(summary['pages'])} pages"
+        )
+        return schemas.PaginatedCollectResponse(**summary)
+
+    except RateLimitExceeded as e:
+        logger.warning(
+            f"Twitter API rate limit exhausted during paginated collection: {e}"
+        )
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    except TwitterAPIError as e:
+        logger.error(f"Twitter API error during paginated collection: {e}")
+        raise HTTPException(
+            status_code=502,
+            detail=f"Error calling Twitter/X API: {str(e)}"
+        )
+    except DatabaseError as e:
+        logger.error(f"Database error during paginated collection: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database error: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error during paginated collection: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error during tweet collection"
+        )
+
+
 @router.get("/", response_model=List[schemas.TweetRead])
 async def list_tweets(
+    response: Response,
     limit: int = 50, 
+    cursor: Optional[str] = None,
+    author_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    hashtag: Optional[str] = None,
     db: Session = Depends(get_db)
 ) -> List[schemas.TweetRead]:
     """
-    Récupère la liste des tweets stockés, triés par date décroissante.
+    Récupère une page de tweets stockés, triés par date décroissante.
     
     Args:
+        response: Réponse FastAPI (en-tête `X-Next-Cursor`)
         limit: Nombre maximum de tweets à retourner (défaut: 50)
+        cursor: Curseur de la page suivante (en-tête `X-Next-Cursor` de la page
+            précédente)
+        author_id: Filtre sur l'auteur (optionnel)
+        start: Début de la plage sur `created_at` (inclus, optionnel)
+        end: Fin de la plage sur `created_at` (exclue, optionnelle)
+        hashtag: Filtre sur un hashtag, avec ou sans `#` (optionnel)
         db: Session de base de données injectée
     
     Returns:
@@ -133,12 +348,24 @@ async def list_tweets(
         # Validation du paramètre limit
         limit = max(1, min(1000, limit))  # Entre 1 et 1000
         
-        tweets = TweetService.get_tweets(limit=limit, db=db)
-        result = [schemas.TweetRead.from_orm(tweet) for tweet in tweets]
+        try:
+            tweets, next_cursor = TweetService.get_tweets_page(
+                db=db, limit=limit, cursor=cursor, author_id=author_id,
+                start=start, end=end, hashtag=hashtag
+            )
+        except ValueError as e:
+            # Curseur invalide : erreur du client
+            raise HTTPException(status_code=400, detail=str(e))
         
-        logger.info(f"Retrieved {len(result)} tweets")
-        return result
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
+        logger.info(f"Retrieved {len(tweets)} tweets")
+        # Lignes limitées aux colonnes de `TweetRead` : sérialisées sans revalidation
+        return fast_response(tweets, response)
+
+    except HTTPException:
+        raise
     except DatabaseError as e:
         logger.error(f"Database error during tweet retrieval: {e}")
         raise HTTPException(
@@ -153,6 +380,164 @@ async def list_tweets(
         )
 
 
+@router.get("/count", response_model=Dict[str, int])
+async def count_tweets(db: Session = Depends(get_db)) -> Dict[str, int]:
+    """
+    Retourne le nombre total de tweets stockés.
+
+    Args:
+        db: Session de base de données injectée
+
+    Returns:
+        Dict: `{"count": n}`
+    """
+    try:
+        return {"count": TweetService.get_tweets_count(db)}
+
+    except DatabaseError as e:
+        logger.error(f"Database error during tweet count: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database error: {str(e)}"
+        )
+
+
+@router.get("/search", response_model=List[schemas.TweetSearchHit])
+async def search_tweets(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    sort: str = Query("rank", pattern="^(rank|recent)$"),
+    db: Session = Depends(get_db)
+) -> List[schemas.TweetSearchHit]:
+    """
+    Recherche plein texte dans les tweets stockés, classée et paginée.
+
+    Args:
+        response: Réponse FastAPI (en-tête `X-Next-Cursor`)
+        q: Texte recherché (`terme*` pour une recherche par préfixe)
+        limit: Nombre maximum de tweets à retourner (défaut: 20)
+        cursor: Curseur de la page suivante (en-tête `X-Next-Cursor` de la page
+            précédente)
+        sort: `rank` (pertinence, défaut) ou `recent` (derniers collectés)
+        db: Session de base de données injectée
+
+    Returns:
+        List[schemas.TweetSearchHit]: Tweets trouvés avec leur score
+    """
+    try:
+        limit = max(1, min(100, limit))  # Entre 1 et 100
+
+        try:
+            hits, next_cursor = SearchService.search(
+                db=db, q=q, limit=limit, cursor=cursor, sort=sort
+            )
+        except ValueError as e:
+            # Requête vide ou curseur invalide : erreur du client
+            raise HTTPException(status_code=400, detail=str(e))
+
+        result = [{**tweet._asdict(), "score": score} for tweet, score in hits]
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+
+        return fast_response(result, response)
+
+    except HTTPException:
+        raise
+    except DatabaseError as e:
+        logger.error(f"Database error during tweet search: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database error: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error during tweet search: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error during tweet search"
+        )
+
+
+@router.get("/export")
+async def export_tweets(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    columns: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Exporte les tweets en flux (NDJSON ou CSV), sans les charger en mémoire.
+
+    Args:
+        request: Requête HTTP (détection de la déconnexion du client)
+        format: `ndjson` (défaut) ou `csv`
+        columns: Colonnes exportées, séparées par des virgules (optionnel)
+        start: Début de la plage sur `created_at` (inclus, optionnel)
+        end: Fin de la plage sur `created_at` (exclue, optionnelle)
+        db: Session de base de données injectée
+
+    Returns:
+        StreamingResponse: Flux NDJSON ou CSV
+    """
+    selected = (
+        [column.strip() for column in columns.split(",") if column.strip()]
+        if columns else list(DEFAULT_EXPORT_COLUMNS)
+    )
+    try:
+        chunks = TweetService.export_tweets(
+            db, fmt=format, columns=selected, start=start, end=end,
+            chunk_size=settings.export_chunk_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_in_thread(request, chunks),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tweets.{format}"'}
+    )
+
+
+async def _stream_in_thread(
+    request: Request, chunks: Iterator[str]
+) -> AsyncIterator[str]:
+    """
+    Émet les paquets d'un générateur bloquant, chacun lu dans un thread.
+
+    Le générateur n'est fermé qu'une fois le paquet en cours de lecture terminé :
+    une déconnexion ou une annulation ne ferme jamais la session sous un thread qui
+    l'utilise encore.
+    """
+    exported = 0
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if await request.is_disconnected():
+                logger.info(
+                    f"Client disconnected, export stopped after {exported} chunks"
+                )
+                break
+            # Lecture du paquet suivant hors de la boucle d'événements ;
+            # `shield` : une annulation n'abandonne pas la lecture en cours
+            pending = asyncio.ensure_future(asyncio.to_thread(next, chunks, None))
+            chunk = await asyncio.shield(pending)
+            pending = None
+            if chunk is None:
+                break
+            exported += 1
+            yield chunk
+    finally:
+        if pending is not None:
+            await asyncio.gather(pending, return_exceptions=True)
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
 @router.get("/top-hashtags")
 def get_top_hashtags(tweets: list[str]):
-    return analyse_hashtag.top_hashtags(tweets)
\ No newline at end of file
+    return analyse_hashtag.top_hashtags(tweets)
@@ -21,27 +21,52 @@ Ces schemas permettent de garantir la cohérence des données échangées entre
    * Pour retourner un tweet aux clients API.
    * Champs : `id`, `tweet_id`, `author_id`, `text`, `created_at`, `collected_at`.
    * `orm_mode = True` → permet de convertir un objet SQLAlchemy directement en Pydantic.
+   * **`TweetSearchHit`** : `TweetRead` + `score` de pertinence (`GET /tweets/search`).
 
 3. **`CollectRequest`**
 
    * Pour la route de collecte (`POST /tweets/collect`).
-   * Champs : `query` (string obligatoire), `max_results` (1-100, défaut 10).
+   * Champs : `query` (string obligatoire), `max_results` (1-100, défaut 10),
+     `background` (rend la main avec un job, écriture par la file d'ingestion).
+   * **`IngestJobRead`** : état d'une collecte en arrière-plan (`GET
+     /tweets/collect/jobs/{job_id}`).
 
-4. **`HashtagAnalysis`**
+4. **`PaginatedCollectRequest`**
+
+   * Pour la collecte multi-pages (`POST /tweets/collect/paginated`).
+   * Champs : `query`, `total` (1-`collect_max_total`, défaut 1000), `page_size`
+     (10-100), `resume` (reprise depuis le dernier `next_token`).
+
+5. **`PageProgress` / `PaginatedCollectResponse`**
+
+   * Progression page par page (reçus, insérés, doublons, `next_token`).
+   * Résumé global : totaux, dernier `next_token`, `completed` si l'API n'a plus de
+     pages.
+
+6. **`HashtagAnalysis`**
 
    * Représente un hashtag et son compteur.
    * Champs : `hashtag` (str), `count` (int).
 
-5. **`VolumeAnalysis`**
+7. **`VolumeAnalysis`**
 
    * Représente le volume de tweets pour un créneau horaire.
    * Champs : `hour_or_key` (str), `count` (int).
 
-6. **`AnalyticsResponse`**
+8. **`AnalyticsResponse`**
 
    * Réponse globale pour les endpoints analytics (`/analytics`).
    * Champs optionnels : `top_hashtags` (liste de `HashtagAnalysis`), `volume_by_hour` (liste de `VolumeAnalysis`).
 
+9. **`CollectionJobCreate` / `CollectionJobUpdate` / `CollectionJobRead`**
+
+   * Jobs de collecte périodique (routes `/jobs`).
+   * Création : `query`, `interval_seconds` (≥ `scheduler_min_interval`), `max_results`
+     (10-100), `enabled`.
+   * Modification partielle : `interval_seconds`, `max_results`, `enabled`.
+   * Lecture : configuration + état (`since_id`, `next_token` si pagination inachevée,
+     `next_run_at`, `last_status`, `consecutive_failures`…).
+
 ---
 
 ### 🔑 Points clés
@@ -60,6 +85,8 @@ from pydantic import BaseModel, Field, validator, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 
+from .config import settings
+
 
 class TweetCreate(BaseModel):
     """Schema pour la création d'un nouveau tweet."""
@@ -84,6 +111,13 @@ class TweetRead(BaseModel):
         orm_mode = True
 
 
+class TweetSearchHit(TweetRead):
+    """Schema d'un résultat de recherche plein texte."""
+    score: float = Field(
+        ..., description="Pertinence (plus grand = plus pertinent, 0 en tri récent)"
+    )
+
+
 class CollectRequest(BaseModel):
     """Schema pour les requêtes de collecte de tweets."""
     query: str = Field(..., min_length=1, description="Requête de recherche")
@@ -93,6 +127,64 @@ class CollectRequest(BaseModel):
         le=100, 
         description="Nombre maximum de résultats (1-100)"
     )
+    background: bool = Field(
+        default=False,
+        description=(
+            "Rend la main immédiatement avec un job (écriture par la file d'ingestion)"
+        ),
+    )
+
+
+class IngestJobRead(BaseModel):
+    """Schema pour l'état d'une collecte en arrière-plan (file d'ingestion)."""
+    id: str
+    query: str
+    status: str
+    fetched: int
+    queued: int
+    written: int
+    deduplicated: int
+    failed: int
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class PaginatedCollectRequest(BaseModel):
+    """Schema pour les collectes multi-pages (suivi de `meta.next_token`)."""
+    query: str = Field(..., min_length=1, description="Requête de recherche")
+    total: int = Field(
+        default=1000,
+        ge=1,
+        le=settings.collect_max_total,
+        description="Nombre maximum de tweets à récupérer sur toutes les pages"
+    )
+    page_size: int = Field(
+        default=100, ge=10, le=100, description="Taille de page (10-100)"
+    )
+    resume: bool = Field(
+        default=True,
+        description="Reprend depuis le dernier next_token commité pour cette requête"
+    )
+
+
+class PageProgress(BaseModel):
+    """Progression d'une page de collecte."""
+    page: int
+    fetched: int
+    saved: int
+    duplicates: int
+    next_token: Optional[str] = None
+
+
+class PaginatedCollectResponse(BaseModel):
+    """Résumé d'une collecte multi-pages."""
+    query: str
+    pages: List[PageProgress]
+    total_fetched: int
+    total_saved: int
+    next_token: Optional[str] = None
+    completed: bool
 
 
 class HashtagAnalysis(BaseModel):
@@ -110,4 +202,48 @@ class VolumeAnalysis(BaseModel):
 class AnalyticsResponse(BaseModel):
     """Schema de réponse pour les analytics."""
     top_hashtags: Optional[List[HashtagAnalysis]] = None
-    volume_by_hour: Optional[List[VolumeAnalysis]] = None
\ No newline at end of file
+    volume_by_hour: Optional[List[VolumeAnalysis]] = None
+
+
+class CollectionJobCreate(BaseModel):
+    """Schema pour créer un job de collecte périodique."""
+    query: str = Field(
+        ..., min_length=1, max_length=512, description="Requête de recherche"
+    )
+    interval_seconds: int = Field(
+        ...,
+        ge=settings.scheduler_min_interval,
+        description="Période entre deux exécutions (secondes)"
+    )
+    max_results: int = Field(
+        default=100, ge=10, le=100, description="Tweets par page (10-100)"
+    )
+    enabled: bool = Field(default=True, description="Job actif dès sa création")
+
+
+class CollectionJobUpdate(BaseModel):
+    """Schema pour modifier un job de collecte (champs optionnels)."""
+    interval_seconds: Optional[int] = Field(None, ge=settings.scheduler_min_interval)
+    max_results: Optional[int] = Field(None, ge=10, le=100)
+    enabled: Optional[bool] = None
+
+
+class CollectionJobRead(BaseModel):
+    """Schema pour la lecture d'un job de collecte et de son état."""
+    id: int
+    query: str
+    interval_seconds: int
+    max_results: int
+    enabled: bool
+    since_id: Optional[str]
+    next_token: Optional[str] = None
+    next_run_at: datetime
+    last_run_at: Optional[datetime]
+    last_status: Optional[str]
+    last_error: Optional[str]
+    consecutive_failures: int
+    runs: int
+    tweets_saved: int
+
+    class Config:
+        orm_mode = True
@@ -6,39 +6,70 @@
 * **Structure** :
 
   * Classe `AnalyticsService` avec uniquement des méthodes statiques.
-  * Utilise **SQLAlchemy** pour récupérer les données (`Tweet.text`, `Tweet.created_at`).
-  * Utilise `Counter` pour agréger et compter efficacement.
+  * Utilise **SQLAlchemy** pour récupérer les données (`HashtagCount`,
+    `Tweet.created_at`).
+  * Agrège côté SQL (`GROUP BY`) quand c'est possible, `Counter` sinon.
   * Ajoute une couche de robustesse (try/except, logs).
 
 * **Fonctionnalités** :
 
   1. **`get_top_hashtags(limit, db)`**
 
-     * Récupère uniquement le champ `text` des tweets depuis la DB.
-     * Extrait les hashtags via une regex (`#\w+` insensible à la casse).
-     * Normalise en minuscules.
-     * Compte les occurrences avec `Counter`.
+     * Lit la table `hashtag_counts`, maintenue à l'ingestion par `HashtagService`.
+     * Requête indexée `ORDER BY count DESC LIMIT n` : plus aucun scan de `tweets.text`.
+     * Hashtags normalisés en minuscules, comptés une fois par tweet.
      * Retourne les `limit` plus fréquents sous forme :
 
        ```json
        [{"hashtag": "#ai", "count": 42}, ...]
        ```
 
-  2. **`get_volume_by_hour(db)`**
+  2. **`get_top_hashtags_approx(limit, db, start, end)`**
 
-     * Récupère uniquement `created_at` des tweets.
-     * Normalise la date en une clé par **heure** (`YYYY-MM-DDTHH`).
+     * Mode approximatif à mémoire bornée (`HashtagSketchService`, algorithme
+       Space-Saving).
+     * Fusionne les résumés de tous les workers et de toutes les fenêtres horaires de la
+       plage.
+     * Retourne chaque hashtag avec sa borne d'erreur, plus `max_error` et `total`.
 
-       * Si `created_at` est une string → prend les 13 premiers caractères.
-       * Si `created_at` est un datetime → formate en ISO horaire.
-       * Sinon → clé `"unknown"`.
-     * Compte le volume de tweets par heure.
-     * Trie par heure et retourne une liste du type :
+  3. **`get_volume_by_hour(db, bucket="hour", start=None, end=None, source="db")`**
+
+     * Agrégation **côté SQL** (`GROUP BY`) : seules les lignes de tranches transitent.
+     * Lit les rollups `tweet_counts_minute` / `tweet_counts_hour` (`ROLLUP_SOURCES`)
+       maintenus à l'ingestion.
+     * Si `start` / `end` ne sont pas alignés sur la granularité du rollup → agrégation
+       exacte sur `tweets`.
+     * Troncature spécifique au dialecte (`_bucket_expression`) :
+
+       * SQLite → `strftime(...)` (et arithmétique sur l'epoch pour `5min`).
+       * PostgreSQL → `date_trunc` / `to_char` (et `floor(epoch / 300)` pour `5min`).
+       * Autre dialecte → repli en agrégation Python.
+     * Tranches supportées (`VOLUME_BUCKETS`) : `minute`, `5min`, `hour` (clé
+       `YYYY-MM-DDTHH`), `day`.
+     * Plage de temps optionnelle (`start` inclus, `end` exclu) filtrée via l'index
+       `ix_tweet_created`.
+     * `source="archive"` → même agrégation sur l'archive Parquet
+       (`ArchiveService.read`, calcul vectorisé `pyarrow.compute`), pour les plages
+       historiques élaguées de la base.
+     * Trie par tranche et retourne une liste du type :
 
        ```json
        [{"hour_or_key": "2025-09-19T14", "count": 17}, ...]
        ```
 
+  4. **`get_trending(db, limit, baseline_hours, alpha, min_count, at)`**
+
+     * Hashtags en accélération : z-score EWMA de la dernière heure contre la ligne de
+       base du hashtag (`TrendService`).
+     * Calculé uniquement à partir du rollup `hashtag_counts_hour`.
+
+  5. **`get_sentiment(db, bucket, limit, start, end)`**
+
+     * Moyennes `AVG(compound)` calculées en SQL sur `tweet_sentiments` (scores
+       persistés à l'ingestion).
+     * Par hashtag (jointure `tweet_hashtags`, hashtags les plus fréquents d'abord) et
+       par tranche de temps (`_bucket_expression`).
+
 * **Logs et robustesse** :
 
   * Logge le nombre de résultats produits.
@@ -50,28 +81,51 @@
 Tu veux que je continue à enchaîner directement sur le service **`tweet_service`** quand tu me l’enverras ?
 
 """
-import re
 import logging
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from collections import Counter
-from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy import ColumnElement, Integer, cast, func, literal_column
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from datetime import datetime, timezone
 
 from .. import models
+from .hashtag_service import HashtagService
+from .rollup_service import RollupService
+from .archive_service import ArchiveService
+from .sketch_service import HashtagSketchService
+from .trend_service import TrendService
+from ..utils.dates import to_utc_naive
 
 logger = logging.getLogger(__name__)
 
+# Tranches supportées : largeur (s), format de clé SQLite/Python, format PostgreSQL
+VOLUME_BUCKETS = {
+    "minute": (60, "%Y-%m-%dT%H:%M", 'YYYY-MM-DD"T"HH24:MI'),
+    "5min": (300, "%Y-%m-%dT%H:%M", 'YYYY-MM-DD"T"HH24:MI'),
+    "hour": (3600, "%Y-%m-%dT%H", 'YYYY-MM-DD"T"HH24'),
+    "day": (86400, "%Y-%m-%d", "YYYY-MM-DD"),
+}
+
+# Rollup lu pour chaque tranche, et sa granularité
+ROLLUP_SOURCES: Dict[str, Tuple[Any, str]] = {
+    "minute": (models.TweetCountMinute, "minute"),
+    "5min": (models.TweetCountMinute, "minute"),
+    "hour": (models.TweetCountHour, "hour"),
+    "day": (models.TweetCountHour, "hour"),
+}
+
 
 class AnalyticsService:
     """Service pour l'analyse des tweets (hashtags, volume, etc.)."""
-    
-    # Pattern regex optimisé pour les hashtags
-    HASHTAG_PATTERN = re.compile(r"#\w+", re.IGNORECASE)
-    
+
+    # Pattern regex des hashtags (partagé avec l'indexation à l'ingestion)
+    HASHTAG_PATTERN = HashtagService.HASHTAG_PATTERN
+
     @staticmethod
-    def get_top_hashtags(limit: int, db: Session) -> List[Dict[str, any]]:
+    def get_top_hashtags(limit: int, db: Session) -> List[Dict[str, Any]]:
         """
-        Analyse les hashtags les plus populaires dans les tweets stockés.
+        Retourne les hashtags les plus populaires depuis les compteurs maintenus à
+        l'ingestion.
         
         Args:
             limit: Nombre maximum de hashtags à retourner
@@ -81,90 +135,367 @@ class AnalyticsService:
             List[Dict]: Liste des hashtags avec leur nombre d'occurrences
         """
         try:
-            # Récupération efficace des textes uniquement
-            tweet_texts = db.query(models.Tweet.text).filter(
-                models.Tweet.text.isnot(None)
-            ).all()
-            
-            if not tweet_texts:
-                return []
-            
-            # Extraction et comptage des hashtags
-            hashtag_counter = Counter()
-            
-            for (text,) in tweet_texts:
-                hashtags = AnalyticsService.HASHTAG_PATTERN.findall(text)
-                # Normalisation en minuscules
-                normalized_hashtags = [tag.lower() for tag in hashtags]
-                hashtag_counter.update(normalized_hashtags)
-            
-            # Tri et limitation des résultats
-            top_hashtags = hashtag_counter.most_common(limit)
-            
+            # Lecture indexée : ORDER BY count DESC LIMIT n sur hashtag_counts
+            top_hashtags = (
+                db.query(models.HashtagCount.hashtag, models.HashtagCount.count)
+                .order_by(models.HashtagCount.count.desc(), models.HashtagCount.hashtag)
+                .limit(limit)
+                .all()
+            )
+
             result = [
                 {"hashtag": hashtag, "count": count}
                 for hashtag, count in top_hashtags
             ]
-            
+
             logger.info(f"Found {len(result)} top hashtags")
             return result
-            
+
         except Exception as e:
             logger.error(f"Failed to analyze hashtags: {e}")
             return []
-    
+
     @staticmethod
-    def get_volume_by_hour(db: Session) -> List[Dict[str, any]]:
+    def get_top_hashtags_approx(
+        limit: int,
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
-        Analyse le volume de tweets par heure.
+        Top hashtags approximatif à mémoire bornée (résumés Space-Saving fusionnés).
+
+        Args:
+            limit: Nombre maximum de hashtags à retourner
+            db: Session de base de données
+            start: Début de la plage analysée (optionnel)
+            end: Fin de la plage analysée (optionnelle)
+
+        Returns:
+            Dict: `top_hashtags` (avec borne d'erreur par hashtag), `max_error`, `total`
+        """
+        try:
+            result = HashtagSketchService.top_hashtags(db, limit, start=start, end=end)
+            logger.info(f"Found {len(result['top_hashtags'])} approximate top hashtags")
+            return result
+
+        except Exception as e:
+            logger.error(f"Failed to analyze approximate hashtags: {e}")
+            return {"top_hashtags": [], "max_error": 0, "total": 0}
+
+    @staticmethod
+    def get_trending(
+        db: Session,
+        limit: int = 20,
+        baseline_hours: int = 24,
+        alpha: float = 0.3,
+        min_count: int = 3,
+        at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Hashtags tendance, classés par accélération (z-score EWMA).
         
         Args:
             db: Session de base de données
+            limit: Nombre maximum de hashtags à retourner
+            baseline_hours: Heures d'historique pour la ligne de base
+            alpha: Facteur de lissage EWMA
+            min_count: Volume minimum sur l'heure de référence
+            at: Heure de référence (optionnelle)
         
         Returns:
-            List[Dict]: Volume de tweets groupé par heure
+            Dict: `bucket` (heure de référence) et `trending`
+        """
+        try:
+            result = TrendService.get_trending(
+                db, limit=limit, baseline_hours=baseline_hours,
+                alpha=alpha, min_count=min_count, at=at
+            )
+            logger.info(f"Found {len(result['trending'])} trending hashtags")
+            return result
+
+        except Exception as e:
+            logger.error(f"Failed to compute trending hashtags: {e}")
+            return {"bucket": None, "trending": []}
+
+    @staticmethod
+    def get_volume_by_hour(
+        db: Session,
+        bucket: str = "hour",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        source: str = "db"
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyse le volume de tweets par tranche de temps, agrégé côté SQL
+        à partir des rollups (ou de `tweets` si les bornes ne sont pas alignées).
+
+        Args:
+            db: Session de base de données
+            bucket: Largeur des tranches (`minute`, `5min`, `hour`, `day`)
+            start: Borne basse incluse sur `created_at` (optionnelle)
+            end: Borne haute exclue sur `created_at` (optionnelle)
+            source: `db` (défaut) ou `archive` (fichiers Parquet archivés)
+
+        Returns:
+            List[Dict]: Volume de tweets groupé par tranche, trié chronologiquement
+
+        Raises:
+            ConfigurationError: Si `source="archive"` et que `pyarrow` n'est pas
+                installé
         """
+        if bucket not in VOLUME_BUCKETS:
+            raise ValueError(
+                f"Unsupported bucket '{bucket}', expected one of {list(VOLUME_BUCKETS)}"
+            )
+        if source == "archive":
+            return AnalyticsService._archived_volume(bucket, start, end)
+
         try:
-            # Récupération des dates de création
-            tweet_dates = db.query(models.Tweet.created_at).filter(
-                models.Tweet.created_at.isnot(None)
-            ).all()
-            
-            if not tweet_dates:
-                return []
-            
-            hour_counter = Counter()
-            
-            for (created_at,) in tweet_dates:
-                if created_at:
-                    try:
-                        # Extraction de l'heure (format YYYY-MM-DD HH:00:00)
-                        if isinstance(created_at, str):
-                            # Si stocké comme string, prendre les 13 premiers caractères
-                            hour_key = created_at[:13] if len(created_at) >= 13 else "unknown"
-                        elif isinstance(created_at, datetime):
-                            # Si datetime, formater proprement
-                            hour_key = created_at.strftime("%Y-%m-%dT%H")
-                        else:
-                            hour_key = "unknown"
-                            
-                        hour_counter[hour_key] += 1
-                        
-                    except Exception as e:
-                        logger.debug(f"Failed to parse date {created_at}: {e}")
-                        hour_counter["unknown"] += 1
-            
-            # Tri par heure
-            sorted_hours = sorted(hour_counter.items())
-            
+            start = to_utc_naive(start) if start is not None else None
+            end = to_utc_naive(end) if end is not None else None
+
+            rollup, granularity = ROLLUP_SOURCES[bucket]
+            use_rollup = all(
+                bound is None or RollupService.truncate(bound, granularity) == bound
+                for bound in (start, end)
+            )
+
+            if use_rollup:
+                # Lecture des rollups maintenus à l'ingestion : quelques centaines de
+                # lignes
+                column: InstrumentedAttribute[Any] = rollup.bucket_start
+                measure: ColumnElement[Any] = func.sum(rollup.count)
+                filters: List[ColumnElement[bool]] = []
+            else:
+                # Bornes non alignées sur le rollup : agrégation exacte sur tweets
+                column = models.Tweet.created_at
+                measure = func.count()
+                filters = [column.isnot(None)]
+
+            # Filtres sur la date → index ix_tweet_created ou clé primaire du rollup
+            if start is not None:
+                filters.append(column >= start)
+            if end is not None:
+                filters.append(column < end)
+
+            key = AnalyticsService._bucket_expression(db, column, bucket)
+            if key is None:
+                # Dialecte sans fonction de troncature connue : agrégation Python
+                tweet_filters: List[ColumnElement[bool]] = [
+                    models.Tweet.created_at.isnot(None)
+                ]
+                if start is not None:
+                    tweet_filters.append(models.Tweet.created_at >= start)
+                if end is not None:
+                    tweet_filters.append(models.Tweet.created_at < end)
+                return AnalyticsService._volume_in_python(db, tweet_filters, bucket)
+
+            key = key.label("bucket")
+            buckets = db.query(key, measure)\
+                        .filter(*filters)\
+                        .group_by(key)\
+                        .order_by(key)\
+                        .all()
+
             result = [
-                {"hour_or_key": hour, "count": count}
-                for hour, count in sorted_hours
+                {"hour_or_key": bucket_key, "count": int(count)}
+                for bucket_key, count in buckets
             ]
-            
+
             logger.info(f"Analyzed volume for {len(result)} time periods")
             return result
-            
+
         except Exception as e:
             logger.error(f"Failed to analyze volume by hour: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    def get_sentiment(
+        db: Session,
+        bucket: str = "hour",
+        limit: int = 20,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Sentiment moyen par hashtag et par tranche de temps, agrégé en SQL
+        à partir des scores persistés dans `tweet_sentiments`.
+
+        Args:
+            db: Session de base de données
+            bucket: Largeur des tranches (`minute`, `5min`, `hour`, `day`)
+            limit: Nombre maximum de hashtags retournés
+            start: Borne basse incluse sur `created_at` (optionnelle)
+            end: Borne haute exclue sur `created_at` (optionnelle)
+
+        Returns:
+            Dict: `by_hashtag` et `by_bucket` (`avg_sentiment` et `count` par entrée)
+        """
+        if bucket not in VOLUME_BUCKETS:
+            raise ValueError(
+                f"Unsupported bucket '{bucket}', expected one of {list(VOLUME_BUCKETS)}"
+            )
+
+        try:
+            sentiment = models.TweetSentiment
+            filters = []
+            if start is not None:
+                filters.append(models.Tweet.created_at >= to_utc_naive(start))
+            if end is not None:
+                filters.append(models.Tweet.created_at < to_utc_naive(end))
+
+            tweet_count = func.count().label("count")
+            hashtag_query = db.query(
+                models.TweetHashtag.hashtag, func.avg(sentiment.compound), tweet_count
+            ).join(sentiment, sentiment.tweet_id == models.TweetHashtag.tweet_id)
+            if filters:
+                # Jointure sur tweets uniquement quand une plage de temps est demandée
+                hashtag_query = hashtag_query.join(
+                    models.Tweet, models.Tweet.id == models.TweetHashtag.tweet_id
+                ).filter(*filters)
+            by_hashtag = (
+                hashtag_query.group_by(models.TweetHashtag.hashtag)
+                .order_by(tweet_count.desc(), models.TweetHashtag.hashtag)
+                .limit(limit)
+                .all()
+            )
+
+            by_bucket = []
+            key = AnalyticsService._bucket_expression(
+                db, models.Tweet.created_at, bucket
+            )
+            if key is not None:
+                key = key.label("bucket")
+                by_bucket = db.query(key, func.avg(sentiment.compound), func.count())\
+                              .join(sentiment, sentiment.tweet_id == models.Tweet.id)\
+                              .filter(models.Tweet.created_at.isnot(None), *filters)\
+                              .group_by(key)\
+                              .order_by(key)\
+                              .all()
+
+            result = {
+                "by_hashtag": [
+                    {
+                        "hashtag": hashtag,
+                        "avg_sentiment": round(avg, 4),
+                        "count": int(count),
+                    }
+                    for hashtag, avg, count in by_hashtag
+                ],
+                "by_bucket": [
+                    {
+                        "hour_or_key": bucket_key,
+                        "avg_sentiment": round(avg, 4),
+                        "count": int(count),
+                    }
+                    for bucket_key, avg, count in by_bucket
+                ],
+            }
+
+            logger.info(
+                f"Analyzed sentiment for {len(result['by_hashtag'])} hashtags "
+                f"and {len(result['by_bucket'])} time periods"
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"Failed to analyze sentiment: {e}")
+            return {"by_hashtag": [], "by_bucket": []}
+
+    @staticmethod
+    def _bucket_expression(db: Session, column, bucket: str):
+        """
+        Construit l'expression SQL qui tronque `column` à la tranche demandée
+        et la formate en clé ISO (`YYYY-MM-DDTHH`, `YYYY-MM-DDTHH:MM`, ...).
+
+        Returns:
+            Expression SQL, ou None si le dialecte n'est pas supporté
+        """
+        width, python_format, pg_format = VOLUME_BUCKETS[bucket]
+        dialect_name = db.get_bind().dialect.name
+
+        if dialect_name == "sqlite":
+            if bucket == "5min":
+                epoch = cast(func.strftime("%s", column), Integer)
+                return func.strftime(
+                    python_format, (epoch // width) * width, "unixepoch"
+                )
+            return func.strftime(python_format, column)
+
+        if dialect_name == "postgresql":
+            # Constantes rendues en littéraux : l'expression du SELECT et du GROUP BY
+            # reste textuellement identique, même avec un binding côté serveur
+            pg_format_literal: ColumnElement[Any] = literal_column(f"'{pg_format}'")
+            if bucket == "5min":
+                floored = func.floor(
+                    func.extract("epoch", column) / literal_column(str(width))
+                )
+                truncated = func.timezone(
+                    literal_column("'UTC'"),
+                    func.to_timestamp(floored * literal_column(str(width)))
+                )
+                return func.to_char(truncated, pg_format_literal)
+            return func.to_char(
+                func.date_trunc(literal_column(f"'{bucket}'"), column),
+                pg_format_literal,
+            )
+
+        return None
+
+    @staticmethod
+    def _volume_in_python(
+        db: Session, filters: list, bucket: str
+    ) -> List[Dict[str, Any]]:
+        """Agrégation de repli, pour les dialectes sans troncature SQL supportée."""
+        width, python_format, _ = VOLUME_BUCKETS[bucket]
+        tweet_dates = db.query(models.Tweet.created_at).filter(*filters).all()
+
+        bucket_counter: Counter[str] = Counter()
+        for (created_at,) in tweet_dates:
+            if isinstance(created_at, datetime):
+                epoch = int(created_at.replace(tzinfo=timezone.utc).timestamp())
+                truncated = datetime.fromtimestamp(
+                    epoch - epoch % width, tz=timezone.utc
+                )
+                bucket_counter[truncated.strftime(python_format)] += 1
+
+        return [
+            {"hour_or_key": bucket_key, "count": count}
+            for bucket_key, count in sorted(bucket_counter.items())
+        ]
+
+    @staticmethod
+    def _archived_volume(
+        bucket: str,
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> List[Dict[str, Any]]:
+        """Volume par tranche calculé sur l'archive Parquet (vectorisé avec
+        `pyarrow.compute`)."""
+        # `read` lève ConfigurationError si pyarrow n'est pas installé
+        archived = ArchiveService.read(["created_at"], start, end)
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        width, python_format, _ = VOLUME_BUCKETS[bucket]
+        created = pc.drop_null(archived["created_at"])
+
+        # Troncature sur l'epoch en microsecondes, puis comptage par tranche
+        step = width * 1_000_000
+        micros = pc.cast(created, pa.int64())
+        buckets = pc.value_counts(pc.multiply(pc.divide(micros, step), step))
+
+        result = [
+            {
+                "hour_or_key": datetime.fromtimestamp(
+                    item["values"].as_py() / 1_000_000, tz=timezone.utc
+                ).strftime(python_format),
+                "count": item["counts"].as_py(),
+            }
+            for item in buckets
+        ]
+        result.sort(key=lambda entry: entry["hour_or_key"])
+
+        logger.info(f"Analyzed archived volume for {len(result)} time periods")
+        return result
@@ -0,0 +1,343 @@
+# app/services/archive_service.py
+"""Columnar Parquet archive of collected tweets.
+
+* **Rôle global** : archiver la table `tweets` en **fichiers Parquet partitionnés par
+  jour**, pour l'analyse hors ligne.
+  👉 La base "chaude" peut rester petite : l'historique est relu depuis l'archive.
+
+* **Dépendance optionnelle** : `pyarrow` (importé à la demande ; absent →
+  `ConfigurationError`).
+
+* **Organisation des fichiers** (partitionnement Hive) :
+
+  ```
+  {archive_dir}/tweets/date=2025-01-01/part-000000000001.parquet
+  ```
+
+  * Partition = jour UTC de `created_at` (ou de `collected_at` si la date du tweet est
+    inconnue).
+  * Un fichier par partition et par exécution, nommé d'après le premier `id` de
+    l'exécution → relancer une exécution interrompue réécrit les mêmes fichiers (pas de
+    doublon).
+
+* **Fonctionnalités** :
+
+  1. **`archive(db, root, include_raw, chunk_size)`**
+
+     * **Incrémental** : n'exporte que les tweets d'`id` supérieur au filigrane
+       (`archive_watermarks`).
+     * Lecture en flux (`yield_per`), écriture paquet par paquet (`ParquetWriter`) →
+       mémoire constante.
+     * Fichiers écrits sous un nom temporaire (préfixe `.`, ignoré à la lecture) puis
+       renommés ; le filigrane n'avance qu'une fois tous les fichiers en place.
+     * `include_raw` → ajoute la colonne `raw_json` (décompressée depuis
+       `tweet_payloads`).
+     * Incrémente la version des données (`AnalyticsCache.bump`) dans la même
+       transaction que le filigrane : le serveur API (autre processus que la CLI)
+       invalide son cache et ses ETags `source=archive` à la requête suivante.
+     * Exposé en ligne de commande : `python -m app.cli archive-tweets`.
+
+  2. **`read(columns, start, end, root)`**
+
+     * Relit l'archive sous forme de `pyarrow.Table`, en n'ouvrant que les partitions de
+       la plage (`start` inclus, `end` exclu).
+
+  3. **`prune(db, before)`**
+
+     * Supprime de la base les tweets **déjà archivés** antérieurs à `before` (et leurs
+       lignes `tweet_hashtags` / `tweet_sentiments` / `tweet_payloads`).
+     * Les compteurs agrégés (`hashtag_counts`, rollups) sont conservés ; en revanche
+       `backfill-hashtags` / `rebuild-rollups` ne verront plus les tweets supprimés.
+     * Incrémente aussi la version des données si des tweets ont été supprimés.
+
+* **Limite** : le filigrane suppose des `id` commités dans l'ordre (vrai sous SQLite) ;
+  sous PostgreSQL, lancer l'archivage hors des pics d'ingestion.
+
+👉 En résumé : un export colonne incrémental, relisible par `AnalyticsService` pour les
+  plages historiques (`source=archive`).
+
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from ..exceptions import ConfigurationError, DatabaseError
+from ..utils.dates import to_utc_naive
+from .cache_service import AnalyticsCache
+from .payload_service import PayloadService
+
+logger = logging.getLogger(__name__)
+
+# Colonnes archivées (hors `raw_json`, optionnelle)
+ARCHIVE_COLUMNS = ("id", "tweet_id", "author_id", "text", "created_at", "collected_at")
+WATERMARK_NAME = "tweets"
+
+
+class ArchiveService:
+    """Service d'archivage Parquet incrémental de la table `tweets`."""
+
+    @staticmethod
+    def _pyarrow():
+        """Importe `pyarrow` à la demande (dépendance optionnelle)."""
+        try:
+            import pyarrow as pa
+            import pyarrow.dataset as ds
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ConfigurationError(
+                "Parquet archive requires the optional 'pyarrow' package "
+                "(pip install pyarrow)"
+            ) from e
+        return pa, ds, pq
+
+    @staticmethod
+    def _dataset_dir(root: Optional[str]) -> str:
+        """Répertoire du jeu de données `tweets` dans l'archive."""
+        return os.path.join(root or settings.archive_dir, "tweets")
+
+    @staticmethod
+    def _temporary_path(path: str) -> str:
+        """Nom d'écriture temporaire (préfixe `.` : ignoré par la lecture de
+        l'archive)."""
+        return os.path.join(os.path.dirname(path), "." + os.path.basename(path))
+
+    @staticmethod
+    def _schema(pa, include_raw: bool):
+        """Schéma Arrow des fichiers archivés."""
+        fields = [
+            ("id", pa.int64()),
+            ("tweet_id", pa.string()),
+            ("author_id", pa.string()),
+            ("text", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            ("collected_at", pa.timestamp("us")),
+        ]
+        if include_raw:
+            fields.append(("raw_json", pa.string()))
+        return pa.schema(fields)
+
+    @staticmethod
+    def get_watermark(db: Session) -> models.ArchiveWatermark:
+        """Récupère (ou crée) le filigrane d'archivage de `tweets`."""
+        watermark = db.get(models.ArchiveWatermark, WATERMARK_NAME)
+        if watermark is None:
+            watermark = models.ArchiveWatermark(
+                name=WATERMARK_NAME, last_id=0, rows_archived=0
+            )
+            db.add(watermark)
+            db.flush()
+        return watermark
+
+    @staticmethod
+    def archive(
+        db: Session,
+        root: Optional[str] = None,
+        include_raw: bool = False,
+        chunk_size: int = 5000
+    ) -> Dict[str, Any]:
+        """
+        Archive en Parquet les tweets insérés depuis la dernière exécution.
+
+        Args:
+            db: Session de base de données
+            root: Répertoire de l'archive (défaut : `settings.archive_dir`)
+            include_raw: Ajoute la colonne `raw_json`
+            chunk_size: Nombre de tweets lus et écrits par paquet
+
+        Returns:
+            Dict: `rows` archivés, `partitions` écrites, nouveau filigrane `last_id`
+
+        Raises:
+            ConfigurationError: Si `pyarrow` n'est pas installé
+            DatabaseError: Si la lecture ou l'écriture échoue
+        """
+        pa, _, pq = ArchiveService._pyarrow()
+        schema = ArchiveService._schema(pa, include_raw)
+        columns = list(schema.names)
+        dataset_dir = ArchiveService._dataset_dir(root)
+
+        writers: Dict[str, Any] = {}
+        paths: Dict[str, str] = {}
+        rows_archived = 0
+
+        try:
+            watermark = ArchiveService.get_watermark(db)
+            first_id = watermark.last_id + 1
+            last_id = watermark.last_id
+
+            stmt = PayloadService.select_tweets(columns)\
+                .where(models.Tweet.id > watermark.last_id)\
+                .order_by(models.Tweet.id)\
+                .execution_options(yield_per=chunk_size)
+
+            for rows in db.execute(stmt).partitions():
+                by_day: Dict[str, List[Dict[str, Any]]] = {}
+                for row in rows:
+                    record = dict(zip(columns, PayloadService.decode_row(columns, row)))
+                    moment = record["created_at"] or record["collected_at"]
+                    by_day.setdefault(moment.strftime("%Y-%m-%d"), []).append(record)
+
+                for day, day_rows in by_day.items():
+                    writer = writers.get(day)
+                    if writer is None:
+                        partition_dir = os.path.join(dataset_dir, f"date={day}")
+                        os.makedirs(partition_dir, exist_ok=True)
+                        paths[day] = os.path.join(
+                            partition_dir, f"part-{first_id:012d}.parquet"
+                        )
+                        writer = writers[day] = pq.ParquetWriter(
+                            ArchiveService._temporary_path(paths[day]), schema
+                        )
+                    writer.write_table(pa.Table.from_pylist(day_rows, schema=schema))
+
+                rows_archived += len(rows)
+                last_id = rows[-1].id
+
+            for day, writer in writers.items():
+                writer.close()
+                os.replace(ArchiveService._temporary_path(paths[day]), paths[day])
+            writers = {}
+
+            if rows_archived:
+                watermark.last_id = last_id
+                watermark.rows_archived += rows_archived
+                AnalyticsCache.bump(db)
+            db.commit()
+            if rows_archived:
+                AnalyticsCache.invalidate()
+
+        except Exception as e:
+            db.rollback()
+            for day, writer in writers.items():
+                writer.close()
+                os.remove(ArchiveService._temporary_path(paths[day]))
+            logger.error(f"Tweet archive failed: {e}")
+            raise DatabaseError(f"Tweet archive failed: {str(e)}")
+
+        logger.info(
+            f"Archived {rows_archived} tweets into {len(paths)} daily partitions"
+        )
+        return {"rows": rows_archived, "partitions": sorted(paths), "last_id": last_id}
+
+    @staticmethod
+    def read(
+        columns: Sequence[str] = ARCHIVE_COLUMNS,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        root: Optional[str] = None
+    ):
+        """
+        Relit les tweets archivés d'une plage de temps.
+
+        Args:
+            columns: Colonnes à lire
+            start: Borne basse incluse sur `created_at` (optionnelle)
+            end: Borne haute exclue sur `created_at` (optionnelle)
+            root: Répertoire de l'archive (défaut : `settings.archive_dir`)
+
+        Returns:
+            pyarrow.Table: Tweets archivés (table vide si rien n'est archivé)
+
+        Raises:
+            ConfigurationError: Si `pyarrow` n'est pas installé
+        """
+        pa, ds, _ = ArchiveService._pyarrow()
+        dataset_dir = ArchiveService._dataset_dir(root)
+        schema = ArchiveService._schema(pa, include_raw=True)
+        if not os.path.isdir(dataset_dir):
+            return schema.empty_table().select(list(columns))
+
+        # Schéma explicite : les fichiers archivés sans `raw_json` sont lus avec des
+        # valeurs nulles
+        dataset = ds.dataset(
+            dataset_dir,
+            format="parquet",
+            schema=schema.append(pa.field("date", pa.string())),
+            partitioning=ds.partitioning(
+                pa.schema([("date", pa.string())]), flavor="hive"
+            ),
+        )
+
+        # Élagage des partitions par jour, puis filtre exact sur created_at
+        conditions = []
+        if start is not None:
+            start = to_utc_naive(start)
+            conditions.append(ds.field("date") >= start.strftime("%Y-%m-%d"))
+            conditions.append(
+                ds.field("created_at") >= pa.scalar(start, pa.timestamp("us"))
+            )
+        if end is not None:
+            end = to_utc_naive(end)
+            last_day = (end - timedelta(microseconds=1)).strftime("%Y-%m-%d")
+            conditions.append(ds.field("date") <= last_day)
+            conditions.append(
+                ds.field("created_at") < pa.scalar(end, pa.timestamp("us"))
+            )
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        return dataset.to_table(columns=list(columns), filter=expression)
+
+    @staticmethod
+    def prune(db: Session, before: datetime) -> int:
+        """
+        Supprime de la base les tweets archivés dont la date est antérieure à `before`.
+
+        Args:
+            db: Session de base de données
+            before: Date limite (exclue) sur `created_at`
+
+        Returns:
+            int: Nombre de tweets supprimés
+
+        Raises:
+            DatabaseError: Si la suppression échoue
+        """
+        try:
+            watermark = ArchiveService.get_watermark(db)
+            archived = select(models.Tweet.id).where(
+                models.Tweet.id <= watermark.last_id,
+                models.Tweet.created_at < to_utc_naive(before)
+            )
+
+            db.execute(
+                delete(models.TweetHashtag).where(
+                    models.TweetHashtag.tweet_id.in_(archived)
+                )
+            )
+            db.execute(
+                delete(models.TweetSentiment).where(
+                    models.TweetSentiment.tweet_id.in_(archived)
+                )
+            )
+            db.execute(
+                delete(models.TweetPayload).where(
+                    models.TweetPayload.tweet_id.in_(archived)
+                )
+            )
+            deleted = db.execute(
+                delete(models.Tweet).where(models.Tweet.id.in_(archived))
+            ).rowcount
+            if deleted:
+                AnalyticsCache.bump(db)
+            db.commit()
+            if deleted:
+                AnalyticsCache.invalidate()
+
+            logger.info(
+                f"Pruned {deleted} archived tweets older than {before.isoformat()}"
+            )
+            return deleted
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Archive prune failed: {e}")
+            raise DatabaseError(f"Archive prune failed: {str(e)}")
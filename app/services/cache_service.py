@@ -0,0 +1,202 @@
+# app/services/cache_service.py
+"""Versioned response cache for analytics endpoints.
+
+* **Rôle global** : éviter de recalculer les analytics à chaque rafraîchissement du
+  dashboard (`app/index.html`).
+  👉 Un résultat n'est recalculé que si de **nouveaux tweets** ont été commités depuis.
+
+* **Fonctionnement** :
+
+  * Une **version** globale, incrémentée par `invalidate()` quand `TweetService` commite
+    des tweets nouveaux.
+  * Une **version persistée** (`data_versions`), incrémentée par `bump(db)` dans la
+    transaction de chaque écriture qui change les analytics (ingestion, archivage /
+    élagage, backfills). `sync(db)` la relit (une lecture par clé primaire) avant chaque
+    réponse : si un autre processus l'a changée → `invalidate()`.
+  * Clé de cache = endpoint + paramètres (sérialisés en JSON trié).
+  * Chaque entrée mémorise la version à laquelle elle a été calculée ; `invalidate()`
+    vide aussi le cache.
+  * Taille bornée (`analytics_cache_size`) avec éviction LRU (`OrderedDict`).
+
+* **ETag** :
+
+  * `etag(endpoint, params)` = hash de la clé + version (+ identifiant du processus pour
+    invalider après redémarrage).
+  * Calculable sans recalcul : après `sync(db)`, un `If-None-Match` identique donne un
+    `304` immédiat.
+
+* **Métriques** (`/metrics`) : hits / misses par endpoint, temps de calcul des misses,
+  taille du cache.
+
+* **Limites** :
+
+  * Cache et ETags restent **propres à chaque processus** (identifiant de processus dans
+    l'ETag) ; seule la version persistée est partagée.
+
+👉 En résumé : un cache invalidé par l'ingestion, plus un ETag gratuit pour les clients
+  qui repollent.
+
+"""
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import select
+
+from .. import models
+from ..config import settings
+from ..database import increment_counters
+from .metrics import GaugeSample, analytics_cache_requests, analytics_compute, registry
+
+logger = logging.getLogger(__name__)
+
+# Ligne de `data_versions` suivie par le cache
+DATA_VERSION_NAME = "analytics"
+
+
+class AnalyticsCache:
+    """Cache versionné des résultats d'analytics, invalidé à l'ingestion."""
+
+    _lock = threading.Lock()
+    _version = 0
+    _instance_id = uuid.uuid4().hex[:8]
+    _entries: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+    # Dernière version persistée vue par ce processus
+    _data_version: Optional[int] = None
+
+    @staticmethod
+    def _key(endpoint: str, params: Dict[str, Any]) -> str:
+        """Clé stable pour un endpoint et ses paramètres."""
+        return f"{endpoint}:{json.dumps(params, sort_keys=True, default=str)}"
+
+    @staticmethod
+    def etag(endpoint: str, params: Dict[str, Any]) -> str:
+        """
+        ETag du résultat courant d'un endpoint, sans le calculer.
+
+        Args:
+            endpoint: Nom de l'endpoint
+            params: Paramètres de la requête
+
+        Returns:
+            str: ETag fort (entre guillemets)
+        """
+        key = AnalyticsCache._key(endpoint, params)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return f'"{AnalyticsCache._instance_id}-{AnalyticsCache._version}-{digest}"'
+
+    @staticmethod
+    def get_or_compute(
+        endpoint: str, params: Dict[str, Any], compute: Callable[[], Any]
+    ) -> Any:
+        """
+        Retourne le résultat en cache, ou le calcule et le mémorise.
+
+        Args:
+            endpoint: Nom de l'endpoint
+            params: Paramètres de la requête
+            compute: Fonction de calcul (appelée sans argument)
+
+        Returns:
+            Any: Résultat de l'endpoint
+        """
+        key = AnalyticsCache._key(endpoint, params)
+        with AnalyticsCache._lock:
+            version = AnalyticsCache._version
+            entry = AnalyticsCache._entries.get(key)
+            if entry is not None and entry[0] == version:
+                AnalyticsCache._entries.move_to_end(key)
+                analytics_cache_requests.inc(endpoint, "hit")
+                return entry[1]
+
+        analytics_cache_requests.inc(endpoint, "miss")
+        started = time.perf_counter()
+        result = compute()
+        analytics_compute.observe(time.perf_counter() - started, endpoint)
+
+        with AnalyticsCache._lock:
+            # Pas de mise en cache si une ingestion a eu lieu pendant le calcul
+            if AnalyticsCache._version == version and settings.analytics_cache_size > 0:
+                AnalyticsCache._entries[key] = (version, result)
+                AnalyticsCache._entries.move_to_end(key)
+                while len(AnalyticsCache._entries) > settings.analytics_cache_size:
+                    AnalyticsCache._entries.popitem(last=False)
+        return result
+
+    @staticmethod
+    def invalidate() -> None:
+        """Nouvelle version des données : tous les résultats et ETags deviennent
+        obsolètes."""
+        with AnalyticsCache._lock:
+            AnalyticsCache._version += 1
+            AnalyticsCache._entries.clear()
+        logger.debug(f"Analytics cache invalidated (version {AnalyticsCache._version})")
+
+    @staticmethod
+    def bump(db) -> None:
+        """
+        Incrémente la version persistée des données, dans la transaction de l'appelant.
+
+        À appeler avant le `COMMIT` de toute écriture qui change les analytics :
+        les autres processus la verront à leur prochain `sync`.
+
+        Args:
+            db: Session (ou connexion) portant la transaction d'écriture
+        """
+        increment_counters(
+            db,
+            models.DataVersion.__table__,
+            [{"name": DATA_VERSION_NAME, "count": 1}],
+            ["name"],
+        )
+
+    @staticmethod
+    def sync(db) -> None:
+        """
+        Invalide le cache si la version persistée a changé depuis la dernière lecture.
+
+        Args:
+            db: Session de base de données
+        """
+        version = (
+            db.execute(
+                select(models.DataVersion.count).where(
+                    models.DataVersion.name == DATA_VERSION_NAME
+                )
+            ).scalar()
+            or 0
+        )
+        with AnalyticsCache._lock:
+            changed = version != AnalyticsCache._data_version
+            AnalyticsCache._data_version = version
+        if changed:
+            AnalyticsCache.invalidate()
+
+    @staticmethod
+    def metrics() -> Iterator[GaugeSample]:
+        """Jauges du cache pour `/metrics` (calculées au scrape)."""
+        yield (
+            "analytics_cache_entries",
+            "Analytics results currently cached.",
+            {},
+            len(AnalyticsCache._entries),
+        )
+        yield (
+            "analytics_cache_version",
+            "Data version (bumped on each ingestion commit).",
+            {},
+            AnalyticsCache._version,
+        )
+
+    @staticmethod
+    def reset() -> None:
+        """Vide le cache (tests, changement de base)."""
+        AnalyticsCache.invalidate()
+
+
+registry.register_collector(AnalyticsCache.metrics)
@@ -0,0 +1,95 @@
+# app/services/corpus.py
+"""Recorded X API responses (record / replay corpus).
+
+* **Rôle global** : conserver de **vraies réponses** de `/tweets/search/recent` pour les
+  rejouer hors ligne (serveur stub `app.stub_api`, benchmarks d'ingestion sans réseau).
+
+* **Format** : fichier NDJSON, une ligne par réponse :
+
+  ```
+  {"query": "python", "next_token": null, "response": {"data": [...], "meta": {...}}}
+  ```
+
+* **Enregistrement** :
+
+  * `TwitterClient` / `AsyncTwitterClient` appellent `record(params, response)` après
+    chaque réponse valide si un corpus leur est passé (`x_api_record_path` pour les
+    clients globaux).
+  * Ou en ligne de commande :
+    `python -m app.cli record-corpus --query ... --out corpus.ndjson`.
+
+* **Relecture** : `load()` indexe les réponses par `(query, next_token)` → la pagination
+  enregistrée est rejouée telle quelle.
+
+👉 En résumé : un magnétophone pour l'API Twitter/X.
+
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Clé de relecture : requête + token de page (None = première page)
+CorpusKey = Tuple[str, Optional[str]]
+
+
+class ResponseCorpus:
+    """Corpus NDJSON de réponses de l'API de recherche."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Fichier NDJSON du corpus (créé à la première réponse enregistrée)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(params: Mapping[str, Any]) -> CorpusKey:
+        """Clé de relecture d'une requête (paramètres de l'appel API)."""
+        return (str(params.get("query", "")), params.get("next_token") or None)
+
+    def record(self, params: Mapping[str, Any], response: Dict[str, Any]) -> None:
+        """
+        Ajoute une réponse au corpus.
+
+        Args:
+            params: Paramètres de la requête envoyée (`query`, `next_token`…)
+            response: JSON de la réponse
+        """
+        query, next_token = ResponseCorpus.key(params)
+        line = json.dumps(
+            {"query": query, "next_token": next_token, "response": response},
+            ensure_ascii=False
+        )
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as corpus_file:
+                corpus_file.write(line + "\n")
+        logger.debug(f"Recorded X API response for '{query}' (next_token={next_token})")
+
+    def load(self) -> Dict[CorpusKey, Dict[str, Any]]:
+        """
+        Charge le corpus indexé par `(query, next_token)`.
+
+        En cas de doublon, la réponse enregistrée en dernier l'emporte.
+
+        Returns:
+            Dict: Réponses par clé (vide si le fichier n'existe pas)
+        """
+        responses: Dict[CorpusKey, Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return responses
+        with open(self.path, encoding="utf-8") as corpus_file:
+            for line in corpus_file:
+                if line.strip():
+                    entry = json.loads(line)
+                    responses[(entry["query"], entry.get("next_token"))] = entry[
+                        "response"
+                    ]
+        return responses
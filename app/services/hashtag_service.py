@@ -0,0 +1,160 @@
+# app/services/hashtag_service.py
+"""Incremental hashtag indexing service.
+
+* **Rôle global** : extraire les hashtags **une seule fois, à l'ingestion**, et
+  maintenir les tables `tweet_hashtags` et `hashtag_counts`.
+  👉 `AnalyticsService.get_top_hashtags` n'a plus besoin de rescanner `tweets.text` : il
+    lit directement les compteurs.
+
+* **Fonctionnalités** :
+
+  1. **`extract_hashtags(text)`**
+
+     * Regex `#\\w+` insensible à la casse, normalisation en minuscules.
+     * Dédoublonne par tweet : un tweet compte une fois par hashtag.
+
+  2. **`index_hashtags(connection, tweets)`**
+
+     * Reçoit des couples `(id, hashtags)` de tweets fraîchement insérés (hashtags déjà
+       extraits).
+     * Insère les lignes `tweet_hashtags` en un seul executemany.
+     * Incrémente `hashtag_counts` via
+       `INSERT ... ON CONFLICT DO UPDATE SET count = count + excluded.count`.
+     * Travaille sur la connexion courante → **même transaction** que l'insertion des
+       tweets.
+     * Appelé par `IngestIndexer` (voir `ingest_indexer.py`), pour le chemin batch comme
+       pour l'unité de travail ORM.
+
+  3. **`backfill(db, chunk_size)`**
+
+     * Vide puis reconstruit les deux tables à partir de `tweets`, par paquets
+       (`yield_per`).
+     * Exposé en ligne de commande : `python -m app.cli backfill-hashtags`.
+
+👉 En résumé : ce service transforme le comptage des hashtags d'un scan O(corpus) par
+  requête en une mise à jour O(page) à l'ingestion.
+
+"""
+import re
+import logging
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import increment_counters
+from ..exceptions import DatabaseError
+from .cache_service import AnalyticsCache
+
+logger = logging.getLogger(__name__)
+
+
+class HashtagService:
+    """Service d'indexation incrémentale des hashtags."""
+
+    # Pattern de référence, réutilisé par AnalyticsService
+    HASHTAG_PATTERN = re.compile(r"#\w+", re.IGNORECASE)
+
+    @staticmethod
+    def extract_hashtags(text: str) -> List[str]:
+        """
+        Extrait les hashtags d'un texte, normalisés et dédoublonnés.
+
+        Args:
+            text: Contenu du tweet
+
+        Returns:
+            List[str]: Hashtags uniques en minuscules, dans l'ordre d'apparition
+        """
+        if not text:
+            return []
+        return list(dict.fromkeys(
+            tag.lower() for tag in HashtagService.HASHTAG_PATTERN.findall(text)
+        ))
+
+    @staticmethod
+    def index_hashtags(connection, tweets: Iterable[Tuple[int, List[str]]]) -> int:
+        """
+        Indexe les hashtags de tweets nouvellement insérés.
+
+        Args:
+            connection: Connexion (ou session) portant la transaction d'insertion
+            tweets: Couples `(tweets.id, hashtags extraits)`
+
+        Returns:
+            int: Nombre de lignes `tweet_hashtags` insérées
+        """
+        links = []
+        counter: Counter[str] = Counter()
+
+        for tweet_pk, hashtags in tweets:
+            for hashtag in hashtags:
+                links.append({"tweet_id": tweet_pk, "hashtag": hashtag})
+                counter[hashtag] += 1
+
+        if not links:
+            return 0
+
+        connection.execute(insert(models.TweetHashtag.__table__), links)
+        increment_counters(
+            connection,
+            models.HashtagCount.__table__,
+            [
+                {"hashtag": hashtag, "count": count}
+                for hashtag, count in counter.items()
+            ],
+            index_elements=["hashtag"],
+        )
+
+        logger.debug(
+            f"Indexed {len(links)} hashtag links ({len(counter)} distinct hashtags)"
+        )
+        return len(links)
+
+    @staticmethod
+    def backfill(db: Session, chunk_size: int = 5000) -> int:
+        """
+        Reconstruit `tweet_hashtags` et `hashtag_counts` depuis la table `tweets`.
+
+        Args:
+            db: Session de base de données
+            chunk_size: Nombre de tweets traités par paquet
+
+        Returns:
+            int: Nombre de tweets parcourus
+
+        Raises:
+            DatabaseError: Si la reconstruction échoue
+        """
+        try:
+            db.execute(delete(models.TweetHashtag))
+            db.execute(delete(models.HashtagCount))
+
+            processed = 0
+            chunk = []
+            rows = db.query(models.Tweet.id, models.Tweet.text)\
+                     .order_by(models.Tweet.id)\
+                     .yield_per(chunk_size)
+
+            for tweet_pk, text in rows:
+                chunk.append((tweet_pk, HashtagService.extract_hashtags(text)))
+                if len(chunk) >= chunk_size:
+                    HashtagService.index_hashtags(db, chunk)
+                    processed += len(chunk)
+                    chunk = []
+
+            if chunk:
+                HashtagService.index_hashtags(db, chunk)
+                processed += len(chunk)
+
+            AnalyticsCache.bump(db)
+            db.commit()
+            logger.info(f"Hashtag backfill completed for {processed} tweets")
+            return processed
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Hashtag backfill failed: {e}")
+            raise DatabaseError(f"Hashtag backfill failed: {str(e)}")
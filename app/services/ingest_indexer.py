@@ -0,0 +1,94 @@
+# app/services/ingest_indexer.py
+"""Ingest-time indexing of newly inserted tweets.
+
+* **Rôle global** : point d'entrée unique de tout ce qui doit être **dérivé d'un tweet
+  au moment de son insertion**.
+  👉 Les hashtags ne sont extraits qu'une fois, puis partagés entre les index et les
+    rollups.
+
+* **Fonctionnalités** :
+
+  1. **`IngestIndexer.index_tweets(connection, tweets)`**
+
+     * Reçoit des triplets `(id, text, created_at)` de tweets fraîchement insérés.
+     * Extrait les hashtags (`HashtagService.extract_hashtags`).
+     * Alimente `tweet_hashtags` / `hashtag_counts` (`HashtagService.index_hashtags`).
+     * Alimente les rollups minute / heure (`RollupService.update_rollups`).
+     * Alimente les résumés Space-Saving en mémoire au `COMMIT` de la session
+       (`HashtagSketchService.observe`, fenêtres en excès persistées).
+     * Score et persiste le sentiment des tweets (`SentimentService.index_sentiments`).
+     * Tout se passe sur la connexion courante → **même transaction** que l'insertion.
+
+  2. **Hook ORM `after_insert` sur `Tweet`**
+
+     * Les tweets insérés via l'unité de travail (`db.add()` + `commit()`) sont indexés
+       automatiquement.
+     * Le chemin batch (`TweetService.save_tweets_batch`) appelle `index_tweets`
+       explicitement (l'insertion en masse ne déclenche pas les événements ORM, donc pas
+       de double comptage).
+
+👉 En résumé : la colle entre l'écriture des tweets et toutes les structures maintenues à
+  l'ingestion.
+
+"""
+import logging
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from .. import models
+from .hashtag_service import HashtagService
+from .rollup_service import RollupService
+from .sentiment_service import SentimentService
+from .sketch_service import HashtagSketchService
+
+logger = logging.getLogger(__name__)
+
+
+class IngestIndexer:
+    """Orchestration des index et rollups maintenus à l'ingestion."""
+
+    @staticmethod
+    def index_tweets(
+        connection,
+        tweets: Iterable[Tuple[int, str, Optional[datetime]]],
+        session: Optional[Session] = None
+    ) -> None:
+        """
+        Indexe des tweets nouvellement insérés dans la transaction courante.
+
+        Args:
+            connection: Connexion (ou session) portant la transaction d'insertion
+            tweets: Triplets `(tweets.id, text, created_at)`
+            session: Session dont le `COMMIT` valide les résumés en mémoire (défaut :
+                `connection`)
+        """
+        tweets = list(tweets)
+        extracted = [
+            (tweet_pk, created_at, HashtagService.extract_hashtags(text))
+            for tweet_pk, text, created_at in tweets
+        ]
+        if not extracted:
+            return
+
+        HashtagService.index_hashtags(
+            connection, [(tweet_pk, hashtags) for tweet_pk, _, hashtags in extracted]
+        )
+        by_time = [(created_at, hashtags) for _, created_at, hashtags in extracted]
+        RollupService.update_rollups(connection, by_time)
+        HashtagSketchService.observe(session or connection, by_time, connection)
+        SentimentService.index_sentiments(
+            connection, [(tweet_pk, text) for tweet_pk, text, _ in tweets]
+        )
+
+
+@event.listens_for(models.Tweet, "after_insert")
+def _index_inserted_tweet(mapper, connection, target: models.Tweet) -> None:
+    """Indexe les tweets insérés via l'unité de travail ORM."""
+    IngestIndexer.index_tweets(
+        connection,
+        [(target.id, target.text, target.created_at)],
+        session=object_session(target),
+    )
@@ -0,0 +1,362 @@
+# app/services/ingest_queue.py
+"""Write-behind ingest queue.
+
+* **Rôle global** : découpler l'appel à l'API X de l'écriture en base.
+  👉 Les collectes en arrière-plan (`POST /tweets/collect` avec `background=true`)
+    rendent la main immédiatement
+  avec un identifiant de job ; la page est récupérée puis **poussée dans une file**,
+  qu'un writer unique vide.
+
+* **Fonctionnement** :
+
+  * **Fetchers** (une tâche asyncio par job) : `TweetService._fetch_new_page` (avec
+    `since_id`) puis `put` dans la file.
+  * **File bornée** (`ingest_queue_size` pages) :
+
+    * File pleine → les fetchers en cours **attendent** que le writer rattrape son
+      retard.
+    * File pleine à la soumission → le job est **refusé** (`IngestQueueFull` → `503` +
+      `Retry-After`).
+  * **Writer** (une tâche asyncio, écriture dans un thread) :
+
+    * Attend la première page, laisse `ingest_flush_interval` secondes aux suivantes
+      d'arriver, puis regroupe jusqu'à `ingest_batch_size` tweets, **toutes requêtes
+      confondues**.
+    * Un seul `save_tweets_batch` + l'avancée des `since_id` de chaque requête (une fois
+      par requête, au plus grand identifiant de ses pages) + **un seul `COMMIT`** pour
+      le lot.
+    * Lot en erreur → jobs concernés en `failed`, `since_id` inchangés (la prochaine
+      collecte reprend ces tweets).
+    * Session propre au writer (`SessionLocal`) → sa propre connexion : les requêtes
+      HTTP ne peuvent pas annuler un lot en cours.
+
+* **Suivi des jobs** (`get_job`, `GET /tweets/collect/jobs/{job_id}`) :
+
+  * `status` : `fetching` → `queued` → `done` (ou `failed`).
+  * Compteurs : `fetched`, `queued` (en attente d'écriture), `written`, `deduplicated`,
+    `failed`.
+  * Gardés en mémoire (les `ingest_job_retention` derniers) : propres au processus,
+    perdus au redémarrage.
+
+* **Arrêt** (`stop`) : les fetchers sont annulés, les pages déjà en file sont écrites
+  avant l'arrêt du writer (au plus `ingest_drain_timeout` secondes).
+
+* **Métriques** (`/metrics`) : `ingest_queue_pages`, `ingest_queue_capacity`,
+  `ingest_jobs_active`.
+
+👉 En résumé : l'API répond sans attendre la base, et la base reçoit de gros commits au
+  lieu d'un par requête.
+
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..exceptions import DatabaseError, IngestQueueFull, TwitterAPIError
+from .cache_service import AnalyticsCache
+from .job_service import JobService
+from .metrics import GaugeSample, registry
+from .tweet_service import TweetService
+
+logger = logging.getLogger(__name__)
+
+# Page en attente d'écriture : (job_id, query, tweets bruts, plus grand identifiant)
+QueuedPage = Tuple[str, str, List[Dict[str, Any]], Optional[str]]
+
+
+class IngestQueue:
+    """File d'ingestion bornée, vidée par un writer unique."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_pages: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None
+    ):
+        """
+        Initialise la file (le writer démarre avec `start()`).
+
+        Args:
+            session_factory: Fabrique de sessions du writer (défaut : `SessionLocal`)
+            max_pages: Capacité de la file en pages (défaut : `ingest_queue_size`)
+            batch_size: Tweets maximum par commit (défaut : `ingest_batch_size`)
+            flush_interval: Attente des pages suivantes avant d'écrire (défaut :
+                `ingest_flush_interval`)
+        """
+        self.session_factory = session_factory
+        self.max_pages = max_pages or settings.ingest_queue_size
+        self.batch_size = batch_size or settings.ingest_batch_size
+        self.flush_interval = (
+            settings.ingest_flush_interval if flush_interval is None else flush_interval
+        )
+        self._queue: Optional["asyncio.Queue[QueuedPage]"] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._fetchers: Set[asyncio.Task] = set()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def start(self) -> None:
+        """Crée la file et lance le writer (à appeler depuis la boucle d'événements)."""
+        if self._writer is None or self._writer.done():
+            # File liée à la boucle courante (une nouvelle boucle par cycle de vie de
+            # l'application)
+            self._queue = asyncio.Queue(maxsize=self.max_pages)
+            self._writer = asyncio.create_task(self._run_writer())
+            logger.info(f"Ingest writer started (queue of {self.max_pages} pages)")
+
+    async def stop(self) -> None:
+        """Annule les fetchers, écrit les pages déjà en file, puis arrête le writer."""
+        fetchers = list(self._fetchers)
+        for task in fetchers:
+            task.cancel()
+        await asyncio.gather(*fetchers, return_exceptions=True)
+
+        if self._writer is not None:
+            if not self._writer.done() and self._queue is not None:
+                try:
+                    await asyncio.wait_for(
+                        self._queue.join(), timeout=settings.ingest_drain_timeout
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"Ingest writer stopped with {self._queue.qsize()} "
+                        f"pages not written"
+                    )
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+            logger.info("Ingest writer stopped")
+
+    def submit_collect(self, query: str, max_results: int) -> Dict[str, Any]:
+        """
+        Crée un job de collecte en arrière-plan et rend la main immédiatement.
+
+        Args:
+            query: Requête de recherche
+            max_results: Nombre maximum de tweets à récupérer (10-100)
+
+        Returns:
+            Dict: État initial du job (`id`, `status`, compteurs)
+
+        Raises:
+            ValueError: Si `query` est vide ou `max_results` invalide
+            IngestQueueFull: Si le writer est en retard (file pleine)
+        """
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty or whitespace-only.")
+        if max_results <= 0:
+            raise ValueError("max_results must be greater than 0.")
+
+        self.start()
+        assert self._queue is not None
+        if self._queue.full():
+            raise IngestQueueFull(
+                f"Ingest queue is full ({self.max_pages} pages waiting), retry later",
+                retry_after=max(1.0, self.flush_interval * 10)
+            )
+
+        job = self._new_job(query.strip())
+        task = asyncio.create_task(self._fetch(job["id"], job["query"], max_results))
+        self._fetchers.add(task)
+        task.add_done_callback(self._fetchers.discard)
+        return dict(job)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        État d'un job de collecte.
+
+        Returns:
+            Optional[Dict]: Copie de l'état du job, ou None s'il est inconnu (ou trop
+            ancien)
+        """
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    def _new_job(self, query: str) -> Dict[str, Any]:
+        """Enregistre un nouveau job (en oubliant les plus anciens au-delà de
+        `ingest_job_retention`)."""
+        job: Dict[str, Any] = {
+            "id": uuid.uuid4().hex,
+            "query": query,
+            "status": "fetching",
+            "fetched": 0,
+            "queued": 0,
+            "written": 0,
+            "deduplicated": 0,
+            "failed": 0,
+            "error": None,
+            "created_at": JobService.utcnow(),
+            "finished_at": None,
+        }
+        self._jobs[job["id"]] = job
+        while len(self._jobs) > settings.ingest_job_retention:
+            self._jobs.popitem(last=False)
+        return job
+
+    def _finish(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        """Marque un job comme terminé."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.update(status=status, error=error, finished_at=JobService.utcnow())
+
+    async def _fetch(self, job_id: str, query: str, max_results: int) -> None:
+        """Fetcher : récupère la page puis la pousse dans la file (attend si elle est
+        pleine)."""
+        db = self.session_factory()
+        try:
+            tweets_data, newest_id = await TweetService._fetch_new_page(
+                query, max_results, db
+            )
+        except TwitterAPIError as e:
+            logger.warning(f"Background collection {job_id} ('{query}') failed: {e}")
+            self._finish(job_id, "failed", str(e))
+            return
+        except Exception as e:
+            logger.error(f"Unexpected error in background collection {job_id}: {e}")
+            self._finish(job_id, "failed", str(e))
+            return
+        finally:
+            db.close()
+
+        job = self._jobs.get(job_id, {})
+        job["fetched"] = len(tweets_data)
+        if not tweets_data:
+            self._finish(job_id, "done")
+            return
+
+        job.update(status="queued", queued=len(tweets_data))
+        # Contre-pression : attend ici tant que le writer n'a pas libéré de place
+        assert self._queue is not None
+        await self._queue.put((job_id, query, tweets_data, newest_id))
+
+    async def _run_writer(self) -> None:
+        """Writer : vide la file par lots et les écrit dans un thread."""
+        queue = self._queue
+        assert queue is not None
+        while True:
+            pages = [await queue.get()]
+            try:
+                if queue.empty() and self.flush_interval > 0:
+                    # Laisse aux autres fetchers le temps d'arriver : un commit pour
+                    # plusieurs pages
+                    await asyncio.sleep(self.flush_interval)
+                size = len(pages[0][2])
+                while size < self.batch_size and not queue.empty():
+                    page = queue.get_nowait()
+                    pages.append(page)
+                    size += len(page[2])
+
+                try:
+                    results = await asyncio.to_thread(self._write, pages)
+                except DatabaseError as e:
+                    for job_id, _, tweets_data, _ in pages:
+                        job = self._jobs.get(job_id, {})
+                        job.update(
+                            queued=0, failed=job.get("failed", 0) + len(tweets_data)
+                        )
+                        self._finish(job_id, "failed", str(e))
+                    continue
+
+                for (job_id, _, _, _), (written, deduplicated, failed) in zip(
+                    pages, results
+                ):
+                    job = self._jobs.get(job_id, {})
+                    job.update(
+                        queued=0,
+                        written=written,
+                        deduplicated=deduplicated,
+                        failed=failed,
+                    )
+                    self._finish(job_id, "done")
+            except Exception as e:
+                logger.error(f"Unexpected error in ingest writer: {e}")
+            finally:
+                for _ in pages:
+                    queue.task_done()
+
+    def _write(self, pages: List[QueuedPage]) -> List[Tuple[int, int, int]]:
+        """
+        Écrit un lot de pages en une transaction (exécuté dans un thread).
+
+        Returns:
+            List[Tuple]: `(written, deduplicated, failed)` par page, dans l'ordre du lot
+
+        Raises:
+            DatabaseError: Si l'écriture ou le commit échoue (rien n'est écrit)
+        """
+        tweets_data = [tweet for _, _, page_tweets, _ in pages for tweet in page_tweets]
+        db = self.session_factory()
+        try:
+            saved_tweets = TweetService.save_tweets_batch(tweets_data, db, commit=False)
+            # Un seul `since_id` par requête : plusieurs pages d'une même requête
+            # peuvent partager le lot
+            newest_ids: Dict[str, str] = {}
+            for _, query, _, newest_id in pages:
+                if newest_id and TweetService._is_newer(
+                    newest_id, newest_ids.get(query)
+                ):
+                    newest_ids[query] = newest_id
+            for query, newest_id in newest_ids.items():
+                TweetService._advance_since_id(query, newest_id, db)
+            db.commit()
+        except DatabaseError:
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Ingest batch of {len(pages)} pages failed: {e}")
+            raise DatabaseError(f"Ingest batch failed: {str(e)}")
+        finally:
+            db.close()
+
+        if saved_tweets:
+            AnalyticsCache.invalidate()
+        logger.info(
+            f"Ingest writer committed {len(saved_tweets)} new tweets "
+            f"from {len(pages)} pages ({len(tweets_data)} received)"
+        )
+
+        # Un tweet inséré est attribué à la première page du lot qui le contenait
+        unclaimed = {tweet.tweet_id for tweet in saved_tweets}
+        results = []
+        for _, _, page_tweets, _ in pages:
+            ids = [
+                str(tweet["id"]) for tweet in page_tweets
+                if isinstance(tweet, dict) and str(tweet.get("id") or "").strip()
+            ]
+            written = len({tweet_id for tweet_id in ids if tweet_id in unclaimed})
+            unclaimed.difference_update(ids)
+            results.append((written, len(ids) - written, len(page_tweets) - len(ids)))
+        return results
+
+    def metrics(self) -> Iterator[GaugeSample]:
+        """Jauges de la file pour `/metrics` (calculées au scrape)."""
+        yield (
+            "ingest_queue_pages",
+            "Pages waiting for the ingest writer.",
+            {},
+            self._queue.qsize() if self._queue else 0,
+        )
+        yield (
+            "ingest_queue_capacity",
+            "Ingest queue capacity (pages).",
+            {},
+            self.max_pages,
+        )
+        active = sum(1 for job in self._jobs.values() if job["finished_at"] is None)
+        yield (
+            "ingest_jobs_active",
+            "Background collections not finished yet.",
+            {},
+            active,
+        )
+
+
+# Instance globale, démarrée par le cycle de vie de l'application
+ingest_queue = IngestQueue()
+registry.register_collector(ingest_queue.metrics)
@@ -0,0 +1,213 @@
+# app/services/job_service.py
+"""Persistent collection jobs (CRUD).
+
+* **Rôle global** : gérer les **requêtes surveillées** (`collection_jobs`) exécutées par
+  le planificateur (`CollectionScheduler`).
+  👉 C'est la logique derrière les routes `/jobs`.
+
+* **Fonctionnalités** :
+
+  1. **`create_job(db, query, interval_seconds, max_results, enabled)`**
+
+     * Une seule ligne par requête (`query` unique) ; première exécution dès le prochain
+       passage du planificateur.
+
+  2. **`list_jobs(db)` / `get_job(db, job_id)`**
+
+  3. **`update_job(db, job_id, changes)`**
+
+     * Modifie `interval_seconds`, `max_results` ou `enabled`.
+     * Réactiver un job remet à zéro son backoff et le rend exécutable immédiatement.
+
+  4. **`delete_job(db, job_id)`**
+
+* **Persistance** : tout est en base (`since_id`, `next_run_at`…) → les jobs survivent
+  aux redémarrages.
+
+👉 En résumé : le registre des collectes périodiques.
+
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from ..exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Champs modifiables par `update_job`
+UPDATABLE_FIELDS = ("interval_seconds", "max_results", "enabled")
+
+
+class JobService:
+    """Service de gestion des jobs de collecte périodique."""
+
+    @staticmethod
+    def create_job(
+        db: Session,
+        query: str,
+        interval_seconds: int,
+        max_results: int = 100,
+        enabled: bool = True
+    ) -> models.CollectionJob:
+        """
+        Enregistre une nouvelle requête à collecter périodiquement.
+
+        Args:
+            db: Session de base de données
+            query: Requête de recherche
+            interval_seconds: Période entre deux exécutions (secondes)
+            max_results: Tweets par page (10-100)
+            enabled: Job actif dès sa création
+
+        Returns:
+            models.CollectionJob: Job créé
+
+        Raises:
+            ValueError: Si la requête est vide, l'intervalle trop court ou la requête
+                déjà enregistrée
+            DatabaseError: Si l'écriture échoue
+        """
+        query = (query or "").strip()
+        if not query:
+            raise ValueError("Query cannot be empty or whitespace-only.")
+        if interval_seconds < settings.scheduler_min_interval:
+            raise ValueError(
+                f"interval_seconds must be at least {settings.scheduler_min_interval}"
+            )
+
+        try:
+            if (
+                db.query(models.CollectionJob.id)
+                .filter(models.CollectionJob.query == query)
+                .first()
+            ):
+                raise ValueError(f"A collection job already exists for query '{query}'")
+
+            job = models.CollectionJob(
+                query=query,
+                interval_seconds=interval_seconds,
+                max_results=max_results,
+                enabled=enabled,
+                next_run_at=JobService.utcnow(),
+                consecutive_failures=0,
+                runs=0,
+                tweets_saved=0
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+
+        except ValueError:
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to create collection job for '{query}': {e}")
+            raise DatabaseError(f"Failed to create collection job: {str(e)}")
+
+        logger.info(
+            f"Created collection job {job.id} for '{query}' every {interval_seconds}s"
+        )
+        return job
+
+    @staticmethod
+    def list_jobs(db: Session) -> List[models.CollectionJob]:
+        """Retourne tous les jobs, par ordre de création."""
+        try:
+            return (
+                db.query(models.CollectionJob).order_by(models.CollectionJob.id).all()
+            )
+        except Exception as e:
+            logger.error(f"Failed to list collection jobs: {e}")
+            raise DatabaseError(f"Failed to list collection jobs: {str(e)}")
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Optional[models.CollectionJob]:
+        """Retourne un job, ou None s'il n'existe pas."""
+        try:
+            return db.get(models.CollectionJob, job_id)
+        except Exception as e:
+            logger.error(f"Failed to read collection job {job_id}: {e}")
+            raise DatabaseError(f"Failed to read collection job: {str(e)}")
+
+    @staticmethod
+    def update_job(
+        db: Session,
+        job_id: int,
+        changes: Dict[str, Any]
+    ) -> Optional[models.CollectionJob]:
+        """
+        Modifie un job existant.
+
+        Args:
+            db: Session de base de données
+            job_id: Identifiant du job
+            changes: Nouvelles valeurs (`interval_seconds`, `max_results`, `enabled`)
+
+        Returns:
+            Optional[models.CollectionJob]: Job modifié, ou None s'il n'existe pas
+
+        Raises:
+            ValueError: Si un champ n'est pas modifiable ou l'intervalle trop court
+            DatabaseError: Si l'écriture échoue
+        """
+        unknown = set(changes) - set(UPDATABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Fields cannot be updated: {', '.join(sorted(unknown))}")
+        interval = changes.get("interval_seconds")
+        if interval is not None and interval < settings.scheduler_min_interval:
+            raise ValueError(
+                f"interval_seconds must be at least {settings.scheduler_min_interval}"
+            )
+
+        try:
+            job = db.get(models.CollectionJob, job_id)
+            if job is None:
+                return None
+
+            if changes.get("enabled") and not job.enabled:
+                # Réactivation : on repart sans backoff, dès le prochain passage
+                job.consecutive_failures = 0
+                job.next_run_at = JobService.utcnow()
+            for field, value in changes.items():
+                if value is not None:
+                    setattr(job, field, value)
+            db.commit()
+            db.refresh(job)
+            return job
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to update collection job {job_id}: {e}")
+            raise DatabaseError(f"Failed to update collection job: {str(e)}")
+
+    @staticmethod
+    def delete_job(db: Session, job_id: int) -> bool:
+        """
+        Supprime un job.
+
+        Returns:
+            bool: True si le job existait
+        """
+        try:
+            job = db.get(models.CollectionJob, job_id)
+            if job is None:
+                return False
+            db.delete(job)
+            db.commit()
+            logger.info(f"Deleted collection job {job_id}")
+            return True
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to delete collection job {job_id}: {e}")
+            raise DatabaseError(f"Failed to delete collection job: {str(e)}")
+
+    @staticmethod
+    def utcnow() -> datetime:
+        """Heure courante en UTC naïf, comme les dates stockées."""
+        return datetime.now(timezone.utc).replace(tzinfo=None)
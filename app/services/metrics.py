@@ -0,0 +1,398 @@
+# app/services/metrics.py
+"""In-process metrics exposed in the Prometheus text format.
+
+* **Rôle global** : mesurer les chemins critiques (requêtes HTTP, base, ingestion, API
+  X, analytics) et les exposer sur `GET /metrics`, lisible par Prometheus (format texte
+  `0.0.4`).
+  👉 Aucune dépendance : compteurs et histogrammes minimalistes, propres au processus.
+
+* **Types** :
+
+  * `Counter` → valeur croissante (nom en `_total`).
+  * `Histogram` → répartition cumulée par seuils (`_bucket`, `_sum`, `_count`).
+  * Jauges calculées **à la lecture** (`MetricsRegistry.register_collector`) : budget de
+    quota, cache, planificateur.
+    👉 Rien n'est fait sur le chemin des requêtes pour ces valeurs.
+
+* **Coût sur le chemin critique** : une mise à jour = un verrou non contendu + une
+  addition (+ une recherche dichotomique dans les seuils pour un histogramme). Le rendu
+  texte n'a lieu qu'au scrape.
+
+* **Métriques exposées** :
+
+  * `http_request_duration_seconds{method, route, status}` → middleware ASGI
+    `MetricsMiddleware` (gabarit de route, pas l'URL brute → cardinalité bornée ;
+    `unmatched` pour les 404).
+  * `db_queries_total{operation}` / `db_query_duration_seconds{operation}` → événements
+    du moteur (`instrument_engine`).
+  * `tweets_ingested_total`, `tweets_deduplicated_total`, `tweets_failed_total{reason}`
+    → `TweetService`.
+  * `x_api_request_duration_seconds{client}` / `x_api_responses_total{client, status}` →
+    `TwitterClient`, `AsyncTwitterClient`.
+  * `x_api_rate_limit_*` → instantané du `rate_limit_governor`.
+  * `analytics_compute_seconds{endpoint}` /
+    `analytics_cache_requests_total{endpoint, result}` → `AnalyticsCache`.
+  * `scheduler_running_jobs`, `collection_job_runs_total{status}` →
+    `collection_scheduler`.
+  * `ingest_queue_pages`, `ingest_queue_capacity`, `ingest_jobs_active` →
+    `ingest_queue`.
+
+👉 En résumé : de la visibilité chiffrée au-delà des logs, pour un coût négligeable par
+  requête.
+
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+# Seuils de latence (secondes) : de la milliseconde (cache, SQLite) à la dizaine de
+# secondes (API X)
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Une ligne de jauge calculée : (nom, aide, labels, valeur)
+GaugeSample = Tuple[str, str, Dict[str, str], Optional[float]]
+
+LabelValues = Tuple[str, ...]
+
+
+class Counter:
+    """Compteur croissant, par combinaison de labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """Ajoute `amount` à la série des labels donnés (dans l'ordre de
+        `labelnames`)."""
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """Valeur courante d'une série (0 si jamais incrémentée)."""
+        with self._lock:
+            return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        """Lignes `(suffixe, labels, valeur)` à exposer."""
+        with self._lock:
+            return [("", labels, value) for labels, value in self._values.items()]
+
+
+class Histogram:
+    """Histogramme cumulatif à seuils fixes, par combinaison de labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Par série : effectifs par seuil (+ dépassement), somme, nombre
+        self._series: Dict[LabelValues, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Enregistre une observation (secondes pour une latence)."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                    0,
+                ]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        """Nombre d'observations d'une série."""
+        with self._lock:
+            series = self._series.get(labelvalues)
+            return series[2] if series else 0
+
+    def samples(self) -> List[Tuple[str, LabelValues, float]]:
+        """Lignes `_bucket` (cumulées, avec `le`), `_sum` et `_count` à exposer."""
+        with self._lock:
+            snapshot = [
+                (labels, list(series[0]), series[1], series[2])
+                for labels, series in self._series.items()
+            ]
+
+        lines: List[Tuple[str, LabelValues, float]] = []
+        for labels, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                lines.append(("_bucket", labels + (_format_value(bound),), cumulative))
+            lines.append(("_sum", labels, total))
+            lines.append(("_count", labels, count))
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble des métriques du processus et des jauges calculées au scrape."""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[GaugeSample]]] = []
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Crée et enregistre un compteur."""
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Crée et enregistre un histogramme."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(
+        self, collector: Callable[[], Iterable[GaugeSample]]
+    ) -> None:
+        """
+        Ajoute une source de jauges évaluée à chaque scrape.
+
+        Args:
+            collector: Fonction retournant des `(nom, aide, labels, valeur)` ; une
+                valeur None est omise
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Exporte toutes les métriques au format texte Prometheus.
+
+        Returns:
+            str: Corps de la réponse `/metrics`
+        """
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            names = metric.labelnames + (("le",) if metric.kind == "histogram" else ())
+            for suffix, labelvalues, value in metric.samples():
+                # `le` ne concerne que les lignes `_bucket`
+                labels = dict(
+                    zip(
+                        names if suffix == "_bucket" else metric.labelnames, labelvalues
+                    )
+                )
+                lines.append(
+                    f"{metric.name}{suffix}{_format_labels(labels)} "
+                    f"{_format_value(value)}"
+                )
+
+        documented = set()
+        for collector in self._collectors:
+            for name, documentation, labels, value in collector():
+                if value is None:
+                    continue
+                if name not in documented:
+                    documented.add(name)
+                    lines.append(f"# HELP {name} {documentation}")
+                    lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """`{a="x",b="y"}` avec échappement des valeurs (vide sans labels)."""
+    if not labels:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur de label (`\\`, `"`, retours à la ligne)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Nombre au format Prometheus (`+Inf`, entiers sans décimale)."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# Registre global et métriques des chemins critiques
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+db_queries = registry.counter(
+    "db_queries_total", "SQL statements executed, by operation.", ("operation",)
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time, by operation.",
+    ("operation",),
+)
+tweets_ingested = registry.counter(
+    "tweets_ingested_total", "Tweets inserted into the database."
+)
+tweets_deduplicated = registry.counter(
+    "tweets_deduplicated_total", "Tweets skipped because already stored."
+)
+tweets_failed = registry.counter(
+    "tweets_failed_total", "Tweets that could not be stored, by reason.", ("reason",)
+)
+x_api_request_duration = registry.histogram(
+    "x_api_request_duration_seconds", "X API HTTP call latency.", ("client",)
+)
+x_api_responses = registry.counter(
+    "x_api_responses_total", "X API responses by status code.", ("client", "status")
+)
+analytics_compute = registry.histogram(
+    "analytics_compute_seconds",
+    "Analytics computation time on cache miss.",
+    ("endpoint",),
+)
+analytics_cache_requests = registry.counter(
+    "analytics_cache_requests_total", "Analytics cache lookups.", ("endpoint", "result")
+)
+collection_job_runs = registry.counter(
+    "collection_job_runs_total",
+    "Scheduled collection job runs, by outcome.",
+    ("status",),
+)
+
+# Opérations SQL suivies (le reste est regroupé sous `other`)
+SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"})
+
+
+def instrument_engine(engine) -> None:
+    """
+    Compte et chronomètre les requêtes SQL d'un moteur (événements
+    `before/after_cursor_execute`).
+
+    Args:
+        engine: Moteur SQLAlchemy à instrumenter (idempotent)
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """Mémorise l'heure de début sur le contexte d'exécution."""
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """Enregistre la durée de la requête sous son opération (`SELECT`, `INSERT`...)."""
+    started = getattr(context, "_metrics_started", None)
+    if started is None:
+        return
+    operation = statement.lstrip()[:6].upper()
+    if operation not in SQL_OPERATIONS:
+        operation = "WITH" if operation.startswith("WITH") else "other"
+    db_queries.inc(operation)
+    db_query_duration.observe(time.perf_counter() - started, operation)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : latence de chaque requête HTTP par gabarit de route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = ["500"]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                _route_template(scope),
+                status[0],
+            )
+
+
+def _route_template(scope) -> str:
+    """Gabarit de la route servie (`/jobs/{job_id}`), renseigné par le routeur dans le
+    scope."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    app = scope.get("app")
+    if app is None:
+        return "unmatched"
+    # Starlette < 0.28 ne publie que l'endpoint : gabarit retrouvé une fois puis
+    # mémorisé
+    templates = getattr(app.state, "metrics_route_templates", None)
+    if templates is None:
+        templates = {
+            route.endpoint: route.path
+            for route in app.routes
+            if hasattr(route, "endpoint")
+        }
+        app.state.metrics_route_templates = templates
+    return templates.get(endpoint, "unmatched")
@@ -0,0 +1,203 @@
+# app/services/payload_service.py
+"""Compressed storage of raw API payloads.
+
+* **Rôle global** : gérer la table `tweet_payloads`, où le JSON brut de chaque tweet est
+  stocké **compressé** (`utils/payload_codec`), à part de `tweets`.
+  👉 `tweets` ne contient plus que les colonnes lues par l'API : scans et
+    `db.query(Tweet)` plus légers.
+
+* **Fonctionnalités** :
+
+  1. **`select_tweets(columns)` / `decode_row(columns, row)`**
+
+     * Lecture en flux de colonnes de `tweets` (export, archive) ; `raw_json` y est une
+       colonne virtuelle : jointure externe sur `tweet_payloads` puis décompression
+       ligne par ligne (ancienne colonne à défaut).
+
+  2. **`compress_legacy(db, chunk_size)`**
+
+     * Migration d'une base existante : compresse les `tweets.raw_json` encore en clair
+       dans `tweet_payloads` puis vide l'ancienne colonne, paquet par paquet (un commit
+       par paquet : reprise possible).
+     * Exposé en ligne de commande : `python -m app.cli compress-payloads`.
+     * SQLite ne rend la place libérée au système qu'après un `VACUUM`.
+
+  3. **`storage_stats(db)`**
+
+     * Octets du JSON brut (décompressé / compressé / encore en clair) → ratio de
+       compression.
+
+👉 En résumé : le JSON brut reste disponible, mais ne coûte plus rien tant qu'on ne le
+  lit pas.
+
+"""
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from .. import models
+from ..database import dialect_insert
+from ..exceptions import DatabaseError
+from ..utils import payload_codec
+
+logger = logging.getLogger(__name__)
+
+# Colonnes lues à la place de la colonne virtuelle `raw_json`
+RAW_JSON_SOURCES = (
+    models.TweetPayload.codec,
+    models.TweetPayload.data,
+    models.Tweet.legacy_raw_json,
+)
+
+
+class PayloadService:
+    """Service de stockage compressé du JSON brut des tweets."""
+
+    @staticmethod
+    def select_tweets(columns: Sequence[str]) -> Select:
+        """
+        `SELECT` des colonnes de `tweets` demandées, `raw_json` compris.
+
+        Args:
+            columns: Noms de colonnes de `Tweet` ; `raw_json` est remplacé par
+                `RAW_JSON_SOURCES`
+
+        Returns:
+            Select: Requête à décoder ligne par ligne avec `decode_row`
+        """
+        selected: List[Any] = []
+        for column in columns:
+            if column == "raw_json":
+                selected.extend(RAW_JSON_SOURCES)
+            else:
+                selected.append(getattr(models.Tweet, column))
+
+        stmt = select(*selected).select_from(models.Tweet)
+        if "raw_json" in columns:
+            stmt = stmt.outerjoin(
+                models.TweetPayload, models.TweetPayload.tweet_id == models.Tweet.id
+            )
+        return stmt
+
+    @staticmethod
+    def decode_row(columns: Sequence[str], row: Sequence[Any]) -> Tuple[Any, ...]:
+        """
+        Ligne de `select_tweets` ramenée aux colonnes demandées (JSON brut décompressé).
+
+        Returns:
+            Tuple: Valeurs dans l'ordre de `columns`
+        """
+        if "raw_json" not in columns:
+            return tuple(row)
+        position = list(columns).index("raw_json")
+        codec, data, legacy = row[position:position + len(RAW_JSON_SOURCES)]
+        raw_json = payload_codec.decompress(codec, data) if data is not None else legacy
+        return (*row[:position], raw_json, *row[position + len(RAW_JSON_SOURCES):])
+
+    @staticmethod
+    def compress_legacy(db: Session, chunk_size: int = 5000) -> Dict[str, int]:
+        """
+        Compresse les JSON bruts encore stockés en clair dans `tweets.raw_json`.
+
+        Args:
+            db: Session de base de données
+            chunk_size: Nombre de tweets migrés par transaction
+
+        Returns:
+            Dict: `tweets` migrés, `raw_bytes` (en clair) et `compressed_bytes`
+
+        Raises:
+            DatabaseError: Si la migration d'un paquet échoue (les paquets précédents
+                restent migrés)
+        """
+        stats = {"tweets": 0, "raw_bytes": 0, "compressed_bytes": 0}
+        last_id = 0
+        while True:
+            try:
+                rows = db.execute(
+                    select(models.Tweet.id, models.Tweet.legacy_raw_json)
+                    .where(
+                        models.Tweet.id > last_id,
+                        models.Tweet.legacy_raw_json.isnot(None),
+                    )
+                    .order_by(models.Tweet.id)
+                    .limit(chunk_size)
+                ).all()
+                if not rows:
+                    break
+
+                payloads = [
+                    {"tweet_id": tweet_pk, **models.TweetPayload.compress(raw_json)}
+                    for tweet_pk, raw_json in rows
+                ]
+                stmt = dialect_insert(db, models.TweetPayload)
+                if hasattr(stmt, "on_conflict_do_nothing"):
+                    # Un payload compressé existant fait foi
+                    stmt = stmt.on_conflict_do_nothing(index_elements=["tweet_id"])
+                db.execute(stmt, payloads)
+
+                ids = [tweet_pk for tweet_pk, _ in rows]
+                db.execute(
+                    update(models.Tweet.__table__)
+                    .where(models.Tweet.__table__.c.id.in_(ids))
+                    .values(raw_json=None)
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(
+                    f"Payload compression failed after {stats['tweets']} tweets: {e}"
+                )
+                raise DatabaseError(f"Payload compression failed: {str(e)}")
+
+            last_id = ids[-1]
+            stats["tweets"] += len(rows)
+            stats["raw_bytes"] += sum(payload["size"] for payload in payloads)
+            stats["compressed_bytes"] += sum(
+                len(payload["data"]) for payload in payloads
+            )
+            logger.info(f"Compressed raw JSON of {stats['tweets']} tweets")
+
+        return stats
+
+    @staticmethod
+    def storage_stats(db: Session) -> Dict[str, Any]:
+        """
+        Volume occupé par le JSON brut des tweets.
+
+        Returns:
+            Dict: `payloads`, `raw_bytes` (décompressé), `compressed_bytes`,
+                `legacy_bytes` (encore en clair), `ratio`
+
+        Raises:
+            DatabaseError: Si la lecture échoue
+        """
+        try:
+            payloads, raw_bytes, compressed_bytes = db.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(models.TweetPayload.size), 0),
+                    func.coalesce(func.sum(func.length(models.TweetPayload.data)), 0),
+                )
+            ).one()
+            legacy_bytes = db.scalar(
+                select(
+                    func.coalesce(
+                        func.sum(func.length(models.Tweet.legacy_raw_json)), 0
+                    )
+                )
+            )
+        except Exception as e:
+            logger.error(f"Database error reading payload storage: {e}")
+            raise DatabaseError(f"Failed to read payload storage: {str(e)}")
+
+        return {
+            "payloads": payloads,
+            "raw_bytes": int(raw_bytes),
+            "compressed_bytes": int(compressed_bytes),
+            "legacy_bytes": int(legacy_bytes or 0),
+            "ratio": round(compressed_bytes / raw_bytes, 3) if raw_bytes else None,
+        }
@@ -0,0 +1,256 @@
+# app/services/rate_limiter.py
+"""Rate-limit governor for the X API.
+
+* **Rôle global** : respecter le quota de l'API Twitter/X **avant** d'envoyer une
+  requête, au lieu de découvrir la limite par des `429` répétés.
+  👉 Partagé par tous les appelants du processus (`TwitterClient`, `AsyncTwitterClient`,
+    planificateur).
+
+* **Fonctionnement** (seau de jetons rechargé à chaque fenêtre) :
+
+  * Chaque réponse met à jour le budget via les en-têtes `x-rate-limit-limit`,
+    `x-rate-limit-remaining`, `x-rate-limit-reset`.
+  * Chaque requête consomme un jeton (`reserve()`) ; les requêtes en vol sont décomptées
+    localement (le budget retenu est le plus petit entre le local et celui annoncé par
+    l'API, dans une même fenêtre).
+  * À l'heure de `reset`, le seau est rechargé à `limit`.
+  * Budget inconnu (aucune réponse reçue) → les requêtes passent.
+
+* **Seau vide** :
+
+  * Attente jusqu'au `reset` si elle est ≤ `x_api_rate_limit_max_wait` → la requête est
+    **mise en file** (`acquire` / `acquire_async`).
+  * Sinon la requête est **rejetée** immédiatement (`RateLimitExceeded`, avec
+    `retry_after`) → `429` côté API.
+
+* **Métriques** : `snapshot()` → `limit`, `remaining`, `reset_in`, `waiting`,
+  `throttled_total`, `shed_total` (exposé par `/health`, et en jauges
+  `x_api_rate_limit_*` par `/metrics`).
+
+👉 En résumé : un garde-fou unique qui étale les appels sur la fenêtre au lieu de la
+  brûler puis de bloquer.
+
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+from ..config import settings
+from ..exceptions import RateLimitExceeded
+from .metrics import GaugeSample, registry
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitGovernor:
+    """Seau de jetons piloté par les en-têtes de quota de l'API Twitter/X."""
+
+    def __init__(
+        self,
+        max_wait: Optional[float] = None,
+        reset_margin: float = 1.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialise le gouverneur (budget inconnu jusqu'à la première réponse).
+
+        Args:
+            max_wait: Attente maximale avant rejet (défaut :
+                `x_api_rate_limit_max_wait`)
+            reset_margin: Marge ajoutée à l'heure de `reset` annoncée (décalage
+                d'horloge)
+            clock: Horloge en secondes epoch (injectable pour les tests)
+        """
+        self.max_wait = (
+            settings.x_api_rate_limit_max_wait if max_wait is None else max_wait
+        )
+        self.reset_margin = reset_margin
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.waiting = 0
+        self.throttled_total = 0
+        self.shed_total = 0
+
+    def reserve(self) -> float:
+        """
+        Consomme un jeton, ou indique combien de temps attendre.
+
+        Returns:
+            float: 0 si la requête peut partir, sinon délai (secondes) avant de
+                réessayer
+
+        Raises:
+            RateLimitExceeded: Si l'attente dépasse `max_wait` (requête rejetée)
+        """
+        with self._lock:
+            now = self._clock()
+            if self.reset_at is not None and now >= self.reset_at:
+                # Nouvelle fenêtre : seau rechargé
+                self.remaining = self.limit
+                self.reset_at = None
+
+            if self.remaining is None or self.reset_at is None:
+                # Budget inconnu : on laisse passer, la réponse fixera le budget
+                if self.remaining:
+                    self.remaining -= 1
+                return 0.0
+            if self.remaining > 0:
+                self.remaining -= 1
+                return 0.0
+
+            wait = self.reset_at - now
+            if wait > self.max_wait:
+                self.shed_total += 1
+                raise RateLimitExceeded(
+                    f"X API rate limit exhausted, retry in {wait:.0f}s",
+                    retry_after=wait,
+                )
+            self.throttled_total += 1
+            return wait
+
+    def acquire(self) -> None:
+        """Attend (en bloquant le thread) qu'un jeton soit disponible."""
+        while True:
+            delay = self.reserve()
+            if delay <= 0:
+                return
+            logger.info(
+                f"X API rate limit reached, waiting {delay:.1f}s for the window reset"
+            )
+            self._set_waiting(1)
+            try:
+                time.sleep(delay)
+            finally:
+                self._set_waiting(-1)
+
+    async def acquire_async(self) -> None:
+        """Attend (sans bloquer la boucle d'événements) qu'un jeton soit disponible."""
+        while True:
+            delay = self.reserve()
+            if delay <= 0:
+                return
+            logger.info(
+                f"X API rate limit reached, waiting {delay:.1f}s for the window reset"
+            )
+            self._set_waiting(1)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._set_waiting(-1)
+
+    def update(self, headers: Mapping[str, str], status_code: int) -> None:
+        """
+        Met à jour le budget à partir d'une réponse de l'API.
+
+        Args:
+            headers: En-têtes de la réponse (insensibles à la casse)
+            status_code: Code HTTP de la réponse
+        """
+        limit = self._header_int(headers, "x-rate-limit-limit")
+        remaining = self._header_int(headers, "x-rate-limit-remaining")
+        reset = self._header_int(headers, "x-rate-limit-reset")
+        if status_code == 429 and reset is not None:
+            remaining = 0
+
+        with self._lock:
+            if limit is not None:
+                self.limit = limit
+            if reset is not None:
+                reset_at = reset + self.reset_margin
+                new_window = self.reset_at is None or reset_at > self.reset_at
+                self.reset_at = reset_at
+            else:
+                new_window = False
+            if remaining is not None:
+                if new_window or self.remaining is None:
+                    self.remaining = remaining
+                else:
+                    # Même fenêtre : les requêtes encore en vol restent décomptées
+                    self.remaining = min(self.remaining, remaining)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        État courant du budget, pour les métriques.
+
+        Returns:
+            Dict: `limit`, `remaining`, `reset_in` (secondes), `waiting`,
+                `throttled_total`, `shed_total`
+        """
+        with self._lock:
+            reset_in = (
+                max(0.0, self.reset_at - self._clock())
+                if self.reset_at is not None
+                else None
+            )
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_in": reset_in,
+                "waiting": self.waiting,
+                "throttled_total": self.throttled_total,
+                "shed_total": self.shed_total,
+            }
+
+    def metrics(self) -> Iterator[GaugeSample]:
+        """Jauges `x_api_rate_limit_*` pour `/metrics` (calculées au scrape)."""
+        snapshot = self.snapshot()
+        yield (
+            "x_api_rate_limit_limit",
+            "X API requests allowed per window.",
+            {},
+            snapshot["limit"],
+        )
+        yield (
+            "x_api_rate_limit_remaining",
+            "X API requests left in the current window.",
+            {},
+            snapshot["remaining"],
+        )
+        yield (
+            "x_api_rate_limit_reset_seconds",
+            "Seconds until the X API window resets.",
+            {},
+            snapshot["reset_in"],
+        )
+        yield (
+            "x_api_rate_limit_waiting",
+            "Requests waiting for a rate-limit token.",
+            {},
+            snapshot["waiting"],
+        )
+        yield (
+            "x_api_rate_limit_throttled",
+            "Requests delayed until a window reset (cumulative).",
+            {},
+            snapshot["throttled_total"],
+        )
+        yield (
+            "x_api_rate_limit_shed",
+            "Requests rejected because the wait was too long (cumulative).",
+            {},
+            snapshot["shed_total"],
+        )
+
+    def _set_waiting(self, delta: int) -> None:
+        """Compte les requêtes en attente d'un jeton."""
+        with self._lock:
+            self.waiting += delta
+
+    @staticmethod
+    def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+        """Lit un en-tête entier (None s'il est absent ou invalide)."""
+        value = headers.get(name)
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+
+# Instance globale partagée par les clients Twitter du processus
+rate_limit_governor = RateLimitGovernor()
+registry.register_collector(rate_limit_governor.metrics)
@@ -0,0 +1,183 @@
+# app/services/rollup_service.py
+"""Time-bucket rollup maintenance service.
+
+* **Rôle global** : maintenir des **tables pré-agrégées par tranche de temps** à chaque
+  écriture dans `tweets`.
+  👉 Les dashboards sur des mois de données lisent quelques centaines de lignes au lieu
+    de millions de tweets.
+
+* **Tables maintenues** :
+
+  * `tweet_counts_minute` → tweets par minute.
+  * `tweet_counts_hour` → tweets par heure.
+  * `hashtag_counts_hour` → tweets par hashtag et par heure.
+
+* **Fonctionnalités** :
+
+  1. **`truncate(value, granularity)`**
+
+     * Ramène une date à la minute / à l'heure, en UTC naïf (comme les dates stockées).
+
+  2. **`update_rollups(connection, tweets)`**
+
+     * Reçoit des couples `(created_at, hashtags)` de tweets fraîchement insérés.
+     * Agrège en mémoire (`Counter`) puis applique un upsert `count = count + n` par
+       table.
+     * Travaille sur la connexion courante → **même transaction** que l'insertion batch.
+     * Les tweets sans `created_at` sont ignorés.
+
+  3. **`rebuild(db, chunk_size)`**
+
+     * Vide puis régénère les trois tables à partir de `tweets` (lecture en flux avec
+       `yield_per`).
+     * Exposé en ligne de commande : `python -m app.cli rebuild-rollups`.
+
+👉 En résumé : le pendant temporel de `HashtagService` — on paie l'agrégation une fois à
+  l'ingestion, plus jamais à la lecture.
+
+"""
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import increment_counters
+from ..exceptions import DatabaseError
+from .cache_service import AnalyticsCache
+from .hashtag_service import HashtagService
+
+logger = logging.getLogger(__name__)
+
+
+class RollupService:
+    """Service de maintenance des rollups par minute / par heure."""
+
+    @staticmethod
+    def truncate(value: datetime, granularity: str) -> datetime:
+        """
+        Tronque une date à la granularité demandée, en UTC naïf.
+
+        Args:
+            value: Date à tronquer (naïve = UTC, ou avec fuseau)
+            granularity: `minute` ou `hour`
+
+        Returns:
+            datetime: Début de la tranche
+        """
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        if granularity == "minute":
+            return value.replace(second=0, microsecond=0)
+        if granularity == "hour":
+            return value.replace(minute=0, second=0, microsecond=0)
+        raise ValueError(f"Unsupported rollup granularity '{granularity}'")
+
+    @staticmethod
+    def update_rollups(
+        connection, tweets: Iterable[Tuple[Optional[datetime], List[str]]]
+    ) -> None:
+        """
+        Ajoute des tweets nouvellement insérés aux rollups.
+
+        Args:
+            connection: Connexion (ou session) portant la transaction d'insertion
+            tweets: Couples `(created_at, hashtags extraits)`
+        """
+        minutes: Counter[datetime] = Counter()
+        hours: Counter[datetime] = Counter()
+        hashtag_hours: Counter[Tuple[str, datetime]] = Counter()
+
+        for created_at, hashtags in tweets:
+            if created_at is None:
+                continue
+            hour = RollupService.truncate(created_at, "hour")
+            minutes[RollupService.truncate(created_at, "minute")] += 1
+            hours[hour] += 1
+            for hashtag in hashtags:
+                hashtag_hours[(hashtag, hour)] += 1
+
+        RollupService._apply(connection, minutes, hours, hashtag_hours)
+
+    @staticmethod
+    def _apply(
+        connection, minutes: Counter, hours: Counter, hashtag_hours: Counter
+    ) -> None:
+        """Écrit des compteurs agrégés dans les trois tables de rollup."""
+        increment_counters(
+            connection,
+            models.TweetCountMinute.__table__,
+            [
+                {"bucket_start": bucket, "count": count}
+                for bucket, count in minutes.items()
+            ],
+            index_elements=["bucket_start"],
+        )
+        increment_counters(
+            connection,
+            models.TweetCountHour.__table__,
+            [
+                {"bucket_start": bucket, "count": count}
+                for bucket, count in hours.items()
+            ],
+            index_elements=["bucket_start"],
+        )
+        increment_counters(
+            connection,
+            models.HashtagCountHour.__table__,
+            [
+                {"hashtag": hashtag, "bucket_start": bucket, "count": count}
+                for (hashtag, bucket), count in hashtag_hours.items()
+            ],
+            index_elements=["hashtag", "bucket_start"]
+        )
+
+    @staticmethod
+    def rebuild(db: Session, chunk_size: int = 5000) -> int:
+        """
+        Régénère toutes les tables de rollup depuis la table `tweets`.
+
+        Args:
+            db: Session de base de données
+            chunk_size: Nombre de tweets lus par paquet
+
+        Returns:
+            int: Nombre de tweets parcourus
+
+        Raises:
+            DatabaseError: Si la reconstruction échoue
+        """
+        try:
+            db.execute(delete(models.TweetCountMinute))
+            db.execute(delete(models.TweetCountHour))
+            db.execute(delete(models.HashtagCountHour))
+
+            processed = 0
+            chunk = []
+            rows = db.query(models.Tweet.created_at, models.Tweet.text)\
+                     .filter(models.Tweet.created_at.isnot(None))\
+                     .yield_per(chunk_size)
+
+            for created_at, text in rows:
+                chunk.append((created_at, HashtagService.extract_hashtags(text)))
+                if len(chunk) >= chunk_size:
+                    RollupService.update_rollups(db, chunk)
+                    processed += len(chunk)
+                    chunk = []
+
+            if chunk:
+                RollupService.update_rollups(db, chunk)
+                processed += len(chunk)
+
+            AnalyticsCache.bump(db)
+            db.commit()
+            logger.info(f"Rollup rebuild completed for {processed} tweets")
+            return processed
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Rollup rebuild failed: {e}")
+            raise DatabaseError(f"Rollup rebuild failed: {str(e)}")
@@ -0,0 +1,456 @@
+# app/services/scheduler_service.py
+"""Background collection scheduler.
+
+* **Rôle global** : exécuter les **jobs de collecte** (`collection_jobs`) à intervalle
+  régulier, sans appel à `POST /tweets/collect`.
+  👉 Tâche asyncio lancée au démarrage de l'application (`scheduler_enabled`, jamais en
+    mode test).
+
+* **Boucle** (`run_forever`, toutes les `scheduler_tick` secondes) :
+
+  * Cherche les jobs actifs dont `next_run_at` est passé (index
+    `ix_collection_jobs_due`).
+  * **Réserve** chaque job par un `UPDATE ... WHERE next_run_at = <valeur lue>` : si
+    plusieurs workers tournent, un seul exécute le job ; un worker arrêté en cours
+    d'exécution libère le job après un intervalle.
+  * Lance les jobs réservés en tâches de fond, au plus `scheduler_max_concurrency` en
+    parallèle (sémaphore).
+
+* **Exécution d'un job** (`run_job`) :
+
+  * Appelle `AsyncTwitterClient.search_recent(..., since_id=...)` avec le `since_id`
+    **partagé** de la requête (`search_watermarks`, aussi avancé par `/tweets/collect`)
+    → seuls les **nouveaux** tweets transitent.
+  * Suit `next_token` (au plus `scheduler_max_pages` pages) si plus d'une page de
+    nouveaux tweets est arrivée.
+  * Écrit les tweets (`TweetService.save_tweets_batch`) et avance `since_id`
+    (`meta.newest_id`) dans la **même transaction**, dans `search_watermarks` ;
+    `job.since_id` n'en est qu'un reflet (lecture via `/jobs`).
+  * Pages épuisées avec un `next_token` restant → `since_id` **n'avance pas** (les
+    tweets plus anciens seraient perdus) : `job.next_token` et `job.pending_newest_id`
+    sont mémorisés, le passage suivant reprend la pagination à ce token (même
+    `since_id`), et `since_id` n'avance au plus récent vu qu'une fois la dernière page
+    atteinte.
+  * Prochaine exécution = intervalle ± `scheduler_jitter` (les jobs de même période ne
+    partent pas tous en même temps).
+  * **Backoff** sur `TwitterAPIError` : intervalle × 2^(échecs consécutifs), plafonné à
+    `scheduler_max_backoff` ; l'erreur est mémorisée sur le job (`last_status`,
+    `last_error`). Écriture en base échouée → même backoff, enregistré dans une nouvelle
+    transaction après le rollback.
+
+* **Métriques** (`/metrics`) : `scheduler_running_jobs`,
+  `collection_job_runs_total{status}`.
+
+* **Tests** : client (`AsyncTwitterClient` vers un serveur stub ou un
+  `httpx.MockTransport`) et fabrique de sessions injectables.
+
+👉 En résumé : une collecte continue et incrémentale, pilotée par les routes `/jobs`.
+
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from ..database import SessionLocal
+from ..exceptions import DatabaseError, TwitterAPIError
+from .cache_service import AnalyticsCache
+from .job_service import JobService
+from .metrics import GaugeSample, collection_job_runs, registry
+from .tweet_service import TweetService
+from .twitter_client import AsyncTwitterClient, async_twitter_client
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionScheduler:
+    """Planificateur asyncio des jobs de collecte périodique."""
+
+    def __init__(
+        self,
+        client: Optional[AsyncTwitterClient] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_concurrency: Optional[int] = None,
+        jitter: Optional[float] = None
+    ):
+        """
+        Initialise le planificateur.
+
+        Args:
+            client: Client API (défaut : `async_twitter_client`)
+            session_factory: Fabrique de sessions (défaut : `SessionLocal`)
+            max_concurrency: Jobs exécutés en parallèle (défaut :
+                `scheduler_max_concurrency`)
+            jitter: Variation des intervalles (défaut : `scheduler_jitter`)
+        """
+        self.client = client
+        self.session_factory = session_factory
+        self.max_concurrency = max_concurrency or settings.scheduler_max_concurrency
+        self.jitter = settings.scheduler_jitter if jitter is None else jitter
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._running: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Lance la boucle du planificateur (à appeler depuis la boucle
+        d'événements)."""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self.run_forever())
+            logger.info("Collection scheduler started")
+
+    async def stop(self) -> None:
+        """Arrête la boucle et annule les jobs en cours."""
+        tasks = [task for task in (self._loop_task, *self._tasks) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._tasks.clear()
+        logger.info("Collection scheduler stopped")
+
+    async def run_forever(self) -> None:
+        """Boucle principale : lance les jobs échus toutes les `scheduler_tick`
+        secondes."""
+        while True:
+            try:
+                await self.run_due()
+            except DatabaseError:
+                # Déjà journalisé ; nouvelle tentative au prochain passage
+                pass
+            await asyncio.sleep(settings.scheduler_tick)
+
+    async def run_due(
+        self, now: Optional[datetime] = None, wait: bool = False
+    ) -> List[int]:
+        """
+        Réserve et lance les jobs échus.
+
+        Args:
+            now: Heure de référence (défaut : maintenant, UTC)
+            wait: Attend la fin des jobs lancés (tests, exécution ponctuelle)
+
+        Returns:
+            List[int]: Identifiants des jobs lancés
+        """
+        free_slots = self.max_concurrency - len(self._running)
+        if free_slots <= 0:
+            return []
+
+        job_ids = await asyncio.to_thread(
+            self._claim_due, now or JobService.utcnow(), free_slots, set(self._running)
+        )
+        tasks = []
+        for job_id in job_ids:
+            self._running.add(job_id)
+            task = asyncio.create_task(self._run_claimed(job_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            tasks.append(task)
+
+        if wait and tasks:
+            await asyncio.gather(*tasks)
+        return job_ids
+
+    def _claim_due(self, now: datetime, limit: int, running: Set[int]) -> List[int]:
+        """
+        Réserve jusqu'à `limit` jobs échus (exécuté dans un thread).
+
+        La réservation repousse `next_run_at` d'un intervalle ; elle n'aboutit que si
+        aucun autre worker n'a modifié le job entre la lecture et l'écriture.
+
+        Returns:
+            List[int]: Identifiants des jobs réservés
+        """
+        db = self.session_factory()
+        try:
+            due = (
+                db.query(
+                    models.CollectionJob.id,
+                    models.CollectionJob.next_run_at,
+                    models.CollectionJob.interval_seconds,
+                )
+                .filter(
+                    models.CollectionJob.enabled.is_(True),
+                    models.CollectionJob.next_run_at <= now,
+                )
+                .order_by(models.CollectionJob.next_run_at)
+                .limit(limit + len(running))
+                .all()
+            )
+
+            claimed: List[int] = []
+            for job_id, next_run_at, interval in due:
+                if job_id in running or len(claimed) >= limit:
+                    continue
+                result = db.execute(
+                    update(models.CollectionJob)
+                    .where(
+                        models.CollectionJob.id == job_id,
+                        models.CollectionJob.next_run_at == next_run_at
+                    )
+                    .values(next_run_at=now + timedelta(seconds=interval))
+                )
+                if result.rowcount == 1:
+                    claimed.append(job_id)
+            db.commit()
+            return claimed
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to claim due collection jobs: {e}")
+            raise DatabaseError(f"Failed to claim due collection jobs: {str(e)}")
+        finally:
+            db.close()
+
+    async def _run_claimed(self, job_id: int) -> None:
+        """Exécute un job réservé ; les erreurs sont journalisées, jamais propagées."""
+        try:
+            await self.run_job(job_id)
+        except DatabaseError:
+            # Déjà journalisé ; la réservation fera repartir le job après un intervalle
+            pass
+        except Exception as e:
+            logger.error(f"Unexpected error in collection job {job_id}: {e}")
+        finally:
+            self._running.discard(job_id)
+
+    async def run_job(
+        self, job_id: int, db: Optional[Session] = None
+    ) -> Optional[models.CollectionJob]:
+        """
+        Exécute un job immédiatement : récupère les nouveaux tweets et planifie le
+        passage suivant.
+
+        Args:
+            job_id: Identifiant du job
+            db: Session à utiliser (défaut : nouvelle session de `session_factory`)
+
+        Returns:
+            Optional[models.CollectionJob]: Job mis à jour, ou None s'il n'existe pas
+
+        Raises:
+            DatabaseError: Si l'écriture des tweets ou du job échoue
+        """
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            async with self._semaphore:
+                job = await asyncio.to_thread(db.get, models.CollectionJob, job_id)
+                if job is None:
+                    return None
+                query, max_results, next_token = (
+                    job.query,
+                    job.max_results,
+                    job.next_token,
+                )
+                if next_token:
+                    # Pagination inachevée : même borne basse que les pages déjà
+                    # collectées
+                    since_id = job.since_id
+                else:
+                    # Watermark partagé avec les collectes manuelles (`/tweets/collect`)
+                    since_id = await asyncio.to_thread(
+                        TweetService.get_since_id, query, db
+                    )
+
+                started = JobService.utcnow()
+                error = None
+                try:
+                    tweets_data, newest_id, next_token = await self._fetch_new(
+                        query, since_id, max_results, next_token
+                    )
+                except TwitterAPIError as e:
+                    tweets_data, newest_id, error = [], None, str(e)
+                    logger.warning(f"Collection job {job_id} ('{query}') failed: {e}")
+
+                return await asyncio.to_thread(
+                    self._record_run,
+                    db,
+                    job_id,
+                    tweets_data,
+                    newest_id,
+                    error,
+                    started,
+                    since_id,
+                    next_token,
+                )
+        finally:
+            if own_session:
+                db.close()
+
+    async def _fetch_new(
+        self,
+        query: str,
+        since_id: Optional[str],
+        max_results: int,
+        next_token: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+        """
+        Récupère les tweets plus récents que `since_id`, en suivant `next_token`.
+
+        Args:
+            next_token: Token de reprise d'une pagination inachevée (None : première
+                page)
+
+        Returns:
+            Tuple: Tweets bruts reçus, plus grand identifiant vu (None si aucun)
+                et `next_token` restant (None si la dernière page a été atteinte)
+
+        Raises:
+            TwitterAPIError: Si l'API échoue ou si aucun client n'est configuré
+        """
+        client = self.client or async_twitter_client
+        if client is None:
+            raise TwitterAPIError("Twitter client not configured. Check BEARER_TOKEN.")
+
+        tweets_data: List[Dict[str, Any]] = []
+        newest_id: Optional[str] = None
+        for _ in range(settings.scheduler_max_pages):
+            api_response = await client.search_recent(
+                query, max_results, next_token=next_token, since_id=since_id
+            )
+            tweets_data.extend(api_response.get("data", []))
+            # Les pages vont du plus récent au plus ancien : le plus récent est sur la
+            # première
+            newest_id = newest_id or TweetService._newest_id(api_response)
+            next_token = api_response.get("meta", {}).get("next_token")
+            if not next_token:
+                break
+        else:
+            if next_token:
+                logger.warning(
+                    f"More than {settings.scheduler_max_pages} pages "
+                    f"of new tweets for '{query}', "
+                    f"older ones are left for the next run"
+                )
+
+        return tweets_data, newest_id, next_token
+
+    def _record_run(
+        self,
+        db: Session,
+        job_id: int,
+        tweets_data: List[Dict[str, Any]],
+        newest_id: Optional[str],
+        error: Optional[str],
+        started: datetime,
+        since_id: Optional[str] = None,
+        next_token: Optional[str] = None
+    ) -> Optional[models.CollectionJob]:
+        """
+        Écrit les tweets et l'état du job dans une seule transaction (exécuté dans un
+        thread).
+
+        `since_id` n'avance que si la pagination est terminée (`next_token` None) ;
+        sinon le token et le plus récent identifiant vu sont mémorisés pour le passage
+        suivant.
+
+        Returns:
+            Optional[models.CollectionJob]: Job mis à jour, ou None s'il a été supprimé
+            entre-temps
+
+        Raises:
+            DatabaseError: Si l'écriture échoue (l'échec est enregistré sur le job, avec
+                backoff)
+        """
+        try:
+            saved_tweets = TweetService.save_tweets_batch(tweets_data, db, commit=False)
+            job = db.get(models.CollectionJob, job_id)
+            if job is None:
+                db.rollback()
+                return None
+
+            if error is None:
+                # Plus récent identifiant de toute la pagination : celui de sa première
+                # page
+                newest_id = job.pending_newest_id or newest_id
+                if next_token:
+                    job.since_id = since_id
+                    job.pending_newest_id = newest_id
+                else:
+                    job.since_id = TweetService._advance_since_id(
+                        job.query, newest_id, db
+                    )
+                    job.pending_newest_id = None
+                job.next_token = next_token
+                job.tweets_saved += len(saved_tweets)
+            self._schedule_next(job, started, error)
+            db.commit()
+            collection_job_runs.inc("ok" if error is None else "error")
+            if saved_tweets:
+                AnalyticsCache.invalidate()
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to record run of collection job {job_id}: {e}")
+            # Nouvelle transaction : l'échec compte pour le backoff (sinon le job
+            # repartirait aussitôt)
+            self._record_failure(db, job_id, started, f"Database error: {e}")
+            raise DatabaseError(f"Failed to record collection job run: {str(e)}")
+
+        logger.info(
+            f"Collection job {job_id} ran: {len(tweets_data)} fetched, "
+            f"{len(saved_tweets)} saved, "
+            f"next run at {job.next_run_at.isoformat()}"
+        )
+        return job
+
+    def _record_failure(
+        self, db: Session, job_id: int, started: datetime, error: str
+    ) -> None:
+        """Enregistre un passage en erreur sans les tweets (après l'échec de leur
+        écriture)."""
+        try:
+            job = db.get(models.CollectionJob, job_id)
+            if job is None:
+                return
+            self._schedule_next(job, started, error)
+            db.commit()
+            collection_job_runs.inc("error")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to record failure of collection job {job_id}: {e}")
+
+    def _schedule_next(
+        self, job: models.CollectionJob, started: datetime, error: Optional[str]
+    ) -> None:
+        """Met à jour l'état d'un job après un passage et planifie le suivant (backoff
+        en cas d'erreur)."""
+        job.runs += 1
+        job.last_run_at = started
+        if error is None:
+            job.last_status = "ok"
+            job.last_error = None
+            job.consecutive_failures = 0
+            delay = job.interval_seconds
+        else:
+            job.consecutive_failures += 1
+            job.last_status = "error"
+            job.last_error = error
+            backoff = job.interval_seconds * 2 ** job.consecutive_failures
+            delay = max(
+                job.interval_seconds, min(backoff, settings.scheduler_max_backoff)
+            )
+        job.next_run_at = started + timedelta(seconds=self._jittered(delay))
+
+    def metrics(self) -> Iterator[GaugeSample]:
+        """Jauges du planificateur pour `/metrics` (calculées au scrape)."""
+        yield "scheduler_running_jobs", "Collection jobs currently running.", {}, len(
+            self._running
+        )
+
+    def _jittered(self, delay: float) -> float:
+        """Applique la variation aléatoire `± jitter` à un délai."""
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+# Instance globale, démarrée par le cycle de vie de l'application
+collection_scheduler = CollectionScheduler()
+registry.register_collector(collection_scheduler.metrics)
@@ -0,0 +1,227 @@
+# app/services/search_service.py
+"""Full-text search over collected tweets.
+
+* **Rôle global** : rechercher des tweets par mots-clés **sans scanner** `tweets.text`
+  (`LIKE '%x%'`).
+  👉 C'est le moteur derrière `GET /tweets/search?q=`.
+
+* **Index utilisés** (définis dans `models.SEARCH_DDL`, maintenus à l'insertion) :
+
+  * SQLite → table FTS5 `tweets_fts`, pertinence **BM25** (`bm25()`).
+  * PostgreSQL → index GIN sur `to_tsvector('simple', text)`, pertinence `ts_rank`,
+    requête `websearch_to_tsquery`.
+  * Autre dialecte → repli `ILIKE` (scan), pertinence nulle.
+
+* **Requête** :
+
+  * SQLite : chaque terme est cité (`"terme"`) → la saisie utilisateur ne peut pas
+    casser la syntaxe FTS5 ; tous les termes sont requis, `terme*` fait une recherche
+    par préfixe.
+  * PostgreSQL : syntaxe "web" (`"expression exacte"`, `-exclu`, `or`).
+
+* **Tri et pagination par curseur** :
+
+  * `sort="rank"` (défaut) → `(score, id)` décroissants, score "plus grand = plus
+    pertinent".
+  * `sort="recent"` → `id` décroissant (dernier collecté en premier), sans calcul de
+    pertinence.
+  * Curseur opaque (`utils.cursor`) de la dernière ligne →
+    `WHERE (score, id) < (curseur)`, jamais d'`OFFSET`.
+  * Le score BM25 dépend du corpus : des insertions entre deux pages peuvent décaler
+    légèrement le classement.
+
+* **Colonnes lues** : celles de `TweetRead` (`READ_COLUMNS`) + le score → des lignes
+  légères, pas d'entités `Tweet`.
+
+* **`rebuild(db)`** : crée l'index s'il manque et le reconstruit depuis `tweets`
+  (`python -m app.cli rebuild-search`).
+
+👉 En résumé : une recherche classée et paginée, servie par l'index natif du moteur de
+  base de données.
+
+"""
+import logging
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    and_,
+    column,
+    func,
+    literal,
+    literal_column,
+    or_,
+    table,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..exceptions import DatabaseError
+from ..utils.cursor import decode_cursor, encode_cursor
+from .tweet_service import READ_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Table virtuelle FTS5 (hors métadonnées : créée par `models.SEARCH_DDL`)
+TWEETS_FTS = table("tweets_fts", column("rowid", Integer), column("text"))
+
+
+class SearchService:
+    """Service de recherche plein texte sur les tweets."""
+
+    @staticmethod
+    def search(
+        db: Session,
+        q: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        sort: str = "rank"
+    ) -> Tuple[List[Tuple[Row, float]], Optional[str]]:
+        """
+        Recherche des tweets par mots-clés, classés et paginés par curseur.
+
+        Args:
+            db: Session de base de données
+            q: Texte recherché
+            limit: Taille de la page
+            cursor: Curseur retourné par la page précédente (optionnel)
+            sort: `rank` (pertinence) ou `recent` (derniers collectés)
+
+        Returns:
+            Tuple: Couples `(tweet, score)` de la page (tweet = ligne `READ_COLUMNS`) et
+                curseur suivant (None si dernière page)
+
+        Raises:
+            ValueError: Si la requête, le tri ou le curseur est invalide
+            DatabaseError: Si la recherche échoue
+        """
+        if sort not in ("rank", "recent"):
+            raise ValueError(f"Unsupported sort '{sort}'")
+        if limit <= 0:
+            raise ValueError("Limit must be greater than 0")
+
+        position = decode_cursor(cursor, float) if cursor else None
+        if position is not None and (position[0] is None) != (sort == "recent"):
+            raise ValueError("Cursor does not match the requested sort")
+        dialect_name = db.get_bind().dialect.name
+        score: ColumnElement[Any]
+
+        if dialect_name == "sqlite":
+            match = SearchService._fts5_query(q)
+            if match is None:
+                raise ValueError("Search query must contain at least one term")
+            query = db.query(*READ_COLUMNS)\
+                      .select_from(TWEETS_FTS)\
+                      .join(models.Tweet, models.Tweet.id == TWEETS_FTS.c.rowid)\
+                      .filter(TWEETS_FTS.c.text.match(match))
+            # bm25() : plus petit = plus pertinent → on inverse le signe
+            score = -func.bm25(literal_column("tweets_fts"))
+        elif dialect_name == "postgresql":
+            if not q.strip():
+                raise ValueError("Search query must contain at least one term")
+            config: ColumnElement[Any] = literal_column(f"'{models.SEARCH_TS_CONFIG}'")
+            vector = func.to_tsvector(config, models.Tweet.text)
+            ts_query = func.websearch_to_tsquery(config, q)
+            query = db.query(*READ_COLUMNS).filter(vector.op("@@")(ts_query))
+            score = func.ts_rank(vector, ts_query)
+        else:
+            if not q.strip():
+                raise ValueError("Search query must contain at least one term")
+            logger.warning(
+                f"No full-text index for dialect '{dialect_name}', "
+                f"falling back to ILIKE"
+            )
+            query = db.query(*READ_COLUMNS).filter(
+                models.Tweet.text.ilike(f"%{q.strip()}%")
+            )
+            score = literal(0.0)
+            sort = "recent"
+
+        try:
+            if sort == "recent":
+                if position is not None:
+                    query = query.filter(models.Tweet.id < position[1])
+                rows = query.add_columns(literal(0.0).label("score"))\
+                            .order_by(models.Tweet.id.desc())\
+                            .limit(limit + 1)\
+                            .all()
+            else:
+                if position is not None:
+                    last_score, last_id = position
+                    query = query.filter(or_(
+                        score < last_score,
+                        and_(score == last_score, models.Tweet.id < last_id)
+                    ))
+                rows = (
+                    query.add_columns(score.label("score"))
+                    .order_by(literal_column("score").desc(), models.Tweet.id.desc())
+                    .limit(limit + 1)
+                    .all()
+                )
+
+        except Exception as e:
+            logger.error(f"Full-text search failed for '{q}': {e}")
+            raise DatabaseError(f"Full-text search failed: {str(e)}")
+
+        hits = [(row, float(row[-1] or 0.0)) for row in rows]
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            last_tweet, last_score = hits[-1]
+            next_cursor = encode_cursor(
+                None if sort == "recent" else last_score, last_tweet.id
+            )
+
+        logger.info(f"Search '{q}' returned {len(hits)} tweets")
+        return hits, next_cursor
+
+    @staticmethod
+    def _fts5_query(q: str) -> Optional[str]:
+        """
+        Convertit une saisie libre en requête FTS5 sûre.
+
+        Chaque terme est cité (les guillemets internes sont doublés) ; un `*`
+        final est conservé comme recherche par préfixe.
+
+        Returns:
+            Optional[str]: Requête FTS5, ou None si aucun terme
+        """
+        terms = []
+        for term in q.split():
+            prefix = term.endswith("*")
+            term = term.rstrip("*")
+            if term:
+                terms.append(
+                    '"' + term.replace('"', '""') + '"' + ("*" if prefix else "")
+                )
+        return " ".join(terms) or None
+
+    @staticmethod
+    def rebuild(db: Session) -> None:
+        """
+        Crée l'index plein texte s'il manque et le reconstruit depuis `tweets`.
+
+        Args:
+            db: Session de base de données
+
+        Raises:
+            DatabaseError: Si la reconstruction échoue
+        """
+        dialect_name = db.get_bind().dialect.name
+        try:
+            for statement in models.SEARCH_DDL.get(dialect_name, []):
+                db.execute(text(statement))
+            if dialect_name == "sqlite":
+                db.execute(
+                    text("INSERT INTO tweets_fts(tweets_fts) VALUES ('rebuild')")
+                )
+            db.commit()
+            logger.info(f"Full-text index rebuilt for dialect '{dialect_name}'")
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Full-text index rebuild failed: {e}")
+            raise DatabaseError(f"Full-text index rebuild failed: {str(e)}")
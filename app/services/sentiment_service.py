@@ -0,0 +1,156 @@
+# app/services/sentiment_service.py
+"""Sentiment scoring service.
+
+* **Rôle global** : calculer **une seule fois** le score de sentiment de chaque tweet et
+  le persister dans `tweet_sentiments`.
+  👉 `/analytics/sentiment` n'a plus qu'à faire des `AVG()` en SQL, sans jamais
+    réanalyser le texte.
+
+* **Score** : `compound` de VADER (entre -1 et 1), calculé par
+  `utils/sentiment_analysis.score_texts` avec un **analyseur unique par processus** (le
+  lexique n'est chargé qu'une fois).
+
+* **Fonctionnalités** :
+
+  1. **`index_sentiments(connection, tweets)`**
+
+     * Appelé à l'ingestion par `IngestIndexer`, dans la **même transaction** que
+       l'insertion.
+     * Score le lot en une passe puis insère les lignes en un seul `executemany`.
+
+  2. **`backfill(db, chunk_size, workers)`**
+
+     * Score les tweets qui n'ont pas encore de ligne `tweet_sentiments` (bases
+       existantes).
+     * Parcours par clé primaire croissante, commit par paquet → reprise possible après
+       interruption.
+     * Chaque paquet est découpé en lots de `sentiment_batch_size` textes répartis sur
+       un **pool de processus** (`sentiment_workers`, défaut : nombre de CPU ; `1` →
+       scoring dans le processus courant).
+     * Exposé en ligne de commande : `python -m app.cli backfill-sentiment`.
+
+👉 En résumé : le sentiment devient une donnée dérivée comme les hashtags — payée à
+  l'écriture, gratuite à la lecture.
+
+"""
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from ..exceptions import DatabaseError
+from .cache_service import AnalyticsCache
+from ..utils.sentiment_analysis import get_analyzer, score_texts
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentService:
+    """Service de calcul et de persistance des scores de sentiment."""
+
+    @staticmethod
+    def index_sentiments(connection, tweets: Iterable[Tuple[int, str]]) -> int:
+        """
+        Score et persiste le sentiment de tweets nouvellement insérés.
+
+        Args:
+            connection: Connexion (ou session) portant la transaction d'insertion
+            tweets: Couples `(tweets.id, text)`
+
+        Returns:
+            int: Nombre de lignes `tweet_sentiments` insérées
+        """
+        tweets = list(tweets)
+        if not tweets:
+            return 0
+
+        scores = score_texts([text for _, text in tweets])
+        connection.execute(
+            insert(models.TweetSentiment.__table__),
+            [
+                {"tweet_id": tweet_pk, "compound": score}
+                for (tweet_pk, _), score in zip(tweets, scores)
+            ]
+        )
+        return len(tweets)
+
+    @staticmethod
+    def backfill(
+        db: Session, chunk_size: int = 5000, workers: Optional[int] = None
+    ) -> int:
+        """
+        Score les tweets qui n'ont pas encore de sentiment persisté.
+
+        Args:
+            db: Session de base de données
+            chunk_size: Nombre de tweets traités (et commités) par paquet
+            workers: Nombre de processus (défaut : `settings.sentiment_workers`)
+
+        Returns:
+            int: Nombre de tweets scorés
+
+        Raises:
+            DatabaseError: Si la persistance échoue
+        """
+        workers = workers or settings.sentiment_workers
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=get_analyzer) \
+            if workers is None or workers > 1 else None
+
+        processed = 0
+        last_pk = 0
+        try:
+            while True:
+                rows = db.query(models.Tweet.id, models.Tweet.text)\
+                         .outerjoin(models.TweetSentiment,
+                                    models.TweetSentiment.tweet_id == models.Tweet.id)\
+                         .filter(models.TweetSentiment.tweet_id.is_(None),
+                                 models.Tweet.id > last_pk)\
+                         .order_by(models.Tweet.id)\
+                         .limit(chunk_size)\
+                         .all()
+                if not rows:
+                    break
+
+                scores = SentimentService._score_chunk(
+                    [text for _, text in rows], executor
+                )
+                db.execute(
+                    insert(models.TweetSentiment.__table__),
+                    [{"tweet_id": tweet_pk, "compound": score}
+                     for (tweet_pk, _), score in zip(rows, scores)]
+                )
+                AnalyticsCache.bump(db)
+                db.commit()
+
+                processed += len(rows)
+                last_pk = rows[-1][0]
+                logger.info(f"Scored sentiment for {processed} tweets")
+
+            return processed
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Sentiment backfill failed: {e}")
+            raise DatabaseError(f"Sentiment backfill failed: {str(e)}")
+
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    @staticmethod
+    def _score_chunk(
+        texts: List[str], executor: Optional[ProcessPoolExecutor]
+    ) -> List[float]:
+        """Score un paquet de textes, réparti en lots sur le pool s'il existe."""
+        if executor is None:
+            return score_texts(texts)
+
+        size = settings.sentiment_batch_size
+        batches = [texts[i:i + size] for i in range(0, len(texts), size)]
+        return [
+            score for batch in executor.map(score_texts, batches) for score in batch
+        ]
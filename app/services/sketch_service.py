@@ -0,0 +1,328 @@
+# app/services/sketch_service.py
+"""Approximate heavy-hitters service for hashtags.
+
+* **Rôle global** : fournir un mode **approximatif à mémoire bornée** pour le top des
+  hashtags, basé sur des résumés Space-Saving (`utils/space_saving.py`).
+  👉 Pour les flux à très forte cardinalité, là où les compteurs exacts grossissent sans
+    limite.
+
+* **Fonctionnement** :
+
+  * Chaque worker (`WORKER_ID` = hôte-pid) accumule en mémoire un résumé **delta** par
+    fenêtre d'une heure.
+  * `observe(session, tweets)` est appelé à l'ingestion par `IngestIndexer` : les
+    observations attendent dans `session.info` et ne sont ajoutées aux résumés qu'au
+    **`COMMIT`** (événement `after_commit`) ; une transaction annulée n'est pas
+    décomptée.
+  * Au-delà de `sketch_memory_windows` fenêtres en mémoire (ex. import d'un historique
+    sur plusieurs jours), les plus anciennes sont **évincées** : fusionnées dans
+    `hashtag_sketches` dans la transaction d'ingestion (rendues à la mémoire si elle est
+    annulée).
+  * `flush(db)` fusionne les deltas dans les lignes `hashtag_sketches` du worker puis
+    vide la mémoire.
+  * `run_periodic_flush()` persiste les deltas toutes les `sketch_flush_interval`
+    secondes (tâche lancée au démarrage de l'app).
+  * `top_hashtags(db, limit, start, end)` fusionne les résumés persistés (tous workers,
+    fenêtres de la plage) et les deltas non encore persistés.
+
+* **Garanties** :
+
+  * Mémoire bornée : au plus `sketch_memory_windows` fenêtres de `sketch_capacity`
+    compteurs en mémoire, `sketch_capacity` compteurs par ligne persistée.
+  * Erreur par hashtag ≤ `max_error` (retournée avec le résultat), de l'ordre de
+    `total / sketch_capacity`.
+
+👉 En résumé : un top hashtags fusionnable entre workers et fenêtres de temps,
+  sélectionné par `/analytics/hashtags?mode=approx`.
+
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session, SessionTransaction
+
+from .. import models
+from ..config import settings
+from ..database import SessionLocal
+from ..exceptions import DatabaseError
+from ..utils.space_saving import SpaceSaving
+from .rollup_service import RollupService
+
+logger = logging.getLogger(__name__)
+
+# Observations en attente de COMMIT, dans `session.info`
+SESSION_KEY = "hashtag_sketch"
+
+
+class HashtagSketchService:
+    """Résumés Space-Saving des hashtags, par worker et par heure."""
+
+    WORKER_ID = f"{socket.gethostname()}-{os.getpid()}"
+
+    _lock = threading.Lock()
+    _pending: Dict[datetime, SpaceSaving] = {}
+
+    @staticmethod
+    def observe(
+        session: Session,
+        tweets: Iterable[Tuple[Optional[datetime], List[str]]],
+        connection=None
+    ) -> None:
+        """
+        Enregistre des hashtags ingérés, appliqués aux résumés en mémoire au `COMMIT` de
+        `session`.
+
+        Les observations sont mises en attente dans `session.info` : un rollback les
+        abandonne, sans fausser les compteurs. Les fenêtres en excès (au-delà de
+        `sketch_memory_windows`) sont évincées : persistées dans la transaction
+        d'insertion, rendues à la mémoire si elle échoue.
+
+        Args:
+            session: Session portant la transaction d'insertion
+            tweets: Couples `(created_at, hashtags extraits)`
+            connection: Connexion de la transaction (défaut : `session`), pour persister
+                les fenêtres évincées
+        """
+        now = datetime.now(timezone.utc)
+        state = session.info.setdefault(SESSION_KEY, {"observed": {}, "held": {}})
+        observed: Dict[datetime, List[str]] = state["observed"]
+        for created_at, hashtags in tweets:
+            if hashtags:
+                observed.setdefault(
+                    RollupService.truncate(created_at or now, "hour"), []
+                ).extend(hashtags)
+
+        evicted: Dict[datetime, SpaceSaving] = {}
+        with HashtagSketchService._lock:
+            pending = HashtagSketchService._pending
+            windows = sorted(set(pending) | set(observed))
+            for window in windows[
+                : max(0, len(windows) - settings.sketch_memory_windows)
+            ]:
+                sketch = pending.pop(window, None)
+                if sketch is not None:
+                    state["held"][window] = sketch
+                    sketch = SpaceSaving(sketch.capacity).merge(sketch)
+                for hashtag in observed.pop(window, []):
+                    if sketch is None:
+                        sketch = SpaceSaving(settings.sketch_capacity)
+                    sketch.update(hashtag)
+                if sketch is not None:
+                    evicted[window] = sketch
+
+        if evicted:
+            HashtagSketchService._merge_windows(
+                connection if connection is not None else session, evicted
+            )
+            logger.debug(f"Evicted {len(evicted)} hashtag sketch windows from memory")
+
+    @staticmethod
+    def _apply_committed(session: Session) -> None:
+        """Ajoute aux résumés en mémoire les observations d'une transaction commitée."""
+        state = session.info.pop(SESSION_KEY, None)
+        if not state or not state["observed"]:
+            return
+        with HashtagSketchService._lock:
+            for window, hashtags in state["observed"].items():
+                sketch = HashtagSketchService._pending.get(window)
+                if sketch is None:
+                    sketch = HashtagSketchService._pending[window] = SpaceSaving(
+                        settings.sketch_capacity
+                    )
+                for hashtag in hashtags:
+                    sketch.update(hashtag)
+
+    @staticmethod
+    def _discard_uncommitted(session: Session) -> None:
+        """Abandonne les observations d'une transaction annulée et rend les fenêtres
+        évincées à la mémoire."""
+        state = session.info.pop(SESSION_KEY, None)
+        if state and state["held"]:
+            HashtagSketchService._restore_pending(state["held"])
+
+    @staticmethod
+    def _take_pending() -> Dict[datetime, SpaceSaving]:
+        """Récupère et vide les deltas en mémoire."""
+        with HashtagSketchService._lock:
+            pending = HashtagSketchService._pending
+            HashtagSketchService._pending = {}
+        return pending
+
+    @staticmethod
+    def _restore_pending(pending: Dict[datetime, SpaceSaving]) -> None:
+        """Remet des deltas non persistés en mémoire (après un échec de flush)."""
+        with HashtagSketchService._lock:
+            for window, sketch in pending.items():
+                current = HashtagSketchService._pending.get(window)
+                HashtagSketchService._pending[window] = (
+                    sketch if current is None else current.merge(sketch)
+                )
+
+    @staticmethod
+    def flush(db: Session) -> int:
+        """
+        Fusionne les deltas en mémoire dans les résumés persistés du worker.
+
+        Args:
+            db: Session de base de données
+
+        Returns:
+            int: Nombre de fenêtres persistées
+
+        Raises:
+            DatabaseError: Si la persistance échoue (les deltas sont conservés)
+        """
+        pending = HashtagSketchService._take_pending()
+        if not pending:
+            return 0
+
+        try:
+            HashtagSketchService._merge_windows(db, pending)
+            db.commit()
+            logger.debug(f"Flushed {len(pending)} hashtag sketch windows")
+            return len(pending)
+
+        except Exception as e:
+            db.rollback()
+            HashtagSketchService._restore_pending(pending)
+            logger.error(f"Failed to persist hashtag sketches: {e}")
+            raise DatabaseError(f"Failed to persist hashtag sketches: {str(e)}")
+
+    @staticmethod
+    def _merge_windows(connection, deltas: Dict[datetime, SpaceSaving]) -> None:
+        """Fusionne des deltas dans les lignes `hashtag_sketches` du worker (sans
+        commit)."""
+        table = models.HashtagSketch.__table__
+        existing = dict(connection.execute(
+            select(table.c.window_start, table.c.payload).where(
+                table.c.worker_id == HashtagSketchService.WORKER_ID,
+                table.c.window_start.in_(list(deltas))
+            )
+        ).all())
+
+        inserts = []
+        for window, delta in deltas.items():
+            payload = existing.get(window)
+            if payload is None:
+                inserts.append({
+                    "worker_id": HashtagSketchService.WORKER_ID,
+                    "window_start": window,
+                    "payload": json.dumps(delta.to_dict()),
+                })
+                continue
+            merged = SpaceSaving.from_dict(json.loads(payload)).merge(delta)
+            connection.execute(
+                update(table)
+                .where(
+                    table.c.worker_id == HashtagSketchService.WORKER_ID,
+                    table.c.window_start == window,
+                )
+                .values(payload=json.dumps(merged.to_dict()))
+            )
+        if inserts:
+            connection.execute(insert(table), inserts)
+
+    @staticmethod
+    def flush_with_new_session() -> int:
+        """Persiste les deltas avec une session dédiée (tâche de fond, arrêt)."""
+        db = SessionLocal()
+        try:
+            return HashtagSketchService.flush(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    async def run_periodic_flush() -> None:
+        """Boucle de persistance périodique, à lancer comme tâche de fond."""
+        while True:
+            await asyncio.sleep(settings.sketch_flush_interval)
+            try:
+                await asyncio.to_thread(HashtagSketchService.flush_with_new_session)
+            except DatabaseError:
+                # Déjà journalisé ; les deltas seront retentés au prochain cycle
+                pass
+
+    @staticmethod
+    def top_hashtags(
+        db: Session,
+        limit: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Top hashtags approximatif, fusionné sur tous les workers et fenêtres.
+
+        Args:
+            db: Session de base de données
+            limit: Nombre maximum de hashtags à retourner
+            start: Début de la plage (inclus, aligné à l'heure inférieure)
+            end: Fin de la plage (exclue)
+
+        Returns:
+            Dict: `top_hashtags` (hashtag, count, error), `max_error` et `total`
+        """
+        # Les fenêtres qui chevauchent partiellement la plage sont incluses
+        if start is not None:
+            start = RollupService.truncate(start, "hour")
+        if end is not None and end.tzinfo is not None:
+            end = end.astimezone(timezone.utc).replace(tzinfo=None)
+
+        def in_range(window: datetime) -> bool:
+            return (start is None or window >= start) and (end is None or window < end)
+
+        query = db.query(models.HashtagSketch.payload)
+        if start is not None:
+            query = query.filter(models.HashtagSketch.window_start >= start)
+        if end is not None:
+            query = query.filter(models.HashtagSketch.window_start < end)
+
+        merged = SpaceSaving(settings.sketch_capacity)
+        for (payload,) in query:
+            merged = merged.merge(SpaceSaving.from_dict(json.loads(payload)))
+
+        with HashtagSketchService._lock:
+            pending = [
+                sketch for window, sketch in HashtagSketchService._pending.items()
+                if in_range(window)
+            ]
+        for sketch in pending:
+            merged = merged.merge(sketch)
+
+        max_error = max((error for _, _, error in merged.top()), default=0)
+        return {
+            "top_hashtags": [
+                {"hashtag": hashtag, "count": count, "error": error}
+                for hashtag, count, error in merged.top(limit)
+            ],
+            "max_error": max_error,
+            "total": merged.total,
+        }
+
+    @staticmethod
+    def reset() -> None:
+        """Vide les deltas en mémoire (tests, changement de base)."""
+        with HashtagSketchService._lock:
+            HashtagSketchService._pending = {}
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_observations(session: Session) -> None:
+    """Applique les observations de la transaction commitée."""
+    HashtagSketchService._apply_committed(session)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted_observations(
+    session: Session, transaction: SessionTransaction
+) -> None:
+    """Abandonne les observations d'une transaction terminée sans commit (rollback,
+    fermeture)."""
+    if transaction.parent is None:
+        HashtagSketchService._discard_uncommitted(session)
@@ -0,0 +1,147 @@
+# app/services/trend_service.py
+"""Trend / burst detection over hashtag time series.
+
+* **Rôle global** : détecter les hashtags **en accélération**, pas seulement les plus
+  fréquents.
+  👉 C'est le cœur de `/analytics/trending` : un hashtag est tendance quand son volume de
+    la dernière heure s'écarte fortement de sa propre ligne de base.
+
+* **Données** :
+
+  * Lit uniquement le rollup `hashtag_counts_hour` (maintenu à l'ingestion), jamais
+    `tweets.text`.
+  * Requête indexée (`ix_hashtag_counts_hour_bucket`) sur les `baseline_hours` dernières
+    heures.
+
+* **Algorithme (`get_trending`)** :
+
+  1. Série horaire dense par hashtag (heures sans tweet = 0), de la plus ancienne à
+     l'heure de référence.
+  2. Moyenne et variance **EWMA** (facteur `alpha`) mises à jour heure par heure.
+  3. Score de la dernière heure : `z = (x - moyenne) / max(écart-type, 1)` calculé avant
+     d'intégrer `x`.
+
+     * Le plancher à 1 évite des scores infinis pour un hashtag sans historique.
+  4. Filtre `min_count` sur le volume courant, tri par score décroissant.
+
+* **Référence temporelle** :
+
+  * Par défaut, la dernière heure présente dans le rollup (fonctionne aussi sur un
+    corpus historique).
+  * Paramètre `at` pour évaluer les tendances à une heure donnée.
+
+👉 En résumé : un z-score EWMA par hashtag, calculé sur quelques centaines de lignes
+  pré-agrégées → quelques millisecondes même sur un gros corpus.
+
+"""
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .. import models
+from .rollup_service import RollupService
+
+logger = logging.getLogger(__name__)
+
+
+class TrendService:
+    """Service de détection des hashtags tendance (z-score EWMA)."""
+
+    @staticmethod
+    def get_trending(
+        db: Session,
+        limit: int = 20,
+        baseline_hours: int = 24,
+        alpha: float = 0.3,
+        min_count: int = 3,
+        at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Classe les hashtags par accélération de leur volume horaire.
+
+        Args:
+            db: Session de base de données
+            limit: Nombre maximum de hashtags à retourner
+            baseline_hours: Nombre d'heures d'historique utilisées pour la ligne de base
+            alpha: Facteur de lissage EWMA (0 < alpha <= 1)
+            min_count: Volume minimum sur l'heure de référence
+            at: Heure de référence (défaut : dernière heure présente dans le rollup)
+
+        Returns:
+            Dict: `bucket` (heure de référence) et `trending` (hashtag, score, count,
+                baseline)
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        if baseline_hours < 1:
+            raise ValueError("baseline_hours must be at least 1")
+
+        table = models.HashtagCountHour
+        if at is None:
+            at = db.query(func.max(table.bucket_start)).scalar()
+            if at is None:
+                return {"bucket": None, "trending": []}
+        current = RollupService.truncate(at, "hour")
+        start = current - timedelta(hours=baseline_hours)
+
+        # Lecture indexée de la fenêtre [start, current]
+        rows = db.query(table.hashtag, table.bucket_start, table.count)\
+                 .filter(table.bucket_start >= start, table.bucket_start <= current)\
+                 .all()
+
+        series: Dict[str, Dict[datetime, int]] = defaultdict(dict)
+        for hashtag, bucket_start, count in rows:
+            series[hashtag][bucket_start] = count
+
+        hours = [
+            start + timedelta(hours=offset) for offset in range(baseline_hours + 1)
+        ]
+        trending = []
+
+        for hashtag, counts in series.items():
+            latest = counts.get(current, 0)
+            if latest < min_count:
+                continue
+
+            mean, variance = TrendService._ewma(
+                [counts.get(hour, 0) for hour in hours[:-1]], alpha
+            )
+            score = (latest - mean) / max(math.sqrt(variance), 1.0)
+            trending.append({
+                "hashtag": hashtag,
+                "score": round(score, 3),
+                "count": latest,
+                "baseline": round(mean, 3),
+            })
+
+        trending.sort(key=lambda entry: (-entry["score"], entry["hashtag"]))
+        logger.info(
+            f"Computed trending scores for {len(series)} hashtags at "
+            f"{current.isoformat()}"
+        )
+
+        return {"bucket": current.isoformat(), "trending": trending[:limit]}
+
+    @staticmethod
+    def _ewma(values: List[int], alpha: float):
+        """
+        Moyenne et variance exponentiellement pondérées d'une série.
+
+        Returns:
+            Tuple[float, float]: (moyenne, variance) après la dernière valeur
+        """
+        if not values:
+            return 0.0, 0.0
+
+        mean, variance = float(values[0]), 0.0
+        for value in values[1:]:
+            diff = value - mean
+            increment = alpha * diff
+            mean += increment
+            variance = (1 - alpha) * (variance + diff * increment)
+        return mean, variance
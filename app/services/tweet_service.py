@@ -5,18 +5,67 @@
 
 * **Fonctionnalités** :
 
-  1. **`collect_tweets(query, max_results, db)`**
+  1. **`collect_tweets(query, max_results, db, batch=False)`**
 
      * Vérifie la validité des paramètres (`query` non vide, `max_results > 0`).
-     * Appelle le client Twitter (`twitter_client.search_recent`).
-     * Pour chaque tweet trouvé :
+     * Appelle le client Twitter (`twitter_client.search_recent`) avec le `since_id` de
+       la requête (`SearchWatermark`) → seuls les tweets plus récents que la dernière
+       collecte sont transférés.
+     * Mode unitaire (par défaut) : pour chaque tweet trouvé :
 
        * Appelle `_save_tweet_if_new()` pour vérifier et insérer.
        * Compte les succès/erreurs.
+     * Mode batch (`batch=True`) : délègue toute la page à `save_tweets_batch()`.
+     * Avance le `since_id` de la requête (`meta.newest_id`) une fois la page
+       enregistrée.
      * Retourne la liste des tweets insérés.
      * Gestion robuste : si erreur API → `TwitterAPIError`, si problème DB → rollback + `DatabaseError`.
 
-  2. **`_save_tweet_if_new(tweet_data, db)` (privé)**
+  2. **`collect_tweets_async(query, max_results, db)`**
+
+     * Version asyncio de la collecte, utilisée par `POST /tweets/collect`.
+     * Appelle `async_twitter_client.search_recent` (httpx, pool partagé) sans bloquer
+       la boucle.
+     * Délègue l'écriture batch à un thread (`asyncio.to_thread`) pour ne pas figer les
+       autres requêtes.
+     * Même collecte incrémentale (`since_id`) que `collect_tweets`.
+
+  3. **`save_tweets_batch(tweets_data, db)`**
+
+     * Ingestion en masse d'une page complète de tweets.
+     * Un seul `SELECT ... WHERE tweet_id IN (...)` pour dédupliquer contre la base.
+     * Un seul `INSERT ... ON CONFLICT DO NOTHING RETURNING` (executemany) pour les
+       nouveaux tweets.
+     * JSON brut compressé dans `tweet_payloads` (un seul `INSERT` en masse), pas dans
+       `tweets`.
+     * Indexe les hashtags et met à jour les rollups (`IngestIndexer.index_tweets`) dans
+       la même transaction.
+     * Un seul `COMMIT` pour toute la page, suivi de l'invalidation du cache d'analytics
+       (`AnalyticsCache`).
+     * Retourne les tweets insérés dans l'ordre de la page (même contrat que le mode
+       unitaire).
+
+  4. **`collect_tweets_paginated(query, total, db, page_size, resume, on_page)`**
+
+     * Suit `meta.next_token` page après page jusqu'à `total` tweets (plusieurs
+       milliers).
+     * Précharge la page suivante (`asyncio.create_task`) pendant l'écriture de la page
+       courante.
+     * Commit chaque page dès réception → mémoire constante, rien n'est accumulé.
+     * Mémorise le `next_token` dans `CollectionState` (même transaction que la page) →
+       reprise après interruption.
+     * Passe le `since_id` de la requête ; ne l'avance qu'une fois **toutes** les pages
+       parcourues (une collecte arrêtée par `total` laisse des tweets plus anciens non
+       collectés).
+     * Rapporte la progression page par page (logs + callback `on_page` + résumé
+       retourné).
+
+  5. **`_build_tweet_row(tweet_data)` (privé)**
+
+     * Valide un tweet brut de l'API et le convertit en dict de colonnes `Tweet`.
+     * Partagé par le mode unitaire et le mode batch.
+
+  6. **`_save_tweet_if_new(tweet_data, db)` (privé)**
 
      * Vérifie que `tweet_data` est un dict valide et contient un `id`.
      * Check si le tweet existe déjà (`tweet_id`).
@@ -25,9 +74,11 @@
      * Gère les erreurs :
 
        * **Doublon** → rollback + warning.
-       * **Autre erreur DB** → rollback + log.
+       * **Autre erreur DB** → rollback + `DatabaseError` : comptée en erreur par
+         `collect_tweets`, qui n'avance alors pas le `since_id` (le tweet sera repris à
+         la prochaine collecte).
 
-  3. **`_parse_tweet_date(date_str)` (privé)**
+  7. **`_parse_tweet_date(date_str)` (privé)**
 
      * Parse une date Twitter (formats ISO8601 variés).
      * Supporte :
@@ -37,17 +88,53 @@
        * Fallback → ajoute `+00:00`.
      * Si parsing échoue → log warning et retourne `None`.
 
-  4. **`get_tweets(limit, db)`**
+  8. **`get_tweets(limit, db)`**
 
      * Récupère les tweets en DB, triés par `created_at` desc.
      * Limite entre 1 et 1000 (au-delà → warning sur pagination).
-     * Retourne une liste de `Tweet`.
+     * Retourne des lignes (`Row`) limitées aux colonnes de `TweetRead` (`READ_COLUMNS`)
+       : ni objets ORM, ni identity map, ni JSON brut.
 
-  5. **`get_tweets_count(db)`**
+  9. **`get_tweets_count(db)`**
 
      * Retourne le nombre total de tweets en DB.
      * En cas d’erreur → `DatabaseError`.
 
+  10. **`get_tweets_page(db, limit, cursor, author_id, start, end, hashtag)`**
+
+     * Pagination **par curseur** (keyset) sur `(created_at, id)` décroissants, utilisée
+       par `GET /tweets/`.
+     * Chaque page est une requête
+       `WHERE (created_at, id) < (curseur) ORDER BY ... LIMIT n` → latence constante
+       quelle que soit la profondeur (pas d'`OFFSET`).
+     * Les tweets sans `created_at` viennent en dernier (seconde phase triée par `id`).
+     * Filtres indexés : `author_id` (`ix_tweet_author_created`), plage `start` / `end`
+       (`ix_tweet_created`), `hashtag` (`ix_tweet_hashtags_hashtag`).
+     * Retourne la page (lignes `READ_COLUMNS`, comme `get_tweets`) et un `next_cursor`
+       opaque (`utils.cursor`), `None` sur la dernière page.
+
+  11. **`export_tweets(db, fmt, columns, start, end, chunk_size)`**
+
+     * Générateur de morceaux de texte NDJSON (une ligne JSON par tweet) ou CSV (avec
+       en-tête), utilisé par `GET /tweets/export`.
+     * Lecture en flux (`yield_per` + `partitions()`, curseur serveur sur PostgreSQL) →
+       mémoire constante, aucun objet ORM ni Pydantic.
+     * Colonnes au choix parmi `EXPORT_COLUMNS`, plage `start` / `end` optionnelle,
+       ordre par `id`.
+     * `raw_json` → jointure sur `tweet_payloads` et décompression à la volée
+       (`PayloadService`).
+
+  12. **`get_since_id(query, db)` / `_advance_since_id(query, newest_id, db)`**
+
+     * Lit / avance (sans commit) le plus grand `tweet_id` reçu pour une requête
+       (`search_watermarks`).
+     * Aussi avancé par le planificateur (`CollectionScheduler`) pour les requêtes
+       surveillées.
+
+* **Métriques** (`/metrics`) : `tweets_ingested_total`, `tweets_deduplicated_total` et
+  `tweets_failed_total{reason}` (`invalid` : tweet sans identifiant ; `database` :
+  écriture échouée), comptés quel que soit le mode de collecte.
+
 * **Points forts** :
 
   * Gestion robuste des erreurs (rollback systématique si DB plante).
@@ -61,28 +148,73 @@ Là où `analytics_service` exploite les tweets déjà stockés, **`tweet_servic
 Tu veux que je t’enchaîne le résumé du **`twitter_client`** quand tu me l’envoies ? Je sens que c’est la pièce qui ferme la boucle côté API externe 🔗.
 
 """
+import asyncio
+import csv
+import io
 import json
 import logging
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import Row, literal, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
 from .. import models
+from ..database import dialect_insert
 from ..exceptions import DatabaseError, TwitterAPIError
-from .twitter_client import twitter_client
+from ..utils.cursor import decode_cursor, encode_cursor
+from ..utils.dates import to_utc_naive
+from .cache_service import AnalyticsCache
+from .ingest_indexer import IngestIndexer
+from .metrics import tweets_deduplicated, tweets_failed, tweets_ingested
+from .payload_service import PayloadService
+from .twitter_client import twitter_client, async_twitter_client
 
 logger = logging.getLogger(__name__)
 
+# Colonnes exportables par `GET /tweets/export` (par défaut : toutes sauf le JSON brut)
+EXPORT_COLUMNS = (
+    "id",
+    "tweet_id",
+    "author_id",
+    "text",
+    "created_at",
+    "collected_at",
+    "raw_json",
+)
+DEFAULT_EXPORT_COLUMNS = EXPORT_COLUMNS[:-1]
+
+# Colonnes lues pour les réponses `TweetRead` (lignes légères plutôt qu'entités `Tweet`)
+READ_COLUMNS = (
+    models.Tweet.id,
+    models.Tweet.tweet_id,
+    models.Tweet.author_id,
+    models.Tweet.text,
+    models.Tweet.created_at,
+    models.Tweet.collected_at,
+)
+
 
 class TweetService:
     """Service pour la gestion des tweets avec gestion d'erreurs robuste."""
 
     @staticmethod
-    def collect_tweets(query: str, max_results: int, db: Session) -> List[models.Tweet]:
+    def collect_tweets(
+        query: str,
+        max_results: int,
+        db: Session,
+        batch: bool = False
+    ) -> List[models.Tweet]:
         """
         Collecte des tweets depuis l'API et les sauvegarde en base.
         Améliore la gestion d'erreurs et la validation des entrées.
+
+        Args:
+            query: Requête de recherche
+            max_results: Nombre maximum de tweets à récupérer
+            db: Session de base de données
+            batch: Si True, ingère toute la page en une seule transaction
+                   (voir `save_tweets_batch`)
         """
         if not query or not query.strip():
             raise ValueError("Query cannot be empty or whitespace-only.")
@@ -93,17 +225,30 @@ class TweetService:
         if not twitter_client:
             raise TwitterAPIError("Twitter client not configured. Check BEARER_TOKEN.")
 
+        query = query.strip()
+
         try:
-            api_response = twitter_client.search_recent(query.strip(), max_results)
+            since_id = TweetService.get_since_id(query, db)
+            api_response = twitter_client.search_recent(
+                query, max_results, since_id=since_id
+            )
             tweets_data = api_response.get("data", [])
+            newest_id = TweetService._newest_id(api_response)
 
             if not tweets_data:
-                logger.info(f"No tweets found for query: {query}")
+                logger.info(f"No new tweets found for query: {query}")
                 return []
 
+            if batch:
+                saved_tweets = TweetService.save_tweets_batch(
+                    tweets_data, db, commit=False
+                )
+                TweetService._commit_since_id(query, newest_id, db, bool(saved_tweets))
+                return saved_tweets
+
             saved_tweets = []
             errors_count = 0
-            
+
             for tweet_data in tweets_data:
                 try:
                     tweet = TweetService._save_tweet_if_new(tweet_data, db)
@@ -115,6 +260,11 @@ class TweetService:
                     continue
 
             logger.info(f"Successfully saved {len(saved_tweets)} new tweets, {errors_count} errors")
+            if not errors_count:
+                # Tous les tweets sont enregistrés ou déjà connus (commités un par un) :
+                # seul le since_id reste à écrire. Sinon il n'avance pas, pour reprendre
+                # les échecs.
+                TweetService._commit_since_id(query, newest_id, db, False)
             return saved_tweets
 
         except TwitterAPIError as e:
@@ -126,59 +276,545 @@ class TweetService:
             raise DatabaseError(f"Tweet collection failed: {str(e)}")
 
     @staticmethod
-    def _save_tweet_if_new(tweet_data: dict, db: Session) -> Optional[models.Tweet]:
+    async def collect_tweets_async(
+        query: str, max_results: int, db: Session
+    ) -> List[models.Tweet]:
         """
-        Sauvegarde un tweet avec validation et gestion d'erreurs améliorée.
+        Collecte asynchrone : appel API non bloquant puis écriture batch dans un thread.
+
+        Args:
+            query: Requête de recherche
+            max_results: Nombre maximum de tweets à récupérer
+            db: Session de base de données
+
+        Returns:
+            List[models.Tweet]: Nouveaux tweets insérés
+        """
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty or whitespace-only.")
+
+        if max_results <= 0:
+            raise ValueError("max_results must be greater than 0.")
+
+        if not async_twitter_client:
+            raise TwitterAPIError("Twitter client not configured. Check BEARER_TOKEN.")
+
+        query = query.strip()
+
+        try:
+            tweets_data, newest_id = await TweetService._fetch_new_page(
+                query, max_results, db
+            )
+
+            if not tweets_data:
+                logger.info(f"No new tweets found for query: {query}")
+                return []
+
+            # L'écriture SQLAlchemy est synchrone : on la sort de la boucle
+            # d'événements. La session n'est utilisée que par ce thread jusqu'au retour,
+            # sur sa propre connexion (pool par session, cf. `create_database_engine`) :
+            # les autres requêtes n'y touchent pas.
+            return await asyncio.to_thread(
+                TweetService._save_page_and_since_id, query, tweets_data, newest_id, db
+            )
+
+        except (TwitterAPIError, DatabaseError) as e:
+            logger.error(f"Error during async tweet collection: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error during tweet collection: {e}")
+            db.rollback()
+            raise DatabaseError(f"Tweet collection failed: {str(e)}")
+
+    @staticmethod
+    async def _fetch_new_page(
+        query: str,
+        max_results: int,
+        db: Session
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Récupère la page de tweets plus récents que le `since_id` de la requête (sans
+        rien écrire).
+
+        Returns:
+            Tuple: Tweets bruts reçus et plus grand identifiant de la page (None si
+                vide)
+
+        Raises:
+            TwitterAPIError: Si l'API échoue ou si le client n'est pas configuré
+        """
+        if not async_twitter_client:
+            raise TwitterAPIError("Twitter client not configured. Check BEARER_TOKEN.")
+
+        since_id = await asyncio.to_thread(TweetService.get_since_id, query, db)
+        api_response = await async_twitter_client.search_recent(
+            query, max_results, since_id=since_id
+        )
+        return api_response.get("data", []), TweetService._newest_id(api_response)
+
+    @staticmethod
+    def save_tweets_batch(
+        tweets_data: List[dict],
+        db: Session,
+        commit: bool = True
+    ) -> List[models.Tweet]:
+        """
+        Sauvegarde une page de tweets en une seule transaction.
+
+        Déduplique la page contre `tweets.tweet_id` en une requête, insère tous
+        les nouveaux tweets en un seul `INSERT ... ON CONFLICT DO NOTHING` et
+        ne commit qu'une fois.
+
+        Args:
+            tweets_data: Tweets bruts retournés par l'API
+            db: Session de base de données
+            commit: Si False, laisse l'appelant commiter (pour grouper d'autres
+                écritures)
+
+        Returns:
+            List[models.Tweet]: Tweets réellement insérés, dans l'ordre de la page
+
+        Raises:
+            DatabaseError: Si l'insertion en masse échoue
+        """
+        # Validation et déduplication intra-page
+        rows: Dict[str, Dict[str, Any]] = {}
+        valid_count = 0
+        for tweet_data in tweets_data:
+            row = TweetService._build_tweet_row(tweet_data)
+            if row:
+                valid_count += 1
+                rows.setdefault(row["tweet_id"], row)
+
+        if not rows:
+            return []
+
+        try:
+            # Déduplication contre la base en une seule requête
+            existing_ids = {
+                tweet_id for (tweet_id,) in db.query(models.Tweet.tweet_id).filter(
+                    models.Tweet.tweet_id.in_(list(rows))
+                )
+            }
+            # Le JSON brut part compressé dans `tweet_payloads`, pas dans `tweets`
+            raw_jsons = {
+                tweet_id: row.pop("raw_json")
+                for tweet_id, row in rows.items()
+                if tweet_id not in existing_ids
+            }
+            new_rows = [rows[tweet_id] for tweet_id in raw_jsons]
+
+            if not new_rows:
+                logger.info(
+                    f"Batch of {len(rows)} tweets already stored, nothing to insert"
+                )
+                tweets_deduplicated.inc(amount=valid_count)
+                return []
+
+            stmt = dialect_insert(db, models.Tweet)
+            if hasattr(stmt, "on_conflict_do_nothing"):
+                # Protège contre les insertions concurrentes entre le SELECT et l'INSERT
+                stmt = stmt.on_conflict_do_nothing(index_elements=["tweet_id"])
+
+            saved_tweets = db.scalars(stmt.returning(models.Tweet), new_rows).all()
+
+            payloads = [
+                {
+                    "tweet_id": tweet.id,
+                    **models.TweetPayload.compress(raw_jsons[tweet.tweet_id]),
+                }
+                for tweet in saved_tweets
+            ]
+            if payloads:
+                db.execute(dialect_insert(db, models.TweetPayload), payloads)
+
+            # Index des hashtags et rollups dans la même transaction
+            IngestIndexer.index_tweets(
+                db, [(tweet.id, tweet.text, tweet.created_at) for tweet in saved_tweets]
+            )
+
+            # Détache les objets pour éviter un rechargement par tweet après le commit
+            # (JSON brut gardé en clair : `raw_json` reste lisible sans requête)
+            for tweet in saved_tweets:
+                tweet._raw_json = raw_jsons[tweet.tweet_id]
+                db.expunge(tweet)
+            if saved_tweets:
+                AnalyticsCache.bump(db)
+            if commit:
+                db.commit()
+                if saved_tweets:
+                    AnalyticsCache.invalidate()
+
+        except Exception as e:
+            db.rollback()
+            tweets_failed.inc("database", amount=len(rows))
+            logger.error(f"Batch insert of {len(rows)} tweets failed: {e}")
+            raise DatabaseError(f"Batch insert failed: {str(e)}")
+
+        tweets_ingested.inc(amount=len(saved_tweets))
+        tweets_deduplicated.inc(amount=valid_count - len(saved_tweets))
+
+        # RETURNING ne garantit pas l'ordre : on restaure celui de la page
+        position = {tweet_id: index for index, tweet_id in enumerate(rows)}
+        saved_tweets = sorted(saved_tweets, key=lambda tweet: position[tweet.tweet_id])
+
+        logger.info(
+            f"Batch saved {len(saved_tweets)} new tweets, "
+            f"{len(rows) - len(saved_tweets)} duplicates skipped"
+        )
+        return saved_tweets
+
+    @staticmethod
+    async def collect_tweets_paginated(
+        query: str,
+        total: int,
+        db: Session,
+        page_size: int = 100,
+        resume: bool = True,
+        on_page: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Collecte plusieurs pages en suivant `meta.next_token`, jusqu'à `total` tweets.
+
+        La page suivante est préchargée pendant que la page courante est écrite,
+        chaque page est commitée dès réception (mémoire constante) et le dernier
+        `next_token` est mémorisé dans `CollectionState` pour permettre la reprise.
+
+        Args:
+            query: Requête de recherche
+            total: Nombre maximum de tweets à récupérer sur toutes les pages
+            db: Session de base de données
+            page_size: Nombre de tweets demandés par page (10-100)
+            resume: Reprend depuis le dernier `next_token` commité pour cette requête
+            on_page: Callback optionnel appelé avec la progression de chaque page
+
+        Returns:
+            Dict: Résumé de la collecte (pages, totaux, dernier next_token, completed)
+        """
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty or whitespace-only.")
+
+        if total <= 0:
+            raise ValueError("total must be greater than 0.")
+
+        if not async_twitter_client:
+            raise TwitterAPIError("Twitter client not configured. Check BEARER_TOKEN.")
+
+        query = query.strip()
+        page_size = max(10, min(100, page_size))
+
+        state = await asyncio.to_thread(TweetService._get_collection_state, query, db)
+        next_token = state.next_token if resume else None
+        if next_token:
+            logger.info(
+                f"Resuming collection for query '{query}' from token {next_token}"
+            )
+        since_id = await asyncio.to_thread(TweetService.get_since_id, query, db)
+        newest_id = None
+
+        summary: Dict[str, Any] = {
+            "query": query,
+            "pages": [],
+            "total_fetched": 0,
+            "total_saved": 0,
+            "next_token": next_token,
+            "completed": False,
+        }
+
+        fetch: Optional[asyncio.Task] = asyncio.create_task(
+            async_twitter_client.search_recent(
+                query, min(page_size, total), next_token, since_id=since_id
+            )
+        )
+
+        try:
+            while fetch is not None:
+                api_response = await fetch
+                tweets_data = api_response.get("data", [])[
+                    : total - summary["total_fetched"]
+                ]
+                next_token = api_response.get("meta", {}).get("next_token")
+                newest_id = newest_id or TweetService._newest_id(api_response)
+                summary["total_fetched"] += len(tweets_data)
+
+                # Préchargement de la page suivante pendant l'écriture de la page
+                # courante
+                remaining = total - summary["total_fetched"]
+                fetch = None
+                if next_token and remaining > 0:
+                    fetch = asyncio.create_task(
+                        async_twitter_client.search_recent(
+                            query,
+                            min(page_size, remaining),
+                            next_token,
+                            since_id=since_id,
+                        )
+                    )
+
+                # Dernière page atteinte : tout ce qui précède newest_id est collecté
+                saved_count = await asyncio.to_thread(
+                    TweetService._persist_page, query, tweets_data, next_token, db,
+                    newest_id if next_token is None else None
+                )
+
+                progress = {
+                    "page": len(summary["pages"]) + 1,
+                    "fetched": len(tweets_data),
+                    "saved": saved_count,
+                    "duplicates": len(tweets_data) - saved_count,
+                    "next_token": next_token,
+                }
+                summary["pages"].append(progress)
+                summary["total_saved"] += saved_count
+                summary["next_token"] = next_token
+
+                logger.info(
+                    f"Page {progress['page']} for '{query}': "
+                    f"{progress['fetched']} fetched, "
+                    f"{progress['saved']} saved ({summary['total_fetched']}/{total})"
+                )
+                if on_page:
+                    on_page(progress)
+
+        except BaseException:
+            # Le dernier token commité reste dans CollectionState pour la reprise
+            if fetch is not None:
+                fetch.cancel()
+            raise
+
+        summary["completed"] = summary["next_token"] is None
+        return summary
+
+    @staticmethod
+    def _get_collection_state(query: str, db: Session) -> models.CollectionState:
+        """Retourne (en le créant si besoin) l'état de collecte d'une requête."""
+        state = db.query(models.CollectionState).filter(
+            models.CollectionState.query == query
+        ).first()
+
+        if state is None:
+            state = models.CollectionState(
+                query=query, pages_collected=0, tweets_fetched=0, tweets_saved=0
+            )
+            db.add(state)
+            db.commit()
+        return state
+
+    @staticmethod
+    def _persist_page(
+        query: str,
+        tweets_data: List[dict],
+        next_token: Optional[str],
+        db: Session,
+        newest_id: Optional[str] = None
+    ) -> int:
+        """
+        Écrit une page et avance `CollectionState` dans la même transaction.
+
+        Args:
+            newest_id: `since_id` à enregistrer pour la requête (optionnel, dernière
+                page)
+
+        Returns:
+            int: Nombre de tweets réellement insérés
+        """
+        saved_tweets = TweetService.save_tweets_batch(tweets_data, db, commit=False)
+
+        try:
+            state = TweetService._get_collection_state(query, db)
+            state.next_token = next_token
+            state.pages_collected += 1
+            state.tweets_fetched += len(tweets_data)
+            state.tweets_saved += len(saved_tweets)
+            TweetService._advance_since_id(query, newest_id, db)
+            db.commit()
+            if saved_tweets:
+                AnalyticsCache.invalidate()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to commit page for query '{query}': {e}")
+            raise DatabaseError(f"Failed to commit collection page: {str(e)}")
+
+        return len(saved_tweets)
+
+    @staticmethod
+    def get_since_id(query: str, db: Session) -> Optional[str]:
+        """
+        Retourne le plus grand `tweet_id` déjà reçu pour une requête.
+
+        Args:
+            query: Requête de recherche
+            db: Session de base de données
+
+        Returns:
+            Optional[str]: `since_id` à passer à l'API, ou None (première collecte)
+        """
+        watermark = db.get(models.SearchWatermark, query)
+        return watermark.since_id if watermark else None
+
+    @staticmethod
+    def _advance_since_id(
+        query: str, newest_id: Optional[str], db: Session
+    ) -> Optional[str]:
+        """
+        Avance le `since_id` d'une requête si `newest_id` est plus récent (sans commit).
+
+        Returns:
+            Optional[str]: `since_id` de la requête après l'avancée
+        """
+        watermark = db.get(models.SearchWatermark, query)
+        if not newest_id:
+            return watermark.since_id if watermark else None
+        if watermark is None:
+            db.add(models.SearchWatermark(query=query, since_id=newest_id))
+        elif TweetService._is_newer(newest_id, watermark.since_id):
+            watermark.since_id = newest_id
+        else:
+            return watermark.since_id
+        return newest_id
+
+    @staticmethod
+    def _commit_since_id(
+        query: str, newest_id: Optional[str], db: Session, invalidate: bool
+    ) -> None:
+        """
+        Avance le `since_id` de la requête et commit (avec la page si elle n'est pas
+        encore commitée).
+
+        Raises:
+            DatabaseError: Si le commit échoue
+        """
+        try:
+            TweetService._advance_since_id(query, newest_id, db)
+            db.commit()
+            if invalidate:
+                AnalyticsCache.invalidate()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to commit since_id for query '{query}': {e}")
+            raise DatabaseError(f"Failed to commit collected tweets: {str(e)}")
+
+    @staticmethod
+    def _save_page_and_since_id(
+        query: str,
+        tweets_data: List[dict],
+        newest_id: Optional[str],
+        db: Session
+    ) -> List[models.Tweet]:
+        """Écrit une page et le `since_id` de la requête dans une seule transaction."""
+        saved_tweets = TweetService.save_tweets_batch(tweets_data, db, commit=False)
+        TweetService._commit_since_id(query, newest_id, db, bool(saved_tweets))
+        return saved_tweets
+
+    @staticmethod
+    def _newest_id(api_response: Dict[str, Any]) -> Optional[str]:
+        """
+        Plus grand identifiant d'une réponse de l'API : `meta.newest_id`,
+        ou à défaut le plus grand `id` numérique de `data`.
+        """
+        newest_id = api_response.get("meta", {}).get("newest_id")
+        if newest_id:
+            return str(newest_id)
+        ids = [
+            str(tweet.get("id")) for tweet in api_response.get("data", [])
+            if isinstance(tweet, dict) and str(tweet.get("id", "")).isdigit()
+        ]
+        return max(ids, key=int) if ids else None
+
+    @staticmethod
+    def _is_newer(candidate: str, current: Optional[str]) -> bool:
+        """Compare deux identifiants de tweets (entiers sous forme de chaînes)."""
+        if not current:
+            return True
+        try:
+            return int(candidate) > int(current)
+        except ValueError:
+            return candidate != current
+
+    @staticmethod
+    def _build_tweet_row(tweet_data: dict) -> Optional[Dict[str, Any]]:
+        """
+        Valide un tweet brut et le convertit en colonnes du modèle `Tweet`.
+
+        Returns:
+            Optional[Dict]: Colonnes prêtes à insérer, ou None si le tweet est invalide
         """
         if not isinstance(tweet_data, dict):
             logger.warning("Invalid tweet data format: expected dict")
+            tweets_failed.inc("invalid")
             return None
-            
+
         tweet_id = tweet_data.get("id")
         if not tweet_id or not str(tweet_id).strip():
             logger.warning(f"Skipping tweet without valid id: {tweet_data}")
+            tweets_failed.inc("invalid")
+            return None
+
+        return {
+            "tweet_id": str(tweet_id),
+            "author_id": tweet_data.get("author_id"),
+            "text": tweet_data.get("text", ""),
+            "created_at": TweetService._parse_tweet_date(tweet_data.get("created_at")),
+            "raw_json": json.dumps(tweet_data, ensure_ascii=False),
+        }
+
+    @staticmethod
+    def _save_tweet_if_new(tweet_data: dict, db: Session) -> Optional[models.Tweet]:
+        """
+        Sauvegarde un tweet avec validation et gestion d'erreurs améliorée.
+
+        Returns:
+            Optional[models.Tweet]: Tweet inséré, ou None s'il est invalide ou déjà en
+            base
+
+        Raises:
+            DatabaseError: Si la vérification ou l'insertion échoue pour une autre
+                raison qu'un doublon
+        """
+        row = TweetService._build_tweet_row(tweet_data)
+        if row is None:
             return None
 
+        tweet_id = row["tweet_id"]
+
         try:
             # Vérification d'existence avec gestion d'erreurs
-            existing = db.query(models.Tweet).filter(
+            existing = db.query(models.Tweet.id).filter(
                 models.Tweet.tweet_id == str(tweet_id)
             ).first()
-            
+
             if existing:
                 logger.debug(f"Tweet {tweet_id} already exists, skipping")
+                tweets_deduplicated.inc()
                 return None
 
         except Exception as e:
             logger.error(f"Error checking tweet existence for {tweet_id}: {e}")
-            return None
+            tweets_failed.inc("database")
+            raise DatabaseError(f"Failed to check tweet {tweet_id}: {str(e)}")
 
-        # Parsing de la date avec gestion d'erreurs robuste
-        created_at = TweetService._parse_tweet_date(tweet_data.get("created_at"))
-
-        new_tweet = models.Tweet(
-            tweet_id=str(tweet_id),
-            author_id=tweet_data.get("author_id"),
-            text=tweet_data.get("text", ""),
-            created_at=created_at,
-            raw_json=json.dumps(tweet_data, ensure_ascii=False)
-        )
+        new_tweet = models.Tweet(**row)
 
         try:
             db.add(new_tweet)
+            AnalyticsCache.bump(db)
             db.commit()
+            AnalyticsCache.invalidate()
             db.refresh(new_tweet)
+            tweets_ingested.inc()
             logger.debug(f"Successfully saved tweet {tweet_id}")
             return new_tweet
-            
+
         except IntegrityError as e:
             db.rollback()
+            tweets_deduplicated.inc()
             logger.warning(f"Tweet {tweet_id} already exists (integrity constraint): {e}")
             return None
         except Exception as e:
             db.rollback()
+            tweets_failed.inc("database")
             logger.error(f"Database error saving tweet {tweet_id}: {e}")
-            return None
+            raise DatabaseError(f"Failed to save tweet {tweet_id}: {str(e)}")
 
     @staticmethod
     def _parse_tweet_date(date_str: Optional[str]) -> Optional[datetime]:
@@ -188,7 +824,7 @@ class TweetService:
         """
         if not date_str:
             return None
-            
+
         try:
             # Format Twitter standard ISO8601
             if date_str.endswith('Z'):
@@ -198,24 +834,28 @@ class TweetService:
             else:
                 # Fallback pour d'autres formats
                 return datetime.fromisoformat(date_str + "+00:00")
-                
+
         except (ValueError, TypeError) as e:
             logger.warning(f"Invalid date format '{date_str}': {e}")
             return None
 
     @staticmethod
-    def get_tweets(limit: int, db: Session) -> List[models.Tweet]:
+    def get_tweets(limit: int, db: Session) -> List[Row]:
         """
         Récupère les tweets avec validation des paramètres et gestion d'erreurs.
+
+        Returns:
+            List[Row]: Lignes `READ_COLUMNS` (attributs `id`, `tweet_id`, ... comme un
+            `Tweet`)
         """
         if limit <= 0:
             raise ValueError("Limit must be greater than 0")
-            
+
         if limit > 1000:
             logger.warning(f"Large limit requested: {limit}, consider pagination")
-            
+
         try:
-            return db.query(models.Tweet)\
+            return db.query(*READ_COLUMNS)\
                      .order_by(models.Tweet.created_at.desc())\
                      .limit(limit)\
                      .all()
@@ -223,6 +863,189 @@ class TweetService:
             logger.error(f"Database error retrieving tweets: {e}")
             raise DatabaseError(f"Failed to retrieve tweets: {str(e)}")
 
+    @staticmethod
+    def get_tweets_page(
+        db: Session,
+        limit: int,
+        cursor: Optional[str] = None,
+        author_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        hashtag: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Récupère une page de tweets par curseur (keyset) sur `(created_at, id)`.
+
+        Args:
+            db: Session de base de données
+            limit: Taille de la page
+            cursor: Curseur opaque retourné par la page précédente (optionnel)
+            author_id: Filtre sur l'auteur (optionnel)
+            start: Borne basse incluse sur `created_at` (optionnelle)
+            end: Borne haute exclue sur `created_at` (optionnelle)
+            hashtag: Filtre sur un hashtag, avec ou sans `#` (optionnel)
+
+        Returns:
+            Tuple: Tweets de la page (lignes `READ_COLUMNS`) et curseur de la page
+                suivante (None si dernière page)
+
+        Raises:
+            ValueError: Si `limit` ou le curseur est invalide
+            DatabaseError: Si la lecture échoue
+        """
+        if limit <= 0:
+            raise ValueError("Limit must be greater than 0")
+
+        position = decode_cursor(cursor, datetime.fromisoformat) if cursor else None
+
+        try:
+            query = db.query(*READ_COLUMNS)
+            if author_id is not None:
+                query = query.filter(models.Tweet.author_id == author_id)
+            if hashtag:
+                normalized = "#" + hashtag.lstrip("#").lower()
+                query = query.join(
+                    models.TweetHashtag, models.TweetHashtag.tweet_id == models.Tweet.id
+                ).filter(models.TweetHashtag.hashtag == normalized)
+
+            tweets = []
+            dated = start is not None or end is not None
+
+            # Phase 1 : tweets datés, (created_at, id) décroissants
+            if position is None or position[0] is not None:
+                phase = query.filter(models.Tweet.created_at.isnot(None))
+                if start is not None:
+                    phase = phase.filter(models.Tweet.created_at >= to_utc_naive(start))
+                if end is not None:
+                    phase = phase.filter(models.Tweet.created_at < to_utc_naive(end))
+                if position is not None:
+                    phase = phase.filter(
+                        tuple_(models.Tweet.created_at, models.Tweet.id)
+                        < tuple_(literal(position[0]), literal(position[1]))
+                    )
+                tweets = (
+                    phase.order_by(
+                        models.Tweet.created_at.desc(), models.Tweet.id.desc()
+                    )
+                    .limit(limit + 1)
+                    .all()
+                )
+
+            # Phase 2 : tweets sans date (exclus si une plage est demandée), id
+            # décroissants
+            if len(tweets) <= limit and not dated:
+                phase = query.filter(models.Tweet.created_at.is_(None))
+                if position is not None and position[0] is None:
+                    phase = phase.filter(models.Tweet.id < position[1])
+                tweets += phase.order_by(models.Tweet.id.desc())\
+                               .limit(limit + 1 - len(tweets))\
+                               .all()
+
+        except Exception as e:
+            logger.error(f"Database error retrieving tweets page: {e}")
+            raise DatabaseError(f"Failed to retrieve tweets: {str(e)}")
+
+        # Une ligne de plus que demandé indique qu'une page suivante existe
+        next_cursor = None
+        if len(tweets) > limit:
+            tweets = tweets[:limit]
+            next_cursor = encode_cursor(
+                tweets[-1].created_at.isoformat() if tweets[-1].created_at else None,
+                tweets[-1].id
+            )
+
+        return tweets, next_cursor
+
+    @staticmethod
+    def export_tweets(
+        db: Session,
+        fmt: str = "ndjson",
+        columns: Sequence[str] = DEFAULT_EXPORT_COLUMNS,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_size: int = 1000
+    ) -> Iterator[str]:
+        """
+        Exporte les tweets en flux, un morceau de texte par paquet de lignes.
+
+        Args:
+            db: Session de base de données
+            fmt: `ndjson` ou `csv`
+            columns: Colonnes exportées (parmi `EXPORT_COLUMNS`)
+            start: Borne basse incluse sur `created_at` (optionnelle)
+            end: Borne haute exclue sur `created_at` (optionnelle)
+            chunk_size: Nombre de lignes lues (et émises) par paquet
+
+        Yields:
+            str: Lignes NDJSON ou CSV d'un paquet
+
+        Raises:
+            ValueError: Si le format ou une colonne est inconnu
+        """
+        if fmt not in ("ndjson", "csv"):
+            raise ValueError(f"Unsupported export format '{fmt}'")
+        unknown = [column for column in columns if column not in EXPORT_COLUMNS]
+        if unknown or not columns:
+            raise ValueError(
+                f"Unknown export columns {unknown}, expected a subset of "
+                f"{list(EXPORT_COLUMNS)}"
+            )
+
+        stmt = PayloadService.select_tweets(columns)
+        if start is not None:
+            stmt = stmt.where(models.Tweet.created_at >= to_utc_naive(start))
+        if end is not None:
+            stmt = stmt.where(models.Tweet.created_at < to_utc_naive(end))
+        stmt = stmt.order_by(models.Tweet.id).execution_options(yield_per=chunk_size)
+
+        def generate() -> Iterator[str]:
+            result = db.execute(stmt)
+            try:
+                if fmt == "csv":
+                    yield TweetService._csv_lines([columns])
+                rows: Sequence[Any]
+                for rows in result.partitions():
+                    if "raw_json" in columns:
+                        rows = [PayloadService.decode_row(columns, row) for row in rows]
+                    if fmt == "csv":
+                        yield TweetService._csv_lines(
+                            [value.isoformat() if isinstance(value, datetime) else value
+                             for value in row]
+                            for row in rows
+                        )
+                    else:
+                        yield "".join(
+                            json.dumps(
+                                dict(zip(columns, row)),
+                                ensure_ascii=False,
+                                default=TweetService._json_default,
+                            )
+                            + "\n"
+                            for row in rows
+                        )
+            finally:
+                # Libère le curseur même si le client se déconnecte en cours de route
+                result.close()
+
+        # Validation immédiate, lecture différée au premier morceau demandé
+        return generate()
+
+    @staticmethod
+    def _json_default(value: Any) -> str:
+        """Sérialisation JSON des dates de l'export."""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        raise TypeError(
+            f"Object of type {type(value).__name__} is not JSON serializable"
+        )
+
+    @staticmethod
+    def _csv_lines(rows) -> str:
+        """Formate des lignes en CSV."""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
     @staticmethod
     def get_tweets_count(db: Session) -> int:
         """Retourne le nombre total de tweets en base."""
@@ -230,4 +1053,4 @@ class TweetService:
             return db.query(models.Tweet).count()
         except Exception as e:
             logger.error(f"Error counting tweets: {e}")
-            raise DatabaseError(f"Failed to count tweets: {str(e)}")
\ No newline at end of file
+            raise DatabaseError(f"Failed to count tweets: {str(e)}")
@@ -10,8 +10,38 @@
 
     * Configure l’authentification avec le **Bearer Token** (pris dans `settings`).
     * Définit une session HTTP (`requests.Session`) avec stratégie de **retry automatique** pour robustesse.
+    * Passe chaque requête par le gouverneur de quota partagé (`rate_limit_governor`).
     * Supporte le timeout (30s).
-  * Instance globale `twitter_client` créée si `settings.bearer_token` est défini, sinon `None`.
+  * Classe `AsyncTwitterClient` :
+
+    * Même interface que `TwitterClient`, mais **asyncio-native** (basée sur
+      `httpx.AsyncClient`).
+    * Pool de connexions keep-alive partagé (`x_api_max_connections`,
+      `x_api_max_keepalive`).
+    * HTTP/2 activé si `x_api_http2=True` et que le paquet `h2` est disponible.
+    * Retry avec backoff exponentiel non bloquant (`asyncio.sleep`) sur
+      `[500, 502, 503, 504]`.
+    * Même gouverneur de quota que `TwitterClient` (attente sans bloquer la boucle).
+    * `transport` injectable → permet de viser un serveur stub local ou un
+      `httpx.MockTransport`.
+  * Instances globales `twitter_client` et `async_twitter_client` créées si
+    `settings.bearer_token` est défini, sinon `None`.
+
+* **Enregistrement** : si un `ResponseCorpus` est fourni (`x_api_record_path` pour les
+  instances globales), chaque réponse valide y est ajoutée → corpus rejouable par le
+  serveur stub (`app.stub_api`).
+
+* **Métriques** (`/metrics`) : latence de chaque appel HTTP
+  (`x_api_request_duration_seconds`) et codes de réponse (`x_api_responses_total`,
+  `error` pour les erreurs réseau), par client (`sync` / `async`).
+
+* **Quota (`429`)** :
+
+  * Les `429` ne passent plus par le backoff fixe : les en-têtes `x-rate-limit-*` de
+    **chaque** réponse alimentent `RateLimitGovernor`, qui met les requêtes suivantes en
+    attente jusqu'au `reset` (ou les rejette si l'attente est trop longue).
+  * Un `429` est retenté après le `reset` (au plus `RATE_LIMIT_RETRIES` fois) ; un rejet
+    lève `RateLimitExceeded` (→ `429` côté API).
 
 * **Fonctionnalités** :
 
@@ -22,10 +52,11 @@
 
   2. **`_create_session()`** (interne)
 
-     * Monte un `HTTPAdapter` avec stratégie de retry (`3 tentatives`, backoff exponentiel `1s`, pour codes `[429, 500, 502, 503, 504]`).
+     * Monte un `HTTPAdapter` avec stratégie de retry (`3 tentatives`, backoff
+       exponentiel `1s`, pour codes `[500, 502, 503, 504]`).
      * Ajoute les headers d’authentification (`Bearer`).
 
-  3. **`search_recent(query, max_results, next_token)`**
+  3. **`search_recent(query, max_results, next_token, since_id)`**
 
      * Fait un appel GET sur `/tweets/search/recent`.
      * Paramètres :
@@ -34,6 +65,7 @@
        * `max_results` : borné entre 10 et 100.
        * `tweet.fields` : récupère `created_at, author_id, text, id`.
        * `next_token` : pour pagination.
+       * `since_id` : ne retourne que les tweets plus récents (collecte incrémentale).
      * Retourne le JSON brut de l’API.
      * Logs détaillés : début recherche, nb de tweets récupérés.
      * Gestion d’erreurs :
@@ -41,9 +73,19 @@
        * Problème réseau/HTTP → `TwitterAPIError`.
        * Réponse JSON invalide → `TwitterAPIError`.
 
+  4. **`AsyncTwitterClient.search_recent(...)` / `aclose()`**
+
+     * Version `async` de la recherche, utilisée par la route `POST /tweets/collect` et
+       le planificateur.
+     * `since_id` (optionnel) → ne retourne que les tweets plus récents que cet
+       identifiant.
+     * `aclose()` ferme le pool (appelé à l'arrêt de l'application).
+
 * **Exemple de flow** :
 
   * `TweetService.collect_tweets()` appelle `twitter_client.search_recent(...)`.
+  * `TweetService.collect_tweets_async()` appelle
+    `await async_twitter_client.search_recent(...)` sans bloquer la boucle d'événements.
   * Si `twitter_client` n’est pas instancié (pas de token), `TweetService` lève une `TwitterAPIError`.
 
 👉 En bref : `twitter_client` est **le guichet officiel pour interroger Twitter/X**.
@@ -52,32 +94,67 @@ Il est conçu pour être robuste (retry, logs, gestion d’erreurs) et sert de b
 Tu veux que je résume maintenant les **`models`** et **`schemas`** (les pièces centrales pour la DB et la validation API), ou tu préfères que je reste concentré sur les services/routes avant d’attaquer la structure data ?
 
 """
+import asyncio
+import importlib.util
 import requests
+import httpx
 import logging
+import time
 from typing import Dict, Any, Optional
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from ..config import settings
 from ..exceptions import TwitterAPIError, ConfigurationError
+from .corpus import ResponseCorpus
+from .metrics import x_api_request_duration, x_api_responses
+from .rate_limiter import RateLimitGovernor, rate_limit_governor
 
 logger = logging.getLogger(__name__)
 
+# Codes HTTP pour lesquels une nouvelle tentative est pertinente (429 : géré par le
+# gouverneur)
+RETRY_STATUS_CODES = [500, 502, 503, 504]
+
+# Nouvelles tentatives après un 429 (une fois la fenêtre de quota rechargée)
+RATE_LIMIT_RETRIES = 2
+
+# Champs demandés à l'API pour chaque tweet
+TWEET_FIELDS = "created_at,author_id,text,id"
+
+
+def _record_call(client: str, started: float, status: str) -> None:
+    """Métriques d'un appel HTTP à l'API (latence et code de réponse)."""
+    x_api_request_duration.observe(time.perf_counter() - started, client)
+    x_api_responses.inc(client, status)
+
 
 class TwitterClient:
     """
     Client pour l'API Twitter/X v2 avec gestion d'erreurs robuste et retry automatique.
     """
-    
-    def __init__(self):
-        """Initialise le client avec la configuration et les headers d'authentification."""
+
+    def __init__(
+        self,
+        governor: Optional[RateLimitGovernor] = None,
+        recorder: Optional[ResponseCorpus] = None
+    ):
+        """
+        Initialise le client avec la configuration et les headers d'authentification.
+
+        Args:
+            governor: Gouverneur de quota (défaut : `rate_limit_governor`, partagé)
+            recorder: Corpus où enregistrer les réponses (optionnel)
+        """
         if not settings.bearer_token:
             raise ConfigurationError("BEARER_TOKEN environment variable is required")
-        
+
         self.base_url = settings.x_api_base
         self.headers = {"Authorization": f"Bearer {settings.bearer_token}"}
+        self.governor = governor or rate_limit_governor
+        self.recorder = recorder
         self.session = self._create_session()
-    
+
     def _create_session(self) -> requests.Session:
         """
         Crée une session HTTP avec retry automatique et timeout configuré.
@@ -87,23 +164,25 @@ class TwitterClient:
         """
         session = requests.Session()
         session.headers.update(self.headers)
-        
+
         # Stratégie de retry pour la robustesse
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=RETRY_STATUS_CODES,
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("https://", adapter)
-        
+        session.mount("http://", adapter)  # serveur stub local
+
         return session
-    
+
     def search_recent(
         self, 
         query: str, 
         max_results: int = 10, 
-        next_token: Optional[str] = None
+        next_token: Optional[str] = None,
+        since_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Effectue une recherche de tweets récents via l'API Twitter/X v2.
@@ -112,32 +191,53 @@ class TwitterClient:
             query: Requête de recherche (mots-clés, hashtags, etc.)
             max_results: Nombre de résultats souhaités (10-100)
             next_token: Token pour la pagination (optionnel)
+            since_id: Ne retourne que les tweets d'identifiant supérieur (optionnel)
         
         Returns:
             Dict: Réponse JSON de l'API
         
         Raises:
             TwitterAPIError: En cas d'erreur API
+            RateLimitExceeded: Si le quota est épuisé pour plus de
+                `x_api_rate_limit_max_wait`
         """
         url = f"{self.base_url}/tweets/search/recent"
-        params = {
+        params: Dict[str, Any] = {
             "query": query,
             "max_results": max(10, min(100, max_results)),
-            "tweet.fields": "created_at,author_id,text,id"
+            "tweet.fields": TWEET_FIELDS
         }
-        
+
         if next_token:
             params["next_token"] = next_token
-        
+        if since_id:
+            params["since_id"] = since_id
+
         try:
             logger.info(f"Searching tweets with query: {query}")
-            response = self.session.get(url, params=params, timeout=30)
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                self.governor.acquire()
+                started = time.perf_counter()
+                try:
+                    response = self.session.get(url, params=params, timeout=30)
+                except requests.exceptions.RequestException:
+                    _record_call("sync", started, "error")
+                    raise
+                _record_call("sync", started, str(response.status_code))
+                self.governor.update(response.headers, response.status_code)
+                if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                    break
+                logger.warning(
+                    "Twitter API returned 429, waiting for the rate limit window"
+                )
             response.raise_for_status()
-            
+
             data = response.json()
             logger.info(f"Successfully retrieved {len(data.get('data', []))} tweets")
+            if self.recorder:
+                self.recorder.record(params, data)
             return data
-            
+
         except requests.exceptions.RequestException as e:
             logger.error(f"Twitter API request failed: {e}")
             raise TwitterAPIError(f"Failed to fetch tweets from Twitter API: {str(e)}")
@@ -146,5 +246,190 @@ class TwitterClient:
             raise TwitterAPIError(f"Invalid response from Twitter API: {str(e)}")
 
 
-# Instance globale du client Twitter
-twitter_client = TwitterClient() if settings.bearer_token else None
+class AsyncTwitterClient:
+    """
+    Client asynchrone pour l'API Twitter/X v2, basé sur `httpx.AsyncClient`.
+    Partage un pool de connexions keep-alive entre toutes les requêtes.
+    """
+
+    def __init__(
+        self,
+        bearer_token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        governor: Optional[RateLimitGovernor] = None,
+        recorder: Optional[ResponseCorpus] = None
+    ):
+        """
+        Initialise le client et son pool de connexions.
+
+        Args:
+            bearer_token: Token d'authentification (défaut: `settings.bearer_token`)
+            base_url: URL de base de l'API (défaut: `settings.x_api_base`)
+            transport: Transport httpx alternatif (serveur stub, tests)
+            max_retries: Nombre de nouvelles tentatives sur erreurs transitoires
+            backoff_factor: Facteur du backoff exponentiel (en secondes)
+            governor: Gouverneur de quota (défaut : `rate_limit_governor`, partagé)
+            recorder: Corpus où enregistrer les réponses (optionnel)
+        """
+        bearer_token = bearer_token or settings.bearer_token
+        if not bearer_token:
+            raise ConfigurationError("BEARER_TOKEN environment variable is required")
+
+        self.base_url = base_url or settings.x_api_base
+        self.headers = {"Authorization": f"Bearer {bearer_token}"}
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.governor = governor or rate_limit_governor
+        self.recorder = recorder
+        self.client = self._create_client(transport)
+
+    def _create_client(
+        self, transport: Optional[httpx.AsyncBaseTransport]
+    ) -> httpx.AsyncClient:
+        """
+        Crée le client httpx avec un pool de connexions partagé.
+
+        Returns:
+            httpx.AsyncClient: Client configuré (keep-alive, HTTP/2 si disponible)
+        """
+        http2 = settings.x_api_http2 and importlib.util.find_spec("h2") is not None
+        limits = httpx.Limits(
+            max_connections=settings.x_api_max_connections,
+            max_keepalive_connections=settings.x_api_max_keepalive,
+        )
+
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=settings.x_api_timeout,
+            limits=limits,
+            http2=http2,
+            transport=transport,
+        )
+
+    async def search_recent(
+        self,
+        query: str,
+        max_results: int = 10,
+        next_token: Optional[str] = None,
+        since_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Effectue une recherche de tweets récents sans bloquer la boucle d'événements.
+
+        Args:
+            query: Requête de recherche (mots-clés, hashtags, etc.)
+            max_results: Nombre de résultats souhaités (10-100)
+            next_token: Token pour la pagination (optionnel)
+            since_id: Ne retourne que les tweets d'identifiant supérieur (optionnel)
+
+        Returns:
+            Dict: Réponse JSON de l'API
+
+        Raises:
+            TwitterAPIError: En cas d'erreur API
+            RateLimitExceeded: Si le quota est épuisé pour plus de
+                `x_api_rate_limit_max_wait`
+        """
+        params: Dict[str, Any] = {
+            "query": query,
+            "max_results": max(10, min(100, max_results)),
+            "tweet.fields": TWEET_FIELDS
+        }
+
+        if next_token:
+            params["next_token"] = next_token
+        if since_id:
+            params["since_id"] = since_id
+
+        logger.info(f"Searching tweets with query: {query}")
+
+        rate_limited = 0
+        for attempt in range(self.max_retries + 1 + RATE_LIMIT_RETRIES):
+            # Les attentes de quota ne comptent pas dans le backoff des erreurs
+            # transitoires
+            retry = attempt - rate_limited
+            try:
+                await self.governor.acquire_async()
+                started = time.perf_counter()
+                try:
+                    response = await self.client.get(
+                        "/tweets/search/recent", params=params
+                    )
+                except httpx.HTTPError:
+                    _record_call("async", started, "error")
+                    raise
+                _record_call("async", started, str(response.status_code))
+                self.governor.update(response.headers, response.status_code)
+
+                if response.status_code == 429 and rate_limited < RATE_LIMIT_RETRIES:
+                    # Le gouverneur fait attendre la prochaine tentative jusqu'au reset
+                    rate_limited += 1
+                    logger.warning(
+                        "Twitter API returned 429, waiting for the rate limit window"
+                    )
+                    continue
+
+                if (
+                    response.status_code in RETRY_STATUS_CODES
+                    and retry < self.max_retries
+                ):
+                    delay = self.backoff_factor * (2 ** retry)
+                    logger.warning(
+                        f"Twitter API returned {response.status_code}, retrying in "
+                        f"{delay}s"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+
+                response.raise_for_status()
+                data = response.json()
+                logger.info(
+                    f"Successfully retrieved {len(data.get('data', []))} tweets"
+                )
+                if self.recorder:
+                    self.recorder.record(params, data)
+                return data
+
+            except httpx.TransportError as e:
+                if retry < self.max_retries:
+                    delay = self.backoff_factor * (2 ** retry)
+                    logger.warning(
+                        f"Twitter API connection error ({e}), retrying in {delay}s"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                logger.error(f"Twitter API request failed: {e}")
+                raise TwitterAPIError(
+                    f"Failed to fetch tweets from Twitter API: {str(e)}"
+                )
+            except httpx.HTTPError as e:
+                logger.error(f"Twitter API request failed: {e}")
+                raise TwitterAPIError(
+                    f"Failed to fetch tweets from Twitter API: {str(e)}"
+                )
+            except ValueError as e:
+                logger.error(f"Invalid JSON response from Twitter API: {e}")
+                raise TwitterAPIError(f"Invalid response from Twitter API: {str(e)}")
+
+        # Inatteignable : la dernière tentative lève ou retourne
+        raise TwitterAPIError(
+            "Failed to fetch tweets from Twitter API: retries exhausted"
+        )
+
+    async def aclose(self) -> None:
+        """Ferme le pool de connexions."""
+        await self.client.aclose()
+
+
+# Instances globales des clients Twitter (enregistrement optionnel des réponses)
+_recorder = (
+    ResponseCorpus(settings.x_api_record_path) if settings.x_api_record_path else None
+)
+twitter_client = TwitterClient(recorder=_recorder) if settings.bearer_token else None
+async_twitter_client = (
+    AsyncTwitterClient(recorder=_recorder) if settings.bearer_token else None
+)
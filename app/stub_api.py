@@ -0,0 +1,258 @@
+# app/stub_api.py
+"""Local stand-in for the X API search endpoint (offline load testing).
+
+* **Rôle global** : servir `GET /2/tweets/search/recent` **sans réseau**, pour tester et
+  mesurer la collecte (`TweetService`, planificateur, gouverneur de quota) avec des
+  réponses réalistes.
+
+* **Lancement** :
+
+  ```
+  make stub-api                      # uvicorn app.stub_api:stub_app --port 8001
+  X_API_BASE=http://127.0.0.1:8001/2 BEARER_TOKEN=stub make run
+  ```
+
+* **Deux sources de données** :
+
+  * **Synthétique** (défaut) : `tweets_per_query` tweets déterministes par requête
+    (`seed`), textes avec hashtags, auteurs et dates ; `new_tweets_per_second` fait
+    apparaître de nouveaux tweets au fil du temps (polling `since_id`).
+  * **Relecture** (`corpus_path`) : rejoue un corpus enregistré (`ResponseCorpus`,
+    `python -m app.cli record-corpus`), page par page selon `(query, next_token)`.
+
+* **Réalisme** :
+
+  * `data`, `meta.result_count`, `meta.newest_id`, `meta.oldest_id`, `meta.next_token` ;
+    filtre `since_id`.
+  * En-têtes `x-rate-limit-limit` / `-remaining` / `-reset` (fenêtre
+    `rate_window_seconds`), `429` une fois le quota épuisé.
+  * Latence (`latency_ms` ± `latency_jitter_ms`) et erreurs `503` aléatoires
+    (`error_rate`).
+  * `401` sans en-tête `Authorization: Bearer ...`.
+
+* **Configuration** : variables d'environnement `STUB_API_*` (`StubSettings`), ou
+  `create_stub_app(StubSettings(...))` dans les tests.
+
+👉 En résumé : un faux X API, déterministe et paramétrable, pour des benchmarks
+  reproductibles.
+
+"""
+import asyncio
+import random
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseSettings
+
+from .services.corpus import ResponseCorpus
+
+# Identifiants synthétiques : de l'ordre des vrais identifiants X, disjoints par requête
+BASE_TWEET_ID = 1_800_000_000_000_000_000
+QUERY_ID_SPACE = 10_000_000
+
+WORDS = (
+    "data",
+    "release",
+    "today",
+    "build",
+    "launch",
+    "open",
+    "source",
+    "fast",
+    "news",
+    "update",
+)
+HASHTAGS = (
+    "#python",
+    "#fastapi",
+    "#data",
+    "#ai",
+    "#opensource",
+    "#rust",
+    "#cloud",
+    "#devops",
+)
+
+
+class StubSettings(BaseSettings):
+    """Paramètres du serveur stub (variables d'environnement `STUB_API_*`)."""
+
+    corpus_path: Optional[str] = None
+    tweets_per_query: int = 1000
+    new_tweets_per_second: float = 0.0
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit: int = 450
+    rate_window_seconds: int = 900
+    seed: int = 42
+
+    class Config:
+        env_prefix = "STUB_API_"
+        case_sensitive = False
+
+
+def create_stub_app(config: Optional[StubSettings] = None) -> FastAPI:
+    """
+    Construit l'application stub.
+
+    Args:
+        config: Paramètres (défaut : lus dans l'environnement)
+
+    Returns:
+        FastAPI: Application servant `/2/tweets/search/recent`
+    """
+    config = config or StubSettings()
+    corpus = ResponseCorpus(config.corpus_path).load() if config.corpus_path else None
+    rng = random.Random(config.seed)
+    started = time.time()
+    window = {"start": started, "count": 0}
+
+    app = FastAPI(title="X API stub", docs_url=None, redoc_url=None)
+
+    def rate_headers(now: float) -> Dict[str, str]:
+        if now - window["start"] >= config.rate_window_seconds:
+            window["start"], window["count"] = now, 0
+        return {
+            "x-rate-limit-limit": str(config.rate_limit),
+            "x-rate-limit-remaining": str(max(0, config.rate_limit - window["count"])),
+            "x-rate-limit-reset": str(
+                int(window["start"] + config.rate_window_seconds)
+            ),
+        }
+
+    @app.get("/2/tweets/search/recent")
+    async def search_recent(
+        request: Request,
+        query: str,
+        max_results: int = Query(10, ge=10, le=100),
+        next_token: Optional[str] = None,
+        since_id: Optional[str] = None,
+    ) -> JSONResponse:
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            return JSONResponse(
+                {"title": "Unauthorized", "status": 401}, status_code=401
+            )
+
+        now = time.time()
+        headers = rate_headers(now)
+        if window["count"] >= config.rate_limit:
+            return JSONResponse(
+                {"title": "Too Many Requests", "status": 429},
+                status_code=429,
+                headers=headers,
+            )
+        window["count"] += 1
+        headers = rate_headers(now)
+
+        if config.latency_ms or config.latency_jitter_ms:
+            jitter = rng.uniform(-config.latency_jitter_ms, config.latency_jitter_ms)
+            await asyncio.sleep(max(0.0, config.latency_ms + jitter) / 1000)
+        if config.error_rate and rng.random() < config.error_rate:
+            return JSONResponse(
+                {"title": "Service Unavailable", "status": 503},
+                status_code=503,
+                headers=headers,
+            )
+
+        if corpus is not None:
+            body = _replay_page(corpus, query, next_token, since_id)
+        else:
+            available = config.tweets_per_query + int(
+                (now - started) * config.new_tweets_per_second
+            )
+            body = _synthetic_page(
+                config.seed, query, available, max_results, next_token, since_id
+            )
+        return JSONResponse(body, headers=headers)
+
+    return app
+
+
+def _synthetic_page(
+    seed: int,
+    query: str,
+    available: int,
+    max_results: int,
+    next_token: Optional[str],
+    since_id: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Page synthétique : les `available` tweets de la requête, du plus récent au plus
+    ancien.
+
+    `next_token` encode le dernier identifiant servi → pagination stable même si de
+    nouveaux tweets arrivent.
+    """
+    base = BASE_TWEET_ID + (zlib.crc32(query.encode("utf-8")) % 10_000) * QUERY_ID_SPACE
+    upper = base + available
+    if next_token and next_token.startswith("p") and next_token[1:].isdigit():
+        upper = min(upper, int(next_token[1:]) - 1)
+    lower = max(base, int(since_id)) if since_id and since_id.isdigit() else base
+
+    ids = list(range(upper, max(lower, upper - max_results), -1))
+    more = bool(ids) and ids[-1] - 1 > lower
+    term = query.split()[0] if query.split() else "tweet"
+    data = [_synthetic_tweet(seed, tweet_id, tweet_id - base, term) for tweet_id in ids]
+
+    meta: Dict[str, Any] = {"result_count": len(data)}
+    if data:
+        meta["newest_id"], meta["oldest_id"] = data[0]["id"], data[-1]["id"]
+    if more:
+        meta["next_token"] = f"p{ids[-1]}"
+    return {"data": data, "meta": meta} if data else {"meta": meta}
+
+
+def _synthetic_tweet(
+    seed: int, tweet_id: int, position: int, term: str
+) -> Dict[str, Any]:
+    """Tweet synthétique déterministe (même identifiant → même contenu)."""
+    rng = random.Random(seed * 1_000_003 + tweet_id)
+    words = rng.choices(WORDS, k=rng.randint(4, 12))
+    hashtags = rng.sample(HASHTAGS, k=rng.randint(0, 3))
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(
+        seconds=position * 10
+    )
+    return {
+        "id": str(tweet_id),
+        "text": " ".join([term, *words, *hashtags]),
+        "author_id": str(rng.randint(1, 5000)),
+        "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+    }
+
+
+def _replay_page(
+    corpus: Dict[Any, Dict[str, Any]],
+    query: str,
+    next_token: Optional[str],
+    since_id: Optional[str]
+) -> Dict[str, Any]:
+    """Page enregistrée pour `(query, next_token)`, filtrée par `since_id` (vide si
+    absente du corpus)."""
+    recorded = corpus.get((query, next_token or None))
+    if recorded is None:
+        return {"meta": {"result_count": 0}}
+    if not since_id or not since_id.isdigit():
+        return recorded
+
+    data: List[Dict[str, Any]] = [
+        tweet for tweet in recorded.get("data", [])
+        if str(tweet.get("id", "")).isdigit() and int(tweet["id"]) > int(since_id)
+    ]
+    meta: Dict[str, Any] = {"result_count": len(data)}
+    if data:
+        meta["newest_id"], meta["oldest_id"] = data[0]["id"], data[-1]["id"]
+    if len(data) == len(recorded.get("data", [])) and "next_token" in recorded.get(
+        "meta", {}
+    ):
+        # Page entièrement plus récente que since_id : la suivante peut encore l'être
+        meta["next_token"] = recorded["meta"]["next_token"]
+    return {"data": data, "meta": meta} if data else {"meta": meta}
+
+
+# Application servie par `uvicorn app.stub_api:stub_app`
+stub_app = create_stub_app()
@@ -12,10 +12,14 @@ from unittest.mock import Mock, patch
 # Ajout du répertoire parent au PYTHONPATH pour importer app
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Active le mode test avant l'import de la configuration (pas de tâches de fond)
+os.environ.setdefault("TESTING", "true")
+
 from app.main import app
 from app.database import Base, get_db
 from app import models  # Import explicite pour enregistrer les modèles
 from app.services import tweet_service
+from app.services.cache_service import AnalyticsCache  # noqa: E402
 
 # Base de données complètement en mémoire - AUCUN fichier
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -71,6 +75,8 @@ def client(db_session):
 
     # Remplace la dépendance de base de données
     app.dependency_overrides[get_db] = override_get_db
+    # Chaque test part d'un cache d'analytics vide
+    AnalyticsCache.reset()
     
     try:
         with TestClient(app) as test_client:
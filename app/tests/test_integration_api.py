@@ -1,10 +1,22 @@
 # tests/test_integration_api.py (version finale)
 """Tests d'intégration de l'API - version sans fichiers."""
+import json
+import time
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock
 from datetime import datetime
-from app.models import Tweet
-from app.exceptions import TwitterAPIError
+from typing import Any, Dict
+from app.config import settings
+from app.models import Tweet, CollectionState
+from app.exceptions import TwitterAPIError, RateLimitExceeded
+from app.services.tweet_service import TweetService
+from app.services.cache_service import AnalyticsCache
+from app.services.ingest_queue import ingest_queue
+from app.services.metrics import (
+    http_request_duration,
+    tweets_deduplicated,
+    tweets_ingested,
+)
 
 
 def parse_iso_date(date_string: str) -> datetime:
@@ -14,9 +26,9 @@ def parse_iso_date(date_string: str) -> datetime:
 
 @pytest.fixture
 def mock_twitter_client_patch(monkeypatch):
-    """Mock du client Twitter via monkeypatch."""
-    mock_client = MagicMock()
-    monkeypatch.setattr("app.services.tweet_service.twitter_client", mock_client)
+    """Mock du client Twitter asynchrone via monkeypatch."""
+    mock_client = AsyncMock()
+    monkeypatch.setattr("app.services.tweet_service.async_twitter_client", mock_client)
     return mock_client
 
 
@@ -49,6 +61,17 @@ def test_collect_tweets_success(client, db_session, mock_twitter_client_patch):
     assert data[1]["tweet_id"] == "2"
 
 
+def test_collect_tweets_rate_limit_shed(client, mock_twitter_client_patch):
+    """Test qu'une requête rejetée par le gouverneur de quota donne un 429."""
+    mock_twitter_client_patch.search_recent.side_effect = RateLimitExceeded(
+        "exhausted", retry_after=12.3
+    )
+
+    response = client.post("/tweets/collect", json={"query": "busy"})
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "13"
+
+
 def test_collect_tweets_empty_query(client):
     """Test avec une query vide."""
     response = client.post("/tweets/collect", json={"query": ""})
@@ -112,6 +135,141 @@ def test_list_tweets_limit(client, db_session):
     assert data[1]["tweet_id"] == "103"
 
 
+def test_list_tweets_cursor_pagination(client, db_session):
+    """Test de la pagination par curseur, tweets sans date en dernier."""
+    db_session.add_all(
+        [
+            Tweet(
+                tweet_id="k1",
+                text="#a",
+                author_id="u1",
+                created_at=parse_iso_date("2025-01-01T10:00:00Z"),
+            ),
+            Tweet(
+                tweet_id="k2",
+                text="#a",
+                author_id="u2",
+                created_at=parse_iso_date("2025-01-01T10:00:00Z"),
+            ),
+            Tweet(
+                tweet_id="k3",
+                text="#b",
+                author_id="u1",
+                created_at=parse_iso_date("2025-01-01T11:00:00Z"),
+            ),
+            Tweet(tweet_id="k4", text="#a", author_id="u1", created_at=None),
+            Tweet(tweet_id="k5", text="#b", author_id="u2", created_at=None),
+        ]
+    )
+    db_session.commit()
+
+    seen, cursor = [], None
+    for _ in range(5):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/tweets/", params=params)
+        assert response.status_code == 200
+        seen += [tweet["tweet_id"] for tweet in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert seen == ["k3", "k2", "k1", "k5", "k4"]
+
+    filtered = client.get("/tweets/", params={"author_id": "u1", "hashtag": "A"}).json()
+    assert [tweet["tweet_id"] for tweet in filtered] == ["k1", "k4"]
+
+    ranged = client.get("/tweets/", params={"start": "2025-01-01T10:30:00Z"}).json()
+    assert [tweet["tweet_id"] for tweet in ranged] == ["k3"]
+
+    assert client.get("/tweets/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/tweets/count").json() == {"count": 5}
+
+
+def test_export_tweets_streaming(client, db_session):
+    """Test de l'export NDJSON / CSV en flux."""
+    db_session.add_all(
+        [
+            Tweet(
+                tweet_id="e1",
+                text="first, \"quoted\"",
+                created_at=parse_iso_date("2025-01-01T10:00:00Z"),
+            ),
+            Tweet(
+                tweet_id="e2",
+                text="second",
+                created_at=parse_iso_date("2025-01-01T12:00:00Z"),
+            ),
+        ]
+    )
+    db_session.commit()
+
+    response = client.get("/tweets/export", params={"columns": "tweet_id,created_at"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {"tweet_id": "e1", "created_at": "2025-01-01T10:00:00"},
+        {"tweet_id": "e2", "created_at": "2025-01-01T12:00:00"},
+    ]
+
+    csv_response = client.get(
+        "/tweets/export",
+        params={
+            "format": "csv",
+            "columns": "tweet_id,text",
+            "start": "2025-01-01T09:00:00Z",
+            "end": "2025-01-01T11:00:00Z",
+        },
+    )
+    assert csv_response.text.splitlines() == ["tweet_id,text", 'e1,"first, ""quoted"""']
+
+    assert (
+        client.get("/tweets/export", params={"columns": "password"}).status_code == 400
+    )
+    assert client.get("/tweets/export", params={"format": "xml"}).status_code == 422
+
+
+def test_search_tweets(client, db_session):
+    """Test de la recherche plein texte classée et paginée."""
+    db_session.add_all(
+        [
+            Tweet(tweet_id="s1", text="python python python release"),
+            Tweet(
+                tweet_id="s2",
+                text="a long tweet about python and many other unrelated things",
+            ),
+            Tweet(tweet_id="s3", text="nothing to see here"),
+        ]
+    )
+    db_session.commit()
+
+    first = client.get("/tweets/search", params={"q": "python", "limit": 1})
+    assert first.status_code == 200
+    assert [hit["tweet_id"] for hit in first.json()] == ["s1"]
+    assert first.json()[0]["score"] > 0
+
+    second = client.get(
+        "/tweets/search",
+        params={"q": "python", "limit": 1, "cursor": first.headers["x-next-cursor"]},
+    )
+    assert [hit["tweet_id"] for hit in second.json()] == ["s2"]
+    assert "x-next-cursor" not in second.headers
+
+    assert (
+        client.get("/tweets/search", params={"q": "pyth*", "sort": "recent"}).json()[0][
+            "tweet_id"
+        ]
+        == "s2"
+    )
+    assert (
+        client.get(
+            "/tweets/search", params={"q": "python", "cursor": "bad"}
+        ).status_code
+        == 400
+    )
+    assert client.get("/tweets/search", params={"q": ""}).status_code == 422
+
+
 def test_list_tweets_database_empty(client):
     """Test avec base de données vide."""
     response = client.get("/tweets/")
@@ -144,6 +302,33 @@ def test_get_top_hashtags_success(client, db_session):
     assert fastapi_found
 
 
+def test_get_top_hashtags_approx_mode(client, db_session):
+    """Test du mode approximatif des hashtags."""
+    from app.services.sketch_service import HashtagSketchService
+    HashtagSketchService.reset()
+
+    db_session.add(
+        Tweet(
+            tweet_id="210",
+            text="#Sketch #sketch #other",
+            created_at=parse_iso_date("2025-01-01T10:00:00Z"),
+        )
+    )
+    db_session.commit()
+
+    response = client.get("/analytics/hashtags", params={"mode": "approx"})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["mode"] == "approx"
+    assert data["top_hashtags"] == [
+        {"hashtag": "#other", "count": 1, "error": 0},
+        {"hashtag": "#sketch", "count": 1, "error": 0},
+    ]
+    assert data["max_error"] == 0
+    HashtagSketchService.reset()
+
+
 def test_get_top_hashtags_empty_db(client):
     """Test hashtags avec DB vide."""
     response = client.get("/analytics/hashtags")
@@ -170,6 +355,12 @@ def test_get_volume_by_hour_success(client, db_session):
     assert len(data) >= 1
 
 
+def test_get_volume_by_hour_bucket_validation(client):
+    """Test qu'une largeur de tranche inconnue est rejetée."""
+    response = client.get("/analytics/volume_by_hour", params={"bucket": "week"})
+    assert response.status_code == 422
+
+
 def test_get_volume_by_hour_empty_db(client):
     """Test volume par heure avec DB vide."""
     response = client.get("/analytics/volume_by_hour")
@@ -177,6 +368,88 @@ def test_get_volume_by_hour_empty_db(client):
     assert response.json()["volume_by_hour"] == []
 
 
+def test_analytics_etag_and_ingest_invalidation(
+    client, db_session, mock_twitter_client_patch
+):
+    """Test du cache d'analytics : 304 tant que rien n'est ingéré, nouvel ETag
+    ensuite."""
+    first = client.get("/analytics/hashtags")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = client.get("/analytics/hashtags", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    mock_twitter_client_patch.search_recent.return_value = {
+        "data": [
+            {"id": "etag1", "text": "#fresh", "created_at": "2025-01-01T10:00:00Z"}
+        ],
+        "meta": {"result_count": 1},
+    }
+    assert (
+        client.post(
+            "/tweets/collect", json={"query": "fresh", "max_results": 10}
+        ).status_code
+        == 200
+    )
+
+    refreshed = client.get("/analytics/hashtags", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()["top_hashtags"] == [{"hashtag": "#fresh", "count": 1}]
+
+
+def test_analytics_etag_follows_writes_from_other_processes(client, db_session):
+    """Test que l'ETag change quand un autre processus (CLI d'archivage, worker) modifie
+    les données."""
+    etag = client.get("/analytics/hashtags").headers["etag"]
+    assert (
+        client.get("/analytics/hashtags", headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+
+    # Écriture commitée par un autre processus : seule la version persistée change
+    db_session.add(Tweet(tweet_id="other1", text="#elsewhere"))
+    AnalyticsCache.bump(db_session)
+    db_session.commit()
+
+    refreshed = client.get("/analytics/hashtags", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+
+def test_get_trending_hashtags(client, db_session):
+    """Test des hashtags tendance calculés depuis le rollup horaire."""
+    tweets = [
+        Tweet(
+            tweet_id=f"tr{i}",
+            text="#calm",
+            created_at=parse_iso_date(f"2025-01-01T0{i}:00:00Z"),
+        )
+        for i in range(4)
+    ] + [
+        Tweet(
+            tweet_id=f"tb{i}",
+            text="#spike",
+            created_at=parse_iso_date(f"2025-01-01T04:0{i}:00Z"),
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(tweets)
+    db_session.commit()
+
+    response = client.get("/analytics/trending", params={"baseline_hours": 4})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["bucket"] == "2025-01-01T04:00:00"
+    assert data["trending"][0]["hashtag"] == "#spike"
+    assert data["trending"][0]["count"] == 5
+
+    assert client.get("/analytics/trending", params={"alpha": 0}).status_code == 422
+
+
 def test_simple_load_test(client, mock_twitter_client_patch):
     """Test de charge avec 100 tweets - version sans fichiers."""
     mock_data = {
@@ -202,4 +475,298 @@ def test_simple_load_test(client, mock_twitter_client_patch):
     
     response = client.get("/tweets/", params={"limit": 1000})
     assert response.status_code == 200
-    assert len(response.json()) > 0
\ No newline at end of file
+    assert len(response.json()) > 0
+
+
+def _page(start: int, count: int, next_token=None) -> dict:
+    """Construit une page de réponse API simulée."""
+    page: Dict[str, Any] = {
+        "data": [
+            {
+                "id": f"page_{i}",
+                "text": f"Paged tweet {i} #paging",
+                "created_at": "2025-01-01T12:00:00.000Z",
+            }
+            for i in range(start, start + count)
+        ],
+        "meta": {"result_count": count},
+    }
+    if next_token:
+        page["meta"]["next_token"] = next_token
+    return page
+
+
+def test_collect_paginated_follows_next_token(
+    client, db_session, mock_twitter_client_patch
+):
+    """Test de collecte multi-pages jusqu'à épuisement des pages."""
+    mock_twitter_client_patch.search_recent.side_effect = [
+        {
+            **_page(0, 100, "t1"),
+            "meta": {"result_count": 100, "newest_id": "9000", "next_token": "t1"},
+        },
+        _page(100, 100, "t2"),
+        _page(150, 100),  # 50 doublons avec la page précédente
+    ]
+
+    response = client.post(
+        "/tweets/collect/paginated", json={"query": "paging", "total": 1000}
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["completed"] is True
+    assert data["total_fetched"] == 300
+    assert data["total_saved"] == 250
+    assert [page["duplicates"] for page in data["pages"]] == [0, 0, 50]
+    assert mock_twitter_client_patch.search_recent.call_args_list[1].args == (
+        "paging",
+        100,
+        "t1",
+    )
+    assert db_session.query(Tweet).count() == 250
+
+    # Collecte complète : la suivante ne demande que les tweets plus récents
+    mock_twitter_client_patch.search_recent.side_effect = [
+        {"meta": {"result_count": 0}}
+    ]
+    client.post("/tweets/collect/paginated", json={"query": "paging", "total": 10})
+    assert (
+        mock_twitter_client_patch.search_recent.call_args.kwargs["since_id"] == "9000"
+    )
+
+
+def test_collect_paginated_stops_at_total(
+    client, db_session, mock_twitter_client_patch
+):
+    """Test que la collecte s'arrête au total demandé et garde le token suivant."""
+    mock_twitter_client_patch.search_recent.side_effect = [
+        _page(0, 100, "t1"),
+        _page(100, 50, "t2"),
+    ]
+
+    response = client.post(
+        "/tweets/collect/paginated", json={"query": "paging", "total": 150}
+    )
+    data = response.json()
+
+    assert data["total_fetched"] == 150
+    assert data["completed"] is False
+    assert data["next_token"] == "t2"
+    assert mock_twitter_client_patch.search_recent.call_args_list[1].args == (
+        "paging",
+        50,
+        "t1",
+    )
+    # Pages restantes non collectées : le since_id n'avance pas
+    assert TweetService.get_since_id("paging", db_session) is None
+
+
+def test_collect_paginated_resumes_after_interruption(
+    client, db_session, mock_twitter_client_patch
+):
+    """Test de reprise depuis le dernier next_token commité."""
+    mock_twitter_client_patch.search_recent.side_effect = [
+        _page(0, 100, "t1"),
+        TwitterAPIError("Simulated outage"),
+    ]
+
+    response = client.post("/tweets/collect/paginated", json={"query": "paging"})
+    assert response.status_code == 502
+
+    state = db_session.query(CollectionState).filter_by(query="paging").one()
+    assert state.next_token == "t1"
+    assert state.tweets_saved == 100
+
+    mock_twitter_client_patch.search_recent.side_effect = [_page(100, 100)]
+    response = client.post("/tweets/collect/paginated", json={"query": "paging"})
+
+    assert response.status_code == 200
+    assert mock_twitter_client_patch.search_recent.call_args.args == (
+        "paging",
+        100,
+        "t1",
+    )
+    assert response.json()["completed"] is True
+    assert db_session.query(Tweet).count() == 200
+
+
+def test_collection_jobs_crud(client):
+    """Test du CRUD des jobs de collecte périodique."""
+    response = client.post("/jobs/", json={"query": "python", "interval_seconds": 300})
+    assert response.status_code == 201
+    job = response.json()
+    assert (
+        job["enabled"] is True and job["since_id"] is None and job["max_results"] == 100
+    )
+
+    assert (
+        client.post(
+            "/jobs/", json={"query": "python", "interval_seconds": 300}
+        ).status_code
+        == 400
+    )
+    assert (
+        client.post("/jobs/", json={"query": "rust", "interval_seconds": 1}).status_code
+        == 422
+    )
+    assert [j["query"] for j in client.get("/jobs/").json()] == ["python"]
+
+    updated = client.patch(
+        f"/jobs/{job['id']}", json={"enabled": False, "interval_seconds": 600}
+    ).json()
+    assert (updated["enabled"], updated["interval_seconds"]) == (False, 600)
+
+    # Sans client API configuré, l'erreur est enregistrée sur le job
+    ran = client.post(f"/jobs/{job['id']}/run").json()
+    assert (ran["last_status"], ran["consecutive_failures"], ran["runs"]) == (
+        "error",
+        1,
+        1,
+    )
+
+    assert client.delete(f"/jobs/{job['id']}").status_code == 204
+    assert client.get(f"/jobs/{job['id']}").status_code == 404
+    assert client.delete(f"/jobs/{job['id']}").status_code == 404
+
+
+def test_metrics_endpoint_exposes_request_and_ingest_metrics(
+    client, mock_twitter_client_patch
+):
+    """Test de `/metrics` : latence par gabarit de route et compteurs d'ingestion."""
+    mock_twitter_client_patch.search_recent.return_value = {
+        "data": [
+            {"id": "m1", "text": "#metrics"},
+            {"id": "m1", "text": "#metrics"},
+            {"id": "m2", "text": "x"},
+        ],
+        "meta": {"result_count": 3},
+    }
+    ingested, deduplicated = tweets_ingested.value(), tweets_deduplicated.value()
+    requests_before = http_request_duration.count("GET", "/jobs/{job_id}", "404")
+
+    assert client.post("/tweets/collect", json={"query": "metrics"}).status_code == 200
+    assert client.get("/jobs/12345").status_code == 404
+    assert tweets_ingested.value() - ingested == 2
+    assert tweets_deduplicated.value() - deduplicated == 1
+    assert (
+        http_request_duration.count("GET", "/jobs/{job_id}", "404")
+        == requests_before + 1
+    )
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_duration_seconds_bucket{method="POST",route="/tweets/collect",'
+        'status="200",le="+Inf"}'
+        in body
+    )
+    assert "# TYPE tweets_ingested_total counter" in body
+    assert "analytics_cache_version" in body
+
+
+def test_collect_background_returns_job_and_writes_behind(
+    client, db_session, mock_twitter_client_patch, monkeypatch
+):
+    """Test du mode `background` : 202 + job, puis écriture par la file d'ingestion."""
+    monkeypatch.setattr(ingest_queue, "session_factory", lambda: db_session)
+    mock_twitter_client_patch.search_recent.return_value = {
+        "data": [{"id": "b1", "text": "#bg"}, {"id": "b2", "text": "#bg"}],
+        "meta": {"newest_id": "b2", "result_count": 2}
+    }
+
+    response = client.post("/tweets/collect", json={"query": "bg", "background": True})
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    for _ in range(100):
+        job = client.get(f"/tweets/collect/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            break
+        time.sleep(0.01)
+
+    assert (job["status"], job["fetched"], job["queued"], job["written"]) == (
+        "done",
+        2,
+        0,
+        2,
+    )
+    assert db_session.query(Tweet).count() == 2
+    assert client.get("/tweets/collect/jobs/unknown").status_code == 404
+
+
+def test_fast_json_responses_match_validated_path(client, db_session, monkeypatch):
+    """Test du sérialiseur rapide : même JSON et mêmes en-têtes que le chemin FastAPI
+    validé."""
+    db_session.add_all(
+        [
+            Tweet(
+                tweet_id=f"fj{i}",
+                author_id="a",
+                text=f"Fast json #orjson {i}",
+                created_at=datetime(2025, 1, 1, 10, i),
+            )
+            for i in range(3)
+        ]
+    )
+    db_session.commit()
+
+    urls = [
+        "/tweets/?limit=2",
+        "/tweets/search?q=json",
+        "/analytics/hashtags",
+        "/analytics/volume_by_hour",
+    ]
+    fast = {url: client.get(url) for url in urls}
+    monkeypatch.setattr(settings, "fast_json", False)
+    validated = {url: client.get(url) for url in urls}
+
+    for url in urls:
+        assert fast[url].status_code == validated[url].status_code == 200
+        assert fast[url].json() == validated[url].json()
+    assert fast["/tweets/?limit=2"].json()[0]["created_at"] == "2025-01-01T10:02:00"
+    assert (
+        fast["/tweets/?limit=2"].headers["X-Next-Cursor"]
+        == validated["/tweets/?limit=2"].headers["X-Next-Cursor"]
+    )
+    assert (
+        fast["/analytics/hashtags"].headers["ETag"]
+        == validated["/analytics/hashtags"].headers["ETag"]
+    )
+
+
+def test_large_responses_are_gzip_compressed(client, db_session):
+    """Test de la compression : grosses réponses en gzip, petites réponses et `identity`
+    intactes."""
+    db_session.add_all(
+        [
+            Tweet(
+                tweet_id=f"gz{i}",
+                author_id="a",
+                text=f"Compressible #gzip tweet {i}",
+                created_at=datetime(2025, 1, 1),
+            )
+            for i in range(100)
+        ]
+    )
+    db_session.commit()
+
+    response = client.get("/tweets/?limit=100", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) < len(response.content) / 3
+    assert len(response.json()) == 100
+
+    assert (
+        "Content-Encoding"
+        not in client.get("/tweets/count", headers={"Accept-Encoding": "gzip"}).headers
+    )
+    assert (
+        "Content-Encoding"
+        not in client.get(
+            "/tweets/?limit=100", headers={"Accept-Encoding": "identity"}
+        ).headers
+    )
@@ -1,40 +1,42 @@
 # app/tests/test_routes.py
 """Tests for API routes."""
 import pytest
+from datetime import datetime
 from unittest.mock import patch
 from fastapi.testclient import TestClient
 
 
 class TestTweetsRoutes:
     """Tests pour les routes de tweets."""
-    
-    @patch('app.routes.tweets.TweetService.collect_tweets')
+
+    @patch('app.routes.tweets.TweetService.collect_tweets_async')
     def test_collect_tweets_endpoint(self, mock_collect, client):
         """Test de l'endpoint de collecte de tweets."""
         from app.models import Tweet
-        
-        # Configuration du mock
+
+        # Configuration du mock (tweet tel que retourné après insertion)
         mock_tweet = Tweet(
             id=1,
             tweet_id="123456789",
             text="Test tweet",
-            author_id="user123"
+            author_id="user123",
+            collected_at=datetime(2025, 1, 1, 12, 0)
         )
         mock_collect.return_value = [mock_tweet]
-        
+
         # Requête
         response = client.post(
             "/tweets/collect",
             json={"query": "python", "max_results": 10}
         )
-        
+
         # Vérifications
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 1
         assert data[0]["tweet_id"] == "123456789"
         assert data[0]["text"] == "Test tweet"
-    
+
     def test_collect_tweets_validation_error(self, client):
         """Test de validation des paramètres d'entrée."""
         # Requête avec paramètres invalides
@@ -42,25 +44,35 @@ class TestTweetsRoutes:
             "/tweets/collect",
             json={"query": "", "max_results": 200}  # Query vide, max_results trop grand
         )
-        
+
         # Vérifications
         assert response.status_code == 422  # Validation Error
-    
-    @patch('app.routes.tweets.TweetService.get_tweets')
+
+    @patch('app.routes.tweets.TweetService.get_tweets_page')
     def test_list_tweets_endpoint(self, mock_get_tweets, client):
         """Test de l'endpoint de liste des tweets."""
-        from app.models import Tweet
-        
-        # Configuration du mock
-        mock_tweets = [
-            Tweet(id=1, tweet_id="1", text="Tweet 1"),
-            Tweet(id=2, tweet_id="2", text="Tweet 2"),
+        from app.services.tweet_service import READ_COLUMNS
+
+        # Configuration du mock : lignes aux colonnes de READ_COLUMNS, sans curseur
+        # suivant
+        fields = [column.key for column in READ_COLUMNS]
+        mock_rows = [
+            dict(
+                zip(
+                    fields, (1, "1", None, "Tweet 1", None, datetime(2025, 1, 1, 12, 0))
+                )
+            ),
+            dict(
+                zip(
+                    fields, (2, "2", None, "Tweet 2", None, datetime(2025, 1, 1, 12, 0))
+                )
+            ),
         ]
-        mock_get_tweets.return_value = mock_tweets
-        
+        mock_get_tweets.return_value = (mock_rows, None)
+
         # Requête
         response = client.get("/tweets/?limit=10")
-        
+
         # Vérifications
         assert response.status_code == 200
         data = response.json()
@@ -71,7 +83,7 @@ class TestTweetsRoutes:
 
 class TestAnalyticsRoutes:
     """Tests pour les routes d'analytics."""
-    
+
     @patch('app.routes.analytics.AnalyticsService.get_top_hashtags')
     def test_hashtags_endpoint(self, mock_hashtags, client):
         """Test de l'endpoint d'analyse des hashtags."""
@@ -80,10 +92,10 @@ class TestAnalyticsRoutes:
             {"hashtag": "#python", "count": 5},
             {"hashtag": "#fastapi", "count": 3},
         ]
-        
+
         # Requête
         response = client.get("/analytics/hashtags?limit=10")
-        
+
         # Vérifications
         assert response.status_code == 200
         data = response.json()
@@ -91,10 +103,19 @@ class TestAnalyticsRoutes:
         assert len(data["top_hashtags"]) == 2
         assert data["top_hashtags"][0]["hashtag"] == "#python"
         assert data["top_hashtags"][0]["count"] == 5
-    
-    def test_sentiment_endpoint_not_implemented(self, client):
-        """Test de l'endpoint de sentiment (non implémenté)."""
-        response = client.get("/analytics/sentiment")
-        
-        assert response.status_code == 501
-        assert "not implemented" in response.json()["detail"].lower()
\ No newline at end of file
+
+    @patch('app.routes.analytics.AnalyticsService.get_sentiment')
+    def test_sentiment_endpoint(self, mock_sentiment, client):
+        """Test de l'endpoint de sentiment (moyennes SQL par hashtag et par tranche)."""
+        mock_sentiment.return_value = {
+            "by_hashtag": [{"hashtag": "#python", "avg_sentiment": 0.5, "count": 2}],
+            "by_bucket": [
+                {"hour_or_key": "2025-01-01T10", "avg_sentiment": 0.5, "count": 2}
+            ],
+        }
+
+        response = client.get("/analytics/sentiment?bucket=day")
+
+        assert response.status_code == 200
+        assert response.json()["by_hashtag"][0]["hashtag"] == "#python"
+        assert mock_sentiment.call_args.kwargs["bucket"] == "day"
@@ -1,13 +1,60 @@
 # tests/test_unit_services.py
 import pytest
+import asyncio
 import json
-from datetime import datetime
-from unittest.mock import MagicMock, patch
+import threading
+import zlib
+import httpx
+from datetime import datetime, timedelta
+from decimal import Decimal
+from collections import Counter
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import create_engine, inspect, select, text
 from sqlalchemy.orm import Session
-from app.models import Tweet
+from sqlalchemy.pool import StaticPool
+from app import schemas
+from app.config import settings
+from app.models import (
+    Tweet,
+    TweetCountMinute,
+    TweetCountHour,
+    HashtagCountHour,
+    TweetSentiment,
+    CollectionJob,
+    HashtagSketch,
+)
 from app.services.tweet_service import TweetService
 from app.services.analytics_service import AnalyticsService
-from app.exceptions import DatabaseError, TwitterAPIError
+from app.services.hashtag_service import HashtagService
+from app.services.rollup_service import RollupService
+from app.services.sketch_service import HashtagSketchService
+from app.services.trend_service import TrendService
+from app.services.sentiment_service import SentimentService
+from app.services.cache_service import AnalyticsCache
+from app.services.archive_service import ArchiveService
+from app.services.search_service import SearchService
+from app.services.job_service import JobService
+from app.services.scheduler_service import CollectionScheduler
+from app.utils.space_saving import SpaceSaving
+from app.services.twitter_client import AsyncTwitterClient
+from app.services.rate_limiter import RateLimitGovernor
+from app.services.corpus import ResponseCorpus
+from app.stub_api import StubSettings, create_stub_app
+from app.services.metrics import MetricsRegistry, instrument_engine, db_queries
+from app.services.ingest_queue import IngestQueue
+from app.services.payload_service import PayloadService
+from app.responses import FastJSONResponse
+from app.compression import CompressionMiddleware, negotiate
+from app.database import Base, create_database_engine, sync_indexes
+from app.exceptions import (
+    DatabaseError,
+    TwitterAPIError,
+    RateLimitExceeded,
+    IngestQueueFull,
+)
+from benchmarks.cli import ingest
+from benchmarks.harness import compare_results, measure, percentile
+from benchmarks.synthetic import SyntheticCorpus
 
 # --- Unit Tests for TweetService ---
 
@@ -30,18 +77,20 @@ def test_collect_tweets_success(mock_db_session, mock_twitter_client):
             {"id": "2", "text": "FastAPI is great", "author_id": "user2"}
         ]
     }
-    
+
     # Simulate a new tweet
     mock_db_session.query.return_value.filter.return_value.first.return_value = None
-    
+
     tweets = TweetService.collect_tweets("test", 10, mock_db_session)
-    
+
     assert len(tweets) == 2
     assert tweets[0].tweet_id == "1"
     assert "Python" in tweets[0].text
-    
+
     assert mock_db_session.add.call_count == 2
-    assert mock_db_session.commit.call_count == 2
+    assert (
+        mock_db_session.commit.call_count == 3
+    )  # one per tweet + the query's since_id
     assert mock_db_session.refresh.call_count == 2
 
 def test_collect_tweets_no_data(mock_db_session, mock_twitter_client):
@@ -61,21 +110,41 @@ def test_collect_tweets_duplicate(mock_db_session, mock_twitter_client):
             {"id": "2", "text": "New tweet"}
         ]
     }
-    
+
     # Simulate first tweet exists, second is new
     existing_tweet = Tweet(tweet_id="1", text="Existing tweet")
     mock_db_session.query.return_value.filter.return_value.first.side_effect = [
         existing_tweet,  # For the first tweet
         None             # For the second tweet
     ]
-    
+
     tweets = TweetService.collect_tweets("test", 10, mock_db_session)
-    
+
     assert len(tweets) == 1
     assert tweets[0].tweet_id == "2"
-    
+
     assert mock_db_session.add.call_count == 1
-    assert mock_db_session.commit.call_count == 1
+    assert mock_db_session.commit.call_count == 2  # new tweet + the query's since_id
+
+
+def test_collect_tweets_keeps_since_id_when_a_tweet_fails_to_save(
+    mock_db_session, mock_twitter_client
+):
+    """Test that a tweet lost to a database error stops since_id from moving past it."""
+    mock_twitter_client.search_recent.return_value = {
+        "data": [{"id": "1", "text": "lost"}, {"id": "2", "text": "saved"}],
+        "meta": {"newest_id": "2"}
+    }
+    mock_db_session.query.return_value.filter.return_value.first.return_value = None
+    mock_db_session.commit.side_effect = [Exception("disk I/O error"), None]
+
+    with patch.object(TweetService, "_commit_since_id") as commit_since_id:
+        tweets = TweetService.collect_tweets("test", 10, mock_db_session)
+
+    assert [tweet.tweet_id for tweet in tweets] == ["2"]
+    assert mock_db_session.rollback.call_count == 1
+    commit_since_id.assert_not_called()
+
 
 def test_collect_tweets_api_limit_reached(mock_db_session, mock_twitter_client):
     """Test handling of API limit error."""
@@ -84,6 +153,156 @@ def test_collect_tweets_api_limit_reached(mock_db_session, mock_twitter_client):
     with pytest.raises(DatabaseError, match="Tweet collection failed"):
         TweetService.collect_tweets("limit", 10, mock_db_session)
 
+
+def test_save_tweets_batch_dedup(db_session):
+    """Test batched ingestion: one insert, duplicates skipped, page order kept."""
+    db_session.add(Tweet(tweet_id="1", text="Already stored"))
+    db_session.commit()
+
+    tweets = TweetService.save_tweets_batch([
+        {"id": "3", "text": "Third #Python", "created_at": "2025-01-01T10:00:00.000Z"},
+        {"id": "1", "text": "Already stored"},
+        {"id": "2", "text": "Second"},
+        {"id": "3", "text": "Third again in the same page"},
+        {"text": "No id"},
+    ], db_session)
+
+    assert [t.tweet_id for t in tweets] == ["3", "2"]
+    assert all(t.id is not None and t.collected_at is not None for t in tweets)
+    assert json.loads(tweets[0].raw_json)["text"] == "Third #Python"
+    assert db_session.query(Tweet).count() == 3
+
+
+def test_raw_json_is_compressed_and_loaded_on_demand(db_session):
+    """Test that raw payloads live compressed in tweet_payloads and legacy rows can be
+    migrated."""
+    payload = {
+        "id": "10",
+        "text": "Compressed #Python",
+        "author_id": "42",
+        "created_at": "2025-01-01T10:00:00.000Z",
+        "edit_history_tweet_ids": ["10"],
+        "public_metrics": {
+            "retweet_count": 0,
+            "reply_count": 0,
+            "like_count": 3,
+            "quote_count": 0,
+        },
+    }
+    TweetService.save_tweets_batch([payload], db_session)
+    db_session.add(Tweet(tweet_id="11", text="Legacy", legacy_raw_json='{"id": "11"}'))
+    db_session.commit()
+    db_session.expunge_all()
+
+    rows = TweetService.get_tweets(10, db_session)
+    assert rows[0].tweet_id == "10" and "raw_json" not in rows[0]._fields
+    assert len(db_session.identity_map) == 0  # column rows, no entity loaded
+
+    tweet = db_session.query(Tweet).filter(Tweet.tweet_id == "10").one()
+    assert "payload" not in tweet.__dict__ and "legacy_raw_json" not in tweet.__dict__
+    assert json.loads(tweet.raw_json) == payload
+    assert tweet.payload.size == len(json.dumps(payload)) > len(tweet.payload.data)
+
+    stats = PayloadService.storage_stats(db_session)
+    assert stats["payloads"] == 1 and stats["legacy_bytes"] > 0
+
+    assert PayloadService.compress_legacy(db_session)["tweets"] == 1
+    db_session.expunge_all()
+    assert PayloadService.storage_stats(db_session)["legacy_bytes"] == 0
+    legacy = db_session.query(Tweet).filter(Tweet.tweet_id == "11").one()
+    assert legacy.legacy_raw_json is None and legacy.raw_json == '{"id": "11"}'
+
+    exported = "".join(
+        TweetService.export_tweets(db_session, columns=("tweet_id", "raw_json"))
+    )
+    assert [
+        json.loads(json.loads(line)["raw_json"])["id"] for line in exported.splitlines()
+    ] == ["10", "11"]
+
+
+def test_collect_tweets_batch_commits_once(db_session, mock_twitter_client):
+    """Test that batch mode commits the whole page once."""
+    mock_twitter_client.search_recent.return_value = {
+        "data": [{"id": str(i), "text": f"Tweet {i}"} for i in range(50)]
+    }
+
+    with patch.object(db_session, "commit", wraps=db_session.commit) as commit:
+        tweets = TweetService.collect_tweets("test", 50, db_session, batch=True)
+
+    assert len(tweets) == 50
+    assert commit.call_count == 1
+
+
+def test_collect_tweets_passes_since_id_per_query(db_session, mock_twitter_client):
+    """Test that repeated collections of a query only ask for newer tweets."""
+    mock_twitter_client.search_recent.return_value = {
+        "data": [{"id": "123456789", "text": "Newest"}, {"id": "99", "text": "Older"}],
+        "meta": {"result_count": 2}
+    }
+    TweetService.collect_tweets("python", 10, db_session, batch=True)
+    TweetService.collect_tweets("python", 10, db_session)
+    TweetService.collect_tweets("rust", 10, db_session, batch=True)
+
+    since_ids = [
+        call.kwargs["since_id"]
+        for call in mock_twitter_client.search_recent.call_args_list
+    ]
+    assert since_ids == [None, "123456789", None]
+    assert TweetService.get_since_id("rust", db_session) == "123456789"
+
+
+def test_export_tweets_yields_one_chunk_per_partition(db_session):
+    """Test that the export streams fixed-size chunks instead of one big payload."""
+    TweetService.save_tweets_batch(
+        [{"id": f"x{i}", "text": f"t{i}"} for i in range(5)], db_session
+    )
+
+    chunks = list(
+        TweetService.export_tweets(db_session, columns=["tweet_id"], chunk_size=2)
+    )
+
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+    with pytest.raises(ValueError):
+        TweetService.export_tweets(db_session, columns=["unknown"])
+
+
+@pytest.mark.asyncio
+async def test_export_stream_waits_for_inflight_chunk_before_closing():
+    """Test that cancelling the export stream closes the generator only after the
+    running read ends."""
+    from app.routes.tweets import _stream_in_thread
+
+    entered, release = threading.Event(), threading.Event()
+    events = []
+
+    def chunks():
+        try:
+            yield "first\n"
+            entered.set()
+            release.wait(5)
+            events.append("read")
+            yield "second\n"
+        finally:
+            events.append("closed")
+
+    class ConnectedRequest:
+        async def is_disconnected(self):
+            return False
+
+    stream = _stream_in_thread(ConnectedRequest(), chunks())
+    assert await stream.__anext__() == "first\n"
+    reading = asyncio.ensure_future(stream.__anext__())
+    await asyncio.to_thread(entered.wait, 5)
+    reading.cancel()
+    await asyncio.sleep(0.05)
+    assert events == []
+
+    release.set()
+    with pytest.raises(asyncio.CancelledError):
+        await reading
+    await stream.aclose()
+    assert events == ["read", "closed"]
+
 def test_get_tweets_success(mock_db_session):
     """Test successful tweet retrieval."""
     mock_db_session.query.return_value.order_by.return_value.limit.return_value.all.return_value = [
@@ -104,35 +323,287 @@ def test_get_tweets_database_empty(mock_db_session):
     
     assert len(tweets) == 0
 
+
+def test_fast_json_response_renders_rows_dates_and_models(db_session):
+    """Test that the orjson-backed response serializes DB rows, datetimes, Decimals and
+    Pydantic models."""
+    db_session.add(
+        Tweet(
+            tweet_id="fj",
+            text="Fast",
+            created_at=datetime(2025, 1, 1, 10, 0, 0, 123456),
+        )
+    )
+    db_session.commit()
+    row = TweetService.get_tweets(1, db_session)[0]
+
+    body = json.loads(FastJSONResponse({
+        "rows": [row],
+        "model": schemas.TweetRead.from_orm(row),
+        "avg": Decimal("0.25"),
+        1: datetime(2025, 1, 1),
+    }).body)
+
+    assert body["rows"][0]["tweet_id"] == "fj"
+    assert body["rows"][0]["created_at"] == "2025-01-01T10:00:00.123456"
+    assert body["model"] == body["rows"][0]
+    assert body["avg"] == 0.25 and body["1"] == "2025-01-01T00:00:00"
+
+
+@pytest.mark.asyncio
+async def test_compression_middleware_streams_incrementally():
+    """Test that streamed bodies are gzip-compressed chunk by chunk and small bodies are
+    left alone."""
+    chunks = [b'{"line": %d, "text": "%s"}\n' % (i, b"x" * 600) for i in range(3)]
+
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")]})
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def small_app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", b"2"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def call(app, accept_encoding="gzip, br;q=0.5"):
+        sent = []
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "headers": [(b"accept-encoding", accept_encoding.encode())],
+        }
+
+        async def send(message):
+            sent.append(message)
+
+        await CompressionMiddleware(app)(scope, None, send)
+        return sent
+
+    sent = await call(streaming_app)
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip" and b"content-length" not in headers
+    assert headers[b"vary"] == b"Accept-Encoding"
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # Each chunk is flushed as it arrives: decodable before the end of the stream
+    assert [decoder.decompress(message["body"]) for message in sent[1:4]] == chunks
+    decoder.decompress(sent[-1]["body"])
+    assert decoder.eof and not sent[-1].get("more_body")
+
+    sent = await call(small_app)
+    assert (
+        b"content-encoding" not in dict(sent[0]["headers"]) and sent[1]["body"] == b"{}"
+    )
+    assert (await call(streaming_app, "identity"))[1]["body"] == chunks[0]
+    assert negotiate("gzip;q=0, deflate") is None and negotiate("*") in ("br", "gzip")
+
+# --- Unit Tests for AsyncTwitterClient ---
+
+
+@pytest.mark.asyncio
+async def test_async_client_search_recent_retries_transient_errors():
+    """Test that the async client retries 503 responses and sends the expected
+    params."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(
+            200, json={"data": [{"id": "1", "text": "Hi"}], "meta": {}}
+        )
+
+    client = AsyncTwitterClient(
+        bearer_token="token", base_url="http://stub/2",
+        transport=httpx.MockTransport(handler), backoff_factor=0
+    )
+    data = await client.search_recent("python", max_results=500, next_token="abc")
+    await client.aclose()
+
+    assert data["data"][0]["id"] == "1"
+    assert len(calls) == 2
+    assert calls[-1].url.params["max_results"] == "100"
+    assert calls[-1].url.params["next_token"] == "abc"
+    assert calls[-1].headers["Authorization"] == "Bearer token"
+
+
+@pytest.mark.asyncio
+async def test_async_client_raises_twitter_api_error():
+    """Test that non-retryable HTTP errors surface as TwitterAPIError."""
+    client = AsyncTwitterClient(
+        bearer_token="token", base_url="http://stub/2",
+        transport=httpx.MockTransport(lambda request: httpx.Response(401))
+    )
+
+    with pytest.raises(TwitterAPIError):
+        await client.search_recent("python")
+    await client.aclose()
+
+
+def test_rate_limit_governor_queues_then_sheds():
+    """Test the token bucket: headers set the budget, empty bucket waits or sheds, reset
+    refills."""
+    now = [1000.0]
+    governor = RateLimitGovernor(max_wait=30, reset_margin=0, clock=lambda: now[0])
+    assert governor.reserve() == 0  # unknown budget: let it through
+
+    governor.update(
+        {
+            "x-rate-limit-limit": "3",
+            "x-rate-limit-remaining": "1",
+            "x-rate-limit-reset": "1020",
+        },
+        200,
+    )
+    assert governor.reserve() == 0
+    assert governor.reserve() == 20
+    now[0] = 1005
+    governor.update({"x-rate-limit-remaining": "2", "x-rate-limit-reset": "1020"}, 200)
+    assert (
+        governor.snapshot()["remaining"] == 0
+    )  # same window: keep the local, smaller budget
+
+    governor.max_wait = 10
+    with pytest.raises(RateLimitExceeded) as shed:
+        governor.reserve()
+    assert shed.value.retry_after == 15
+    assert (governor.throttled_total, governor.shed_total) == (1, 1)
+
+    now[0] = 1020
+    assert governor.reserve() == 0
+    assert governor.snapshot()["remaining"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_waits_for_rate_limit_reset_on_429():
+    """Test that a 429 is retried through the governor instead of the 5xx backoff."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(
+                429, headers={"x-rate-limit-remaining": "0", "x-rate-limit-reset": "0"}
+            )
+        return httpx.Response(
+            200,
+            json={"meta": {}},
+            headers={
+                "x-rate-limit-limit": "450",
+                "x-rate-limit-remaining": "449",
+                "x-rate-limit-reset": "9999999999",
+            },
+        )
+
+    governor = RateLimitGovernor(reset_margin=0)
+    client = AsyncTwitterClient(
+        bearer_token="token", base_url="http://stub/2",
+        transport=httpx.MockTransport(handler), max_retries=0, governor=governor
+    )
+    await client.search_recent("python")
+    await client.aclose()
+
+    assert len(calls) == 2
+    assert (governor.limit, governor.remaining) == (450, 449)
+
+
+def _stub_client(config, **kwargs):
+    """AsyncTwitterClient wired in-process to the local X API stub."""
+    return AsyncTwitterClient(
+        bearer_token="stub", base_url="http://stub/2",
+        transport=httpx.ASGITransport(app=create_stub_app(config)), **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_stub_api_paginates_filters_since_id_and_rate_limits():
+    """Test the synthetic stub: stable pagination, since_id filter and rate-limit
+    headers."""
+    governor = RateLimitGovernor(reset_margin=0, max_wait=0)
+    client = _stub_client(
+        StubSettings(tweets_per_query=250, rate_limit=4), governor=governor
+    )
+
+    pages, next_token = [], None
+    while True:
+        response = await client.search_recent("python", 100, next_token)
+        pages.append(response["data"])
+        next_token = response["meta"].get("next_token")
+        if not next_token:
+            break
+    ids = [int(tweet["id"]) for page in pages for tweet in page]
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert ids == sorted(set(ids), reverse=True)
+    assert governor.remaining == 1
+
+    newer = await client.search_recent("python", 100, since_id=str(ids[2]))
+    assert [tweet["id"] for tweet in newer["data"]] == [str(ids[0]), str(ids[1])]
+
+    with pytest.raises(RateLimitExceeded):
+        await client.search_recent("python")
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stub_api_replays_recorded_corpus(tmp_path):
+    """Test record then replay: responses recorded by the client are served back page by
+    page."""
+    corpus_path = str(tmp_path / "corpus.ndjson")
+    recorder = _stub_client(
+        StubSettings(tweets_per_query=15),
+        recorder=ResponseCorpus(corpus_path),
+        governor=RateLimitGovernor(),
+    )
+    first = await recorder.search_recent("rust", 10)
+    second = await recorder.search_recent("rust", 10, first["meta"]["next_token"])
+    await recorder.aclose()
+
+    replay = _stub_client(
+        StubSettings(corpus_path=corpus_path), governor=RateLimitGovernor()
+    )
+    assert await replay.search_recent("rust", 10) == first
+    assert await replay.search_recent("rust", 10, first["meta"]["next_token"]) == second
+    assert (await replay.search_recent("unknown", 10))["meta"]["result_count"] == 0
+    await replay.aclose()
+
 # --- Unit Tests for AnalyticsService ---
 
 @pytest.fixture
 def sample_tweets():
     """Provides sample Tweet objects for analytics tests."""
     return [
-        Tweet(text="A test tweet with #PyTest and #FastAPI."),
-        Tweet(text="Another test with #FastAPI and #Docker."),
-        Tweet(text="A third tweet with no hashtags."),
-        Tweet(text="A tweet with #pytest, just for case testing.")
+        Tweet(tweet_id="a1", text="A test tweet with #PyTest and #FastAPI."),
+        Tweet(tweet_id="a2", text="Another test with #FastAPI and #Docker."),
+        Tweet(tweet_id="a3", text="A third tweet with no hashtags."),
+        Tweet(tweet_id="a4", text="A tweet with #pytest, just for case testing.")
     ]
 
-def test_get_top_hashtags_success(mock_db_session, sample_tweets):
-    """Test successful hashtag analysis."""
-    mock_db_session.query.return_value.filter.return_value.all.return_value = [
-        (t.text,) for t in sample_tweets
-    ]
+
+def test_get_top_hashtags_success(db_session, sample_tweets):
+    """Test successful hashtag analysis from the counters maintained at ingest."""
+    db_session.add_all(sample_tweets)
+    db_session.commit()
     
-    hashtags = AnalyticsService.get_top_hashtags(10, mock_db_session)
+    hashtags = AnalyticsService.get_top_hashtags(10, db_session)
     
-    assert len(hashtags) == 4
+    assert len(hashtags) == 3
     assert hashtags[0]["hashtag"] == "#fastapi"
     assert hashtags[0]["count"] == 2
     assert hashtags[1]["hashtag"] == "#pytest"
     assert hashtags[1]["count"] == 2
     assert hashtags[2]["hashtag"] == "#docker"
     assert hashtags[2]["count"] == 1
-    assert hashtags[3]["hashtag"] == "#pytest"
-    assert hashtags[3]["count"] == 2
 
 def test_get_top_hashtags_empty_db(mock_db_session):
     """Test hashtag analysis with an empty database."""
@@ -142,26 +613,935 @@ def test_get_top_hashtags_empty_db(mock_db_session):
     
     assert len(hashtags) == 0
 
-def test_get_volume_by_hour_success(mock_db_session):
-    """Test successful volume analysis."""
-    mock_db_session.query.return_value.filter.return_value.all.return_value = [
-        (datetime(2025, 1, 1, 10, 0, 0),),
-        (datetime(2025, 1, 1, 10, 30, 0),),
-        (datetime(2025, 1, 1, 11, 0, 0),)
-    ]
-    
-    volume = AnalyticsService.get_volume_by_hour(mock_db_session)
-    
+
+def test_hashtag_index_batch_and_backfill(db_session):
+    """Test that batch ingest maintains the counters and backfill rebuilds them
+    identically."""
+    TweetService.save_tweets_batch([
+        {"id": "h1", "text": "#AI #ai #Python"},
+        {"id": "h2", "text": "#ai news"},
+    ], db_session)
+    db_session.add(Tweet(tweet_id="h3", text="#python again"))
+    db_session.commit()
+
+    expected = [{"hashtag": "#ai", "count": 2}, {"hashtag": "#python", "count": 2}]
+    assert AnalyticsService.get_top_hashtags(10, db_session) == expected
+
+    assert HashtagService.backfill(db_session, chunk_size=2) == 3
+    assert AnalyticsService.get_top_hashtags(10, db_session) == expected
+
+
+def test_get_volume_by_hour_success(db_session):
+    """Test successful volume analysis aggregated in SQL."""
+    db_session.add_all([
+        Tweet(tweet_id="v1", text="t1", created_at=datetime(2025, 1, 1, 10, 0, 0)),
+        Tweet(tweet_id="v2", text="t2", created_at=datetime(2025, 1, 1, 10, 30, 0)),
+        Tweet(tweet_id="v3", text="t3", created_at=datetime(2025, 1, 1, 11, 0, 0)),
+    ])
+    db_session.commit()
+
+    volume = AnalyticsService.get_volume_by_hour(db_session)
+
     assert len(volume) == 2
     assert volume[0]["hour_or_key"] == "2025-01-01T10"
     assert volume[0]["count"] == 2
     assert volume[1]["hour_or_key"] == "2025-01-01T11"
     assert volume[1]["count"] == 1
 
+
+@pytest.mark.parametrize(
+    "bucket, expected",
+    [
+        (
+            "minute",
+            [("2025-01-01T10:03", 2), ("2025-01-01T10:07", 1), ("2025-01-02T09:00", 1)],
+        ),
+        (
+            "5min",
+            [("2025-01-01T10:00", 2), ("2025-01-01T10:05", 1), ("2025-01-02T09:00", 1)],
+        ),
+        ("day", [("2025-01-01", 3), ("2025-01-02", 1)]),
+    ],
+)
+def test_get_volume_buckets(db_session, bucket, expected):
+    """Test the supported bucket widths."""
+    db_session.add_all([
+        Tweet(tweet_id="b1", text="t", created_at=datetime(2025, 1, 1, 10, 3, 10)),
+        Tweet(tweet_id="b2", text="t", created_at=datetime(2025, 1, 1, 10, 3, 50)),
+        Tweet(tweet_id="b3", text="t", created_at=datetime(2025, 1, 1, 10, 7, 0)),
+        Tweet(tweet_id="b4", text="t", created_at=datetime(2025, 1, 2, 9, 0, 0)),
+    ])
+    db_session.commit()
+
+    volume = AnalyticsService.get_volume_by_hour(db_session, bucket=bucket)
+
+    assert [(v["hour_or_key"], v["count"]) for v in volume] == expected
+
+
+def test_get_volume_time_range(db_session):
+    """Test the optional time range (start included, end excluded)."""
+    db_session.add_all([
+        Tweet(tweet_id=f"r{h}", text="t", created_at=datetime(2025, 1, 1, h, 0, 0))
+        for h in range(8, 13)
+    ])
+    db_session.commit()
+
+    volume = AnalyticsService.get_volume_by_hour(
+        db_session, start=datetime(2025, 1, 1, 9), end=datetime(2025, 1, 1, 11)
+    )
+
+    assert [v["hour_or_key"] for v in volume] == ["2025-01-01T09", "2025-01-01T10"]
+
+
+def test_rollups_maintained_at_ingest_and_rebuilt(db_session):
+    """Test that batch and ORM inserts maintain the rollups, and rebuild regenerates
+    them."""
+    TweetService.save_tweets_batch([
+        {"id": "r1", "text": "#ai one", "created_at": "2025-01-01T10:03:10.000Z"},
+        {"id": "r2", "text": "#ai two", "created_at": "2025-01-01T10:03:50.000Z"},
+    ], db_session)
+    db_session.add(
+        Tweet(tweet_id="r3", text="#ml", created_at=datetime(2025, 1, 1, 11, 15))
+    )
+    db_session.commit()
+
+    def snapshot():
+        return (
+            sorted(
+                (r.bucket_start, r.count) for r in db_session.query(TweetCountMinute)
+            ),
+            sorted((r.bucket_start, r.count) for r in db_session.query(TweetCountHour)),
+            sorted(
+                (r.hashtag, r.bucket_start, r.count)
+                for r in db_session.query(HashtagCountHour)
+            ),
+        )
+
+    minutes, hours, hashtag_hours = snapshot()
+    assert minutes == [
+        (datetime(2025, 1, 1, 10, 3), 2),
+        (datetime(2025, 1, 1, 11, 15), 1),
+    ]
+    assert hours == [(datetime(2025, 1, 1, 10), 2), (datetime(2025, 1, 1, 11), 1)]
+    assert hashtag_hours == [
+        ("#ai", datetime(2025, 1, 1, 10), 2),
+        ("#ml", datetime(2025, 1, 1, 11), 1),
+    ]
+
+    assert RollupService.rebuild(db_session, chunk_size=2) == 3
+    assert snapshot() == (minutes, hours, hashtag_hours)
+
+
+def test_get_volume_unaligned_range_reads_tweets(db_session):
+    """Test that a range not aligned on the rollup granularity stays exact."""
+    db_session.add_all([
+        Tweet(tweet_id="u1", text="t", created_at=datetime(2025, 1, 1, 10, 10)),
+        Tweet(tweet_id="u2", text="t", created_at=datetime(2025, 1, 1, 10, 40)),
+    ])
+    db_session.commit()
+
+    volume = AnalyticsService.get_volume_by_hour(
+        db_session, start=datetime(2025, 1, 1, 10, 30)
+    )
+
+    assert volume == [{"hour_or_key": "2025-01-01T10", "count": 1}]
+
 def test_get_volume_by_hour_empty_db(mock_db_session):
     """Test volume analysis with an empty database."""
     mock_db_session.query.return_value.filter.return_value.all.return_value = []
     
     volume = AnalyticsService.get_volume_by_hour(mock_db_session)
     
-    assert len(volume) == 0
\ No newline at end of file
+    assert len(volume) == 0
+
+# --- Unit Tests for Space-Saving sketches ---
+
+
+def _zipf_stream(size: int, distinct: int):
+    """Deterministic Zipf-like stream: item i appears about size / i times."""
+    weights = [1 / rank for rank in range(1, distinct + 1)]
+    scale = size / sum(weights)
+    stream = []
+    for rank, weight in enumerate(weights, start=1):
+        stream.extend([f"#tag{rank}"] * max(1, int(weight * scale)))
+    return stream
+
+
+def test_space_saving_bounded_error():
+    """Test memory bound and error guarantee on a skewed stream."""
+    stream = _zipf_stream(20000, 2000)
+    exact = Counter(stream)
+    sketch = SpaceSaving(100)
+    for item in reversed(stream):
+        sketch.update(item)
+
+    assert len(sketch) == 100
+    assert sketch.total == len(stream)
+    for item, count, error in sketch.top(10):
+        assert count - error <= exact[item] <= count
+        assert error <= sketch.max_error <= len(stream) // 100
+    assert [item for item, _, _ in sketch.top(3)] == ["#tag1", "#tag2", "#tag3"]
+
+
+def test_space_saving_merge_and_serialization():
+    """Test that merged sketches keep the guarantee and survive a JSON round-trip."""
+    stream = _zipf_stream(10000, 1000)
+    left, right = SpaceSaving(50), SpaceSaving(50)
+    for index, item in enumerate(stream):
+        (left if index % 2 else right).update(item)
+
+    merged = SpaceSaving.from_dict(json.loads(json.dumps(left.to_dict()))).merge(right)
+    exact = Counter(stream)
+
+    assert len(merged) <= 50
+    assert merged.total == len(stream)
+    for item, count, error in merged.top(5):
+        assert count - error <= exact[item] <= count
+
+
+def test_hashtag_sketch_service_flush_and_merge(db_session):
+    """Test that persisted and pending sketches are merged across windows."""
+    HashtagSketchService.reset()
+    TweetService.save_tweets_batch([
+        {"id": "s1", "text": "#ai #ml", "created_at": "2025-01-01T10:00:00.000Z"},
+        {"id": "s2", "text": "#ai", "created_at": "2025-01-01T11:00:00.000Z"},
+    ], db_session)
+
+    assert HashtagSketchService.flush(db_session) == 2
+    TweetService.save_tweets_batch([
+        {"id": "s3", "text": "#ai", "created_at": "2025-01-01T11:30:00.000Z"},
+    ], db_session)
+
+    result = AnalyticsService.get_top_hashtags_approx(10, db_session)
+    assert result["top_hashtags"][0] == {"hashtag": "#ai", "count": 3, "error": 0}
+    assert result["total"] == 4
+
+    ranged = AnalyticsService.get_top_hashtags_approx(
+        10, db_session, start=datetime(2025, 1, 1, 11, 15)
+    )
+    assert ranged["top_hashtags"] == [{"hashtag": "#ai", "count": 2, "error": 0}]
+    HashtagSketchService.reset()
+
+
+def test_hashtag_sketch_service_evicts_oldest_windows(db_session, monkeypatch):
+    """Test that pending windows stay bounded and evicted windows are persisted with the
+    ingest."""
+    HashtagSketchService.reset()
+    monkeypatch.setattr(settings, "sketch_memory_windows", 2)
+    TweetService.save_tweets_batch(
+        [
+            {
+                "id": f"e{hour}",
+                "text": "#backfill",
+                "created_at": f"2025-01-01T{hour:02d}:00:00.000Z",
+            }
+            for hour in range(5)
+        ],
+        db_session,
+    )
+
+    assert sorted(HashtagSketchService._pending) == [
+        datetime(2025, 1, 1, 3),
+        datetime(2025, 1, 1, 4),
+    ]
+    assert db_session.query(HashtagSketch).count() == 3
+    result = AnalyticsService.get_top_hashtags_approx(10, db_session)
+    assert result["top_hashtags"] == [{"hashtag": "#backfill", "count": 5, "error": 0}]
+    HashtagSketchService.reset()
+
+
+def test_hashtag_sketch_service_ignores_rolled_back_inserts(db_session, monkeypatch):
+    """Test that sketch observations only count once the ingest transaction commits."""
+    HashtagSketchService.reset()
+    monkeypatch.setattr(settings, "sketch_memory_windows", 1)
+    db_session.add(
+        Tweet(tweet_id="r0", text="#kept", created_at=datetime(2025, 1, 1, 0))
+    )
+    db_session.commit()
+    session = Session(
+        bind=db_session.connection(), join_transaction_mode="create_savepoint"
+    )
+
+    # L'heure 1 évince l'heure 0 de la mémoire, puis la transaction est annulée
+    session.add(
+        Tweet(tweet_id="r1", text="#dropped", created_at=datetime(2025, 1, 1, 1))
+    )
+    session.flush()
+    session.add(
+        Tweet(tweet_id="r0", text="#kept #dropped", created_at=datetime(2025, 1, 1, 0))
+    )
+    with pytest.raises(Exception):
+        session.flush()
+    session.rollback()
+    session.close()
+
+    assert list(HashtagSketchService._pending) == [datetime(2025, 1, 1, 0)]
+    assert db_session.query(HashtagSketch).count() == 0
+    result = AnalyticsService.get_top_hashtags_approx(10, db_session)
+    assert result["top_hashtags"] == [{"hashtag": "#kept", "count": 1, "error": 0}]
+    HashtagSketchService.reset()
+
+# --- Unit Tests for trend detection ---
+
+
+def test_trending_ranks_bursting_hashtags(db_session):
+    """Test that a burst above the baseline outranks a steady, more frequent hashtag."""
+    rows = []
+    for hour in range(6):
+        rows.append(
+            HashtagCountHour(
+                hashtag="#steady", bucket_start=datetime(2025, 1, 1, hour), count=20
+            )
+        )
+        rows.append(
+            HashtagCountHour(
+                hashtag="#burst", bucket_start=datetime(2025, 1, 1, hour), count=1
+            )
+        )
+    rows.append(
+        HashtagCountHour(
+            hashtag="#burst", bucket_start=datetime(2025, 1, 1, 6), count=15
+        )
+    )
+    rows.append(
+        HashtagCountHour(
+            hashtag="#steady", bucket_start=datetime(2025, 1, 1, 6), count=20
+        )
+    )
+    rows.append(
+        HashtagCountHour(hashtag="#rare", bucket_start=datetime(2025, 1, 1, 6), count=1)
+    )
+    db_session.add_all(rows)
+    db_session.commit()
+
+    result = TrendService.get_trending(db_session, baseline_hours=6)
+
+    assert result["bucket"] == "2025-01-01T06:00:00"
+    assert [entry["hashtag"] for entry in result["trending"]] == ["#burst", "#steady"]
+    assert result["trending"][0]["count"] == 15
+    assert result["trending"][0]["score"] > 10
+    assert result["trending"][1]["score"] == 0
+
+    # Évaluation à une heure passée : aucun hashtag au-dessus de min_count n'accélère
+    past = TrendService.get_trending(
+        db_session, baseline_hours=5, at=datetime(2025, 1, 1, 5, 30)
+    )
+    assert past["bucket"] == "2025-01-01T05:00:00"
+    assert past["trending"][0] == {
+        "hashtag": "#steady",
+        "score": 0.0,
+        "count": 20,
+        "baseline": 20.0,
+    }
+
+
+def test_trending_empty_db(db_session):
+    """Test trend detection without any rollup data."""
+    assert TrendService.get_trending(db_session) == {"bucket": None, "trending": []}
+
+# --- Unit Tests for sentiment scoring ---
+
+
+def test_sentiment_scored_at_ingest_and_aggregated(db_session):
+    """Test that sentiment is persisted once per tweet and averaged in SQL."""
+    TweetService.save_tweets_batch(
+        [
+            {
+                "id": "p1",
+                "text": "I love this, great work #ai",
+                "created_at": "2025-01-01T10:00:00.000Z",
+            },
+            {
+                "id": "p2",
+                "text": "Terrible, awful bug #ai #bug",
+                "created_at": "2025-01-01T11:00:00.000Z",
+            },
+        ],
+        db_session,
+    )
+    db_session.add(
+        Tweet(
+            tweet_id="p3", text="Happy day #ai", created_at=datetime(2025, 1, 1, 11, 30)
+        )
+    )
+    db_session.commit()
+
+    assert db_session.query(TweetSentiment).count() == 3
+
+    result = AnalyticsService.get_sentiment(db_session)
+    by_hashtag = {entry["hashtag"]: entry for entry in result["by_hashtag"]}
+    assert by_hashtag["#ai"]["count"] == 3
+    assert by_hashtag["#bug"]["avg_sentiment"] < 0
+    assert [entry["hour_or_key"] for entry in result["by_bucket"]] == [
+        "2025-01-01T10",
+        "2025-01-01T11",
+    ]
+    assert result["by_bucket"][0]["avg_sentiment"] > 0
+
+    ranged = AnalyticsService.get_sentiment(db_session, start=datetime(2025, 1, 1, 11))
+    assert {entry["hashtag"]: entry["count"] for entry in ranged["by_hashtag"]} == {
+        "#ai": 2,
+        "#bug": 1,
+    }
+
+
+def test_sentiment_backfill_scores_missing_tweets(db_session):
+    """Test that the backfill only scores tweets without a persisted sentiment."""
+    TweetService.save_tweets_batch(
+        [{"id": "b1", "text": "good #ok"}, {"id": "b2", "text": "bad"}], db_session
+    )
+    db_session.query(TweetSentiment).filter(TweetSentiment.compound < 0).delete()
+    db_session.commit()
+
+    assert SentimentService.backfill(db_session, chunk_size=1, workers=1) == 1
+    assert db_session.query(TweetSentiment).count() == 2
+    assert SentimentService.backfill(db_session, workers=1) == 0
+
+# --- Unit Tests for the analytics cache ---
+
+
+def test_analytics_cache_invalidated_by_batch_commit(db_session):
+    """Test that cached results are reused until new tweets are committed."""
+    AnalyticsCache.reset()
+    compute = MagicMock(return_value={"top_hashtags": []})
+    etag = AnalyticsCache.etag("hashtags", {"limit": 20})
+
+    AnalyticsCache.get_or_compute("hashtags", {"limit": 20}, compute)
+    AnalyticsCache.get_or_compute("hashtags", {"limit": 20}, compute)
+    assert compute.call_count == 1
+
+    TweetService.save_tweets_batch([{"id": "c1", "text": "#a"}], db_session)
+    assert AnalyticsCache.etag("hashtags", {"limit": 20}) != etag
+
+    # Doublons uniquement : aucune invalidation
+    etag = AnalyticsCache.etag("hashtags", {"limit": 20})
+    TweetService.save_tweets_batch([{"id": "c1", "text": "#a"}], db_session)
+    assert AnalyticsCache.etag("hashtags", {"limit": 20}) == etag
+
+    AnalyticsCache.get_or_compute("hashtags", {"limit": 20}, compute)
+    assert compute.call_count == 2
+
+# --- Unit Tests for the Parquet archive ---
+
+
+def test_archive_is_incremental_and_queryable(db_session, tmp_path):
+    """Test daily partitions, watermark-based increments, archived volume and prune."""
+    pytest.importorskip("pyarrow")
+    TweetService.save_tweets_batch([
+        {"id": "a1", "text": "#x day one", "created_at": "2025-01-01T10:00:00.000Z"},
+        {"id": "a2", "text": "day two", "created_at": "2025-01-02T08:00:00.000Z"},
+    ], db_session)
+
+    first = ArchiveService.archive(db_session, root=str(tmp_path), chunk_size=1)
+    assert first["rows"] == 2
+    assert sorted(p.name for p in (tmp_path / "tweets").iterdir()) == [
+        "date=2025-01-01",
+        "date=2025-01-02",
+    ]
+
+    TweetService.save_tweets_batch([
+        {"id": "a3", "text": "later", "created_at": "2025-01-02T09:30:00.000Z"},
+    ], db_session)
+    second = ArchiveService.archive(db_session, root=str(tmp_path), include_raw=True)
+    assert second["rows"] == 1
+    assert ArchiveService.archive(db_session, root=str(tmp_path))["rows"] == 0
+
+    table = ArchiveService.read(
+        ["tweet_id", "raw_json"], start=datetime(2025, 1, 2), root=str(tmp_path)
+    )
+    assert sorted(table["tweet_id"].to_pylist()) == ["a2", "a3"]
+
+    with patch("app.services.archive_service.settings.archive_dir", str(tmp_path)):
+        volume = AnalyticsService.get_volume_by_hour(
+            db_session, bucket="day", source="archive"
+        )
+    assert volume == [
+        {"hour_or_key": "2025-01-01", "count": 1},
+        {"hour_or_key": "2025-01-02", "count": 2},
+    ]
+
+    assert ArchiveService.prune(db_session, before=datetime(2025, 1, 2)) == 1
+    assert [t.tweet_id for t in db_session.query(Tweet).order_by(Tweet.id)] == [
+        "a2",
+        "a3",
+    ]
+
+
+def test_archive_and_prune_invalidate_analytics_cache_across_processes(
+    db_session, tmp_path
+):
+    """Test that archive-source results are recomputed after another process archives or
+    prunes."""
+    pytest.importorskip("pyarrow")
+    TweetService.save_tweets_batch([
+        {"id": "c1", "text": "old", "created_at": "2025-01-01T10:00:00.000Z"},
+    ], db_session)
+    compute = MagicMock(
+        side_effect=lambda: ArchiveService.read(
+            ["tweet_id"], root=str(tmp_path)
+        ).num_rows
+    )
+    params = {"source": "archive"}
+
+    AnalyticsCache.sync(db_session)
+    assert AnalyticsCache.get_or_compute("volume", params, compute) == 0
+    etag = AnalyticsCache.etag("volume", params)
+
+    # La CLI tourne dans un autre processus : son invalidation locale n'atteint pas le
+    # serveur API
+    with patch.object(AnalyticsCache, "invalidate"):
+        ArchiveService.archive(db_session, root=str(tmp_path))
+    assert AnalyticsCache.etag("volume", params) == etag
+    AnalyticsCache.sync(db_session)
+    assert AnalyticsCache.etag("volume", params) != etag
+    assert AnalyticsCache.get_or_compute("volume", params, compute) == 1
+
+    etag = AnalyticsCache.etag("volume", params)
+    with patch.object(AnalyticsCache, "invalidate"):
+        assert ArchiveService.prune(db_session, before=datetime(2025, 1, 2)) == 1
+    AnalyticsCache.sync(db_session)
+    assert AnalyticsCache.etag("volume", params) != etag
+    AnalyticsCache.get_or_compute("volume", params, compute)
+    assert compute.call_count == 3
+
+    # Sans nouvelle écriture, la resynchronisation garde le cache
+    etag = AnalyticsCache.etag("volume", params)
+    AnalyticsCache.sync(db_session)
+    assert AnalyticsCache.etag("volume", params) == etag
+
+
+# --- Unit Tests for SearchService ---
+
+def test_search_index_follows_inserts_updates_and_deletes(db_session):
+    """Test that the FTS index is kept in sync by the batch and ORM write paths."""
+    TweetService.save_tweets_batch([
+        {"id": "f1", "text": "FastAPI \"search\" with sqlite"},
+        {"id": "f2", "text": "nothing relevant"},
+    ], db_session)
+    db_session.add(Tweet(tweet_id="f3", text="search search everywhere"))
+    db_session.commit()
+
+    hits, cursor = SearchService.search(db_session, "search")
+    assert [t.tweet_id for t, _ in hits] == ["f3", "f1"]
+    assert hits[0][1] >= hits[1][1] and cursor is None
+    assert [
+        t.tweet_id for t, _ in SearchService.search(db_session, 'fast* "sqlite')[0]
+    ] == ["f1"]
+
+    tweet = db_session.query(Tweet).filter_by(tweet_id="f2").one()
+    tweet.text = "now about search"
+    db_session.delete(db_session.query(Tweet).filter_by(tweet_id="f3").one())
+    db_session.commit()
+    assert sorted(
+        t.tweet_id for t, _ in SearchService.search(db_session, "search")[0]
+    ) == ["f1", "f2"]
+
+
+def test_search_keyset_pages_and_invalid_input(db_session):
+    """Test (score, id) keyset pagination and client errors."""
+    TweetService.save_tweets_batch(
+        [{"id": f"p{i}", "text": f"same words {i}"} for i in range(5)], db_session
+    )
+
+    seen, cursor = [], None
+    while True:
+        hits, cursor = SearchService.search(db_session, "words", limit=2, cursor=cursor)
+        seen += [t.tweet_id for t, _ in hits]
+        if cursor is None:
+            break
+    assert sorted(seen) == [f"p{i}" for i in range(5)] and len(seen) == 5
+
+    _, recent_cursor = SearchService.search(db_session, "words", limit=2, sort="recent")
+    with pytest.raises(ValueError):
+        SearchService.search(db_session, "words", cursor=recent_cursor)
+    with pytest.raises(ValueError):
+        SearchService.search(db_session, "words", cursor="garbage")
+    with pytest.raises(ValueError):
+        SearchService.search(db_session, "  * ")
+
+
+# --- Unit Tests for CollectionScheduler ---
+
+@pytest.mark.asyncio
+async def test_scheduler_polls_since_id_and_backs_off(db_session):
+    """Test due-job claiming, since_id tracking and backoff on API errors."""
+    calls = []
+
+    def handler(request):
+        calls.append(dict(request.url.params))
+        if len(calls) == 1:
+            return httpx.Response(
+                200,
+                json={
+                    "data": [
+                        {"id": "12", "text": "new #py"},
+                        {"id": "11", "text": "older"},
+                    ],
+                    "meta": {"newest_id": "12", "result_count": 2},
+                },
+            )
+        if len(calls) == 2:
+            return httpx.Response(200, json={"meta": {"result_count": 0}})
+        return httpx.Response(429)
+
+    client = AsyncTwitterClient(
+        bearer_token="token", base_url="http://stub/2",
+        transport=httpx.MockTransport(handler), max_retries=0
+    )
+    scheduler = CollectionScheduler(
+        client=client, session_factory=lambda: db_session, jitter=0
+    )
+    job_id = JobService.create_job(db_session, "python", interval_seconds=60).id
+
+    assert await scheduler.run_due(wait=True) == [job_id]
+    assert await scheduler.run_due(wait=True) == []
+    job = db_session.get(CollectionJob, job_id)
+    assert (job.since_id, job.tweets_saved, job.last_status) == ("12", 2, "ok")
+    assert job.next_run_at == job.last_run_at + timedelta(seconds=60)
+    assert "since_id" not in calls[0]
+
+    # Une collecte manuelle avance le watermark partagé : le job repart de là
+    TweetService._advance_since_id("python", "15", db_session)
+    db_session.commit()
+    job = await scheduler.run_job(job_id)
+    assert calls[1]["since_id"] == "15" and job.since_id == "15"
+
+    job = await scheduler.run_job(job_id)
+    await client.aclose()
+    assert (job.last_status, job.consecutive_failures, job.since_id) == (
+        "error",
+        1,
+        "15",
+    )
+    assert job.next_run_at == job.last_run_at + timedelta(seconds=120)
+    assert db_session.query(Tweet).count() == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_resumes_unfinished_pagination_before_advancing_since_id(
+    db_session, monkeypatch
+):
+    """Test that pages left over after scheduler_max_pages are fetched next run before
+    since_id moves."""
+    pages = {
+        None: {
+            "data": [{"id": "40", "text": "a"}, {"id": "39", "text": "b"}],
+            "meta": {"newest_id": "40", "next_token": "t1"},
+        },
+        "t1": {
+            "data": [{"id": "38", "text": "c"}],
+            "meta": {"newest_id": "38", "next_token": "t2"},
+        },
+        "t2": {"data": [{"id": "37", "text": "d"}], "meta": {"newest_id": "37"}},
+    }
+    calls = []
+
+    def handler(request):
+        params = dict(request.url.params)
+        calls.append(params)
+        return httpx.Response(200, json=pages[params.get("next_token")])
+
+    monkeypatch.setattr(settings, "scheduler_max_pages", 2)
+    client = AsyncTwitterClient(
+        bearer_token="token", base_url="http://stub/2",
+        transport=httpx.MockTransport(handler), max_retries=0
+    )
+    scheduler = CollectionScheduler(
+        client=client, session_factory=lambda: db_session, jitter=0
+    )
+    TweetService._advance_since_id("deep", "20", db_session)
+    job_id = JobService.create_job(db_session, "deep", interval_seconds=60).id
+
+    job = await scheduler.run_job(job_id)
+    assert (job.next_token, job.pending_newest_id, job.since_id) == ("t2", "40", "20")
+    assert TweetService.get_since_id("deep", db_session) == "20"
+
+    job = await scheduler.run_job(job_id)
+    await client.aclose()
+    assert calls[2]["next_token"] == "t2" and calls[2]["since_id"] == "20"
+    assert (job.next_token, job.pending_newest_id, job.since_id) == (None, None, "40")
+    assert TweetService.get_since_id("deep", db_session) == "40"
+    assert db_session.query(Tweet).count() == 4
+
+
+@pytest.mark.asyncio
+async def test_scheduler_backs_off_when_saving_fails(db_session, monkeypatch):
+    """Test that a database error while saving tweets is recorded on the job with
+    backoff."""
+    client = AsyncTwitterClient(
+        bearer_token="token",
+        base_url="http://stub/2",
+        max_retries=0,
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                200,
+                json={
+                    "data": [{"id": "30", "text": "#db"}],
+                    "meta": {"newest_id": "30", "result_count": 1},
+                },
+            )
+        ),
+    )
+    job_id = JobService.create_job(db_session, "broken", interval_seconds=60).id
+    # Savepoints : le rollback du scheduler ne doit pas annuler la transaction du test
+    session = Session(
+        bind=db_session.connection(), join_transaction_mode="create_savepoint"
+    )
+    scheduler = CollectionScheduler(
+        client=client, session_factory=lambda: session, jitter=0
+    )
+
+    def failing_save(tweets_data, db, commit=True):
+        raise DatabaseError("disk full")
+
+    monkeypatch.setattr(TweetService, "save_tweets_batch", failing_save)
+    with pytest.raises(DatabaseError):
+        await scheduler.run_job(job_id)
+    await client.aclose()
+
+    db_session.expire_all()
+    job = db_session.get(CollectionJob, job_id)
+    assert (job.runs, job.last_status, job.consecutive_failures) == (1, "error", 1)
+    assert "disk full" in job.last_error
+    assert job.next_run_at == job.last_run_at + timedelta(seconds=120)
+    assert TweetService.get_since_id("broken", db_session) is None
+
+
+# --- Unit Tests for IngestQueue ---
+
+
+@pytest.mark.asyncio
+async def test_ingest_queue_groups_pages_and_applies_backpressure(
+    db_session, monkeypatch
+):
+    """Test cross-query batching in one write, per-job counts and rejection when the
+    queue is full."""
+    pages = {
+        "a": ([{"id": "1", "text": "#a"}, {"id": "2", "text": "#a"}], "2"),
+        "b": (
+            [{"id": "2", "text": "#a"}, {"id": "3", "text": "#b"}, {"text": "no id"}],
+            "3",
+        ),
+        "c": ([{"id": "4", "text": "#c"}], "4"),
+    }
+
+    async def fetch(query, max_results, db):
+        return pages[query[0]]
+
+    monkeypatch.setattr(TweetService, "_fetch_new_page", fetch)
+    queue = IngestQueue(
+        session_factory=lambda: db_session, max_pages=1, flush_interval=0.05
+    )
+    write = queue._write
+    batches = []
+
+    def recording_write(batch):
+        batches.append([page[1] for page in batch])
+        return write(batch)
+
+    monkeypatch.setattr(queue, "_write", recording_write)
+    first = queue.submit_collect("a", 10)
+    second = queue.submit_collect("b", 10)
+    await asyncio.sleep(0.2)
+
+    assert batches == [["a", "b"]]
+    assert queue.get_job(first["id"])["written"] == 2
+    job = queue.get_job(second["id"])
+    assert (job["status"], job["written"], job["deduplicated"], job["failed"]) == (
+        "done",
+        1,
+        1,
+        1,
+    )
+    assert TweetService.get_since_id("b", db_session) == "3"
+
+    # Writer bloqué : la page suivante remplit la file, la soumission d'après est
+    # refusée
+    release = threading.Event()
+    monkeypatch.setattr(queue, "_write", lambda batch: release.wait(5) and write(batch))
+    queue.submit_collect("c1", 10)
+    await asyncio.sleep(0.1)
+    queue.submit_collect("c2", 10)
+    await asyncio.sleep(0.01)
+    with pytest.raises(IngestQueueFull):
+        queue.submit_collect("c3", 10)
+
+    release.set()
+    await queue.stop()
+    assert db_session.query(Tweet).count() == 4
+
+
+def test_ingest_queue_write_advances_each_query_once(db_session):
+    """Test two pages of the same new query in one batch create a single watermark at
+    the newest id."""
+    queue = IngestQueue(session_factory=lambda: db_session)
+    results = queue._write([
+        ("job1", "same", [{"id": "5", "text": "#x"}], "5"),
+        ("job2", "same", [{"id": "9", "text": "#x"}], "9"),
+        ("job3", "other", [{"id": "7", "text": "#y"}], "7"),
+    ])
+
+    assert results == [(1, 0, 0), (1, 0, 0), (1, 0, 0)]
+    assert TweetService.get_since_id("same", db_session) == "9"
+    assert TweetService.get_since_id("other", db_session) == "7"
+
+# --- Unit Tests for metrics ---
+
+
+def test_metrics_registry_renders_prometheus_text():
+    """Test counters, cumulative histogram buckets, label escaping and scrape-time
+    gauges."""
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests.", ("path",))
+    latency = registry.histogram("demo_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.register_collector(
+        lambda: [("demo_gauge", "Gauge.", {}, 3), ("demo_unknown", "Unset.", {}, None)]
+    )
+
+    requests.inc('/a"b')
+    requests.inc('/a"b', amount=2)
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+
+    body = registry.render()
+    assert 'demo_requests_total{path="/a\\"b"} 3' in body
+    assert 'demo_seconds_bucket{le="0.1"} 1' in body
+    assert 'demo_seconds_bucket{le="1"} 2' in body
+    assert 'demo_seconds_bucket{le="+Inf"} 3' in body
+    assert "demo_seconds_count 3" in body
+    assert "demo_gauge 3" in body
+    assert "demo_unknown" not in body
+
+
+def test_instrument_engine_counts_queries(db_session):
+    """Test that SQL statements are counted per operation once the engine is
+    instrumented."""
+    engine = db_session.get_bind().engine
+    instrument_engine(engine)
+    instrument_engine(engine)  # idempotent
+    before = db_queries.value("SELECT")
+
+    db_session.query(Tweet).count()
+    assert db_queries.value("SELECT") == before + 1
+
+# --- Unit Tests for the benchmark harness ---
+
+
+def test_synthetic_corpus_is_deterministic_zipfian_and_chronological():
+    """Test the benchmark corpus: same seed, skewed hashtags, ordered timestamps."""
+    def generate():
+        corpus = SyntheticCorpus(5000, seed=7, vocabulary=200)
+        return [tweet for batch in corpus.iter_batches(500) for tweet in batch]
+
+    tweets = generate()
+    assert tweets == generate()
+    assert len({tweet["id"] for tweet in tweets}) == 5000
+    counts = Counter(
+        tag for tweet in tweets for tag in tweet["text"].split() if tag.startswith("#")
+    )
+    assert [tag for tag, _ in counts.most_common(2)] == ["#tag1", "#tag2"]
+    assert counts["#tag1"] > 10 * counts.get("#tag100", 1)
+    # Chronologique d'un paquet à l'autre
+    assert tweets[499]["created_at"][:13] <= tweets[500]["created_at"][:13]
+
+
+def test_benchmark_ingest_and_result_comparison(db_session):
+    """Test the timed bulk ingest and the regression check between two runs."""
+    stats = ingest(SyntheticCorpus(250, seed=1), db_session, batch_size=100)
+
+    assert (stats["iterations"], stats["items"]) == (3, 250)
+    assert db_session.query(Tweet).count() == 250
+    assert measure(lambda: [1, 2], repeat=4, warmup=0, items=len)["items"] == 8
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+
+    baseline = {
+        "benchmarks": {
+            "a": {"p50_ms": 10.0, "p99_ms": 12.0},
+            "b": {"p50_ms": 5.0, "p99_ms": 6.0},
+        }
+    }
+    current = {
+        "benchmarks": {
+            "a": {"p50_ms": 12.0, "p99_ms": 15.0},
+            "b": {"p50_ms": 5.1, "p99_ms": 6.0},
+        }
+    }
+    rows = {
+        row["name"]: row for row in compare_results(baseline, current, threshold=0.10)
+    }
+    assert rows["a"]["regression"] and not rows["b"]["regression"]
+
+
+def test_sync_indexes_rebuilds_index_with_changed_columns():
+    """Test that an index created by an older schema is rebuilt to match the model."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        # Base existante : ancien ix_tweet_created sur created_at seul, index auteur
+        # absent
+        connection.execute(text("DROP INDEX ix_tweet_created"))
+        connection.execute(text("DROP INDEX ix_tweet_author_created"))
+        connection.execute(text("CREATE INDEX ix_tweet_created ON tweets (created_at)"))
+
+    assert sorted(sync_indexes(engine)) == [
+        "ix_tweet_author_created",
+        "ix_tweet_created",
+    ]
+
+    indexes = {
+        index["name"]: index["column_names"]
+        for index in inspect(engine).get_indexes("tweets")
+    }
+    assert indexes["ix_tweet_created"] == ["created_at", "id"]
+    assert indexes["ix_tweet_author_created"] == ["author_id", "created_at"]
+    assert sync_indexes(engine) == []
+
+
+def test_file_sqlite_engine_gives_each_session_its_own_connection(tmp_path):
+    """Test that closing a request session cannot roll back a writer's pending batch."""
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tweets.db'}")
+    Base.metadata.create_all(bind=engine)
+    writer, request = Session(bind=engine), Session(bind=engine)
+
+    writer.add(Tweet(tweet_id="w1", text="writer batch"))
+    writer.flush()
+    request.execute(select(Tweet.id)).all()
+    request.close()
+    writer.commit()
+
+    assert Session(bind=engine).query(Tweet.tweet_id).all() == [("w1",)]
+    assert not isinstance(engine.pool, StaticPool)
+    assert isinstance(create_database_engine("sqlite:///:memory:").pool, StaticPool)
+
+
+@pytest.mark.asyncio
+async def test_collect_async_save_is_isolated_from_other_request_sessions(tmp_path):
+    """Test that another request ending during the threaded save cannot roll back the
+    collected page."""
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tweets.db'}")
+    Base.metadata.create_all(bind=engine)
+    collector, other_request = Session(bind=engine), Session(bind=engine)
+    other_request.execute(select(Tweet.id)).all()
+
+    client = MagicMock()
+    client.search_recent = AsyncMock(return_value={
+        "data": [{"id": "1", "text": "first"}, {"id": "2", "text": "second"}],
+        "meta": {"newest_id": "2"},
+    })
+    commit_since_id = TweetService._commit_since_id
+
+    def request_ends_mid_save(*args):
+        # Requête concurrente terminée entre l'INSERT du lot et son COMMIT
+        other_request.rollback()
+        other_request.close()
+        return commit_since_id(*args)
+
+    with patch("app.services.tweet_service.async_twitter_client", client), patch.object(
+        TweetService, "_commit_since_id", side_effect=request_ends_mid_save
+    ):
+        saved = await TweetService.collect_tweets_async("q", 10, collector)
+
+    check = Session(bind=engine)
+    assert [tweet.tweet_id for tweet in saved] == ["1", "2"]
+    assert check.query(Tweet).count() == 2
+    assert TweetService.get_since_id("q", check) == "2"
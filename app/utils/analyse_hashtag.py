@@ -11,10 +11,12 @@
      * Utilise une regex `#(\w+)` pour extraire les hashtags.
      * Retourne une **liste brute** de tous les hashtags trouvés (sans normalisation, sans tri).
 
-  2. **`top_hashtags(tweets, n=10)`**
+  2. **`top_hashtags(tweets, n=10, capacity=None)`**
 
      * Appelle `extract_hashtags`.
      * Compte les occurrences avec `Counter`.
+     * Si `capacity` est fourni → compte avec un résumé `SpaceSaving` à mémoire bornée
+       (résultat approximatif).
      * Retourne les `n` hashtags les plus fréquents sous forme de liste de tuples `(hashtag, count)`.
 
   3. **Exécution directe (`__main__`)**
@@ -48,7 +50,17 @@ def extract_hashtags(tweets):
         hashtags.extend(found)
     return hashtags
 
-def top_hashtags(tweets, n=10):
+
+def top_hashtags(tweets, n=10, capacity=None):
+    if capacity:
+        # Import local : le script reste exécutable directement (`python
+        # analyse_hashtag.py`)
+        from .space_saving import SpaceSaving
+        sketch = SpaceSaving(capacity)
+        for tweet in tweets:
+            for hashtag in re.findall(r'#(\w+)', tweet):
+                sketch.update(hashtag)
+        return [(hashtag, count) for hashtag, count, _ in sketch.top(n)]
     hashtags = extract_hashtags(tweets)
     return Counter(hashtags).most_common(n)
 
@@ -0,0 +1,54 @@
+# cursor.py
+"""
+* **Rôle global** : curseurs **opaques** de la pagination par clé (keyset), partagés par
+  `TweetService` et `SearchService`.
+  👉 Un curseur encode la position de la dernière ligne servie : `(clé de tri, id)`.
+
+* **Format** : JSON `[clé, id]` en base64 URL-safe, sans padding `=` (sûr dans une query
+  string).
+
+* **Fonctionnalités** :
+
+  1. **`encode_cursor(key, tweet_pk)`** → curseur opaque (`key` doit être sérialisable
+     en JSON : `None`, nombre, chaîne ISO…).
+  2. **`decode_cursor(cursor, parse_key)`** → `(clé, id)`, la clé étant convertie par
+     `parse_key` si elle n'est pas `None`. Tout curseur malformé lève `ValueError`.
+
+👉 Bref : un seul encodage de curseur pour toutes les listes paginées de l'API.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+K = TypeVar("K")
+
+
+def encode_cursor(key: Any, tweet_pk: int) -> str:
+    """Encode une position `(clé, id)` en curseur opaque."""
+    payload = json.dumps([key, tweet_pk])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, parse_key: Callable[[Any], K]
+) -> Tuple[Optional[K], int]:
+    """
+    Décode un curseur produit par `encode_cursor`.
+
+    Args:
+        cursor: Curseur opaque reçu du client
+        parse_key: Conversion de la clé décodée (ex. `datetime.fromisoformat`, `float`)
+
+    Returns:
+        Tuple `(clé, id)`, la clé valant `None` si elle a été encodée ainsi
+
+    Raises:
+        ValueError: Si le curseur est malformé
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, tweet_pk = json.loads(base64.urlsafe_b64decode(padded))
+        return (parse_key(key) if key is not None else None, int(tweet_pk))
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,22 @@
+# dates.py
+"""
+* **Rôle global** : normalisation des **bornes de dates** reçues par les services avant
+  de filtrer `tweets.created_at`.
+  👉 Les dates sont stockées en **UTC naïf** (sans `tzinfo`) : une borne avec fuseau doit
+    être convertie pour être comparée.
+
+* **Fonctionnalités** :
+
+  1. **`to_utc_naive(value)`** → convertit une date avec fuseau en UTC puis retire
+     `tzinfo` ; une date naïve est supposée déjà en UTC.
+
+👉 Bref : la même conversion pour `TweetService`, `AnalyticsService` et `ArchiveService`.
+"""
+from datetime import datetime, timezone
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Convertit une borne en UTC naïf, comme les dates stockées."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
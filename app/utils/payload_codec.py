@@ -0,0 +1,85 @@
+# payload_codec.py
+"""
+* **Rôle global** : compression des **JSON bruts de l'API X** (`tweet_payloads.data`)
+  avant stockage.
+  👉 Un tweet pèse quelques centaines d'octets, trop peu pour que zlib seul trouve des
+    répétitions :
+  on lui fournit un **dictionnaire prédéfini** (`zdict`) contenant les clés et fragments
+  récurrents des objets tweet v2.
+
+* **Codecs** (identifiant stocké avec chaque payload → les anciens payloads restent
+  lisibles si le dictionnaire évolue) :
+
+  * `CODEC_ZLIB_V1` (1) → zlib niveau `LEVEL`, dictionnaire `ZDICT_V1`.
+
+* **Fonctionnalités** :
+
+  1. **`compress(raw)`** → `(codec, taille décompressée, octets compressés)` avec le
+     codec courant.
+  2. **`decompress(codec, data)`** → JSON d'origine (`str`).
+
+👉 Bref : un JSON de tweet compressé à environ la moitié de sa taille, décompressé en
+  quelques microsecondes.
+"""
+import zlib
+from typing import Dict, Tuple
+
+CODEC_ZLIB_V1 = 1
+CURRENT_CODEC = CODEC_ZLIB_V1
+LEVEL = 6
+
+# Fragments des objets tweet de l'API v2 (/2/tweets/search/recent), les plus fréquents
+# en dernier : zlib cherche ses correspondances en priorité à la fin du dictionnaire
+ZDICT_V1 = (
+    '"referenced_tweets": [{"type": "retweeted", "id": "'
+    '{"type": "quoted", "id": "{"type": "replied_to", "id": "'
+    '"entities": {"urls": [{"start": , "end": , "url": "https://t.co/", '
+    '"expanded_url": "https://'
+    '"display_url": "", "mentions": [{"start": , "end": , "username": "", "id": "'
+    '"annotations": [{"start": , "end": , "probability": 0.9, "type": "Person", '
+    '"normalized_text": "'
+    '"cashtags": [{"start": , "end": , "tag": "'
+    '"context_annotations": [{"domain": {"id": "", "name": "", "description": "'
+    '"entity": {"id": "", "name": "'
+    '"public_metrics": {"retweet_count": 0, "reply_count": 0, "like_count": 0, '
+    '"quote_count": 0, '
+    '"bookmark_count": 0, "impression_count": 0}, '
+    '"possibly_sensitive": false, "lang": "en", "lang": "fr", "conversation_id": "'
+    '"in_reply_to_user_id": "", "reply_settings": "everyone", "source": "'
+    '"hashtags": [{"start": , "end": , "tag": "'
+    '"edit_history_tweet_ids": ["1'
+    '{"id": "1", "text": "RT @", "author_id": "", "created_at": '
+    '"2025-01-01T00:00:00.000Z"}'
+).encode("utf-8")
+
+_DICTIONARIES: Dict[int, bytes] = {CODEC_ZLIB_V1: ZDICT_V1}
+
+
+def compress(raw: str) -> Tuple[int, int, bytes]:
+    """
+    Compresse un JSON brut avec le codec courant.
+
+    Returns:
+        Tuple: `(codec, taille décompressée en octets, données compressées)`
+    """
+    encoded = raw.encode("utf-8")
+    compressor = zlib.compressobj(LEVEL, zdict=_DICTIONARIES[CURRENT_CODEC])
+    return (
+        CURRENT_CODEC,
+        len(encoded),
+        compressor.compress(encoded) + compressor.flush(),
+    )
+
+
+def decompress(codec: int, data: bytes) -> str:
+    """
+    Décompresse un payload stocké.
+
+    Raises:
+        ValueError: Si le codec est inconnu
+    """
+    zdict = _DICTIONARIES.get(codec)
+    if zdict is None:
+        raise ValueError(f"Unknown payload codec {codec}")
+    decompressor = zlib.decompressobj(zdict=zdict)
+    return (decompressor.decompress(data) + decompressor.flush()).decode("utf-8")
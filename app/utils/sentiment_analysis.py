@@ -3,15 +3,29 @@ import re
 from collections import defaultdict
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
+# Analyseur VADER unique par processus (le chargement du lexique est coûteux)
+_analyzer = None
+
+
+def get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def score_texts(texts):
+    """Score VADER `compound` (-1 à 1) de chaque texte, avec l'analyseur partagé."""
+    polarity_scores = get_analyzer().polarity_scores
+    return [polarity_scores(text)['compound'] for text in texts]
+
 def extract_hashtags(tweet):
     return re.findall(r'#(\w+)', tweet)
 
 def analyze_sentiment(tweets):
-    analyzer = SentimentIntensityAnalyzer()
     hashtag_sentiments = defaultdict(list)
-    for tweet in tweets:
+    for tweet, sentiment in zip(tweets, score_texts(tweets)):
         hashtags = extract_hashtags(tweet)
-        sentiment = analyzer.polarity_scores(tweet)['compound']
         for hashtag in hashtags:
             hashtag_sentiments[hashtag].append(sentiment)
     return {hashtag: sum(scores)/len(scores) for hashtag, scores in hashtag_sentiments.items()}
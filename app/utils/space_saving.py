@@ -0,0 +1,157 @@
+# space_saving.py
+"""
+* **Rôle global** : implémentation de l'algorithme **Space-Saving** (Metwally et al.)
+  pour suivre les éléments les plus fréquents d'un flux avec une **mémoire bornée**.
+  👉 Alternative approximative au `Counter`, dont la taille croît avec la cardinalité du
+    flux.
+
+* **Garanties** :
+
+  * Au plus `capacity` éléments suivis en mémoire.
+  * Pour chaque élément suivi : `count - error <= fréquence réelle <= count`.
+  * Erreur maximale par élément : `total / capacity` (donc
+    `capacity = ceil(1 / epsilon)` pour une erreur relative `epsilon`).
+
+* **Fonctionnalités** :
+
+  1. **`update(item, weight=1)`** → ajoute une occurrence (éviction du minimum si le
+     résumé est plein).
+  2. **`top(n)`** → les `n` éléments les plus fréquents, avec leur borne d'erreur.
+  3. **`merge(other)`** → fusion de deux résumés (entre workers ou fenêtres de temps),
+     résultat toujours borné à `capacity`.
+  4. **`to_dict()` / `from_dict()`** → sérialisation JSON pour la persistance.
+
+👉 Bref : un `Counter` à mémoire constante, fusionnable, avec une erreur connue.
+"""
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+
+class SpaceSaving:
+    """Résumé Space-Saving des éléments fréquents d'un flux."""
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0")
+        self.capacity = capacity
+        self.total = 0
+        # item -> [count, error]
+        self.counters: Dict[str, List[int]] = {}
+        # Tas paresseux (count, item) : les entrées obsolètes sont ignorées à l'éviction
+        self._heap: List[Tuple[int, str]] = []
+
+    @classmethod
+    def from_error(cls, epsilon: float) -> "SpaceSaving":
+        """Construit un résumé dont l'erreur par élément est bornée par
+        `epsilon * total`."""
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon must be between 0 and 1")
+        return cls(math.ceil(1 / epsilon))
+
+    @property
+    def max_error(self) -> int:
+        """Borne supérieure de la surestimation de n'importe quel compteur."""
+        if len(self.counters) < self.capacity:
+            return 0
+        return self.total // self.capacity
+
+    def update(self, item: str, weight: int = 1) -> None:
+        """Ajoute `weight` occurrences de `item`."""
+        self.total += weight
+        counter = self.counters.get(item)
+
+        if counter is not None:
+            counter[0] += weight
+        elif len(self.counters) < self.capacity:
+            counter = self.counters[item] = [weight, 0]
+        else:
+            min_count, _ = self._pop_min()
+            counter = self.counters[item] = [min_count + weight, min_count]
+
+        heapq.heappush(self._heap, (counter[0], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def _pop_min(self) -> Tuple[int, str]:
+        """Évince l'élément de plus petit compteur et le retourne."""
+        while True:
+            count, item = heapq.heappop(self._heap)
+            counter = self.counters.get(item)
+            if counter is not None and counter[0] == count:
+                del self.counters[item]
+                return count, item
+
+    def _rebuild_heap(self) -> None:
+        """Purge les entrées obsolètes du tas."""
+        self._heap = [(counter[0], item) for item, counter in self.counters.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """
+        Retourne les éléments les plus fréquents.
+
+        Returns:
+            List[Tuple]: Triplets `(item, count, error)` triés par compteur décroissant
+        """
+        ranked = sorted(
+            ((item, counter[0], counter[1]) for item, counter in self.counters.items()),
+            key=lambda entry: (-entry[1], entry[0])
+        )
+        return ranked if n is None else ranked[:n]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Fusionne deux résumés en un nouveau résumé de capacité `max` des deux.
+
+        Un élément absent d'un résumé plein peut y avoir eu jusqu'à son
+        compteur minimum : ce minimum est ajouté au compteur et à l'erreur.
+        """
+        capacity = max(self.capacity, other.capacity)
+        self_min = self._min_count()
+        other_min = other._min_count()
+
+        merged: Dict[str, List[int]] = {}
+        for item in set(self.counters) | set(other.counters):
+            count_a, error_a = self.counters.get(item, (self_min, self_min))
+            count_b, error_b = other.counters.get(item, (other_min, other_min))
+            merged[item] = [count_a + count_b, error_a + error_b]
+
+        result = SpaceSaving(capacity)
+        result.total = self.total + other.total
+        kept = sorted(merged.items(), key=lambda entry: (-entry[1][0], entry[0]))[
+            :capacity
+        ]
+        result.counters = {item: counter for item, counter in kept}
+        result._rebuild_heap()
+        return result
+
+    def _min_count(self) -> int:
+        """Compteur minimum si le résumé est plein (0 sinon : rien n'a été évincé)."""
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(counter[0] for counter in self.counters.values())
+
+    def to_dict(self) -> dict:
+        """Sérialise le résumé (JSON-compatible)."""
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "counters": {
+                item: list(counter) for item, counter in self.counters.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SpaceSaving":
+        """Reconstruit un résumé sérialisé par `to_dict()`."""
+        sketch = cls(data["capacity"])
+        sketch.total = data["total"]
+        sketch.counters = {
+            item: list(counter) for item, counter in data["counters"].items()
+        }
+        sketch._rebuild_heap()
+        return sketch
+
+    def __len__(self) -> int:
+        return len(self.counters)
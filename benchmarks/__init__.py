@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+"""Benchmarks des chemins critiques (ingestion, analytics, lecture) sur un corpus synthétique."""
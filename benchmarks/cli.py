@@ -0,0 +1,297 @@
+# benchmarks/cli.py
+"""Benchmark suite for the analytics hot paths.
+
+* **Rôle global** : mesurer, sur un corpus synthétique de 10^5 à 10^7 tweets, les chemins les plus sollicités
+  de l'application, et **stocker les résultats en JSON** pour comparer les runs entre eux.
+
+* **Commandes** :
+
+  * `python -m benchmarks.cli run [--tweets N] [--database-url URL] [--repeat N] [--output FICHIER]`
+
+    * **Base dédiée** (vidée au démarrage : `drop_all` + `create_all`) ; SQLite par défaut
+      (`benchmarks/data/bench.db`), PostgreSQL via `--database-url postgresql://...` (nécessite `psycopg2`).
+    * `--reuse` → garde une base déjà remplie par un run précédent (génération de 10^7 tweets évitée).
+    * Résultats dans `benchmarks/results/<dialecte>-<tweets>-<horodatage>.json` par défaut.
+
+  * `python -m benchmarks.cli compare REFERENCE.json COURANT.json [--threshold 0.10]`
+
+    * Tableau des `p50_ms` / `p99_ms` ; code de sortie 1 si un benchmark régresse au-delà du seuil.
+
+* **Benchmarks** :
+
+  1. **`bulk_ingest`** : `TweetService.save_tweets_batch` par paquets de `--batch-size` tweets
+     (index des hashtags, rollups, sentiment compris) → c'est aussi le remplissage de la base.
+  2. **`get_top_hashtags`** : `AnalyticsService.get_top_hashtags(10)`.
+  3. **`get_volume_by_hour`** : `AnalyticsService.get_volume_by_hour(bucket="hour")` (lecture des rollups).
+  4. **`get_volume_by_hour_unaligned`** : mêmes tranches sur une plage non alignée (agrégation sur `tweets`).
+  5. **`get_tweets`** / **`get_tweets_1000`** : `TweetService.get_tweets(100)` / `(1000)`.
+  6. **`list_tweets_1000`** : page de 1000 tweets (`get_tweets_page`) convertie en `TweetRead` (chemin validé) ;
+     **`render_tweets_1000`** : la même page rendue par `FastJSONResponse`, comme `GET /tweets/`.
+  7. **`get_tweets_raw_json`** : 100 entités `Tweet`, puis lecture (décompression à la demande) de leur JSON brut.
+  8. **`scan_tweets`** : parcours complet de `tweets` en objets ORM (`--scan-repeat` itérations).
+  9. **`analyse_hashtag_top`** / **`analyse_hashtag_top_sketch`** : `utils/analyse_hashtag.top_hashtags`
+     sur les textes de `--text-sample` tweets, en comptage exact puis avec un résumé Space-Saving.
+  10. **`compress_gzip_1`** / **`compress_gzip_6`** / **`compress_brotli_4`** (si `brotli` est installé) :
+      compression HTTP du corps de `render_tweets_1000` (`app/compression.py`) ; débit en octets/s,
+      `ratio` = octets compressés / octets d'origine.
+
+  Les services sont appelés directement (sans le cache `AnalyticsCache` des routes) : on mesure le calcul.
+
+* **Mesures** : débit, p50 / p99, pic de RSS (`benchmarks/harness.py`) ; pic d'allocations (`alloc_peak_mb`) des lectures.
+  Volume du JSON brut (`PayloadService.storage_stats`) et taille du fichier SQLite dans `meta.storage`.
+
+👉 En résumé : `make bench` avant et après une optimisation, puis `make bench-compare`.
+
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict
+
+from .harness import Timer, compare_results, measure, run_metadata, write_results
+from .synthetic import SyntheticCorpus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmarks/data/bench.db"
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+def run(args: argparse.Namespace) -> None:
+    """Remplit la base de benchmark puis mesure chaque chemin critique."""
+    # La configuration de l'application est lue à l'import : la base doit être fixée avant
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DEBUG"] = "false"
+    if args.database_url.startswith("sqlite:///"):
+        directory = os.path.dirname(args.database_url[len("sqlite:///"):])
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    from app import models, schemas
+    from app.compression import BrotliEncoder, GzipEncoder, brotli
+    from app.database import Base, SessionLocal, engine
+    from app.responses import FastJSONResponse
+    from app.services.analytics_service import AnalyticsService
+    from app.services.payload_service import PayloadService
+    from app.services.tweet_service import TweetService
+    from app.utils.analyse_hashtag import top_hashtags
+
+    corpus = SyntheticCorpus(
+        args.tweets, seed=args.seed, vocabulary=args.vocabulary, zipf_s=args.zipf_s, days=args.days
+    )
+    results: Dict[str, Dict[str, Any]] = {}
+
+    db = SessionLocal()
+    try:
+        stored = 0
+        if args.reuse:
+            Base.metadata.create_all(bind=engine)
+            stored = TweetService.get_tweets_count(db)
+            logger.info(f"Reusing benchmark database with {stored} tweets")
+        if stored < args.tweets:
+            Base.metadata.drop_all(bind=engine)
+            Base.metadata.create_all(bind=engine)
+            results["bulk_ingest"] = ingest(corpus, db, args.batch_size)
+            stored = TweetService.get_tweets_count(db)
+
+        end = corpus.end
+        start = end - timedelta(days=corpus.days)
+        # Bornes décalées de quelques minutes : les rollups ne peuvent pas servir
+        unaligned = (start + timedelta(minutes=7), end - timedelta(minutes=7))
+
+        read_paths = {
+            "get_top_hashtags": (lambda: AnalyticsService.get_top_hashtags(10, db), len),
+            "get_volume_by_hour": (lambda: AnalyticsService.get_volume_by_hour(db, bucket="hour"), len),
+            "get_volume_by_hour_unaligned": (
+                lambda: AnalyticsService.get_volume_by_hour(db, bucket="hour", start=unaligned[0], end=unaligned[1]),
+                len,
+            ),
+            "get_tweets": (lambda: TweetService.get_tweets(100, db), len),
+            "get_tweets_1000": (lambda: TweetService.get_tweets(1000, db), len),
+            "list_tweets_1000": (
+                lambda: [
+                    schemas.TweetRead.from_orm(tweet) for tweet in TweetService.get_tweets_page(db, 1000)[0]
+                ],
+                len,
+            ),
+            "render_tweets_1000": (
+                lambda: FastJSONResponse(TweetService.get_tweets_page(db, 1000)[0]).body,
+                lambda body: body.count(b'"tweet_id":'),
+            ),
+            "get_tweets_raw_json": (
+                lambda: [tweet.raw_json for tweet in db.query(models.Tweet).limit(100)], len
+            ),
+        }
+        for name, (operation, items) in read_paths.items():
+            logger.info(f"Benchmarking {name}")
+            results[name] = measure(
+                operation, repeat=args.repeat, warmup=args.warmup, items=items, allocations=True
+            )
+            # Les sessions gardent les objets chargés : on repart d'une identité vide
+            db.expunge_all()
+
+        # Compression HTTP d'une page de 1000 tweets : CPU dépensé contre octets économisés
+        page = FastJSONResponse(TweetService.get_tweets_page(db, 1000)[0]).body
+        encoders: Dict[str, Callable[[], Any]] = {"compress_gzip_1": lambda: GzipEncoder(1), "compress_gzip_6": lambda: GzipEncoder(6)}
+        if brotli is not None:
+            encoders["compress_brotli_4"] = lambda: BrotliEncoder(4)
+        for name, new_encoder in encoders.items():
+            logger.info(f"Benchmarking {name}")
+            results[name] = measure(
+                lambda: compress_body(new_encoder(), page), repeat=args.repeat, warmup=args.warmup,
+                items=lambda _: len(page)
+            )
+            compressed = len(compress_body(new_encoder(), page))
+            results[name].update(
+                original_bytes=len(page), compressed_bytes=compressed, ratio=round(compressed / len(page), 3)
+            )
+
+        logger.info("Benchmarking scan_tweets")
+        results["scan_tweets"] = measure(
+            lambda: scan_tweets(db), repeat=args.scan_repeat, warmup=1, items=lambda count: count
+        )
+        storage = PayloadService.storage_stats(db)
+        if args.database_url.startswith("sqlite:///"):
+            storage["database_bytes"] = os.path.getsize(args.database_url[len("sqlite:///"):])
+    finally:
+        db.close()
+
+    texts = list(corpus.iter_texts(min(args.text_sample, args.tweets), args.batch_size))
+    logger.info(f"Benchmarking analyse_hashtag on {len(texts)} texts")
+    results["analyse_hashtag_top"] = measure(
+        lambda: top_hashtags(texts, n=10), repeat=args.repeat, warmup=args.warmup,
+        items=lambda _: len(texts)
+    )
+    results["analyse_hashtag_top_sketch"] = measure(
+        lambda: top_hashtags(texts, n=10, capacity=args.sketch_capacity), repeat=args.repeat,
+        warmup=args.warmup, items=lambda _: len(texts)
+    )
+
+    dialect = engine.dialect.name
+    meta = run_metadata(
+        dialect=dialect, tweets=stored, seed=args.seed, vocabulary=args.vocabulary,
+        zipf_s=args.zipf_s, days=args.days, batch_size=args.batch_size, repeat=args.repeat,
+        text_sample=len(texts), storage=storage,
+    )
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{dialect}-{stored}-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    )
+    write_results(output, meta, results)
+
+    for name, stats in results.items():
+        print(
+            f"{name:32} p50 {stats['p50_ms']:>10.3f} ms  p99 {stats['p99_ms']:>10.3f} ms  "
+            f"{stats['items_per_sec'] or 0:>14,.0f} items/s  rss {stats['peak_rss_mb']} MB"
+            + (f"  alloc {stats['alloc_peak_mb']} MB" if "alloc_peak_mb" in stats else "")
+            + (f"  ratio {stats['ratio']}" if "ratio" in stats else "")
+        )
+    print(
+        f"{'raw_json storage':32} {storage['raw_bytes']:,} -> {storage['compressed_bytes']:,} bytes "
+        f"(ratio {storage['ratio']})"
+    )
+    if "database_bytes" in storage:
+        print(f"{'database file':32} {storage['database_bytes']:,} bytes")
+    print(f"Results written to {output}")
+
+
+def compress_body(encoder, body: bytes) -> bytes:
+    """Compresse un corps de réponse complet, comme `CompressionMiddleware`."""
+    return encoder.compress(body, flush=False) + encoder.finish()
+
+
+def ingest(corpus: SyntheticCorpus, db, batch_size: int) -> Dict[str, Any]:
+    """Insère le corpus par paquets via `save_tweets_batch` et chronomètre chaque paquet."""
+    from app.services.tweet_service import TweetService
+
+    timer = Timer()
+    for batch in corpus.iter_batches(batch_size):
+        started = time.perf_counter()
+        saved = TweetService.save_tweets_batch(batch, db)
+        timer.record(time.perf_counter() - started, len(saved))
+        if len(timer.samples) % 100 == 0:
+            logger.info(f"Ingested {timer.items}/{corpus.total} tweets")
+    return timer.summary()
+
+
+def scan_tweets(db) -> int:
+    """Parcourt toute la table `tweets` en objets ORM (colonnes chargées par défaut)."""
+    from sqlalchemy import select
+
+    from app import models
+
+    count = 0
+    for _ in db.scalars(select(models.Tweet).execution_options(yield_per=5000)):
+        count += 1
+    db.expunge_all()
+    return count
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Affiche l'écart entre deux runs ; 1 si une régression dépasse le seuil."""
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.current, encoding="utf-8") as current_file:
+        current = json.load(current_file)
+
+    rows = compare_results(baseline, current, threshold=args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:32} p50 {row['baseline_p50_ms']:>10.3f} -> {row['current_p50_ms']:>10.3f} ms "
+            f"({row['change']:+.1%})  p99 {row['baseline_p99_ms']:>10.3f} -> {row['current_p99_ms']:>10.3f} ms  {flag}"
+        )
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit le parseur de la ligne de commande."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.cli", description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bench = subparsers.add_parser("run", help="Génère le corpus et mesure les chemins critiques")
+    bench.add_argument("--tweets", type=int, default=100_000, help="Taille du corpus (10^5 à 10^7)")
+    bench.add_argument(
+        "--database-url", default=DEFAULT_DATABASE_URL, help="Base dédiée (vidée au démarrage)"
+    )
+    bench.add_argument("--reuse", action="store_true", help="Garde la base si elle contient déjà le corpus")
+    bench.add_argument("--batch-size", type=int, default=1000, help="Tweets par paquet d'ingestion")
+    bench.add_argument("--repeat", type=int, default=50, help="Itérations mesurées par benchmark")
+    bench.add_argument("--scan-repeat", type=int, default=5, help="Itérations de scan_tweets")
+    bench.add_argument("--warmup", type=int, default=3, help="Itérations d'échauffement")
+    bench.add_argument("--seed", type=int, default=42, help="Graine du corpus")
+    bench.add_argument("--vocabulary", type=int, default=5000, help="Hashtags distincts")
+    bench.add_argument("--zipf-s", type=float, default=1.1, help="Exposant de Zipf des hashtags")
+    bench.add_argument("--days", type=int, default=30, help="Période couverte (jours)")
+    bench.add_argument("--text-sample", type=int, default=100_000, help="Textes pour analyse_hashtag")
+    bench.add_argument("--sketch-capacity", type=int, default=1000, help="Capacité Space-Saving")
+    bench.add_argument("--output", default=None, help="Fichier de résultats JSON")
+    bench.add_argument("--verbose", action="store_true", help="Garde les journaux des services")
+    bench.set_defaults(handler=run)
+
+    diff = subparsers.add_parser("compare", help="Compare deux fichiers de résultats")
+    diff.add_argument("baseline", help="Run de référence")
+    diff.add_argument("current", help="Run à évaluer")
+    diff.add_argument("--threshold", type=float, default=0.10, help="Hausse de p50 tolérée (0.10 = +10 %%)")
+    diff.set_defaults(handler=compare)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Point d'entrée de la ligne de commande."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    args = build_parser().parse_args(argv)
+    # Les journaux par appel des services fausseraient les mesures
+    logging.getLogger("app").setLevel(logging.INFO if getattr(args, "verbose", False) else logging.WARNING)
+    return args.handler(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
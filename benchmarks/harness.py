@@ -0,0 +1,206 @@
+# benchmarks/harness.py
+"""Timing harness and result files.
+
+* **Rôle global** : chronométrer une opération et la résumer en **statistiques comparables** d'un run à l'autre.
+
+* **Mesures** (`measure`, `Timer`) :
+
+  * Latence par itération (`time.perf_counter`) → `mean_ms`, `p50_ms`, `p99_ms`, `min_ms`, `max_ms`.
+  * Débit → `ops_per_sec` (itérations) et `items_per_sec` (tweets traités, lignes lues...).
+  * `peak_rss_mb` → pic de mémoire résidente du processus **depuis son démarrage** (`getrusage`) :
+    il ne redescend jamais, un benchmark gourmand se voit donc sur sa ligne et les suivantes.
+  * `alloc_peak_mb` (`measure(..., allocations=True)`) → pic des allocations Python d'**une** itération
+    (`tracemalloc`, après les itérations chronométrées) : la mémoire propre à l'opération, comparable d'un run à l'autre.
+
+* **Résultats** : un fichier JSON par run (`meta` + `benchmarks`), écrit par `write_results`.
+  `compare_results` rapproche deux runs et signale les régressions de `p50_ms` au-delà d'un seuil.
+
+👉 En résumé : des chiffres simples (p50 / p99 / débit / RSS), stockés pour suivre les régressions.
+
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Percentile `q` (0-100) par interpolation linéaire (0 si aucun échantillon)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pic de mémoire résidente du processus en Mo (None si indisponible)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux : kilo-octets ; macOS : octets
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def peak_allocation_mb(operation: Callable[[], Any]) -> float:
+    """Pic des allocations Python (Mo) pendant un appel de `operation` (`tracemalloc`)."""
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 3)
+
+
+class Timer:
+    """Accumule les latences d'une opération mesurée au fil de l'eau (ex. ingestion par paquets)."""
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self.items = 0
+
+    def record(self, seconds: float, items: int = 1) -> None:
+        """Ajoute une itération de `seconds` secondes ayant traité `items` éléments."""
+        self.samples.append(seconds)
+        self.items += items
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Statistiques des itérations enregistrées.
+
+        Returns:
+            Dict: `iterations`, `items`, `total_s`, `ops_per_sec`, `items_per_sec`,
+            `mean_ms`, `p50_ms`, `p99_ms`, `min_ms`, `max_ms`, `peak_rss_mb`
+        """
+        total = sum(self.samples)
+        count = len(self.samples)
+        return {
+            "iterations": count,
+            "items": self.items,
+            "total_s": round(total, 6),
+            "ops_per_sec": round(count / total, 2) if total else None,
+            "items_per_sec": round(self.items / total, 2) if total else None,
+            "mean_ms": round(total / count * 1000, 4) if count else 0.0,
+            "p50_ms": round(percentile(self.samples, 50) * 1000, 4),
+            "p99_ms": round(percentile(self.samples, 99) * 1000, 4),
+            "min_ms": round(min(self.samples) * 1000, 4) if count else 0.0,
+            "max_ms": round(max(self.samples) * 1000, 4) if count else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+def measure(
+    operation: Callable[[], Any],
+    repeat: int,
+    warmup: int = 1,
+    items: Optional[Callable[[Any], int]] = None,
+    allocations: bool = False
+) -> Dict[str, Any]:
+    """
+    Chronomètre `operation` sur `repeat` itérations (après `warmup` itérations non comptées).
+
+    Args:
+        operation: Fonction sans argument à mesurer
+        repeat: Itérations mesurées
+        warmup: Itérations d'échauffement (caches SQLite, plans de requête...)
+        items: Éléments traités par itération, calculés depuis le résultat (défaut : 1)
+        allocations: Ajoute `alloc_peak_mb` (une itération supplémentaire sous `tracemalloc`)
+
+    Returns:
+        Dict: Statistiques (`Timer.summary`)
+    """
+    for _ in range(warmup):
+        operation()
+
+    timer = Timer()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = operation()
+        elapsed = time.perf_counter() - started
+        timer.record(elapsed, items(result) if items else 1)
+    summary = timer.summary()
+    if allocations:
+        # Itération à part : tracemalloc ralentit fortement les allocations
+        summary["alloc_peak_mb"] = peak_allocation_mb(operation)
+    return summary
+
+
+def run_metadata(**extra: Any) -> Dict[str, Any]:
+    """Contexte du run (commit, versions, machine) pour interpréter une comparaison."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    import sqlalchemy
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        **extra,
+    }
+
+
+def write_results(path: str, meta: Dict[str, Any], benchmarks: Dict[str, Dict[str, Any]]) -> str:
+    """Écrit un run en JSON (répertoires créés si besoin) et retourne le chemin."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump({"meta": meta, "benchmarks": benchmarks}, results_file, indent=2, sort_keys=True)
+        results_file.write("\n")
+    return path
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.10
+) -> List[Dict[str, Any]]:
+    """
+    Compare deux runs benchmark par benchmark.
+
+    Args:
+        baseline: Run de référence (contenu d'un fichier de résultats)
+        current: Run à évaluer
+        threshold: Hausse relative de `p50_ms` tolérée (0.10 = +10 %)
+
+    Returns:
+        List[Dict]: Une ligne par benchmark commun : `name`, `baseline_p50_ms`, `current_p50_ms`,
+        `change` (relatif), `baseline_p99_ms`, `current_p99_ms`, `regression`
+    """
+    rows = []
+    for name, before in sorted(baseline.get("benchmarks", {}).items()):
+        after = current.get("benchmarks", {}).get(name)
+        if after is None:
+            continue
+        change = (after["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0.0
+        rows.append({
+            "name": name,
+            "baseline_p50_ms": before["p50_ms"],
+            "current_p50_ms": after["p50_ms"],
+            "change": round(change, 4),
+            "baseline_p99_ms": before["p99_ms"],
+            "current_p99_ms": after["p99_ms"],
+            "regression": change > threshold,
+        })
+    return rows
@@ -0,0 +1,120 @@
+# benchmarks/synthetic.py
+"""Synthetic tweet corpus generator.
+
+* **Rôle global** : produire des **tweets bruts** (format de l'API X) en volume (10^5 à 10^7), déterministes (`seed`),
+  avec une distribution réaliste pour que les benchmarks mesurent ce qui se passe en production.
+
+* **Réalisme** :
+
+  * **Hashtags Zipfiens** : vocabulaire de `vocabulary` hashtags, le hashtag de rang `r` a un poids `1 / r^s`
+    (`zipf_s`, 1.1 par défaut) → quelques hashtags très fréquents, une longue traîne de hashtags rares.
+  * 0 à 4 hashtags par tweet (la plupart en ont 0 ou 1).
+  * **Auteurs Zipfiens** aussi (quelques comptes très actifs).
+  * **Horodatages** répartis sur `days` jours avec un **cycle journalier** (creux la nuit, pic en soirée, UTC),
+    en ordre croissant comme une collecte continue.
+  * Identifiants croissants de l'ordre des vrais identifiants X.
+
+* **Mémoire constante** : `iter_batches()` produit le corpus par paquets → 10^7 tweets sans tout matérialiser.
+
+👉 En résumé : un flux de tweets crédible et reproductible pour `python -m benchmarks.cli run`.
+
+"""
+import bisect
+import itertools
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+BASE_TWEET_ID = 1_700_000_000_000_000_000
+WORDS = (
+    "data", "release", "today", "build", "launch", "open", "source", "fast", "news", "update",
+    "market", "vote", "game", "music", "love", "great", "bad", "new", "team", "season",
+)
+
+# Poids relatifs par heure UTC (creux vers 4 h, pic vers 20 h)
+HOURLY_PROFILE = tuple(1.0 + 0.8 * math.sin((hour - 14) * math.pi / 12) for hour in range(24))
+
+
+class SyntheticCorpus:
+    """Générateur déterministe de tweets bruts."""
+
+    def __init__(
+        self,
+        total: int,
+        seed: int = 42,
+        vocabulary: int = 5000,
+        zipf_s: float = 1.1,
+        authors: int = 50_000,
+        days: int = 30,
+        end: Optional[datetime] = None
+    ):
+        """
+        Args:
+            total: Nombre de tweets à générer
+            seed: Graine du générateur (même graine → même corpus)
+            vocabulary: Nombre de hashtags distincts
+            zipf_s: Exposant de la loi de Zipf (plus grand → plus concentré)
+            authors: Nombre d'auteurs distincts
+            days: Période couverte par les horodatages
+            end: Fin de la période (défaut : 2025-01-01 UTC, fixe pour la reproductibilité)
+        """
+        if total < 0:
+            raise ValueError("total must be >= 0")
+        self.total = total
+        self.seed = seed
+        self.days = days
+        self.end = end or datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.hashtags = [f"#tag{rank}" for rank in range(1, vocabulary + 1)]
+        self._hashtag_weights = self.zipf_cumulative(vocabulary, zipf_s)
+        self._author_weights = self.zipf_cumulative(authors, zipf_s)
+        hours = [HOURLY_PROFILE[hour % 24] for hour in range(days * 24)]
+        self._hour_weights = list(itertools.accumulate(hours))
+
+    @staticmethod
+    def zipf_cumulative(size: int, s: float) -> List[float]:
+        """Poids cumulés de la loi de Zipf sur les rangs 1..size (pour `random.choices`)."""
+        return list(itertools.accumulate(1.0 / rank ** s for rank in range(1, size + 1)))
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Produit le corpus par paquets de `batch_size` tweets, dans l'ordre chronologique.
+
+        Yields:
+            List[Dict]: Tweets au format de l'API (`id`, `text`, `author_id`, `created_at`)
+        """
+        rng = random.Random(self.seed)
+        start = self.end - timedelta(days=self.days)
+        for offset in range(0, self.total, batch_size):
+            size = min(batch_size, self.total - offset)
+            # Heures tirées selon le profil journalier, triées → flux chronologique par paquet
+            span = self._hour_weights[-1]
+            first = offset / max(self.total, 1) * span
+            last = (offset + size) / max(self.total, 1) * span
+            moments = sorted(rng.uniform(first, last) for _ in range(size))
+            yield [
+                self._tweet(rng, offset + index, start, moment)
+                for index, moment in enumerate(moments)
+            ]
+
+    def iter_texts(self, limit: int, batch_size: int = 1000) -> Iterator[str]:
+        """Textes des `limit` premiers tweets (entrée de `utils/analyse_hashtag`)."""
+        for batch in itertools.islice(self.iter_batches(batch_size), math.ceil(limit / batch_size)):
+            for tweet in batch:
+                yield tweet["text"]
+
+    def _tweet(self, rng: random.Random, index: int, start: datetime, moment: float) -> Dict[str, Any]:
+        """Un tweet ; `moment` est une position dans les poids horaires cumulés."""
+        hour = min(bisect.bisect_left(self._hour_weights, moment), len(self._hour_weights) - 1)
+        created_at = start + timedelta(hours=hour, seconds=rng.random() * 3600)
+        tag_count = min(4, int(rng.expovariate(1.2)))
+        hashtags = rng.choices(self.hashtags, cum_weights=self._hashtag_weights, k=tag_count)
+        author = rng.choices(range(1, len(self._author_weights) + 1), cum_weights=self._author_weights)[0]
+        words = rng.choices(WORDS, k=rng.randint(5, 16))
+        return {
+            "id": str(BASE_TWEET_ID + index),
+            "text": " ".join([*words, *dict.fromkeys(hashtags)]),
+            "author_id": str(author),
+            "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        }
+